@@ -12,19 +12,29 @@ from typing import Any, Dict, List, Optional
 import asyncio
 import sentry_sdk
 from fastapi import Body, FastAPI, Query, Request
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from playwright.async_api import Browser, BrowserContext, Page, Playwright, TimeoutError as PlaywrightTimeoutError, async_playwright
 
-from src import assistant_actions
-from src.candidate_store import search_candidates_advanced, get_candidate_count, search_candidates_by_resume
-from src.config import get_boss_zhipin_config, get_browser_config, get_service_config, get_sentry_config
+from src import assistant_actions, cpu_pool
+from src.candidate_store import scan_candidates, search_candidates_advanced, get_candidate_count, search_candidates_by_resume
+from src.config import get_boss_zhipin_config, get_browser_config, get_dedupe_config, get_service_config, get_resume_index_config, get_sentry_config, get_snapshot_config, get_stats_config
+from src.candidate_snapshot import sync_snapshot
+from src.resume_index import sync_resume_index
+from src.candidate_dedupe import sync_dedupe_index
 from src.global_logger import logger
+from src.response_cache import StaleWhileRevalidateCache
 import src.chat_actions as chat_actions
 import src.recommendation_actions as recommendation_actions
-from src.stats_service import compile_all_jobs, build_daily_candidate_counts
+from src.stats_service import (
+    backfill_stats_rollups,
+    build_daily_candidate_counts,
+    build_daily_candidate_counts_from_rollups,
+    compile_all_jobs,
+    rollups_ready,
+)
 from src.runtime_utils import start_caffeinate, stop_caffeinate
 
 class BossServiceAsync:
@@ -77,6 +87,7 @@ class BossServiceAsync:
         self.caffeinate_process = None
         self.last_activity_time = 0.0
         self.activity_monitor_task: Optional[asyncio.Task] = None
+        self.stats_backfill_task: Optional[asyncio.Task] = None
         
         self.setup_cors()
         self.setup_routes()
@@ -87,11 +98,14 @@ class BossServiceAsync:
     # ------------------------------------------------------------------
     @asynccontextmanager
     async def lifespan(self, app: FastAPI):
+        # warm the CPU worker processes before the first resume needs them
+        await asyncio.to_thread(cpu_pool.start)
         await self._startup_async()
         try:
             yield
         finally:
             await self._shutdown_async()
+            cpu_pool.shutdown(wait=False)
 
     async def _startup_async(self) -> None:
         if self.playwright:
@@ -104,6 +118,8 @@ class BossServiceAsync:
         # Start activity monitor for caffeinate
         if not self.activity_monitor_task:
             self.activity_monitor_task = asyncio.create_task(self._activity_monitor_loop())
+        if not self.stats_backfill_task:
+            self.stats_backfill_task = asyncio.create_task(self._stats_backfill_loop())
             
         logger.debug("Playwright 初始化完成。")
 
@@ -237,6 +253,9 @@ class BossServiceAsync:
         # Stop activity monitor and caffeinate
         if self.activity_monitor_task:
             self.activity_monitor_task.cancel()
+        if self.stats_backfill_task:
+            self.stats_backfill_task.cancel()
+            self.stats_backfill_task = None
         if self.caffeinate_process:
             stop_caffeinate(self.caffeinate_process)
             self.caffeinate_process = None
@@ -275,6 +294,31 @@ class BossServiceAsync:
                 logger.warning(f"Activity monitor error: {e}")
                 await asyncio.sleep(60)
 
+    async def _stats_backfill_loop(self) -> None:
+        """Periodically reconcile the stats rollups (and the local snapshot / resume index / dedupe index, if enabled) with Milvus."""
+        interval = float(get_stats_config().get("backfill_interval_minutes") or 60) * 60
+        while True:
+            try:
+                steps = [("Stats rollup backfill", backfill_stats_rollups)]
+                if get_snapshot_config().get("enabled"):
+                    steps.append(("Candidate snapshot sync", sync_snapshot))
+                if get_resume_index_config().get("enabled"):
+                    steps.append(("Resume index sync", sync_resume_index))
+                if get_dedupe_config().get("enabled"):
+                    steps.append(("Dedupe index sync", sync_dedupe_index))
+                # one failing step must not hold the others back for a whole interval
+                for name, step in steps:
+                    try:
+                        await asyncio.to_thread(step)
+                    except Exception as e:
+                        logger.warning(f"{name} error: {e}")
+                await asyncio.sleep(interval)
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logger.warning(f"Stats rollup backfill error: {e}")
+                await asyncio.sleep(interval)
+
     # ------------------------------------------------------------------
     # Browser/session helpers
     # ------------------------------------------------------------------
@@ -1270,34 +1314,14 @@ async def web_index(request: Request):
     """
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.get("/stats", tags=["web"])
-async def web_stats():
-    """Get statistics data as JSON for frontend rendering.
-    
-    Returns:
-        JSONResponse: Statistics data including jobs, best job, and quick stats
-    """
-    # Get quick stats (candidate count, message counts)
-    # Note: Chat stats require Playwright, but we don't want to block this endpoint
-    # if other Playwright operations are in progress. Use a short timeout to avoid blocking.
-    new_messages = 0
-    new_greets = 0
-    try:
-        # Use a short timeout (0.5s) to avoid blocking if browser is busy
-        # If we can't get the browser session quickly, skip chat stats and return defaults
-        page = await asyncio.wait_for(
-            service._ensure_browser_session(),
-            timeout=0.5
-        )
-        stats = await chat_actions.get_chat_stats_action(page)
-        new_messages = stats.get("new_message_count", 0)
-        new_greets = stats.get("new_greet_count", 0)
-    except asyncio.TimeoutError:
-        # Browser is busy with other operations, skip chat stats
-        logger.debug("Browser busy, skipping chat stats to avoid blocking /stats endpoint")
-    except Exception as e:
-        logger.warning(f"Failed to get chat stats: {e}")
-    
+
+def _scan_daily_candidate_counts() -> List[Dict[str, Any]]:
+    """Exact daily candidate counts from a streaming scan (used until the stats rollups are built)."""
+    return build_daily_candidate_counts(scan_candidates(fields=["candidate_id", "created_ts", "updated_at"]), days=30)
+
+
+def _compute_stats_payload() -> Dict[str, Any]:
+    """Compute the `/stats` payload (database only, runs in a worker thread)."""
     try:
         total_candidates = get_candidate_count()
     except Exception as e:
@@ -1307,24 +1331,14 @@ async def web_stats():
     # Get daily candidate counts for historical chart
     daily_candidate_counts = []
     try:
-        # Get candidates for historical chart
-        # Note: search_candidates_advanced multiplies limit by 3, so we use 5461 to stay under 16384
-        # 5461 * 3 = 16383, which is just under Milvus's max of 16384
-        all_candidates = search_candidates_advanced(
-            fields=["candidate_id", "updated_at"],
-            limit=5461,  # Will become 16383 after * 3, staying under Milvus limit of 16384
-            sort_by="updated_at",
-            sort_direction="desc"
-        )
-        daily_candidate_counts = build_daily_candidate_counts(
-            all_candidates,
-            total_candidates,
-            30
-        )
+        if rollups_ready():
+            daily_candidate_counts = build_daily_candidate_counts_from_rollups(total_candidates, 30)
+        else:
+            daily_candidate_counts = _scan_daily_candidate_counts()
     except Exception as e:
         logger.warning(f"Failed to get daily candidate counts: {e}")
     
-    # Get job statistics (database queries, no browser lock needed)
+    # Get job statistics (rollup reads once built, database queries otherwise; no browser lock needed)
     stats_data = compile_all_jobs()
     jobs = stats_data.get("jobs", [])
     best = stats_data.get("best")
@@ -1342,18 +1356,44 @@ async def web_stats():
             return [convert_score_analysis(item) for item in obj]
         return obj
     
-    jobs_serialized = convert_score_analysis(jobs)
-    best_serialized = convert_score_analysis(best) if best else None
-    
-    return JSONResponse({
+    return {
         "success": True,
         "quick_stats": {
             "total_candidates": total_candidates,
             "daily_candidate_counts": daily_candidate_counts,
         },
-        "best": best_serialized,
-        "jobs": jobs_serialized,
-    })
+        "best": convert_score_analysis(best) if best else None,
+        "jobs": convert_score_analysis(jobs),
+    }
+
+
+async def _compute_stats_payload_async() -> Dict[str, Any]:
+    return await asyncio.to_thread(_compute_stats_payload)
+
+
+# Stale-while-revalidate: polling clients get the cached payload immediately,
+# a single background task refreshes it once it is older than the TTL.
+stats_cache = StaleWhileRevalidateCache(
+    _compute_stats_payload_async,
+    ttl_seconds=float(get_stats_config().get("cache_ttl_seconds") or 60),
+    name="/stats",
+)
+
+
+@app.get("/stats", tags=["web"])
+async def web_stats(request: Request):
+    """Get statistics data as JSON for frontend rendering.
+    
+    Served from `stats_cache`; responds 304 when `If-None-Match` carries the current ETag.
+    
+    Returns:
+        Response: Statistics data including jobs, best job, and quick stats
+    """
+    entry = await stats_cache.get()
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 @app.get("/recent-activity", response_class=HTMLResponse, tags=["web"])
 async def web_recent_activity():
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Add and backfill the typed candidate columns mirrored from the JSON / ISO fields.
+
+`score`, `contacted`, `has_contact`, `action` and the epoch-ms `created_ts` /
+`updated_ts` (see `candidate_store.TYPED_FIELDS`) let filters, time windows and the
+contact sort run inside Milvus on indexed scalars instead of JSON paths, ISO string
+comparisons or Python. New writes keep them in sync through `upsert_candidate`; this script
+  1. adds the fields to an existing collection (nullable, no data rewrite),
+  2. creates their scalar indexes,
+  3. derives the values for every existing candidate and writes them back with
+     partial upserts (`updated_at` is left untouched).
+
+The creation time of existing candidates was never stored, so `created_ts` is
+backfilled from `updated_at` (the best available lower bound of their activity).
+
+It also adds `resume_minhash` (the MinHash signature `candidate_matched` compares
+instead of running SequenceMatcher over full resumes) and `resume_profile` (the
+structured education / work / skills parse, see `src.resume_profile`) and computes
+both from the stored resumes in a second pass.
+
+Usage:
+  python scripts/backfill_candidate_typed_fields.py --dry-run
+  python scripts/backfill_candidate_typed_fields.py
+  python scripts/backfill_candidate_typed_fields.py --only-missing
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import candidate_store
+from src.candidate_store import (
+    TYPED_FIELDS,
+    _client,
+    build_resume_profile,
+    _collection_name,
+    derive_typed_fields,
+    ensure_scalar_indexes,
+    get_collection_schema,
+    resume_signature,
+    scan_candidates,
+)
+from src.global_logger import logger
+
+
+BACKFILLED_FIELDS = (*TYPED_FIELDS, "resume_minhash", "resume_profile")
+
+
+def add_missing_fields(dry_run: bool = False) -> list[str]:
+    """Add the typed / signature fields missing from the remote collection."""
+    existing = candidate_store._get_existing_field_names()
+    schema = {f.name: f for f in get_collection_schema()}
+    missing = [name for name in BACKFILLED_FIELDS if name not in existing]
+    for name in missing:
+        field = schema[name]
+        logger.info("%s field '%s' (%s)", "Would add" if dry_run else "Adding", name, field.dtype.name)
+        if dry_run:
+            continue
+        extra = {"max_length": field.params["max_length"]} if "max_length" in field.params else {}
+        _client.add_collection_field(
+            collection_name=_collection_name,
+            field_name=name,
+            data_type=field.dtype,
+            nullable=True,
+            **extra,
+        )
+    if missing and not dry_run:
+        candidate_store._get_existing_field_names.cache_clear()
+    return missing
+
+
+def backfill(batch_size: int = 500, only_missing: bool = False, dry_run: bool = False) -> int:
+    """Derive the typed columns for every candidate and write them back."""
+    filter_expr = "updated_ts IS NULL or contacted IS NULL" if only_missing else None
+    fields = ["candidate_id", "analysis", "metadata", "updated_at", "created_ts"]
+    written = scanned = 0
+    chunk: list[dict] = []
+    start = time.perf_counter()
+
+    def flush() -> None:
+        nonlocal written, chunk
+        if chunk and not dry_run:
+            _client.upsert(collection_name=_collection_name, data=chunk, partial_update=True)
+        written += len(chunk)
+        chunk = []
+
+    for candidate in scan_candidates(fields=fields, filter_expr=filter_expr):
+        scanned += 1
+        typed = derive_typed_fields(candidate)
+        if not typed:
+            continue
+        typed["created_ts"] = candidate.get("created_ts") or typed.get("updated_ts")
+        # Partial upserts need the same keys on every row of a batch
+        chunk.append({"candidate_id": candidate["candidate_id"], **{f: typed.get(f) for f in TYPED_FIELDS}})
+        if len(chunk) >= batch_size:
+            flush()
+            logger.info("Backfilled %d/%d candidates", written, scanned)
+    flush()
+    logger.info(
+        "%s typed fields for %d/%d candidates in %.1fs",
+        "Would write" if dry_run else "Wrote", written, scanned, time.perf_counter() - start,
+    )
+    return written
+
+
+def backfill_signatures(batch_size: int = 200, only_missing: bool = False, dry_run: bool = False) -> int:
+    """Compute `resume_minhash` and `resume_profile` for every candidate with a resume."""
+    filter_expr = "resume_minhash IS NULL or resume_profile IS NULL" if only_missing else None
+    written = scanned = 0
+    chunk: list[dict] = []
+    start = time.perf_counter()
+
+    def flush() -> None:
+        nonlocal written, chunk
+        if chunk and not dry_run:
+            _client.upsert(collection_name=_collection_name, data=chunk, partial_update=True)
+        written += len(chunk)
+        chunk = []
+
+    for candidate in scan_candidates(fields=["candidate_id", "resume_text", "full_resume"], filter_expr=filter_expr):
+        scanned += 1
+        row = {
+            "candidate_id": candidate["candidate_id"],
+            # every row of a partial upsert batch must carry the same fields
+            "resume_minhash": resume_signature(candidate.get("resume_text") or ""),
+            "resume_profile": build_resume_profile(candidate),
+        }
+        if not row["resume_minhash"] and not row["resume_profile"]:
+            continue
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            flush()
+            logger.info("Signed %d/%d candidates", written, scanned)
+    flush()
+    logger.info(
+        "%s resume signatures / profiles for %d/%d candidates in %.1fs",
+        "Would write" if dry_run else "Wrote", written, scanned, time.perf_counter() - start,
+    )
+    return written
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per partial upsert")
+    parser.add_argument("--only-missing", action="store_true", help="Skip candidates whose typed fields are already set")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+
+    try:
+        missing = add_missing_fields(dry_run=args.dry_run)
+    except Exception as exc:
+        # e.g. servers without AddCollectionField: rebuild the collection instead
+        logger.error(
+            "Could not add typed fields (%s); run `python scripts/migrate_collection.py candidates`, "
+            "which recreates the collection with the new schema and derives these fields", exc,
+        )
+        return 1
+    if missing and args.dry_run:
+        logger.info("Fields %s do not exist yet; run without --dry-run to add them before backfilling", missing)
+        return 0
+    created = ensure_scalar_indexes(indexes={f: candidate_store.SCALAR_INDEXES[f] for f in TYPED_FIELDS}, dry_run=args.dry_run)
+    logger.info("Indexes %s: %s", "to create" if args.dry_run else "created", created or "none")
+    backfill(batch_size=args.batch_size, only_missing=args.only_missing, dry_run=args.dry_run)
+    backfill_signatures(only_missing=args.only_missing, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
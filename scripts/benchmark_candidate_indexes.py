@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark candidate filter latency with and without the scalar indexes.
+
+Loads the same synthetic candidates into two collections of a local Milvus Lite
+database (``pip install milvus-lite``):
+  - plain:    only the vector index
+  - indexed:  vector index + `candidate_store.SCALAR_INDEXES`
+and times ``count(*)`` queries for the hot filters (job, time window, stage).
+The candidate schema is used as is, except for a small vector dimension and without
+the BM25 full-text fields (scalar filters only). Milvus Lite only builds INVERTED
+scalar indexes, so STL_SORT entries are built as INVERTED here.
+
+Usage:
+  python scripts/benchmark_candidate_indexes.py
+  python scripts/benchmark_candidate_indexes.py --rows 200000 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymilvus import CollectionSchema, DataType, FieldSchema, MilvusClient
+
+from src.candidate_store import BM25_FIELDS, SCALAR_INDEXES, get_collection_schema
+
+_DIM = 8
+_STAGES = ["PASS", "CHAT", "SEEK", "CONTACT", ""]
+
+
+def _schema() -> CollectionSchema:
+    fields = []
+    for f in get_collection_schema():
+        if f.dtype == DataType.FLOAT_VECTOR:
+            f = FieldSchema(name=f.name, dtype=DataType.FLOAT_VECTOR, dim=_DIM)
+        elif f.name in BM25_FIELDS:
+            f = FieldSchema(name=f.name, dtype=f.dtype, max_length=f.params["max_length"], nullable=True)
+        elif f.name in BM25_FIELDS.values():
+            continue
+        fields.append(f)
+    return CollectionSchema(fields=fields)
+
+
+def _create(client: MilvusClient, name: str, scalar_indexes: Dict[str, Dict]) -> None:
+    index_params = client.prepare_index_params()
+    index_params.add_index(field_name="resume_vector", index_type="AUTOINDEX", metric_type="IP")
+    for field, params in scalar_indexes.items():
+        if params.get("index_type") == "STL_SORT":
+            params = {**params, "index_type": "INVERTED"}
+        index_params.add_index(field_name=field, **params)
+    client.create_collection(name, schema=_schema(), index_params=index_params)
+
+
+def _rows(n: int, jobs: List[str], days: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = datetime.now()
+    for i in range(n):
+        updated = now - timedelta(minutes=rng.randint(0, days * 24 * 60))
+        yield {
+            "candidate_id": f"c{i:08d}",
+            "resume_vector": [rng.random() for _ in range(_DIM)],
+            "chat_id": f"chat{i}",
+            "name": f"候选人{i}",
+            "job_applied": rng.choice(jobs),
+            "stage": rng.choice(_STAGES),
+            "updated_at": updated.isoformat(),
+            "updated_ts": int(updated.timestamp() * 1000),
+            "metadata": {},
+        }
+
+
+def _load(client: MilvusClient, names: List[str], rows, batch: int = 5000) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            for name in names:
+                client.insert(name, chunk)
+            chunk = []
+    if chunk:
+        for name in names:
+            client.insert(name, chunk)
+    for name in names:
+        client.flush(name)
+        _wait_for_indexes(client, name)
+
+
+def _wait_for_indexes(client: MilvusClient, name: str, timeout: float = 300) -> None:
+    deadline = time.monotonic() + timeout
+    for index in client.list_indexes(name):
+        while client.describe_index(name, index).get("pending_index_rows") and time.monotonic() < deadline:
+            time.sleep(0.5)
+
+
+def _median_ms(client: MilvusClient, name: str, expr: str, repeat: int) -> tuple[float, int]:
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = client.query(name, filter=expr, output_fields=["count(*)"])
+        timings.append((time.perf_counter() - start) * 1000)
+        count = result[0]["count(*)"]
+    return statistics.median(timings), count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic candidates")
+    parser.add_argument("--jobs", type=int, default=30, help="Number of jobs")
+    parser.add_argument("--days", type=int, default=180, help="updated_at spread (days)")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per query (median is reported)")
+    parser.add_argument("--db", default=None, help="Milvus Lite file (default: temporary)")
+    args = parser.parse_args()
+
+    db = args.db or str(Path(tempfile.mkdtemp()) / "bench.db")
+    client = MilvusClient(db)
+    for name in ("plain", "indexed"):
+        if client.has_collection(name):
+            client.drop_collection(name)
+    _create(client, "plain", {})
+    _create(client, "indexed", SCALAR_INDEXES)
+
+    jobs = [f"job_{i:02d}" for i in range(args.jobs)]
+    start = time.perf_counter()
+    _load(client, ["plain", "indexed"], _rows(args.rows, jobs, args.days))
+    print(f"Loaded {args.rows} candidates into {db} in {time.perf_counter() - start:.1f}s\n")
+
+    week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+    filters = {
+        "job": f'job_applied == "{jobs[7]}"',
+        "job + 7d": f'job_applied == "{jobs[7]}" and updated_at >= "{week_ago}"',
+        "7d window": f'updated_at >= "{week_ago}"',
+        "7d window (ts)": f'updated_ts >= {int(datetime.fromisoformat(week_ago).timestamp() * 1000)}',
+        "3 jobs + stage": f'job_applied in ["{jobs[1]}", "{jobs[2]}", "{jobs[3]}"] and stage == "SEEK"',
+    }
+    header = f"{'filter':<16} | {'rows':>7} | {'plain ms':>9} | {'indexed ms':>10} | {'speedup':>7}"
+    print(header)
+    print("-" * len(header))
+    for label, expr in filters.items():
+        plain, count = _median_ms(client, "plain", expr, args.repeat)
+        indexed, indexed_count = _median_ms(client, "indexed", expr, args.repeat)
+        assert count == indexed_count, (label, count, indexed_count)
+        print(f"{label:<16} | {count:>7} | {plain:>9.2f} | {indexed:>10.2f} | {plain / indexed:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
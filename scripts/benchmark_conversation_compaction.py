@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark prompt size / latency against conversation length, with and without compaction.
+
+For each conversation length N, a synthetic followup chat (alternating candidate /
+recruiter messages) is built and measured two ways:
+  - full:      the whole chat is replayed (what the OpenAI conversation holds today)
+  - compacted: init items + summary note + the recent `keep_recent` messages
+               (what `src.conversation_compaction` leaves in the new conversation)
+
+Offline mode (default) reports estimated tokens only. `--live` additionally creates
+real conversations and reports `usage.input_tokens` and wall-clock latency of one
+`responses.create` call per variant (costs API tokens).
+
+Usage:
+  python scripts/benchmark_conversation_compaction.py
+  python scripts/benchmark_conversation_compaction.py --lengths 20 80 320 --live
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.conversation_compaction import (
+    build_summary_note,
+    estimate_tokens,
+    get_job_compaction_config,
+    plan_compaction,
+)
+
+_USER_TEXT = "我之前在一家电商公司负责推荐系统的召回与排序，日均请求量大概两千万，主要用 Python 和 Go，也做过 Flink 实时特征。"
+_ASSISTANT_TEXT = "了解，想再深入问一下：当时排序模型上线后，线上指标和离线指标不一致的问题，你们是怎么定位和解决的？"
+_SUMMARY_TEXT = "- 候选人有电商推荐系统召回/排序经验，日均两千万请求；技术栈 Python/Go/Flink\n" * 8
+
+
+def _synthetic_history(n: int) -> List[Dict[str, Any]]:
+    history: List[Dict[str, Any]] = [
+        {"role": "developer", "content": "候选人主动投递简历，请分析是否匹配。如匹配可以主动和候选人沟通。"},
+        {"role": "developer", "content": "以下是岗位信息（JSON，仅用于内部判断）：" + "{...}" * 200},
+    ]
+    for i in range(n):
+        role = "user" if i % 2 == 0 else "assistant"
+        text = _USER_TEXT if role == "user" else _ASSISTANT_TEXT
+        history.append({"role": role, "timestamp": f"2025-11-{1 + i // 48:02d} {i % 24:02d}:00:00", "content": f"{text}（{i}）"})
+    return history
+
+
+def _items_tokens(items: List[Dict[str, Any]]) -> int:
+    return sum(estimate_tokens(str(m.get("content") or "")) for m in items)
+
+
+def _variants(history: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    full = history
+    plan = plan_compaction(history, config)
+    if not plan.needed:
+        return {"full": full, "compacted": full}
+    seeds = [m for m in history if m.get("role") == "developer"]
+    recent = [m for m in history[plan.split_index:] if m.get("role") != "developer"]
+    compacted = seeds + [build_summary_note(_SUMMARY_TEXT, len(plan.older))] + recent
+    return {"full": full, "compacted": compacted}
+
+
+def _live_measure(client: Any, model: str, items: List[Dict[str, Any]]) -> tuple[float, int]:
+    conversation = client.conversations.create(
+        items=[{"role": m["role"], "content": m["content"], "type": "message"} for m in items]
+    )
+    start = time.perf_counter()
+    response = client.responses.create(
+        model=model,
+        conversation=conversation.id,
+        instructions="请用一句话回复候选人。",
+        input=[{"role": "user", "content": "[沉默]"}],
+    )
+    latency = time.perf_counter() - start
+    usage = getattr(response, "usage", None)
+    return latency, int(getattr(usage, "input_tokens", 0) or 0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 20, 40, 80, 160, 320], help="Conversation lengths (messages)")
+    parser.add_argument("--max-turns", type=int, default=None, help="Override compaction.max_turns")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Override compaction.max_tokens")
+    parser.add_argument("--keep-recent", type=int, default=None, help="Override compaction.keep_recent")
+    parser.add_argument("--live", action="store_true", help="Call the OpenAI API and measure real latency/input tokens")
+    args = parser.parse_args()
+
+    overrides = {"max_turns": args.max_turns, "max_tokens": args.max_tokens, "keep_recent": args.keep_recent}
+    config = get_job_compaction_config({"metadata": {"compaction": {k: v for k, v in overrides.items() if v is not None}}})
+    print(f"compaction config: {config}")
+
+    client = model = None
+    if args.live:
+        from src.assistant_utils import _openai_client as client
+        from src.config import get_openai_config
+
+        model = get_openai_config()["model"]
+
+    header = f"{'messages':>8} | {'full tok':>9} | {'compact tok':>11} | {'saved':>6}"
+    if args.live:
+        header += f" | {'full in_tok':>11} | {'full s':>7} | {'cmp in_tok':>10} | {'cmp s':>7}"
+    print(header)
+    print("-" * len(header))
+    for n in args.lengths:
+        variants = _variants(_synthetic_history(n), config)
+        full_tok, compact_tok = _items_tokens(variants["full"]), _items_tokens(variants["compacted"])
+        row = f"{n:>8} | {full_tok:>9} | {compact_tok:>11} | {1 - compact_tok / full_tok:>6.0%}"
+        if args.live:
+            full_s, full_in = _live_measure(client, model, variants["full"])
+            cmp_s, cmp_in = _live_measure(client, model, variants["compacted"])
+            row += f" | {full_in:>11} | {full_s:>7.2f} | {cmp_in:>10} | {cmp_s:>7.2f}"
+        print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
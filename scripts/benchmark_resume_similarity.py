@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark the exact resume similarity vs the MinHash check used by `candidate_matched`.
+
+Pairs are built from real resumes of the configured collection:
+  - recapture: a resume vs a perturbed re-capture of itself (a varying 牛人分析器 header,
+               one section dropped, a few characters changed) — should match
+  - same-name: candidates sharing name + job_applied — the pairs `candidate_matched` decides
+  - random:    resumes of two different candidates — should not match
+
+For every pair the decision of `calculate_resume_similarity(...) >= 0.7` (SequenceMatcher)
+is compared with `resumes_match` given the stored signature (the incoming resume is
+signed inside the timed call, as on a real upsert), and with the signature alone.
+`--synthetic` generates resumes instead of reading Milvus.
+
+Usage:
+  python scripts/benchmark_resume_similarity.py
+  python scripts/benchmark_resume_similarity.py --limit 500 --pairs 300
+  python scripts/benchmark_resume_similarity.py --synthetic
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import candidate_store
+from src.candidate_store import calculate_resume_similarity, resume_signature, resumes_match, scan_candidates
+
+_THRESHOLD = 0.7
+# Synthetic text needs a realistic character vocabulary: SequenceMatcher's autojunk
+# ignores every character above 1% frequency in texts over 200 characters
+_CJK = [chr(0x4E00 + i) for i in range(2000)]
+
+
+def _synthetic_resumes(n: int, rng: random.Random) -> List[Dict[str, str]]:
+    def section(title: str) -> str:
+        return title + "\n" + "".join(rng.choice(_CJK) for _ in range(rng.randint(300, 900)))
+
+    return [
+        {
+            "name": f"候选人{i % (n // 2 or 1)}",
+            "job_applied": "job",
+            "resume_text": "\n".join(section(t) for t in ("个人优势", "工作经历", "项目经历", "教育经历")),
+        }
+        for i in range(n)
+    ]
+
+
+def _recapture(text: str, rng: random.Random) -> str:
+    """A plausible second capture of the same resume."""
+    sections = text.split("\n")
+    if len(sections) > 3:
+        sections.pop(rng.randrange(len(sections)))
+    chars = list("\n".join(sections))
+    for _ in range(len(chars) // 200):
+        chars[rng.randrange(len(chars))] = rng.choice(_CJK)
+    header = f"牛人分析器 活跃度{rng.randint(1, 99)} 查看全部{rng.randint(3, 9)}项分析\n"
+    return header + "".join(chars)
+
+
+def _pairs(resumes: List[Dict[str, str]], count: int, rng: random.Random) -> Dict[str, List[Tuple[str, str]]]:
+    groups: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for r in resumes:
+        groups[(r.get("name") or "", r.get("job_applied") or "")].append(r["resume_text"])
+    same_name = [p for texts in groups.values() if len(texts) > 1 for p in itertools.combinations(texts, 2)]
+    texts = [r["resume_text"] for r in resumes]
+    return {
+        "recapture": [(t, _recapture(t, rng)) for t in rng.sample(texts, min(count, len(texts)))],
+        "same-name": rng.sample(same_name, min(count, len(same_name))),
+        "random": [tuple(rng.sample(texts, 2)) for _ in range(count)] if len(texts) > 1 else [],
+    }
+
+
+def _timed(fn: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=300, help="Resumes to read from Milvus")
+    parser.add_argument("--pairs", type=int, default=200, help="Pairs per kind")
+    parser.add_argument("--synthetic", action="store_true", help="Generate resumes instead of reading Milvus")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.synthetic:
+        resumes = _synthetic_resumes(args.limit, rng)
+    else:
+        rows = scan_candidates(fields=["name", "job_applied", "resume_text"], filter_expr='resume_text != ""')
+        resumes = [r for r in itertools.islice(rows, args.limit) if r.get("resume_text")]
+    if len(resumes) < 2:
+        print("Not enough resumes; run with --synthetic")
+        return 1
+    print(f"{len(resumes)} resumes, median {statistics.median(len(r['resume_text']) for r in resumes):.0f} chars\n")
+
+    header = (
+        f"{'pairs':>10} | {'n':>4} | {'exact ms':>9} | {'minhash ms':>10} | {'speedup':>8} | "
+        f"{'agree':>6} | {'sig-only agree':>14} | {'exact fallback':>14}"
+    )
+    print(header)
+    print("-" * len(header))
+    for kind, pairs in _pairs(resumes, args.pairs, rng).items():
+        if not pairs:
+            print(f"{kind:>10} | {0:>4} |")
+            continue
+        exact_ms, fast_ms = [], []
+        agree = sig_agree = fallback = 0
+        for a, b in pairs:
+            stored = resume_signature(b)
+            candidate_store._resume_signature.cache_clear()  # the incoming resume is signed on every upsert
+            similarity, ms = _timed(lambda: calculate_resume_similarity(a, b))
+            exact_ms.append(ms)
+            (matched, estimate), ms = _timed(lambda: resumes_match(a, b, stored))
+            fast_ms.append(ms)
+            expected = similarity >= _THRESHOLD
+            agree += matched == expected
+            fallback += estimate == similarity
+            sig_agree += resumes_match(a, signature2=stored)[0] == expected
+        exact, fast = statistics.mean(exact_ms), statistics.mean(fast_ms)
+        n = len(pairs)
+        print(
+            f"{kind:>10} | {n:>4} | {exact:>9.2f} | {fast:>10.2f} | {exact / fast:>7.1f}x | "
+            f"{agree / n:>6.1%} | {sig_agree / n:>14.1%} | {fallback / n:>14.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark per-job Python aggregation vs the single-scan vectorized aggregation.
+
+For each candidate volume N, synthetic candidates of the last 7 days are spread
+over `--jobs` jobs and aggregated two ways:
+  - per-job:  what `compile_all_jobs` used to do after one Milvus query per job —
+              filter the job's candidates, then `build_daily_series`,
+              `conversion_table` and `_score_quality` with per-candidate loops
+  - grouped:  `aggregate_job_stats` over all candidates at once (one scan,
+              NumPy group-by)
+
+Only the aggregation is timed; `--live` additionally times the Milvus fetches
+(N per-job queries vs one projected query) against the configured collection.
+
+Usage:
+  python scripts/benchmark_stats_aggregation.py
+  python scripts/benchmark_stats_aggregation.py --sizes 1000 10000 100000 --jobs 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.stats_service import (
+    HIGH_SCORE_THRESHOLD,
+    _score_quality,
+    aggregate_job_stats,
+    build_daily_series,
+    conversion_table,
+    fetch_job_candidates,
+    fetch_recent_candidates,
+    normalize_stage,
+)
+
+_STAGES = ["PASS", "CHAT", "SEEK", "CONTACT", None]
+
+
+def _synthetic_candidates(n: int, jobs: List[str], seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [
+        {
+            "job_applied": rng.choice(jobs),
+            "stage": rng.choice(_STAGES),
+            "analysis": {"overall": rng.randint(1, 10)} if rng.random() < 0.9 else None,
+            "updated_at": (now - timedelta(minutes=rng.randint(0, 7 * 24 * 60 - 1))).isoformat(),
+            "metadata": {"contacted": rng.random() < 0.1},
+        }
+        for _ in range(n)
+    ]
+
+
+def _per_job(candidates: List[Dict[str, Any]], jobs: List[str]) -> Dict[str, Any]:
+    result = {}
+    for job in jobs:
+        rows = [c for c in candidates if c["job_applied"] == job]
+        scores = [(c.get("analysis") or {}).get("overall") for c in rows if (c.get("analysis") or {}).get("overall") is not None]
+        result[job] = {
+            "daily": build_daily_series(rows, days=7),
+            "conversions": conversion_table(rows),
+            "score_summary": _score_quality(scores),
+            "high": sum(1 for s in scores if s >= HIGH_SCORE_THRESHOLD),
+            "seek": sum(1 for c in rows if normalize_stage(c.get("stage")) == "SEEK"),
+            "contacted": sum(1 for c in rows if c.get("metadata", {}).get("contacted")),
+        }
+    return result
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Candidate volumes")
+    parser.add_argument("--jobs", type=int, default=20, help="Number of jobs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--live", action="store_true", help="Also time the Milvus fetches of the configured collection")
+    args = parser.parse_args()
+
+    jobs = [f"job_{i:02d}" for i in range(args.jobs)]
+    header = f"{'candidates':>10} | {'per-job s':>10} | {'grouped s':>10} | {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for n in args.sizes:
+        candidates = _synthetic_candidates(n, jobs)
+        legacy = _best_of(lambda: _per_job(candidates, jobs), args.repeat)
+        grouped = _best_of(lambda: aggregate_job_stats(candidates, jobs=jobs), args.repeat)
+        print(f"{n:>10} | {legacy:>10.4f} | {grouped:>10.4f} | {legacy / grouped:>7.1f}x")
+
+    if args.live:
+        from src.jobs_store import get_all_jobs
+
+        positions = [j.get("position") or j.get("job_id") for j in get_all_jobs() or []]
+        positions = [p for p in positions if p]
+        start = time.perf_counter()
+        fetched = sum(len(fetch_job_candidates(p, days=7)) for p in positions)
+        per_job_s = time.perf_counter() - start
+        start = time.perf_counter()
+        single = len(fetch_recent_candidates(days=7))
+        single_s = time.perf_counter() - start
+        print(f"\nlive fetch: {len(positions)} per-job queries {per_job_s:.2f}s ({fetched} rows) | one query {single_s:.2f}s ({single} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
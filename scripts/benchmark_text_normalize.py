@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Check and benchmark `src.text_normalize` against the multi-pass chains it replaced.
+
+The original implementations (`clean_resume_text` of the capture modules and
+`normalize_resume_for_matching` of the candidate store) are kept below verbatim as
+the reference. The script
+
+  1. asserts identical output on random inputs built from the fragments that drive
+     every pass (control characters, BOSS tokens, full-width text, whitespace-only
+     lines, newline runs, the 牛人分析器 / privacy / 其他名…牛人 / 经历概览 sections)
+  2. times both versions over real resumes of the configured collection
+     (`--synthetic`: generated resumes instead of reading Milvus)
+  3. with `--write-golden`, regenerates `test/golden/text_normalize.json` from the
+     reference implementations (the corpus `test/test_text_normalize.py` pins)
+
+Usage:
+  python scripts/benchmark_text_normalize.py
+  python scripts/benchmark_text_normalize.py --synthetic --cases 20000
+  python scripts/benchmark_text_normalize.py --write-golden
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.text_normalize import clean_resume_text, collapse_line_breaks, normalize_resume_for_matching
+
+GOLDEN_PATH = Path(__file__).parent.parent / "test" / "golden" / "text_normalize.json"
+
+
+# ------------------------------------------------------------------
+# Reference implementations (verbatim)
+# ------------------------------------------------------------------
+def legacy_clean_resume_text(text: str) -> str:
+    if not text:
+        return ""
+    text = text.replace('\x00', '')
+    text = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    text = re.sub(r'[A-Za-z0-9_-]{10,}~~', '', text)
+    text = unicodedata.normalize('NFKC', text)
+    text = re.sub(r'\n\s+\n', '\n\n', text)
+    text = re.sub(r'\n{4,}', '\n\n\n', text)
+    text = re.sub(r'[ \t]{2,}(?!\n)', ' ', text)
+    text = re.sub(r'[ \t]+\n', '\n', text)
+    return text.strip()
+
+
+def legacy_collapse_line_breaks(text: str) -> str:
+    text = re.sub(r'\n{3,}', '<TRIPLE_NL>', text)
+    text = re.sub(r'\n{2,}', '', text)
+    text = re.sub(r'\n\s\n', '', text)
+    text = re.sub(r'\n', '', text)
+    text = text.replace('<TRIPLE_NL>', '\n\n')
+    return text
+
+
+def legacy_normalize_resume_for_matching(text: str) -> str:
+    if not text:
+        return ""
+    text = text.replace(r"\r\n", " ")
+    text = re.sub(r'牛人分析器.*?查看全部\d+项分析', '', text, flags=re.DOTALL)
+    text = re.sub(r'为妥善保护.*?传播、存储。', '', text, flags=re.DOTALL)
+    text = re.sub(r'其他名.*?牛人.*?经历概览', '经历概览', text, flags=re.DOTALL)
+    text = re.sub(r'经历概览.*', '', text, flags=re.DOTALL)
+    text = re.sub(r'[\r\n]+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+PAIRS: Dict[str, tuple[Callable[[str], str], Callable[[str], str]]] = {
+    "clean_resume_text": (legacy_clean_resume_text, clean_resume_text),
+    "collapse_line_breaks": (legacy_collapse_line_breaks, collapse_line_breaks),
+    "normalize_resume_for_matching": (legacy_normalize_resume_for_matching, normalize_resume_for_matching),
+}
+
+# ------------------------------------------------------------------
+# Inputs
+# ------------------------------------------------------------------
+_FRAGMENTS = [
+    "\n", "\n", "\n", "\n\n", "\n\n\n", " ", " ", "  ", "\t", "\r", "\r\n", "　", "\xa0", "\x85", " ",
+    "\x00", "\x07", "\x0b", "\x1f", "\x7f", "abc", "Python", "工作经历", "负责推荐系统", "ＡＢＣ１２３", "ﬁ", "①",
+    "07ab71446862f8541Xx629-5F1RQxY6~~", "abc~~", "~~", "～～", "\\r\\n", "<TRIPLE_NL>",
+    "牛人分析器", "活跃度12", "查看全部6项分析", "为妥善保护", "传播、存储。", "其他名", "牛人", "经历概览",
+]
+_CJK = [chr(0x4E00 + i) for i in range(2000)]
+
+
+def fuzz_inputs(n: int, rng: random.Random) -> List[str]:
+    return ["".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 40))) for _ in range(n)]
+
+
+def synthetic_resumes(n: int, rng: random.Random) -> List[str]:
+    def section(title: str) -> str:
+        lines = ["".join(rng.choice(_CJK) for _ in range(rng.randint(10, 60))) + rng.choice(["", "  ", "\t"]) for _ in range(rng.randint(5, 25))]
+        return f"{title}\n---\n" + "\n".join(lines) + rng.choice(["\n", "\n\n", "\n \n\n"])
+
+    header = "牛人分析器 活跃度12 查看全部6项分析\n"
+    footer = "为妥善保护牛人在平台提交的个人信息，请勿传播、存储。\n其他名企大厂经历牛人\n经历概览\n" + "概" * 200
+    return [header + "".join(section(t) for t in ("个人优势", "工作经历", "项目经历", "教育经历")) + footer for _ in range(n)]
+
+
+def stored_resumes(limit: int) -> List[str]:
+    from src.candidate_store import scan_candidates
+
+    texts = []
+    for row in scan_candidates(fields=["candidate_id", "resume_text"], filter_expr='resume_text != ""'):
+        if row.get("resume_text"):
+            texts.append(row["resume_text"])
+        if len(texts) >= limit:
+            break
+    return texts
+
+
+GOLDEN_CASES = {
+    "empty": "",
+    "control_chars": "张三\x00\x01\x07简历\x0b\x0c\x1f\x7f\t完",
+    "boss_tokens": "工作经历07ab71446862f8541Xx629-5F1RQxY6-VfmXWOGkl_7RPhFl3g~~ 负责 short~~ 后端",
+    "fullwidth": "ＰＹＴＨＯＮ　工程师 ﬁ ① ２０２０年",
+    "blank_lines": "第一行\n  \n\t\n第二行\n\n\n\n\n第三行\n \n第四行",
+    "spaces": "a    b\t\tc  \n d \t \ne   \rf   ",
+    "crlf": "line1\r\nline2\r\n\r\nline3\\r\\nline4",
+    "unicode_spaces": "甲\xa0\xa0乙  丙\x85\x85丁　　戊",
+    "pdf_lines": "教育\n经历\n\n清华\n \n大学\n\n\n工作\n经历\n\n\n\n字节",
+    "marker_literal": "a<TRIPLE_NL>b\n\n\nc",
+    "analyzer": "牛人分析器\n活跃度 12\n查看全部6项分析\n工作经历 负责推荐系统",
+    "privacy": "工作经历 负责推荐\n为妥善保护牛人在平台提交的个人信息，请勿传播、存储。\n教育经历 清华",
+    "others_then_overview": "工作经历 A公司\n其他名企大厂经历牛人\n张三 李四\n经历概览\n2020 A公司",
+    "overview_then_others": "工作经历 经历概览 其他名 牛人 经历概览 末尾",
+    "others_without_overview": "工作经历 其他名 牛人 没有概览",
+    "others_people_before": "牛人 其他名 经历概览 牛人 结尾",
+    "resume": (
+        "牛人分析器 活跃度12 查看全部6项分析\n张三  \n5年工作经验　本科\n\n期望职位\n---\n算法工程师 北京\t \n\n\n\n"
+        "工作经历\n---\n字节跳动  高级算法工程师\n2020.07 - 至今\n负责推荐系统07ab71446862f8541Xx629-5F1RQxY6~~的召回。\n"
+        "为妥善保护牛人在平台提交的个人信息，请勿传播、存储。\n其他名企大厂经历牛人\n经历概览\n字节跳动"
+    ),
+}
+
+
+def write_golden() -> None:
+    corpus = [
+        {"name": name, "input": text, **{fn: legacy(text) for fn, (legacy, _) in PAIRS.items()}}
+        for name, text in GOLDEN_CASES.items()
+    ]
+    GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    GOLDEN_PATH.write_text(json.dumps(corpus, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    print(f"Wrote {len(corpus)} golden cases to {GOLDEN_PATH}")
+
+
+def check_equivalence(inputs: List[str]) -> int:
+    mismatches = 0
+    for fn, (legacy, fused) in PAIRS.items():
+        for text in inputs:
+            if legacy(text) != fused(text):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"MISMATCH {fn}: {text!r}\n  legacy: {legacy(text)!r}\n  fused:  {fused(text)!r}")
+    return mismatches
+
+
+def bench(texts: List[str], repeat: int) -> None:
+    size = sum(len(t) for t in texts) / max(len(texts), 1)
+    print(f"\n{len(texts)} resumes, {size:.0f} chars on average, best of {repeat}")
+    print(f"{'function':<32}{'legacy ms':>12}{'fused ms':>12}{'speedup':>10}")
+    for fn, pair in PAIRS.items():
+        timings = []
+        for impl in pair:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for text in texts:
+                    impl(text)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best * 1000)
+        print(f"{fn:<32}{timings[0]:>12.1f}{timings[1]:>12.1f}{timings[0] / timings[1]:>9.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", action="store_true", help="Generate resumes instead of reading the collection")
+    parser.add_argument("--limit", type=int, default=500, help="Resumes to benchmark")
+    parser.add_argument("--cases", type=int, default=5000, help="Random equivalence cases")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--write-golden", action="store_true", help="Regenerate test/golden/text_normalize.json")
+    args = parser.parse_args()
+
+    if args.write_golden:
+        write_golden()
+    rng = random.Random(args.seed)
+    texts = synthetic_resumes(args.limit, rng) if args.synthetic else stored_resumes(args.limit)
+    mismatches = check_equivalence(fuzz_inputs(args.cases, rng) + list(GOLDEN_CASES.values()) + texts)
+    print(f"Equivalence: {mismatches} mismatches over {args.cases + len(GOLDEN_CASES) + len(texts)} inputs x {len(PAIRS)} functions")
+    if texts:
+        bench(texts, args.repeat)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
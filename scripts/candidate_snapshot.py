@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Sync and query the local columnar candidate snapshot (`src.candidate_snapshot`).
+
+Commands:
+  sync   Incrementally pull candidates changed since the stored watermark (--full rebuilds)
+  info   Print path / row count / watermark / last sync time
+  jobs   Per-job stage / score / contact breakdown, computed offline on the snapshot
+
+Usage:
+  python scripts/candidate_snapshot.py sync
+  python scripts/candidate_snapshot.py sync --full
+  python scripts/candidate_snapshot.py jobs --days 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.candidate_snapshot import query_snapshot, snapshot_info, sync_snapshot
+
+
+def _cmd_jobs(days: int | None) -> None:
+    import pyarrow.compute as pc
+
+    start = time.perf_counter()
+    table = query_snapshot(
+        ["job_applied", "stage", "score", "contacted", "has_contact"],
+        updated_from=datetime.now() - timedelta(days=days) if days else None,
+    )
+    table = table.append_column("scored", pc.is_valid(table["score"]))
+    grouped = table.group_by("job_applied").aggregate([
+        ("job_applied", "count"),
+        ("score", "mean"),
+        ("scored", "sum"),
+        ("contacted", "sum"),
+        ("has_contact", "sum"),
+    ])
+    stages = table.group_by(["job_applied", "stage"]).aggregate([("stage", "count")])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    by_stage: dict = {}
+    for row in stages.to_pylist():
+        by_stage.setdefault(row["job_applied"], {})[row["stage"] or "-"] = row["stage_count"]
+    rows = sorted(grouped.to_pylist(), key=lambda r: r["job_applied_count"], reverse=True)
+    print(f"{'job':<30} | {'total':>6} | {'scored':>6} | {'avg':>5} | {'contacted':>9} | {'contact':>7} | stages")
+    for row in rows:
+        avg = f"{row['score_mean']:.2f}" if row["score_mean"] is not None else "-"
+        print(
+            f"{(row['job_applied'] or '-')[:30]:<30} | {row['job_applied_count']:>6} | {row['scored_sum']:>6} | {avg:>5} | "
+            f"{row['contacted_sum']:>9} | {row['has_contact_sum']:>7} | {by_stage.get(row['job_applied'], {})}"
+        )
+    print(f"\n{table.num_rows} candidates aggregated in {elapsed_ms:.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Incrementally sync the snapshot from Milvus")
+    sync.add_argument("--full", action="store_true", help="Rebuild from scratch (drops deleted candidates)")
+    sub.add_parser("info", help="Show snapshot metadata")
+    jobs = sub.add_parser("jobs", help="Per-job breakdown computed on the snapshot")
+    jobs.add_argument("--days", type=int, default=None, help="Only candidates updated in the last N days")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        print(json.dumps(sync_snapshot(full=args.full), ensure_ascii=False, indent=2))
+    elif args.command == "info":
+        print(json.dumps(snapshot_info(), ensure_ascii=False, indent=2))
+    else:
+        _cmd_jobs(args.days)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
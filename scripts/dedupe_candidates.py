@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Find and resolve near-duplicate candidates (`src.candidate_dedupe`).
+
+Unlike `remove_duplicate_candidates.py` (exact name groups), clusters are built from
+LSH buckets over the resume MinHash signatures and `resume_vector` sketches, verified
+by similarity (and by default the same name). Run
+`backfill_candidate_typed_fields.py` first so that existing rows have `resume_minhash`.
+
+Commands:
+  sync     Sketch candidates changed since the stored watermark (--full rebuilds)
+  report   Stream every cluster of the index to a JSONL report
+  resolve  Keep the latest member of each reported cluster, merge missing fields into it
+           and delete the others (dry run unless --execute)
+  info     Print path / sketch / bucket counts, watermark and last sync time
+
+Usage:
+  python scripts/dedupe_candidates.py sync --full
+  python scripts/dedupe_candidates.py report --out data/candidate_duplicates.jsonl
+  python scripts/dedupe_candidates.py resolve data/candidate_duplicates.jsonl
+  python scripts/dedupe_candidates.py resolve data/candidate_duplicates.jsonl --execute --no-merge
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.candidate_dedupe import find_duplicates, index_info, read_report, resolve_duplicates, sync_dedupe_index, write_report
+from src.config import get_dedupe_config, resolve_repo_path
+
+
+def main() -> int:
+    default_report = str(resolve_repo_path(get_dedupe_config().get("report_path") or "data/candidate_duplicates.jsonl"))
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Incrementally sketch candidates from Milvus")
+    sync.add_argument("--full", action="store_true", help="Rebuild from scratch (drops deleted candidates)")
+    report = sub.add_parser("report", help="Write every near-duplicate cluster to a JSONL report")
+    report.add_argument("--out", default=default_report, help="Report path")
+    report.add_argument("--show", type=int, default=5, help="Clusters to print")
+    resolve = sub.add_parser("resolve", help="Merge and delete the duplicates of a report")
+    resolve.add_argument("report", nargs="?", default=default_report, help="Report written by `report`")
+    resolve.add_argument("--execute", action="store_true", help="Actually write and delete (default is dry-run)")
+    resolve.add_argument("--no-merge", action="store_true", help="Delete without copying missing fields into the kept candidate")
+    resolve.add_argument("--batch-size", type=int, default=100, help="Clusters per round of reads / writes / deletes")
+    sub.add_parser("info", help="Show index metadata")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        print(json.dumps(sync_dedupe_index(full=args.full), ensure_ascii=False, indent=2))
+    elif args.command == "report":
+        if index_info() is None:
+            print("Index not built yet: run `sync --full` first")
+            return 1
+        written = write_report(find_duplicates(), args.out)
+        for cluster in itertools.islice(read_report(args.out), args.show):
+            print(json.dumps(cluster["members"], ensure_ascii=False))
+        print(f"\n{written} clusters written to {args.out}")
+    elif args.command == "resolve":
+        totals = resolve_duplicates(
+            read_report(args.report),
+            merge=not args.no_merge,
+            dry_run=not args.execute,
+            batch_size=args.batch_size,
+        )
+        print(json.dumps(totals, ensure_ascii=False, indent=2))
+        if not args.execute:
+            print("Dry run: re-run with --execute to apply")
+    else:
+        print(json.dumps(index_info(), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
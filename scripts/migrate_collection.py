@@ -7,6 +7,7 @@ the current schema definitions in candidate_store.py and jobs_store.py.
 Usage:
     python scripts/migrate_collection.py candidates [new_collection_name]
     python scripts/migrate_collection.py jobs [new_collection_name]
+    python scripts/migrate_collection.py candidates --indexes-only [--dry-run]
 """
 
 import sys
@@ -23,8 +24,17 @@ if str(ROOT) not in sys.path:
 from pymilvus import MilvusClient, Collection, CollectionSchema, DataType, connections
 from src.config import get_zilliz_config
 from src.global_logger import logger
-from src.candidate_store import get_collection_schema as get_candidate_schema
-from src.jobs_store import get_job_collection_schema
+from src.candidate_store import (
+    BM25_FIELDS,
+    SCALAR_INDEXES,
+    build_collection_schema as build_candidate_schema,
+    derive_typed_fields,
+    ensure_scalar_indexes,
+    get_collection_schema as get_candidate_schema,
+    build_resume_profile,
+    resume_signature,
+)
+from src.jobs_store import get_base_job_id, get_job_collection_schema
 from src.job_optimization_feedback_store import get_collection_schema as get_optimization_schema
 
 
@@ -45,9 +55,8 @@ def get_index_config(collection_type: str, zilliz_config: dict):
                 "metric_type": "IP",
                 "params": {},
             },
-            'conversation_id': {},
-            'chat_id': {},
-            'stage': {},
+            **{sparse: {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "BM25"} for sparse in BM25_FIELDS.values()},
+            **SCALAR_INDEXES,
         }
     elif collection_type == 'jobs':
         return {
@@ -55,7 +64,8 @@ def get_index_config(collection_type: str, zilliz_config: dict):
                 "metric_type": "L2",
                 "index_type": "AUTOINDEX",
             },
-            'version': {},
+            'base_job_id': {"index_type": "INVERTED"},
+            'version': {"index_type": "STL_SORT"},
             'current': {},
         }
     elif collection_type == 'optimizations':
@@ -181,7 +191,7 @@ def rename_collection(client: MilvusClient, zilliz_config: dict, old_name: str,
                         "index_type": "AUTOINDEX",
                     }
                     new_col.create_index(field_name=field.name, index_params=index_params)
-                elif field.name in ['version', 'current', 'conversation_id', 'chat_id', 'stage', 'name']:
+                elif field.name in ['version', 'current', 'base_job_id', 'name', *SCALAR_INDEXES]:
                     # Scalar indexes
                     new_col.create_index(field_name=field.name, index_params={})
             except Exception as e:
@@ -233,6 +243,10 @@ def transform_record(record: dict, schema_fields: list, collection_type: str) ->
     
     # Collection-specific transformations
     if collection_type == 'candidates':
+        # Sparse fields are generated by the BM25 functions on insert
+        for sparse in BM25_FIELDS.values():
+            new_record.pop(sparse, None)
+
         # Handle conversation_id: preserve existing, or use thread_id as fallback
         if "conversation_id" in record and record.get("conversation_id"):
             new_record["conversation_id"] = record["conversation_id"]
@@ -244,6 +258,20 @@ def transform_record(record: dict, schema_fields: list, collection_type: str) ->
         # Initialize notified field if not present
         if "notified" not in new_record or new_record["notified"] is None:
             new_record["notified"] = False
+
+        # Backfill typed mirrors of the analysis/metadata JSON and updated_at
+        for key, value in derive_typed_fields(record).items():
+            if key in valid_field_names and new_record.get(key) is None:
+                new_record[key] = value
+        # Creation time was never stored: approximate it with the last update
+        if "created_ts" in valid_field_names and new_record.get("created_ts") is None:
+            new_record["created_ts"] = new_record.get("updated_ts")
+        # MinHash of the resume used by candidate matching
+        if "resume_minhash" in valid_field_names and not new_record.get("resume_minhash"):
+            new_record["resume_minhash"] = resume_signature(new_record.get("resume_text") or "")
+        # Structured education / work / skills parse of the resume
+        if "resume_profile" in valid_field_names and not new_record.get("resume_profile"):
+            new_record["resume_profile"] = build_resume_profile(new_record)
         
         # Generate candidate_id if not present (since auto_id is now False)
         # Preserve existing candidate_id if it exists, otherwise generate a new UUID
@@ -263,6 +291,13 @@ def transform_record(record: dict, schema_fields: list, collection_type: str) ->
         # Initialize metadata field if not present
         if "metadata" not in new_record or new_record["metadata"] is None:
             new_record["metadata"] = {}
+        
+        # Backfill the indexed versioning fields from the versioned job_id (e.g. "ml_engineer_v2")
+        job_id = new_record.get("job_id") or ""
+        new_record["base_job_id"] = get_base_job_id(job_id)
+        if not new_record.get("version"):
+            suffix = job_id[len(new_record["base_job_id"]) + 2:]
+            new_record["version"] = int(suffix) if suffix.isdigit() else 1
     elif collection_type == 'optimizations':
         # Ensure feedback_vector exists
         if "feedback_vector" not in new_record or not new_record["feedback_vector"]:
@@ -371,11 +406,14 @@ def migrate_collection(collection_type: str, new_collection_name: str = None):
         logger.info(f"Creating new collection: {new_collection}")
         logger.debug(f"Schema fields: {[f.name for f in schema_fields]}")
         
-        # Create CollectionSchema from fields
-        schema = CollectionSchema(
-            fields=schema_fields,
-            description=description
-        )
+        # Create CollectionSchema from fields (candidates also carry the BM25 functions)
+        if collection_type == 'candidates':
+            schema = build_candidate_schema(description)
+        else:
+            schema = CollectionSchema(
+                fields=schema_fields,
+                description=description
+            )
         
         # Create new collection with auto_id=False for candidates (since we're generating IDs manually)
         if collection_type == 'candidates':
@@ -544,6 +582,7 @@ Examples:
   python scripts/migrate_collection.py jobs
   python scripts/migrate_collection.py candidates CN_candidates_v3
   python scripts/migrate_collection.py jobs CN_jobs_v2
+  python scripts/migrate_collection.py candidates --indexes-only --dry-run
         """
     )
     parser.add_argument(
@@ -557,8 +596,27 @@ Examples:
         help='Optional name for new collection (defaults to {old_name}_v2)'
     )
     
+    parser.add_argument(
+        '--indexes-only',
+        action='store_true',
+        help='Only create the missing scalar indexes (candidate_store.SCALAR_INDEXES) in place, without copying data'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --indexes-only: list the missing indexes without creating them'
+    )
+    
     args = parser.parse_args()
     
+    if args.indexes_only:
+        if args.collection_type != 'candidates':
+            parser.error('--indexes-only is only supported for candidates')
+        missing = ensure_scalar_indexes(args.new_collection_name, dry_run=args.dry_run)
+        action = "Missing" if args.dry_run else "Created"
+        print(f"✅ {action} scalar indexes: {', '.join(missing) or 'none'}")
+        sys.exit(0)
+    
     success = migrate_collection(args.collection_type, args.new_collection_name)
     if success:
         print("✅ Successfully migrated collection!")
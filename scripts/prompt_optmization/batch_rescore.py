@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""Offline bulk re-scoring of exported candidates through a batch endpoint.
+
+Why this script exists
+- After a job portrait / ANALYZE_ACTION change, hundreds of stored candidates need a
+  fresh `analysis`. Replaying them through the interactive `responses.create` path
+  (generate_optimized.py) burns the online rate-limit budget the browser flows depend on.
+- The OpenAI Batch API runs the same `/v1/responses` requests asynchronously (24h
+  window, discounted, separate quota), so this script builds JSONL request files from
+  a `download_data_for_prompt_optimization.py` export and ingests the results later.
+
+Steps (state is kept in `<run_dir>/rescore/batch_state.json`, every step is resumable)
+  prepare  export candidates (or reuse --run-dir) and write `rescore/requests_NNN.jsonl`
+  submit   upload request files and create one batch per file
+  poll     wait for the batches to finish and download `rescore/results_NNN.jsonl`
+  ingest   validate results against AnalysisSchema and merge the scores onto the live
+           analysis of each candidate, written back in bulk
+  run      prepare + submit + poll + ingest
+
+Backends (--backend)
+- openai: real Batch API (`files.create(purpose="batch")` + `batches.create`)
+- local:  stand-in that replays each request line synchronously and writes an
+          OpenAI-shaped output file (endpoints without batch support, smoke tests)
+
+Run (example)
+  cd scripts/prompt_optmization
+  python batch_rescore.py run --job-position 架构师 --limit 500
+  python batch_rescore.py poll --run-dir 架构师/run_20251219_161733
+  python batch_rescore.py ingest --run-dir 架构师/run_20251219_161733 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.config import get_openai_config
+from src.global_logger import logger
+from src.prompts.assistant_actions_prompts import ACTION_PROMPTS as MODULE_ACTION_PROMPTS, AnalysisSchema
+
+from generate_optimized import (
+    _build_analysis_payload,
+    _build_analyze_instructions,
+    _extract_first_json_object,
+    _load_action_prompts_from_md,
+    _read_text,
+    _resolve_path,
+    _write_json,
+)
+
+try:
+    from openai import OpenAI  # type: ignore
+except Exception:  # pragma: no cover
+    OpenAI = None  # type: ignore
+
+try:
+    from tqdm import tqdm  # type: ignore
+except Exception:  # pragma: no cover
+
+    def tqdm(it, **_kwargs):  # type: ignore
+        return it
+
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_BATCH_ENDPOINT = "/v1/responses"
+_MAX_REQUESTS_PER_FILE = 50000  # Batch API limit per input file
+_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+# ---------------------------------------------------------------------------
+# Request files
+# ---------------------------------------------------------------------------
+
+
+def _write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _read_jsonl(path: Path) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                rows.append(json.loads(line))
+    return rows
+
+
+def _analysis_text_format() -> dict[str, Any]:
+    """Strict structured output for AnalysisSchema (all fields are required)."""
+    schema = AnalysisSchema.model_json_schema()
+    schema["additionalProperties"] = False
+    return {"format": {"type": "json_schema", "name": "AnalysisSchema", "schema": schema, "strict": True}}
+
+
+def _load_job_portrait(run_dir: Path) -> dict[str, Any]:
+    for name in ("job_portrait_optimized.json", "job_portrait.json"):
+        path = run_dir / name
+        if path.exists():
+            return json.loads(_read_text(path))
+    raise SystemExit(f"job_portrait(.optimized).json not found in: {run_dir}")
+
+
+def build_batch_requests(
+    run_dir: Path,
+    analyze_prompt: str,
+    model: str,
+    history_max_messages: int = 20,
+    resume_max_chars: int = 8000,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Build one Batch API request per exported candidate.
+
+    Returns:
+        (requests, skipped): request lines keyed by `custom_id=candidate_id`, and the
+        candidate files that were skipped (no candidate_id or no resume).
+    """
+    job_portrait = _load_job_portrait(run_dir)
+    instructions = _build_analyze_instructions(analyze_prompt)
+    text_format = _analysis_text_format()
+
+    requests: list[dict[str, Any]] = []
+    skipped: list[str] = []
+    seen: set[str] = set()
+    for path in sorted((run_dir / "candidates").glob("*.json")):
+        data = json.loads(_read_text(path))
+        candidate_id = data.get("candidate_id")
+        resume = (data.get("resume") or "").strip()
+        if not candidate_id or not resume or candidate_id in seen:
+            skipped.append(path.name)
+            continue
+        seen.add(candidate_id)
+        payload = _build_analysis_payload(
+            job_portrait, resume, data.get("history") or [], history_max_messages, resume_max_chars
+        )
+        requests.append(
+            {
+                "custom_id": candidate_id,
+                "method": "POST",
+                "url": _BATCH_ENDPOINT,
+                "body": {"model": model, "instructions": instructions, "input": payload, "text": text_format},
+            }
+        )
+    return requests, skipped
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class OpenAIBatchBackend:
+    """Submit request files to the OpenAI Batch API."""
+
+    name = "openai"
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def submit(self, requests_path: Path, metadata: dict[str, str]) -> dict[str, Any]:
+        with requests_path.open("rb") as fh:
+            file_obj = self.client.files.create(file=fh, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=file_obj.id,
+            endpoint=_BATCH_ENDPOINT,
+            completion_window="24h",
+            metadata=metadata,
+        )
+        return {"batch_id": batch.id, "input_file_id": file_obj.id, "status": batch.status}
+
+    def retrieve(self, batch_id: str) -> dict[str, Any]:
+        batch = self.client.batches.retrieve(batch_id)
+        counts = getattr(batch, "request_counts", None)
+        return {
+            "status": batch.status,
+            "output_file_id": getattr(batch, "output_file_id", None),
+            "error_file_id": getattr(batch, "error_file_id", None),
+            "request_counts": counts.model_dump() if hasattr(counts, "model_dump") else counts,
+        }
+
+    def download(self, file_id: str, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(self.client.files.content(file_id).read())
+
+
+class LocalBatchBackend:
+    """Stand-in backend: runs every request line through `handler(body) -> response body`.
+
+    Output lines use the Batch API output format, so `poll`/`ingest` are identical
+    for both backends. Batches complete during `submit`.
+    """
+
+    name = "local"
+
+    def __init__(self, handler: Callable[[dict[str, Any]], dict[str, Any]], work_dir: Path):
+        self.handler = handler
+        self.work_dir = work_dir
+
+    def _output_path(self, batch_id: str) -> Path:
+        return self.work_dir / f"{batch_id}_output.jsonl"
+
+    def submit(self, requests_path: Path, metadata: dict[str, str]) -> dict[str, Any]:
+        batch_id = f"local_{requests_path.stem}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        lines: list[dict[str, Any]] = []
+        failed = 0
+        for i, request in enumerate(tqdm(_read_jsonl(requests_path), desc=f"local {requests_path.name}")):
+            line: dict[str, Any] = {"id": f"{batch_id}_{i}", "custom_id": request.get("custom_id"), "response": None, "error": None}
+            try:
+                line["response"] = {"status_code": 200, "body": self.handler(request.get("body") or {})}
+            except Exception as exc:
+                failed += 1
+                line["error"] = {"code": type(exc).__name__, "message": str(exc)}
+            lines.append(line)
+        _write_jsonl(self._output_path(batch_id), lines)
+        return {
+            "batch_id": batch_id,
+            "input_file_id": str(requests_path),
+            "status": "completed",
+            "request_counts": {"total": len(lines), "completed": len(lines) - failed, "failed": failed},
+        }
+
+    def retrieve(self, batch_id: str) -> dict[str, Any]:
+        output_path = self._output_path(batch_id)
+        if not output_path.exists():
+            return {"status": "failed", "output_file_id": None, "error_file_id": None}
+        return {"status": "completed", "output_file_id": str(output_path), "error_file_id": None}
+
+    def download(self, file_id: str, dest: Path) -> None:
+        if Path(file_id).resolve() != dest.resolve():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file_id, dest)
+
+
+def _make_backend(name: str, rescore_dir: Path) -> Any:
+    if OpenAI is None:
+        raise SystemExit("openai sdk not installed/available")
+    openai_config = get_openai_config()
+    api_key = openai_config.get("api_key")
+    if not api_key:
+        raise SystemExit("OpenAI config missing api_key")
+    client = OpenAI(api_key=api_key, base_url=openai_config.get("base_url"))
+    if name == "local":
+        return LocalBatchBackend(lambda body: client.responses.create(**body).model_dump(), rescore_dir)
+    return OpenAIBatchBackend(client)
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+
+def _response_output_text(body: dict[str, Any]) -> str:
+    """Concatenate `output_text` parts of a serialized Responses API object."""
+    if isinstance(body.get("output_text"), str):
+        return body["output_text"]
+    texts: list[str] = []
+    for item in body.get("output") or []:
+        for part in (item.get("content") or []) if isinstance(item, dict) else []:
+            if isinstance(part, dict) and part.get("type") == "output_text":
+                texts.append(part.get("text") or "")
+    return "".join(texts)
+
+
+def parse_batch_results(lines: list[dict[str, Any]]) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    """Parse Batch API output lines into validated analyses.
+
+    Returns:
+        (scores, errors): AnalysisSchema dicts and error messages, both keyed by custom_id
+    """
+    scores: dict[str, dict[str, Any]] = {}
+    errors: dict[str, str] = {}
+    for line in lines:
+        custom_id = line.get("custom_id")
+        if not custom_id:
+            continue
+        if line.get("error"):
+            errors[custom_id] = str((line["error"] or {}).get("message") or line["error"])
+            continue
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        if response.get("status_code") != 200:
+            message = ((body.get("error") or {}) if isinstance(body, dict) else {}).get("message") or ""
+            errors[custom_id] = f"HTTP {response.get('status_code')}: {message}".strip()
+            continue
+        obj = _extract_first_json_object(_response_output_text(body))
+        if obj is None:
+            errors[custom_id] = "failed to parse analysis JSON"
+            continue
+        try:
+            scores[custom_id] = AnalysisSchema.model_validate(obj).model_dump()
+        except Exception as exc:
+            errors[custom_id] = f"analysis schema validation failed: {exc}"
+    return scores, errors
+
+
+def merge_rescored_analyses(
+    scores: dict[str, dict[str, Any]],
+    live: dict[str, dict[str, Any]],
+    model: str | None,
+    rescored_at: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Merge new scores onto the live `analysis` of each candidate.
+
+    Only the AnalysisSchema fields (scores, summary, tips) are replaced; action/message/reason
+    etc. written since the export are kept. Candidates missing from `live` are skipped.
+
+    Returns:
+        (updates, changes): `bulk_update_candidates` rows and per-candidate overall before/after
+    """
+    updates: list[dict[str, Any]] = []
+    changes: list[dict[str, Any]] = []
+    for candidate_id, analysis in scores.items():
+        if candidate_id not in live:
+            continue
+        previous = live[candidate_id].get("analysis") or {}
+        merged = {**previous, **analysis, "rescored_at": rescored_at, "rescore_model": model}
+        updates.append({"candidate_id": candidate_id, "analysis": merged})
+        changes.append(
+            {
+                "candidate_id": candidate_id,
+                "overall_before": previous.get("overall"),
+                "overall_after": analysis.get("overall"),
+            }
+        )
+    return updates, changes
+
+
+# ---------------------------------------------------------------------------
+# Steps
+# ---------------------------------------------------------------------------
+
+
+def _state_path(run_dir: Path) -> Path:
+    return run_dir / "rescore" / "batch_state.json"
+
+
+def _load_state(run_dir: Path) -> dict[str, Any]:
+    path = _state_path(run_dir)
+    if not path.exists():
+        raise SystemExit(f"batch_state.json not found, run `prepare` first: {path}")
+    return json.loads(_read_text(path))
+
+
+def _save_state(run_dir: Path, state: dict[str, Any]) -> None:
+    state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    _write_json(_state_path(run_dir), state)
+
+
+def step_prepare(args: argparse.Namespace) -> Path:
+    """Export candidates (unless --run-dir is given) and write JSONL request files."""
+    if args.run_dir:
+        run_dir = _resolve_path(args.run_dir, kind="run_dir")
+    else:
+        from download_data_for_prompt_optimization import (
+            step1_select_job_and_create_run_dir,
+            step2_fetch_recent_candidates_and_save,
+        )
+
+        job, run_dir, _job_profile_path, _previous_run_dir = step1_select_job_and_create_run_dir(
+            prompt_opt_dir=_SCRIPT_DIR,
+            job_id=args.job_id,
+            job_position=args.job_position,
+        )
+        step2_fetch_recent_candidates_and_save(
+            job=job,
+            run_dir=run_dir,
+            batch_size=args.limit,
+            require_existing_analysis=True,
+            max_batch_size=args.limit,
+        )
+
+    if args.prompt_source == "md":
+        prompts = _load_action_prompts_from_md(_resolve_path(args.assistant_prompts_md, kind="assistant_actions_prompts.md"))
+    else:
+        prompts = dict(MODULE_ACTION_PROMPTS)
+    model = args.model or get_openai_config().get("model")
+    if not model:
+        raise SystemExit("OpenAI config missing model")
+
+    requests, skipped = build_batch_requests(
+        run_dir,
+        analyze_prompt=prompts.get("ANALYZE_ACTION") or "",
+        model=str(model),
+        history_max_messages=args.history_max_messages,
+        resume_max_chars=args.resume_max_chars,
+    )
+    if not requests:
+        raise SystemExit(f"No candidates to re-score in: {run_dir / 'candidates'}")
+
+    rescore_dir = run_dir / "rescore"
+    per_file = max(1, min(args.requests_per_file, _MAX_REQUESTS_PER_FILE))
+    files: list[dict[str, Any]] = []
+    for n, start in enumerate(range(0, len(requests), per_file), start=1):
+        requests_path = rescore_dir / f"requests_{n:03d}.jsonl"
+        _write_jsonl(requests_path, requests[start : start + per_file])
+        files.append({"requests": requests_path.name, "count": len(requests[start : start + per_file])})
+
+    _save_state(
+        run_dir,
+        {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "model": str(model),
+            "prompt_source": args.prompt_source,
+            "total_requests": len(requests),
+            "skipped": skipped,
+            "files": files,
+        },
+    )
+    logger.info("Prepared %d requests in %d file(s), skipped %d: %s", len(requests), len(files), len(skipped), rescore_dir)
+    return run_dir
+
+
+def step_submit(run_dir: Path, backend: Any) -> None:
+    state = _load_state(run_dir)
+    state["backend"] = backend.name
+    for entry in state["files"]:
+        if entry.get("batch_id"):
+            logger.info("Already submitted %s -> %s", entry["requests"], entry["batch_id"])
+            continue
+        requests_path = run_dir / "rescore" / entry["requests"]
+        entry.update(backend.submit(requests_path, metadata={"run_dir": run_dir.name, "file": entry["requests"]}))
+        entry["submitted_at"] = datetime.now().isoformat(timespec="seconds")
+        # Persist after every file so a crash never re-submits (and re-bills) a batch.
+        _save_state(run_dir, state)
+        logger.info("Submitted %s -> %s (%s)", entry["requests"], entry["batch_id"], entry.get("status"))
+
+
+def step_poll(run_dir: Path, backend: Any, interval: float, wait: bool) -> bool:
+    """Refresh batch statuses and download finished results. Returns True when all are final."""
+    state = _load_state(run_dir)
+    rescore_dir = run_dir / "rescore"
+    while True:
+        pending = 0
+        for entry in state["files"]:
+            if not entry.get("batch_id"):
+                raise SystemExit(f"{entry['requests']} has not been submitted yet")
+            if entry.get("status") in _FINAL_STATUSES and entry.get("results"):
+                continue
+            entry.update(backend.retrieve(entry["batch_id"]))
+            if entry["status"] not in _FINAL_STATUSES:
+                pending += 1
+                continue
+            stem = entry["requests"].replace("requests_", "").replace(".jsonl", "")
+            if entry.get("output_file_id"):
+                backend.download(entry["output_file_id"], rescore_dir / f"results_{stem}.jsonl")
+                entry["results"] = f"results_{stem}.jsonl"
+            if entry.get("error_file_id"):
+                backend.download(entry["error_file_id"], rescore_dir / f"errors_{stem}.jsonl")
+                entry["errors"] = f"errors_{stem}.jsonl"
+            entry.setdefault("results", None)
+            logger.info("Batch %s finished: %s %s", entry["batch_id"], entry["status"], entry.get("request_counts") or "")
+        _save_state(run_dir, state)
+        if not pending or not wait:
+            if pending:
+                logger.info("%d batch(es) still running", pending)
+            return not pending
+        logger.info("%d batch(es) still running, next poll in %ss", pending, interval)
+        time.sleep(interval)
+
+
+def step_ingest(run_dir: Path, dry_run: bool, write_batch_size: int) -> dict[str, Any]:
+    """Validate downloaded results and write the new analysis back in bulk."""
+    state = _load_state(run_dir)
+    rescore_dir = run_dir / "rescore"
+    lines: list[dict[str, Any]] = []
+    for entry in state["files"]:
+        for key in ("results", "errors"):
+            if entry.get(key):
+                lines.extend(_read_jsonl(rescore_dir / entry[key]))
+    if not lines:
+        raise SystemExit("No downloaded results, run `poll` first")
+    scores, errors = parse_batch_results(lines)
+
+    names: dict[str, Any] = {}
+    for path in sorted((run_dir / "candidates").glob("*.json")):
+        data = json.loads(_read_text(path))
+        if data.get("candidate_id"):
+            names[data["candidate_id"]] = data.get("name")
+
+    from src.candidate_store import fetch_candidates
+
+    # Batches can take up to 24h: merge onto the analysis stored now, not the export snapshot.
+    live = {row["candidate_id"]: row for row in fetch_candidates(list(scores), fields=["candidate_id", "analysis"])}
+    now = datetime.now().isoformat(timespec="seconds")
+    updates, changes = merge_rescored_analyses(scores, live, model=state.get("model"), rescored_at=now)
+    for change in changes:
+        change["name"] = names.get(change["candidate_id"])
+    for candidate_id in scores.keys() - live.keys():
+        errors[candidate_id] = "candidate no longer exists"
+
+    written = 0
+    if updates and not dry_run:
+        from src.candidate_store import bulk_update_candidates
+
+        # touch=False: re-scoring must not bump candidates to the top of recency views
+        written = bulk_update_candidates(updates, batch_size=write_batch_size, touch=False)
+
+    summary = {
+        "ingested_at": now,
+        "dry_run": dry_run,
+        "scored": len(updates),
+        "failed": len(errors),
+        "written": written,
+        "changed_overall": sum(1 for c in changes if c["overall_before"] != c["overall_after"]),
+        "changes": changes,
+        "errors": errors,
+    }
+    _write_json(rescore_dir / "rescore_report.json", summary)
+    state["ingested"] = {k: v for k, v in summary.items() if k not in ("changes", "errors")}
+    _save_state(run_dir, state)
+    logger.info(
+        "Ingested %d scores (%d failed, %d overall changed), wrote %d%s",
+        len(updates), len(errors), summary["changed_overall"], written, " [dry-run]" if dry_run else "",
+    )
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["prepare", "submit", "poll", "ingest", "run"])
+    parser.add_argument("--run-dir", default=None, help="Existing run directory (contains candidates/); required except for prepare/run")
+    parser.add_argument("--job-id", default=None, help="prepare/run without --run-dir: select job by job_id/base_job_id")
+    parser.add_argument("--job-position", default=None, help="prepare/run without --run-dir: select job by position keyword")
+    parser.add_argument("--limit", type=int, default=200, help="prepare/run without --run-dir: number of newest candidates to export")
+    parser.add_argument("--prompt-source", default="module", choices=["module", "md"], help="Where ANALYZE_ACTION comes from (default: production prompts)")
+    parser.add_argument("--assistant-prompts-md", default="assistant_actions_prompts.md", help="Used when --prompt-source=md")
+    parser.add_argument("--model", default=None, help="Override OpenAI model (default: config model)")
+    parser.add_argument("--history-max-messages", type=int, default=20, help="How many history messages to include")
+    parser.add_argument("--resume-max-chars", type=int, default=8000, help="Clip resume to this many chars")
+    parser.add_argument("--requests-per-file", type=int, default=1000, help="Requests per batch input file")
+    parser.add_argument("--backend", default="openai", choices=["openai", "local"], help="Batch backend (default: openai)")
+    parser.add_argument("--poll-interval", type=float, default=60, help="Seconds between status polls")
+    parser.add_argument("--no-wait", action="store_true", help="poll: check once instead of waiting for completion")
+    parser.add_argument("--write-batch-size", type=int, default=100, help="Rows per bulk upsert during ingest")
+    parser.add_argument("--dry-run", action="store_true", help="ingest: write rescore_report.json but do not update the store")
+    args = parser.parse_args()
+
+    if args.command in ("prepare", "run"):
+        if not args.run_dir and not (args.job_id or args.job_position):
+            parser.error("prepare/run needs --run-dir or --job-id/--job-position")
+        run_dir = step_prepare(args)
+    else:
+        if not args.run_dir:
+            parser.error(f"{args.command} needs --run-dir")
+        run_dir = _resolve_path(args.run_dir, kind="run_dir")
+
+    if args.command in ("submit", "poll", "run"):
+        # Batches must be polled with the backend that created them.
+        backend_name = args.backend if args.command != "poll" else _load_state(run_dir).get("backend", args.backend)
+        backend = _make_backend(backend_name, run_dir / "rescore")
+        if args.command in ("submit", "run"):
+            step_submit(run_dir, backend)
+        if args.command in ("poll", "run"):
+            finished = step_poll(run_dir, backend, interval=args.poll_interval, wait=not args.no_wait)
+            if not finished:
+                return 0
+    if args.command in ("ingest", "run"):
+        step_ingest(run_dir, dry_run=args.dry_run, write_batch_size=args.write_batch_size)
+
+    logger.info("Done. Run directory: %s", run_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
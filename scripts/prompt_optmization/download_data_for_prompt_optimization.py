@@ -32,12 +32,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.global_logger import logger
 from src.prompts.assistant_actions_prompts import ACTION_PROMPTS, AnalysisSchema
 
-try:
-    from tqdm import tqdm  # type: ignore
-except Exception:  # pragma: no cover
-    def tqdm(it, **_kwargs):  # type: ignore
-        return it
-
 _SCRIPT_DIR = Path(__file__).resolve().parent
 
 
@@ -596,14 +590,16 @@ def step2_fetch_recent_candidates_and_save(
     batch_size: int = 10,
     fetch_multiplier: int = 5,
     require_existing_analysis: bool = False,
+    max_batch_size: int = 50,
 ) -> list[CandidateExport]:
     """Fetch newest candidates and save one json per candidate.
 
     Note: to get *valid* N samples, we fetch N*multiplier then filter by
-    resume/analysis/dialogue availability.
+    resume/analysis/dialogue availability. `max_batch_size` caps N (bulk
+    exports such as batch_rescore.py raise it).
     """
 
-    from src.candidate_store import search_candidates_advanced
+    from src.candidate_store import fetch_candidates, search_candidates_advanced
 
     job_applied = job.get("position") or ""
     if not job_applied:
@@ -612,58 +608,33 @@ def step2_fetch_recent_candidates_and_save(
     # We want the newest conversations by metadata.history[-1].timestamp, but Milvus
     # cannot sort by nested JSON fields. We therefore:
     # 1) fetch N * fetch_multiplier raw candidates (sorted by updated_at as a proxy),
-    #    including metadata.history so we can compute history[-1].timestamp locally;
+    #    then their metadata.history so we can compute history[-1].timestamp locally;
     # 2) sort locally by history[-1].timestamp desc and pick the newest ones.
-    target_size = min(batch_size, 50)
+    target_size = min(batch_size, max_batch_size)
     raw_limit = max(target_size, target_size * max(1, fetch_multiplier))
 
-    # Phase 1: fetch raw candidates with metadata so we can rank by history timestamp.
-    raw_fields = ["candidate_id", "name", "conversation_id", "metadata", "updated_at", "job_applied"]
-    try:
-        raw_candidates = search_candidates_advanced(
-            job_applied=job_applied,
-            limit=raw_limit,
-            sort_by="updated_at",
-            sort_direction="desc",
-            fields=raw_fields,
-            strict=True,
-        )
-        logger.info(
-            "Fetched %d raw candidates (with metadata) for job_applied=%s (raw_limit=%d)",
-            len(raw_candidates),
-            job_applied,
-            raw_limit,
-        )
-    except Exception as exc:
-        # Fallback: older clusters/settings may reject large metadata payloads.
-        logger.exception("Failed to fetch raw candidates with metadata; falling back to header-only: %s", exc)
-        list_fields = ["candidate_id", "name", "conversation_id", "updated_at", "job_applied"]
-        raw_candidates = search_candidates_advanced(
-            job_applied=job_applied,
-            limit=raw_limit,
-            sort_by="updated_at",
-            sort_direction="desc",
-            fields=list_fields,
-            strict=True,
-        )
-        logger.info(
-            "Fetched %d candidate headers for job_applied=%s (raw_limit=%d)",
-            len(raw_candidates),
-            job_applied,
-            raw_limit,
-        )
-        meta_fields = ["candidate_id", "metadata", "updated_at"]
-        enriched: list[dict[str, Any]] = []
-        for header in tqdm(raw_candidates, desc="Fetch metadata (fallback)", total=len(raw_candidates)):
-            candidate_id = header.get("candidate_id")
-            if not candidate_id:
-                continue
-            rows = search_candidates_advanced(candidate_ids=[candidate_id], limit=1, fields=meta_fields, strict=True)
-            c = rows[0] if rows else {}
-            merged = dict(header)
-            merged["metadata"] = c.get("metadata")
-            enriched.append(merged)
-        raw_candidates = enriched
+    # Phase 1: list light headers, then read the (large) metadata in batches sized to
+    # the gRPC response limit by `fetch_candidates`.
+    list_fields = ["candidate_id", "name", "conversation_id", "updated_at", "job_applied"]
+    headers = search_candidates_advanced(
+        job_applied=job_applied,
+        limit=raw_limit,
+        sort_by="updated_at",
+        sort_direction="desc",
+        fields=list_fields,
+        strict=True,
+    )
+    metadata_by_id = {
+        c["candidate_id"]: c.get("metadata")
+        for c in fetch_candidates([h.get("candidate_id") for h in headers], fields=["candidate_id", "metadata"])
+    }
+    raw_candidates = [{**h, "metadata": metadata_by_id.get(h.get("candidate_id"))} for h in headers]
+    logger.info(
+        "Fetched %d raw candidates (with metadata) for job_applied=%s (raw_limit=%d)",
+        len(raw_candidates),
+        job_applied,
+        raw_limit,
+    )
 
     candidates_dir = run_dir / "candidates"
     candidates_dir.mkdir(parents=True, exist_ok=True)
@@ -708,33 +679,9 @@ def step2_fetch_recent_candidates_and_save(
         "job_applied",
     ]
 
-    # Phase 2: download selected candidates' details.
-    # Default to small batches to avoid 4MB gRPC response limit.
+    # Phase 2: download selected candidates' details (size-adaptive batches).
     candidate_ids = [c.get("candidate_id") for _dt, c in ranked if c.get("candidate_id")]
-    chunk_size = 5
-
-    def _chunks(items: list[str], size: int) -> list[list[str]]:
-        return [items[i : i + size] for i in range(0, len(items), size)]
-
-    chunks = _chunks(candidate_ids, max(1, min(chunk_size, len(candidate_ids))))
-    fetched: dict[str, dict[str, Any]] = {}
-    for chunk in tqdm(chunks, desc="Download candidates", total=len(chunks)):
-        try:
-            rows = search_candidates_advanced(candidate_ids=chunk, limit=len(chunk), fields=detail_fields, strict=False)
-        except Exception:
-            # Fallback to one-by-one within this chunk.
-            rows = []
-            for cid in chunk:
-                try:
-                    one = search_candidates_advanced(candidate_ids=[cid], limit=1, fields=detail_fields, strict=True)
-                    if one:
-                        rows.append(one[0])
-                except Exception:
-                    continue
-        for r in rows:
-            cid = r.get("candidate_id")
-            if cid:
-                fetched[cid] = r
+    fetched: dict[str, dict[str, Any]] = {r["candidate_id"]: r for r in fetch_candidates(candidate_ids, fields=detail_fields)}
 
     for last_dt, header in ranked:
         candidate_id = header.get("candidate_id")
@@ -12,6 +12,10 @@ Key behavior
   1) `analysis` via `ANALYZE_ACTION` (strict JSON Schema = AnalysisSchema)
   2) one next message via `CHAT_ACTION` or `FOLLOWUP_ACTION` (heuristic choice)
 - Appends the generation outputs into the run's `优化报告.md`
+- Runs candidates on a worker pool (`--concurrency`, `--rate-limit`); each finished
+  candidate is checkpointed to `generated/<stem>.generated.json`, so reruns skip
+  candidates that already succeeded with the same prompts/model (`--force` to redo).
+  The report is merged in candidate-file order regardless of completion order.
 
 Prompt sources (choose one)
 - Default: `<run_dir>/prompt_optimized.py` (ACTION_PROMPTS dict)
@@ -20,19 +24,23 @@ Prompt sources (choose one)
 Run (example)
   python scripts/prompt_optmization/generate_optimized.py \
     --run-dir scripts/prompt_optmization/架构师/run_20251219_161733 \
-    --limit 10
+    --limit 10 --concurrency 4 --rate-limit 60
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -108,7 +116,60 @@ def _write_text(path: Path, text: str) -> None:
 
 def _write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Write to a temp file first so an interrupted run never leaves a half-written checkpoint.
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class _RateLimiter:
+    """Thread-safe limiter that spaces API calls to at most `per_minute` starts per minute."""
+
+    def __init__(self, per_minute: float):
+        self._interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self._interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def _generation_fingerprint(prompts: dict[str, str], model: str, job_portrait: dict[str, Any], args: argparse.Namespace) -> str:
+    """Hash of everything that changes generation output; checkpoints from other settings are redone."""
+    payload = json.dumps(
+        {
+            "prompts": prompts,
+            "model": model,
+            "job_portrait": job_portrait,
+            "history_max_messages": args.history_max_messages,
+            "resume_max_chars": args.resume_max_chars,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _load_checkpoint(path: Path, fingerprint: str) -> Optional[dict[str, Any]]:
+    """Return a previous successful output for this candidate, or None if it must be (re)generated."""
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(_read_text(path))
+    except Exception:
+        return None
+    if payload.get("fingerprint") != fingerprint:
+        return None
+    if payload.get("analysis_error") or payload.get("message_error"):
+        return None
+    return payload
 
 
 def _normalize_history_role(item: dict[str, Any]) -> str:
@@ -261,19 +322,15 @@ def _build_analyze_instructions(analyze_prompt: str) -> str:
     return (base + contract).strip()
 
 
-def _gen_analysis(
-    client: Any,
-    model: str,
-    analyze_prompt: str,
-    tools: list[dict[str, Any]],
+def _build_analysis_payload(
     job_portrait: dict[str, Any],
     resume: str,
     history: list[dict[str, Any]],
     history_max_messages: int,
     resume_max_chars: int,
-) -> tuple[Optional[dict[str, Any]], Optional[str]]:
-    instructions = _build_analyze_instructions(analyze_prompt)
-    payload = "\n\n".join(
+) -> str:
+    """Build the ANALYZE_ACTION user input (shared with batch_rescore.py)."""
+    return "\n\n".join(
         [
             "【岗位肖像】",
             json.dumps(_compact_job_portrait(job_portrait), ensure_ascii=False, indent=2),
@@ -286,8 +343,26 @@ def _gen_analysis(
         ]
     ).strip()
 
+
+def _gen_analysis(
+    client: Any,
+    model: str,
+    analyze_prompt: str,
+    tools: list[dict[str, Any]],
+    job_portrait: dict[str, Any],
+    resume: str,
+    history: list[dict[str, Any]],
+    history_max_messages: int,
+    resume_max_chars: int,
+    throttle: Optional[Callable[[], None]] = None,
+) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    throttle = throttle or (lambda: None)
+    instructions = _build_analyze_instructions(analyze_prompt)
+    payload = _build_analysis_payload(job_portrait, resume, history, history_max_messages, resume_max_chars)
+
     primary_error: Optional[str] = None
     try:
+        throttle()
         resp = client.responses.create(
             model=model,
             instructions=instructions,
@@ -312,6 +387,7 @@ def _gen_analysis(
 
     if obj is None:
         try:
+            throttle()
             resp = client.responses.create(
                 model=model,
                 instructions=instructions,
@@ -344,6 +420,7 @@ def _gen_message(
     history: list[dict[str, Any]],
     history_max_messages: int,
     resume_max_chars: int,
+    throttle: Optional[Callable[[], None]] = None,
 ) -> tuple[Optional[dict[str, Any]], Optional[str]]:
     instructions = (action_prompt or "").strip()
     payload = "\n\n".join(
@@ -362,6 +439,8 @@ def _gen_message(
         ]
     ).strip()
     try:
+        if throttle:
+            throttle()
         resp = client.responses.parse(
             model=model,
             instructions=instructions,
@@ -535,6 +614,9 @@ def main() -> int:
     parser.add_argument("--history-max-messages", type=int, default=20, help="How many history messages to include")
     parser.add_argument("--resume-max-chars", type=int, default=8000, help="Clip resume to this many chars for generation")
     parser.add_argument("--start-index", type=int, default=1, help="1-based start index within sorted candidates files")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of candidates generated in parallel")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Max OpenAI calls per minute across workers (0=unlimited)")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if a matching checkpoint exists")
     args = parser.parse_args()
 
     try:
@@ -587,81 +669,102 @@ def main() -> int:
     # Collect per-candidate outputs for a concise report.
     outputs_for_report: list[dict[str, Any]] = []
 
-    for idx, path in enumerate(tqdm(candidate_files, desc="Generate", total=len(candidate_files)), start=args.start_index):
-        data = json.loads(_read_text(path))
-        name = data.get("name") or "unknown"
-        conversation_id = data.get("conversation_id") or ""
-        resume = data.get("resume") or ""
-        history = data.get("history") or []
-
-        analyze_prompt = prompts.get("ANALYZE_ACTION") or ""
-        analysis, analysis_error = _gen_analysis(
-            client,
-            model=str(model),
-            analyze_prompt=analyze_prompt,
-            tools=tools,
-            job_portrait=job_portrait,
-            resume=resume,
-            history=history,
-            history_max_messages=args.history_max_messages,
-            resume_max_chars=args.resume_max_chars,
-        )
+    fingerprint = _generation_fingerprint(prompts, str(model), job_portrait, args)
+    limiter = _RateLimiter(args.rate_limit)
 
-        msg_action = _choose_message_action(history)
-        msg_prompt = prompts.get(msg_action) or prompts.get("CHAT_ACTION") or ""
-        msg_obj, message_error = _gen_message(
-            client,
-            model=str(model),
-            action_prompt=msg_prompt,
-            tools=tools,
-            job_portrait=job_portrait,
-            resume=resume,
-            analysis=analysis,
-            history=history,
-            history_max_messages=args.history_max_messages,
-            resume_max_chars=args.resume_max_chars,
-        )
-        message_text = ""
-        action_out = None
-        reason_out = None
-        if isinstance(msg_obj, dict):
-            action_out = msg_obj.get("action")
-            reason_out = msg_obj.get("reason")
-            message_text = (msg_obj.get("message") or "").strip()
-        checks = _simple_message_checks(message_text)
-
-        out_payload = {
-            "generated_at": now,
-            "candidate_file": str(path),
-            "name": name,
-            "conversation_id": conversation_id,
-            "message_action": msg_action,
-            "message": message_text,
-            "message_obj": msg_obj,
-            "message_error": message_error,
-            "message_checks": checks,
-            "analysis": analysis,
-            "analysis_error": analysis_error,
-        }
+    def _process(idx: int, path: Path) -> dict[str, Any]:
+        raw = _read_text(path)
+        # Checkpoints are tied to prompts/model/portrait and to the candidate file content.
+        cand_fingerprint = hashlib.sha256((fingerprint + raw).encode("utf-8")).hexdigest()[:16]
         out_path = out_dir / f"{path.stem}.generated.json"
-        _write_json(out_path, out_payload)
+        out_payload = None if args.force else _load_checkpoint(out_path, cand_fingerprint)
+        reused = out_payload is not None
+        if not reused:
+            data = json.loads(raw)
+            resume = data.get("resume") or ""
+            history = data.get("history") or []
+
+            analyze_prompt = prompts.get("ANALYZE_ACTION") or ""
+            analysis, analysis_error = _gen_analysis(
+                client,
+                model=str(model),
+                analyze_prompt=analyze_prompt,
+                tools=tools,
+                job_portrait=job_portrait,
+                resume=resume,
+                history=history,
+                history_max_messages=args.history_max_messages,
+                resume_max_chars=args.resume_max_chars,
+                throttle=limiter.wait,
+            )
 
-        outputs_for_report.append(
-            {
-                "idx": idx,
+            msg_action = _choose_message_action(history)
+            msg_prompt = prompts.get(msg_action) or prompts.get("CHAT_ACTION") or ""
+            msg_obj, message_error = _gen_message(
+                client,
+                model=str(model),
+                action_prompt=msg_prompt,
+                tools=tools,
+                job_portrait=job_portrait,
+                resume=resume,
+                analysis=analysis,
+                history=history,
+                history_max_messages=args.history_max_messages,
+                resume_max_chars=args.resume_max_chars,
+                throttle=limiter.wait,
+            )
+            message_text = ""
+            if isinstance(msg_obj, dict):
+                message_text = (msg_obj.get("message") or "").strip()
+
+            out_payload = {
+                "generated_at": now,
+                "fingerprint": cand_fingerprint,
                 "candidate_file": str(path),
-                "generated_json": str(out_path),
-                "name": name,
-                "conversation_id": conversation_id,
+                "name": data.get("name") or "unknown",
+                "conversation_id": data.get("conversation_id") or "",
                 "message_action": msg_action,
                 "message": message_text,
                 "message_obj": msg_obj,
                 "message_error": message_error,
-                "message_checks": checks,
+                "message_checks": _simple_message_checks(message_text),
                 "analysis": analysis,
                 "analysis_error": analysis_error,
             }
-        )
+            _write_json(out_path, out_payload)
+
+        return {
+            "idx": idx,
+            "candidate_file": str(path),
+            "generated_json": str(out_path),
+            "name": out_payload.get("name") or "unknown",
+            "conversation_id": out_payload.get("conversation_id") or "",
+            "message_action": out_payload.get("message_action"),
+            "message": out_payload.get("message") or "",
+            "message_obj": out_payload.get("message_obj"),
+            "message_error": out_payload.get("message_error"),
+            "message_checks": out_payload.get("message_checks") or {},
+            "analysis": out_payload.get("analysis"),
+            "analysis_error": out_payload.get("analysis_error"),
+            "from_checkpoint": reused,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = {
+            executor.submit(_process, idx, path): path
+            for idx, path in enumerate(candidate_files, start=args.start_index)
+        }
+        for future in tqdm(as_completed(futures), desc="Generate", total=len(futures)):
+            try:
+                outputs_for_report.append(future.result())
+            except Exception as exc:
+                # Leave no checkpoint so the candidate is retried on the next run.
+                logger.error("generation failed for %s: %s", futures[future], exc)
+    # Merge deterministically in candidate-file order, independent of completion order.
+    outputs_for_report.sort(key=lambda o: o["idx"])
+    resumed = sum(1 for o in outputs_for_report if o.get("from_checkpoint"))
+    if resumed:
+        logger.info("Reused %d/%d checkpointed candidates", resumed, len(candidate_files))
 
     # Build a lightweight report section (no per-candidate full dumps).
     summary = _summarize_checks(outputs_for_report)
@@ -674,6 +777,7 @@ def main() -> int:
         f"- prompt_source: `{args.prompt_source}`",
         f"- model: `{model}`",
         f"- 处理候选人: {summary.get('total')}",
+        f"- 复用断点结果: {resumed}/{summary.get('total')}",
         f"- analysis 生成成功: {summary.get('analysis_ok')}/{summary.get('total')}",
         f"- message(JSON) 生成成功: {summary.get('message_ok')}/{summary.get('total')}",
         f"- analysis 生成失败: {summary.get('analysis_failed')}/{summary.get('total')}",
@@ -2,7 +2,7 @@
 """Remove duplicate candidates by name, keeping the latest one by updated_at.
 
 This script:
-1. Queries all candidates from CN_candidates collection
+1. Streams all candidates from CN_candidates collection (query_iterator, no 16384 cap)
 2. Groups candidates by name
 3. For each duplicate group, keeps the candidate with the latest updated_at
 4. Deletes all older duplicates
@@ -18,6 +18,7 @@ from typing import Dict, List, Any
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from pymilvus import MilvusClient
+from src.candidate_store import scan_candidates
 from src.config import get_zilliz_config
 from src.global_logger import logger
 
@@ -35,12 +36,24 @@ def parse_datetime(date_str: str) -> datetime:
         return datetime.min
 
 
-def remove_duplicates(collection_name: str = "CN_candidates", dry_run: bool = True):
+def _iter_snapshot_candidates():
+    """Candidates (candidate_id, name, updated_at) from the local columnar snapshot."""
+    from src.candidate_snapshot import query_snapshot
+
+    table = query_snapshot(["candidate_id", "name", "updated_at"])
+    for row in table.to_pylist():
+        if row["name"]:
+            yield {**row, "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None}
+
+
+def remove_duplicates(collection_name: str = "CN_candidates", dry_run: bool = True, from_snapshot: bool = False):
     """Remove duplicate candidates by name, keeping the latest by updated_at.
     
     Args:
         collection_name: Name of the collection to process
         dry_run: If True, only report what would be deleted without actually deleting
+        from_snapshot: Read names from the local snapshot (`scripts/candidate_snapshot.py sync`)
+            instead of scanning Milvus
     """
     # Get Zilliz config
     zilliz_config = get_zilliz_config()
@@ -56,31 +69,27 @@ def remove_duplicates(collection_name: str = "CN_candidates", dry_run: bool = Tr
     
     logger.info(f"Connecting to collection: {collection_name}")
     
-    # Query all candidates with name and updated_at
-    # Milvus has a limit of 16384 for query results
-    logger.info("Querying all candidates...")
+    # Stream all candidates with name and updated_at (not bounded by the 16384 query window)
+    # Group by name (normalize by stripping whitespace)
+    logger.info("Scanning all candidates...")
+    name_groups = defaultdict(list)
+    total_scanned = 0
     try:
-        all_candidates = client.query(
+        candidates_source = _iter_snapshot_candidates() if from_snapshot else scan_candidates(
+            fields=["candidate_id", "name", "updated_at"],
+            filter_expr='name != ""',
             collection_name=collection_name,
-            filter='name != ""',
-            output_fields=["candidate_id", "name", "updated_at"],
-            limit=16384  # Maximum allowed by Milvus
         )
-        logger.info(f"Queried {len(all_candidates)} candidates (max 16384 due to Milvus limit)")
-        if len(all_candidates) == 16384:
-            logger.warning("Query returned maximum limit. There may be more candidates. Consider running multiple times with additional filters.")
+        for candidate in candidates_source:
+            total_scanned += 1
+            name = candidate.get("name")
+            if name and name.strip():
+                name_groups[name.strip()].append(candidate)
     except Exception as e:
-        logger.error(f"Failed to query candidates: {e}")
+        logger.error(f"Failed to scan candidates: {e}")
         return
     
-    logger.info(f"Found {len(all_candidates)} candidates with names")
-    
-    # Group by name (normalize by stripping whitespace)
-    name_groups = defaultdict(list)
-    for candidate in all_candidates:
-        name = candidate.get("name")
-        if name and name.strip():
-            name_groups[name.strip()].append(candidate)
+    logger.info(f"Found {total_scanned} candidates with names")
     
     # Find duplicates
     duplicates_to_delete = []
@@ -110,7 +119,7 @@ def remove_duplicates(collection_name: str = "CN_candidates", dry_run: bool = Tr
             )
     
     logger.info(f"\nSummary:")
-    logger.info(f"  Total candidates with names: {len(all_candidates)}")
+    logger.info(f"  Total candidates with names: {total_scanned}")
     logger.info(f"  Unique names: {len(name_groups)}")
     logger.info(f"  Names with duplicates: {len([n for n, c in name_groups.items() if len(c) > 1])}")
     logger.info(f"  Candidates to keep: {len(kept_candidates)}")
@@ -175,11 +184,17 @@ if __name__ == "__main__":
         action="store_true",
         help="Actually delete duplicates (default is dry-run)"
     )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Find duplicates in the local candidate snapshot instead of scanning Milvus"
+    )
     
     args = parser.parse_args()
     
     remove_duplicates(
         collection_name=args.collection,
-        dry_run=not args.execute
+        dry_run=not args.execute,
+        from_snapshot=args.snapshot,
     )
 
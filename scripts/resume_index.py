@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Build and query the local resume keyword index (`src.resume_index`).
+
+Commands:
+  sync     Index candidates changed since the stored watermark (--full rebuilds)
+  compact  Merge pending rows into the compressed posting lists (--full also drops retired documents)
+  info     Print path / document / term / pending counts, watermark and last sync time
+  query    Resolve a keyword to candidate ids locally
+
+Usage:
+  python scripts/resume_index.py sync --full
+  python scripts/resume_index.py sync
+  python scripts/resume_index.py query "机器学习 python"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.resume_index import compact, index_info, search_candidate_ids, sync_resume_index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Incrementally index candidates from Milvus")
+    sync.add_argument("--full", action="store_true", help="Rebuild from scratch (drops deleted candidates)")
+    compact_cmd = sub.add_parser("compact", help="Merge pending rows into the posting lists")
+    compact_cmd.add_argument("--full", action="store_true", help="Rewrite every posting list and drop retired documents")
+    sub.add_parser("info", help="Show index metadata")
+    query = sub.add_parser("query", help="Resolve a keyword to candidate ids")
+    query.add_argument("keyword")
+    query.add_argument("--limit", type=int, default=20, help="Ids to print")
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        print(json.dumps(sync_resume_index(full=args.full), ensure_ascii=False, indent=2))
+    elif args.command == "compact":
+        print(json.dumps(compact(full=args.full), ensure_ascii=False, indent=2))
+    elif args.command == "info":
+        print(json.dumps(index_info(), ensure_ascii=False, indent=2))
+    else:
+        start = time.perf_counter()
+        ids = search_candidate_ids(args.keyword)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if ids is None:
+            print("Index not enabled/built, or keyword not indexable (single CJK character): search falls back to LIKE")
+            return 1
+        print("\n".join(ids[:args.limit]))
+        print(f"\n{len(ids)} candidates matched in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,7 +13,16 @@ from .candidate_store import upsert_candidate
 from .config import get_dingtalk_config, get_openai_config
 from .global_logger import logger
 from .assistant_utils import _openai_client
-from .prompts.assistant_actions_prompts import ACTION_PROMPTS, ACTION_SCHEMAS
+from .conversation_sync import build_watermark
+from .resume_profile import get_resume_profile, with_profile_summary
+from .conversation_compaction import (
+    build_compaction_cache,
+    build_summary_input,
+    build_summary_note,
+    get_job_compaction_config,
+    plan_compaction,
+)
+from .prompts.assistant_actions_prompts import ACTION_PROMPTS, ACTION_SCHEMAS, COMPACT_HISTORY_PROMPT
 
 # Constants - Import from unified stage definition
 from .candidate_stages import ALL_STAGES as STAGES, STAGE_DESCRIPTIONS
@@ -62,12 +71,12 @@ def init_chat(
         items=full_history
     )
 
-    # create candidate record
+    # create candidate record (watermark marks the seeded history as already synced)
     candidate_id = upsert_candidate(
         chat_id=chat_id,
         stage=None,  # Not analyzed yet
         conversation_id=conversation.id,
-        metadata={'history': chat_history},
+        metadata={'history': chat_history, 'conversation_sync': build_watermark(conversation.id, chat_history)},
         **kwargs,
     )
     if not candidate_id:
@@ -78,6 +87,75 @@ def init_chat(
         "candidate_id": candidate_id,
     }
 
+def compact_conversation(
+    conversation_id: str,
+    chat_history: List[Dict[str, Any]],
+    candidate: Optional[Dict[str, Any]],
+    job: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Compact a long conversation into a fresh one when it exceeds the job's thresholds.
+
+    Older turns are summarized (extending the cached summary in `metadata.compaction`)
+    and a new conversation is created with the init developer items, the resume and the
+    summary note. The recent turns are left for the incremental sync to send.
+
+    Args:
+        conversation_id: Current OpenAI conversation ID
+        chat_history: Merged chat history (oldest first)
+        candidate: Candidate record (metadata holds the cached summary)
+        job: Job record, whose `metadata.compaction` may override the thresholds
+    Returns:
+        None if no compaction was needed, otherwise dict with the new `conversation_id`,
+        `watermark` (conversation_sync) and `compaction` (cache) values
+    """
+    candidate = candidate or {}
+    metadata = candidate.get("metadata") or {}
+    plan = plan_compaction(chat_history, get_job_compaction_config(job), metadata.get("compaction"), conversation_id)
+    if not plan.needed:
+        return None
+    logger.info(f"Compacting conversation {conversation_id} for {candidate.get('name')}: {plan.reason}")
+
+    openai_config = get_openai_config()
+    response = _openai_client.responses.create(
+        model=openai_config["model"],
+        instructions=COMPACT_HISTORY_PROMPT,
+        input=build_summary_input(plan),
+    )
+    summary = (response.output_text or "").strip() or plan.previous_summary
+    summarized_count = plan.previous_count + len(plan.older)
+
+    # init_chat developer items (job info / intro) + resume + summary note
+    items = [
+        {'role': 'developer', 'content': m['content'], 'type': 'message'}
+        for m in chat_history if m.get('role') == 'developer' and m.get('content')
+    ]
+    resume = candidate.get("full_resume") or candidate.get("resume_text")
+    if resume:
+        resume = with_profile_summary(resume, get_resume_profile(candidate))
+        items.append({'role': 'developer', 'content': f"候选人简历：\n{resume}", 'type': 'message'})
+    items.append({**build_summary_note(summary, summarized_count), 'type': 'message'})
+    conversation = _openai_client.conversations.create(
+        metadata={
+            "chat_id": candidate.get("chat_id"),
+            "name": candidate.get("name"),
+            "job_applied": candidate.get("job_applied"),
+            "compacted_from": conversation_id,
+        },
+        items=items,
+    )
+
+    compaction = build_compaction_cache(plan, summary, conversation.id, conversation_id)
+    # everything before the recent window is now represented by the summary note
+    watermark = build_watermark(conversation.id, chat_history[:plan.split_index])
+    if candidate.get("candidate_id"):
+        upsert_candidate(
+            candidate_id=candidate["candidate_id"],
+            conversation_id=conversation.id,
+            metadata={"compaction": compaction, "conversation_sync": watermark},
+        )
+    return {"conversation_id": conversation.id, "watermark": watermark, "compaction": compaction}
+
 ## ------------Main Message Generation----------------------------------
 
 def generate_message(
@@ -0,0 +1,524 @@
+"""Near-duplicate candidate detection with locality-sensitive hashing.
+
+Every candidate is reduced to two sketches:
+  - ``resume_minhash`` (see `minhash`), split into `MINHASH_BANDS` bands of 4 rows:
+    pairs with Jaccard 0.65 share a band with probability > 0.99, unrelated resumes
+    (Jaccard < 0.1) almost never do
+  - a `SIMHASH_BITS`-bit random-hyperplane sketch of ``resume_vector``, split into
+    16-bit bands (covers candidates whose signature was not backfilled yet)
+
+Candidates sharing any band bucket are verified against the configured thresholds
+(estimated Jaccard / cosine) and the ``match_fields`` (by default the same name), and
+verified pairs are joined into clusters with union-find. Work is proportional to the
+bucket sizes instead of all pairs, and oversized buckets (template texts) are skipped.
+
+Sketches and buckets live in a local SQLite file (like `resume_index`), synced from
+Milvus with an ``updated_at`` watermark, so a periodic sync only sketches new or
+changed candidates and reports the clusters they joined.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .config import get_dedupe_config, resolve_repo_path
+from .global_logger import logger
+from .minhash import NUM_PERM, decode_signature, estimate_jaccard
+
+MINHASH_BANDS = 32
+SIMHASH_BITS = 256
+SIMHASH_BANDS = 16
+MATCH_FIELDS = ("name", "job_applied")
+
+_ROWS_PER_BAND = NUM_PERM // MINHASH_BANDS
+_BYTES_PER_SIMHASH_BAND = SIMHASH_BITS // 8 // SIMHASH_BANDS
+_BATCH_ROWS = 500
+_SQL_VARS = 900  # stay below SQLite's bound-parameter limit
+
+_INDEX_PATH = resolve_repo_path(get_dedupe_config().get("path") or "data/candidate_dedupe.sqlite3")
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sketches (
+    candidate_id TEXT PRIMARY KEY,
+    name TEXT,
+    job_applied TEXT,
+    updated_at TEXT,
+    minhash BLOB,
+    simhash BLOB
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    candidate_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_buckets_key ON buckets(band, key);
+CREATE INDEX IF NOT EXISTS idx_buckets_candidate ON buckets(candidate_id);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(_INDEX_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+    return _conn
+
+
+def _settings() -> Dict[str, Any]:
+    config = get_dedupe_config()
+    match_fields = [f for f in config.get("match_fields", ["name"]) or [] if f in MATCH_FIELDS]
+    return {
+        "min_jaccard": float(config.get("min_jaccard") or 0.65),
+        "min_cosine": float(config.get("min_cosine") or 0.97),
+        "max_bucket": int(config.get("max_bucket") or 200),
+        "use_vectors": bool(config.get("use_vectors", True)),
+        "match_fields": match_fields,
+    }
+
+
+# ------------------------------------------------------------------
+# Sketches and band keys
+# ------------------------------------------------------------------
+@lru_cache(maxsize=4)
+def _hyperplanes(dim: int) -> np.ndarray:
+    # fixed seed: sketches must be comparable across processes and syncs
+    return np.random.default_rng(20240601).standard_normal((dim, SIMHASH_BITS)).astype(np.float32)
+
+
+def simhash_sketch(vector: Any) -> Optional[bytes]:
+    """Random-hyperplane sketch of an embedding; None for missing or all-zero vectors."""
+    if vector is None or not len(vector):
+        return None
+    v = np.asarray(vector, dtype=np.float32)
+    if not np.any(v):
+        return None  # placeholder vector of a candidate without resume
+    return np.packbits(v @ _hyperplanes(len(v)) > 0).tobytes()
+
+
+def estimate_cosine(sketch1: bytes, sketch2: bytes) -> float:
+    """Cosine similarity estimated from the fraction of differing sketch bits."""
+    differing = np.unpackbits(np.bitwise_xor(np.frombuffer(sketch1, np.uint8), np.frombuffer(sketch2, np.uint8))).sum()
+    return math.cos(math.pi * differing / SIMHASH_BITS)
+
+
+def band_keys(minhash: Optional[bytes], simhash: Optional[bytes]) -> List[Tuple[int, int]]:
+    """LSH ``(band, key)`` buckets of one candidate; vector bands are numbered after the MinHash ones."""
+    keys = []
+    if minhash:
+        step = _ROWS_PER_BAND * 4
+        for band in range(MINHASH_BANDS):
+            digest = hashlib.blake2b(minhash[band * step:(band + 1) * step], digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, "little", signed=True)))
+    if simhash:
+        step = _BYTES_PER_SIMHASH_BAND
+        for band in range(SIMHASH_BANDS):
+            keys.append((MINHASH_BANDS + band, int.from_bytes(simhash[band * step:(band + 1) * step], "little")))
+    return keys
+
+
+def _sketch(candidate: Dict[str, Any], use_vectors: bool) -> Tuple[Optional[bytes], Optional[bytes]]:
+    signature = decode_signature(candidate.get("resume_minhash"))
+    minhash = signature.astype("<u4").tobytes() if signature is not None else None
+    simhash = simhash_sketch(candidate.get("resume_vector")) if use_vectors else None
+    return minhash, simhash
+
+
+# ------------------------------------------------------------------
+# Index updates
+# ------------------------------------------------------------------
+def _forget(conn: sqlite3.Connection, candidate_ids: List[str]) -> None:
+    for start in range(0, len(candidate_ids), _SQL_VARS):
+        chunk = candidate_ids[start:start + _SQL_VARS]
+        marks = ", ".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM buckets WHERE candidate_id IN ({marks})", chunk)
+        conn.execute(f"DELETE FROM sketches WHERE candidate_id IN ({marks})", chunk)
+
+
+def _index_batch(conn: sqlite3.Connection, candidates: List[Dict[str, Any]], use_vectors: bool) -> List[str]:
+    """(Re-)sketch a batch of candidates; returns the ids whose sketch is new or changed."""
+    ids = [c["candidate_id"] for c in candidates]
+    previous = {cid: (row[4], row[5]) for cid, row in _load_sketches(conn, set(ids)).items()}
+    _forget(conn, ids)
+    sketched = []
+    for cand in candidates:
+        minhash, simhash = _sketch(cand, use_vectors)
+        if not minhash and not simhash:
+            continue
+        cid = cand["candidate_id"]
+        conn.execute(
+            "INSERT INTO sketches (candidate_id, name, job_applied, updated_at, minhash, simhash) VALUES (?, ?, ?, ?, ?, ?)",
+            (cid, cand.get("name"), cand.get("job_applied"), cand.get("updated_at"), minhash, simhash),
+        )
+        conn.executemany("INSERT INTO buckets (band, key, candidate_id) VALUES (?, ?, ?)", ((b, k, cid) for b, k in band_keys(minhash, simhash)))
+        if previous.get(cid) != (minhash, simhash):
+            sketched.append(cid)
+    return sketched
+
+
+def forget_candidates(candidate_ids: Iterable[str]) -> None:
+    """Drop deleted candidates from the index."""
+    with _LOCK:
+        conn = _connect()
+        with conn:
+            _forget(conn, list(candidate_ids))
+
+
+def sync_dedupe_index(
+    full: bool = False,
+    source: Optional[Callable[..., Iterable[Dict[str, Any]]]] = None,
+    report_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Sketch candidates changed since the stored watermark and report the clusters they joined.
+
+    Args:
+        full: Drop the index and rebuild it from every candidate (no report: use `find_duplicates`)
+        source: Row source with the `scan_candidates(fields=..., updated_from=...)` signature
+        report_path: JSONL file the new clusters are appended to (default: config ``report_path``)
+
+    Returns:
+        Dict with ``fetched`` rows, newly ``sketched`` candidates, new ``clusters`` and ``watermark``
+    """
+    if source is None:
+        from .candidate_store import scan_candidates as source
+
+    settings = _settings()
+    fields = ["candidate_id", "name", "job_applied", "updated_at", "resume_minhash"]
+    if settings["use_vectors"]:
+        fields.append("resume_vector")
+
+    with _LOCK:
+        conn = _connect()
+        if full:
+            with conn:
+                for table in ("sketches", "buckets", "index_meta"):
+                    conn.execute(f"DELETE FROM {table}")
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'watermark'").fetchone()
+        previous = row[0] if row else None
+
+    watermark = previous or ""
+    fetched = 0
+    changed: List[str] = []
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal batch
+        with _LOCK:
+            conn = _connect()
+            with conn:
+                changed.extend(_index_batch(conn, batch, settings["use_vectors"]))
+        batch = []
+
+    for cand in source(fields=fields, updated_from=previous):
+        if not cand.get("candidate_id"):
+            continue
+        fetched += 1
+        watermark = max(watermark, str(cand.get("updated_at") or ""))
+        batch.append(cand)
+        if len(batch) >= _BATCH_ROWS:
+            flush()
+    flush()
+
+    with _LOCK:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                [("watermark", watermark), ("synced_at", datetime.now().isoformat())],
+            )
+
+    clusters = 0
+    if previous and changed and not full:
+        if not report_path and get_dedupe_config().get("report_path"):
+            report_path = str(resolve_repo_path(get_dedupe_config()["report_path"]))
+        found = find_duplicates(candidate_ids=changed)
+        clusters = write_report(found, report_path, append=True) if report_path else sum(1 for _ in found)
+    logger.info("候选人去重索引同步完成: 拉取 %s 位候选人, 生成 %s 个签名, 新增 %s 组疑似重复, 水位 %s", fetched, len(changed), clusters, watermark or "-")
+    return {"fetched": fetched, "sketched": len(changed), "clusters": clusters, "watermark": watermark}
+
+
+# ------------------------------------------------------------------
+# Clustering
+# ------------------------------------------------------------------
+class _UnionFind:
+    def __init__(self) -> None:
+        self.parent: Dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        parent = self.parent.setdefault(x, x)
+        if parent != x:
+            parent = self.parent[x] = self.find(parent)
+        return parent
+
+    def union(self, a: str, b: str) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+    def groups(self) -> Dict[str, List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for x in self.parent:
+            groups.setdefault(self.find(x), []).append(x)
+        return groups
+
+
+def _load_sketches(conn: sqlite3.Connection, candidate_ids: Optional[Set[str]] = None) -> Dict[str, tuple]:
+    query = "SELECT candidate_id, name, job_applied, updated_at, minhash, simhash FROM sketches"
+    if candidate_ids is None:
+        return {row[0]: row for row in conn.execute(query)}
+    ids = list(candidate_ids)
+    sketches = {}
+    for start in range(0, len(ids), _SQL_VARS):
+        chunk = ids[start:start + _SQL_VARS]
+        sketches.update((row[0], row) for row in conn.execute(f"{query} WHERE candidate_id IN ({', '.join('?' * len(chunk))})", chunk))
+    return sketches
+
+
+def pair_similarity(a: tuple, b: tuple, settings: Dict[str, Any]) -> Optional[float]:
+    """Similarity of two sketch rows if they are duplicates under `settings`, else None."""
+    if any((a[i] or "") != (b[i] or "") for i in (1 + MATCH_FIELDS.index(f) for f in settings["match_fields"])):
+        return None
+    if a[4] and b[4]:
+        jaccard = estimate_jaccard(np.frombuffer(a[4], "<u4"), np.frombuffer(b[4], "<u4"))
+        return jaccard if jaccard >= settings["min_jaccard"] else None
+    if a[5] and b[5]:
+        cosine = estimate_cosine(a[5], b[5])
+        return cosine if cosine >= settings["min_cosine"] else None
+    return None
+
+
+def _bucket_members(conn: sqlite3.Connection, candidate_ids: Optional[List[str]], max_bucket: int) -> Iterator[List[str]]:
+    if candidate_ids is None:
+        rows = conn.execute(
+            "SELECT group_concat(candidate_id, char(31)) FROM buckets GROUP BY band, key HAVING COUNT(*) BETWEEN 2 AND ?",
+            (max_bucket,),
+        )
+        for (members,) in rows:
+            yield members.split("\x1f")
+        return
+    keys: Set[Tuple[int, int]] = set()
+    for start in range(0, len(candidate_ids), _SQL_VARS):
+        chunk = candidate_ids[start:start + _SQL_VARS]
+        keys.update(conn.execute(f"SELECT band, key FROM buckets WHERE candidate_id IN ({', '.join('?' * len(chunk))})", chunk))
+    for band, key in keys:
+        members = [r[0] for r in conn.execute("SELECT candidate_id FROM buckets WHERE band = ? AND key = ? LIMIT ?", (band, key, max_bucket + 1))]
+        if 2 <= len(members) <= max_bucket:
+            yield members
+
+
+def find_duplicates(candidate_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Near-duplicate clusters, one dict per cluster.
+
+    Args:
+        candidate_ids: Only report clusters containing these candidates (incremental
+            runs); None scans every bucket of the index
+
+    Yields:
+        ``{"keep", "duplicates", "similarity", "members"}``: ``keep`` is the most
+        recently updated member, ``similarity`` the weakest verified link, ``members``
+        the id / name / job_applied / updated_at of every member (latest first)
+    """
+    settings = _settings()
+    targets = None if candidate_ids is None else list(dict.fromkeys(candidate_ids))
+    with _LOCK:
+        conn = _connect()
+        buckets = list(_bucket_members(conn, targets, settings["max_bucket"]))
+        involved = None if targets is None else {cid for members in buckets for cid in members}
+        sketches = _load_sketches(conn, involved)
+
+    links = _UnionFind()
+    weakest: Dict[str, float] = {}
+    for members in buckets:
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if links.find(a) == links.find(b) or a not in sketches or b not in sketches:
+                    continue
+                score = pair_similarity(sketches[a], sketches[b], settings)
+                if score is None:
+                    continue
+                floor = min(weakest.get(links.find(a), 1.0), weakest.get(links.find(b), 1.0), score)
+                links.union(a, b)
+                weakest[links.find(a)] = floor
+
+    wanted = None if targets is None else set(targets)
+    for root, members in links.groups().items():
+        if len(members) < 2 or (wanted is not None and wanted.isdisjoint(members)):
+            continue
+        rows = sorted((sketches[m] for m in members), key=lambda r: r[3] or "", reverse=True)
+        yield {
+            "keep": rows[0][0],
+            "duplicates": [r[0] for r in rows[1:]],
+            "similarity": round(weakest.get(root, 1.0), 4),
+            "members": [{"candidate_id": r[0], "name": r[1], "job_applied": r[2], "updated_at": r[3]} for r in rows],
+        }
+
+
+def write_report(clusters: Iterable[Dict[str, Any]], path: str, append: bool = False) -> int:
+    """Stream clusters to a JSONL report; returns the number written."""
+    report = Path(path)
+    report.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with report.open("a" if append else "w", encoding="utf-8") as fh:
+        for cluster in clusters:
+            fh.write(json.dumps({**cluster, "found_at": datetime.now().isoformat()}, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def read_report(path: str) -> Iterator[Dict[str, Any]]:
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ------------------------------------------------------------------
+# Resolution
+# ------------------------------------------------------------------
+def _merged_fields(keep: Dict[str, Any], duplicates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fields missing on the kept candidate, taken from its duplicates (latest first)."""
+    update: Dict[str, Any] = {}
+    metadata = dict(keep.get("metadata") or {})
+    for dup in duplicates:
+        for field, value in dup.items():
+            if field == "metadata" and isinstance(value, dict):
+                metadata = {**value, **metadata}  # keys already present win
+            elif field not in keep:
+                update.setdefault(field, value)
+    if metadata != (keep.get("metadata") or {}):
+        update["metadata"] = metadata
+    return update
+
+
+def resolve_duplicates(
+    clusters: Iterable[Dict[str, Any]],
+    merge: bool = True,
+    dry_run: bool = True,
+    batch_size: int = 100,
+) -> Dict[str, int]:
+    """Delete the duplicates of each cluster, keeping its most recently updated member.
+
+    Clusters may come from an old report, so every member is re-read first: a cluster
+    whose kept candidate no longer exists is skipped, and only duplicates that still
+    exist and still pass `pair_similarity` against the kept candidate are merged and
+    deleted.
+
+    Args:
+        clusters: Output of `find_duplicates` / `read_report`
+        merge: First copy fields the kept candidate lacks (and missing metadata keys) from
+            its duplicates; vectors are never copied (nor regenerated for a copied resume)
+        dry_run: Only count what would change
+        batch_size: Clusters resolved per round of reads / writes / deletes
+
+    Returns:
+        Dict with the ``clusters`` processed, ``skipped`` clusters (kept candidate gone),
+        ``merged`` kept candidates and ``deleted`` duplicates
+    """
+    from .candidate_store import _readable_fields, bulk_update_candidates, delete_candidates, fetch_candidates
+
+    settings = _settings()
+    fields = list(_readable_fields) + (["resume_vector"] if settings["use_vectors"] else [])
+    totals = {"clusters": 0, "skipped": 0, "merged": 0, "deleted": 0}
+
+    def sketch_row(candidate: Dict[str, Any]) -> tuple:
+        minhash, simhash = _sketch(candidate, settings["use_vectors"])
+        return (candidate["candidate_id"], candidate.get("name"), candidate.get("job_applied"), candidate.get("updated_at"), minhash, simhash)
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        updates, duplicates = [], []
+        rows = {r["candidate_id"]: r for r in fetch_candidates([i for c in batch for i in [c["keep"], *c["duplicates"]]], fields)}
+        for cluster in batch:
+            keep = rows.get(cluster["keep"])
+            if keep is None:
+                logger.warning("候选人去重: 保留的候选人 %s 已不存在，跳过该组", cluster["keep"])
+                totals["skipped"] += 1
+                continue
+            kept = sketch_row(keep)
+            confirmed = [
+                rows[i] for i in cluster["duplicates"]
+                if i in rows and i != cluster["keep"] and pair_similarity(kept, sketch_row(rows[i]), settings) is not None
+            ]
+            if merge and confirmed:
+                update = _merged_fields(
+                    {k: v for k, v in keep.items() if k != "resume_vector"},
+                    [{k: v for k, v in row.items() if k != "resume_vector"} for row in confirmed],
+                )
+                if update:
+                    updates.append({"candidate_id": cluster["keep"], **update})
+            duplicates += [row["candidate_id"] for row in confirmed]
+            totals["clusters"] += 1
+        if not dry_run:
+            if updates:
+                bulk_update_candidates(updates, touch=False)
+            if duplicates:
+                delete_candidates(duplicates)
+                forget_candidates(duplicates)
+        totals["merged"] += len(updates)
+        totals["deleted"] += len(duplicates)
+
+    batch: List[Dict[str, Any]] = []
+    for cluster in clusters:
+        if cluster.get("duplicates"):
+            batch.append(cluster)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    logger.info(
+        "候选人去重%s: %s 组, 跳过 %s 组, 合并 %s 位, 删除 %s 位",
+        "预演" if dry_run else "完成", totals["clusters"], totals["skipped"], totals["merged"], totals["deleted"],
+    )
+    return totals
+
+
+def index_info() -> Optional[Dict[str, Any]]:
+    """Path, sketch / bucket counts, watermark and last sync; None if never built."""
+    if not _INDEX_PATH.exists():
+        return None
+    with _LOCK:
+        conn = _connect()
+        meta = dict(conn.execute("SELECT key, value FROM index_meta").fetchall())
+        if "synced_at" not in meta:
+            return None
+        return {
+            "path": str(_INDEX_PATH),
+            "candidates": conn.execute("SELECT COUNT(*) FROM sketches").fetchone()[0],
+            "signed": conn.execute("SELECT COUNT(*) FROM sketches WHERE minhash IS NOT NULL").fetchone()[0],
+            "buckets": conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0],
+            "watermark": meta.get("watermark") or None,
+            "synced_at": meta.get("synced_at"),
+        }
+
+
+__all__ = [
+    "MINHASH_BANDS",
+    "SIMHASH_BITS",
+    "simhash_sketch",
+    "estimate_cosine",
+    "band_keys",
+    "sync_dedupe_index",
+    "find_duplicates",
+    "write_report",
+    "read_report",
+    "resolve_duplicates",
+    "forget_candidates",
+    "index_info",
+]
@@ -0,0 +1,245 @@
+"""Columnar local snapshot of the candidate collection for analytics.
+
+Stats, prompt-optimization exports and dedupe keep pulling JSON-heavy rows from
+Zilliz. The snapshot keeps one flattened row per candidate in a local Arrow IPC file
+(memory-mapped on read, so aggregations touch only the columns they use):
+
+    candidate_id, name, chat_id, job_applied, stage, score, contacted,
+    has_contact, notified, updated_at
+
+`sync_snapshot` is incremental: only candidates with ``updated_at >=`` the stored
+watermark are fetched (`scan_candidates`) and replace their previous rows. Deleted
+candidates are only dropped by a full re-sync (``full=True``).
+
+Requires ``pyarrow``; without it `is_snapshot_fresh` is False and callers fall back
+to Milvus.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _ARROW_AVAILABLE = True
+except ImportError:  # optional dependency
+    pa = pc = None
+    _ARROW_AVAILABLE = False
+
+from .candidate_stages import normalize_stage
+from .config import get_snapshot_config, resolve_repo_path
+from .global_logger import logger
+
+_SNAPSHOT_PATH = resolve_repo_path(get_snapshot_config().get("path") or "data/candidate_snapshot.arrow")
+_LOCK = threading.Lock()
+
+# Milvus fields read by the sync (no resume text / vectors)
+SYNC_FIELDS = ["candidate_id", "name", "chat_id", "job_applied", "stage", "analysis", "metadata", "notified", "updated_at"]
+_CHUNK_ROWS = 10000
+
+
+def _schema():
+    return pa.schema([
+        ("candidate_id", pa.string()),
+        ("name", pa.string()),
+        ("chat_id", pa.string()),
+        ("job_applied", pa.string()),
+        ("stage", pa.string()),  # normalized stage, "" if none
+        ("score", pa.int8()),  # analysis.overall clipped to 1-10, null if not analyzed
+        ("contacted", pa.bool_()),
+        ("has_contact", pa.bool_()),  # phone or wechat collected
+        ("notified", pa.bool_()),
+        ("updated_at", pa.timestamp("us")),  # local wall-clock time as stored in Milvus
+    ])
+
+
+def _require_arrow() -> None:
+    if not _ARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for the candidate snapshot (pip install pyarrow)")
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _to_score(analysis: Any) -> Optional[int]:
+    overall = analysis.get("overall") if isinstance(analysis, dict) else None
+    try:
+        return max(1, min(10, int(overall))) if overall is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_candidate(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a Milvus candidate row into the snapshot columns."""
+    metadata = row.get("metadata") if isinstance(row.get("metadata"), dict) else {}
+    return {
+        "candidate_id": row.get("candidate_id"),
+        "name": row.get("name") or "",
+        "chat_id": row.get("chat_id") or "",
+        "job_applied": row.get("job_applied") or "",
+        "stage": normalize_stage(row.get("stage")) or "",
+        "score": _to_score(row.get("analysis")),
+        "contacted": bool(metadata.get("contacted")),
+        "has_contact": bool(metadata.get("phone_number") or metadata.get("wechat_number")),
+        "notified": bool(row.get("notified")),
+        "updated_at": _to_timestamp(row.get("updated_at")),
+    }
+
+
+def _read_table(path: Path) -> Optional["pa.Table"]:
+    if not path.exists():
+        return None
+    # Zero-copy: column buffers point into the mapped file
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _write_table(table: "pa.Table", path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _chunks(rows: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= _CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sync_snapshot(full: bool = False, source: Optional[Callable[..., Iterable[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """Bring the local snapshot up to date with Milvus.
+
+    Args:
+        full: Rebuild from scratch (also drops candidates deleted from Milvus)
+        source: Row source with the `scan_candidates(fields=..., updated_from=...)` signature
+
+    Returns:
+        Dict with ``fetched`` (changed rows), ``rows`` (snapshot size) and ``watermark``
+    """
+    _require_arrow()
+    if source is None:
+        from .candidate_store import scan_candidates as source
+
+    schema = _schema()
+    with _LOCK:
+        existing = None if full else _read_table(_SNAPSHOT_PATH)
+        metadata = (existing.schema.metadata or {}) if existing is not None else {}
+        previous = metadata.get(b"watermark", b"").decode() or None
+        watermark = previous or ""
+        fetched = 0
+        batches = []
+        for chunk in _chunks(source(fields=SYNC_FIELDS, updated_from=previous)):
+            chunk = [row for row in chunk if row.get("candidate_id")]
+            fetched += len(chunk)
+            watermark = max([watermark] + [str(row.get("updated_at") or "") for row in chunk])
+            batches.append(pa.Table.from_pylist([flatten_candidate(row) for row in chunk], schema=schema))
+
+        changed = pa.concat_tables(batches) if batches else schema.empty_table()
+        if existing is not None:
+            if changed.num_rows:
+                # the watermark is inclusive: re-fetched rows replace their previous version
+                keep = pc.invert(pc.is_in(existing["candidate_id"], value_set=changed["candidate_id"]))
+                existing = existing.filter(keep)
+            table = pa.concat_tables([existing.replace_schema_metadata(None), changed])
+        else:
+            table = changed
+        table = table.replace_schema_metadata({
+            "watermark": watermark,
+            "synced_at": datetime.now().isoformat(),
+        })
+        _write_table(table, _SNAPSHOT_PATH)
+
+    logger.info("候选人快照同步完成: 新增/更新 %s 行, 共 %s 行, 水位 %s", fetched, table.num_rows, watermark or "-")
+    return {"fetched": fetched, "rows": table.num_rows, "watermark": watermark}
+
+
+def snapshot_info() -> Optional[Dict[str, Any]]:
+    """Path, row count, watermark and last sync time; None if there is no snapshot."""
+    if not _ARROW_AVAILABLE or not _SNAPSHOT_PATH.exists():
+        return None
+    reader = pa.ipc.open_file(pa.memory_map(str(_SNAPSHOT_PATH), "r"))
+    metadata = reader.schema.metadata or {}
+    return {
+        "path": str(_SNAPSHOT_PATH),
+        "rows": sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches)),
+        "watermark": metadata.get(b"watermark", b"").decode() or None,
+        "synced_at": metadata.get(b"synced_at", b"").decode() or None,
+    }
+
+
+def is_snapshot_fresh(max_age_minutes: Optional[float] = None) -> bool:
+    """Whether the snapshot exists and was synced within `snapshot.max_age_minutes`."""
+    info = snapshot_info()
+    if not info or not info["synced_at"]:
+        return False
+    max_age = float(max_age_minutes or get_snapshot_config().get("max_age_minutes") or 60)
+    return datetime.now() - datetime.fromisoformat(info["synced_at"]) <= timedelta(minutes=max_age)
+
+
+def query_snapshot(
+    columns: Optional[List[str]] = None,
+    updated_from: Optional[datetime] = None,
+    jobs: Optional[Iterable[str]] = None,
+    stage: Optional[str] = None,
+) -> "pa.Table":
+    """Filtered, projected view of the snapshot (empty table if there is none)."""
+    _require_arrow()
+    table = _read_table(_SNAPSHOT_PATH)
+    if table is None:
+        table = _schema().empty_table()
+    mask = None
+    conditions = []
+    if updated_from is not None:
+        conditions.append(pc.greater_equal(table["updated_at"], pa.scalar(updated_from, pa.timestamp("us"))))
+    if jobs is not None:
+        conditions.append(pc.is_in(table["job_applied"], value_set=pa.array(list(jobs), pa.string())))
+    if stage:
+        conditions.append(pc.equal(table["stage"], normalize_stage(stage) or stage))
+    for condition in conditions:
+        mask = condition if mask is None else pc.and_(mask, condition)
+    if mask is not None:
+        table = table.filter(mask)
+    return table.select(columns) if columns else table
+
+
+def stats_columns(days: int = 7) -> Dict[str, Any]:
+    """NumPy columns for `stats_service.aggregate_job_columns` over the last `days` days."""
+    table = query_snapshot(
+        ["job_applied", "stage", "score", "contacted", "updated_at"],
+        updated_from=datetime.now() - timedelta(days=days),
+    )
+    return {
+        "job": table["job_applied"].to_numpy(zero_copy_only=False),
+        "stage": table["stage"].to_numpy(zero_copy_only=False),
+        "score": pc.fill_null(table["score"], 0).to_numpy().astype("int64"),
+        "contacted": table["contacted"].to_numpy(zero_copy_only=False).astype(bool),
+        "day": table["updated_at"].to_numpy(zero_copy_only=False).astype("datetime64[D]"),
+    }
+
+
+__all__ = [
+    "SYNC_FIELDS",
+    "flatten_candidate",
+    "sync_snapshot",
+    "snapshot_info",
+    "is_snapshot_fresh",
+    "query_snapshot",
+    "stats_columns",
+]
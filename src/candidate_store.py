@@ -1,15 +1,20 @@
 """Zilliz/Milvus-backed QA and candidate interaction store integration."""
-from difflib import SequenceMatcher
 from functools import lru_cache
-import json, re, uuid
+import base64, heapq, json, uuid
 from datetime import datetime, timedelta
 from dateutil import parser as date_parser
-from typing import Any, Dict, List, Optional
-from pymilvus import MilvusClient, DataType, FieldSchema
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pymilvus import AnnSearchRequest, CollectionSchema, Function, FunctionType, MilvusClient, DataType, FieldSchema, RRFRanker
 from pymilvus.exceptions import MilvusException
 from tenacity import retry, stop_after_attempt, wait_exponential
 from .global_logger import logger
-from .config import get_zilliz_config
+from .config import get_resume_index_config, get_zilliz_config
+from .stats_rollup_store import record_candidate_update
+from .resume_index import index_candidate, search_candidate_ids
+from .minhash import SIGNATURE_CHARS, decode_signature, encode_signature, estimate_jaccard, minhash_signature
+from . import cpu_pool
+from .text_normalize import normalize_resume_for_matching, resume_similarity
+from .resume_profile import PROFILE_VERSION, degree_rank, parse_resume, resume_fingerprint
 
 # ------------------------------------------------------------------
 # Schema Definition
@@ -19,6 +24,11 @@ _zilliz_config = get_zilliz_config()
 _max_length = _zilliz_config["max_length"]
 _collection_name = _zilliz_config["candidate_collection_name"]
 
+# Full-text search: Milvus tokenizes these VARCHAR fields on write (jieba, lower-cased)
+# and fills the paired sparse field through a BM25 function (see `hybrid_search_candidates`).
+_TEXT_ANALYZER = {"tokenizer": "jieba", "filter": ["lowercase"]}
+BM25_FIELDS = {"resume_text": "resume_sparse", "full_resume": "full_resume_sparse"}
+
 def get_collection_schema() -> list[FieldSchema]:
     """Get the collection schema definition.
     
@@ -32,22 +42,78 @@ def get_collection_schema() -> list[FieldSchema]:
         FieldSchema(name="name", dtype=DataType.VARCHAR, max_length=200, nullable=True),
         FieldSchema(name="job_applied", dtype=DataType.VARCHAR, max_length=128, nullable=True),
         FieldSchema(name="last_message", dtype=DataType.VARCHAR, max_length=2048, nullable=True),
-        FieldSchema(name="resume_text", dtype=DataType.VARCHAR, max_length=_max_length, nullable=True),
+        FieldSchema(name="resume_text", dtype=DataType.VARCHAR, max_length=_max_length, nullable=True,
+                    enable_analyzer=True, analyzer_params=_TEXT_ANALYZER),
         FieldSchema(name="metadata", dtype=DataType.JSON, nullable=True),
         FieldSchema(name="updated_at", dtype=DataType.VARCHAR, max_length=64, nullable=True),
         FieldSchema(name="analysis", dtype=DataType.JSON, nullable=True),
         FieldSchema(name="stage", dtype=DataType.VARCHAR, max_length=20, nullable=True),
-        FieldSchema(name="full_resume", dtype=DataType.VARCHAR, max_length=_max_length, nullable=True),
+        FieldSchema(name="full_resume", dtype=DataType.VARCHAR, max_length=_max_length, nullable=True,
+                    enable_analyzer=True, analyzer_params=_TEXT_ANALYZER),
         FieldSchema(name="conversation_id", dtype=DataType.VARCHAR, max_length=100, nullable=True),
         FieldSchema(name="generated_message", dtype=DataType.VARCHAR, max_length=5000, nullable=True),
         FieldSchema(name="notified", dtype=DataType.BOOL, nullable=True),
+        # Typed mirrors of hot JSON paths, kept in sync on write (see `derive_typed_fields`)
+        FieldSchema(name="score", dtype=DataType.FLOAT, nullable=True),  # analysis.overall
+        FieldSchema(name="contacted", dtype=DataType.BOOL, nullable=True),  # metadata.contacted
+        FieldSchema(name="has_contact", dtype=DataType.BOOL, nullable=True),  # phone or wechat collected
+        FieldSchema(name="action", dtype=DataType.VARCHAR, max_length=20, nullable=True),  # latest assistant action
+        FieldSchema(name="created_ts", dtype=DataType.INT64, nullable=True),  # epoch ms of the first insert
+        FieldSchema(name="updated_ts", dtype=DataType.INT64, nullable=True),  # epoch ms, mirrors updated_at
+        # MinHash of the normalized resume_text, computed on write (see `resume_signature`)
+        FieldSchema(name="resume_minhash", dtype=DataType.VARCHAR, max_length=SIGNATURE_CHARS, nullable=True),
+        # Structured education / work / skills parsed from the resume (see `src.resume_profile`)
+        FieldSchema(name="resume_profile", dtype=DataType.JSON, nullable=True),
+        # BM25 outputs of resume_text / full_resume, generated by Milvus (never written by clients)
+        FieldSchema(name="resume_sparse", dtype=DataType.SPARSE_FLOAT_VECTOR),
+        FieldSchema(name="full_resume_sparse", dtype=DataType.SPARSE_FLOAT_VECTOR),
     ]
     return fields
+
+
+def get_collection_functions() -> list[Function]:
+    """BM25 functions filling the sparse fields of `BM25_FIELDS` from the resume text."""
+    return [
+        Function(
+            name=f"{sparse}_bm25",
+            function_type=FunctionType.BM25,
+            input_field_names=[text],
+            output_field_names=[sparse],
+        )
+        for text, sparse in BM25_FIELDS.items()
+    ]
+
+
+def build_collection_schema(description: str = "") -> CollectionSchema:
+    """Full candidates schema: fields plus the BM25 functions."""
+    return CollectionSchema(fields=get_collection_schema(), functions=get_collection_functions(), description=description)
+
+# Scalar indexes of the candidates collection (field -> index params). Applied by
+# `create_collection`; `ensure_scalar_indexes` adds missing ones to existing collections.
+# INVERTED also serves range filters on VARCHAR fields (updated_at is an ISO string);
+# the numeric epoch fields use STL_SORT, which serves range scans on INT64.
+SCALAR_INDEXES: Dict[str, Dict[str, Any]] = {
+    "chat_id": {"index_type": "INVERTED"},
+    "conversation_id": {"index_type": "INVERTED"},
+    "stage": {"index_type": "INVERTED"},
+    "job_applied": {"index_type": "INVERTED"},  # stats / search page / followup filters
+    "updated_at": {"index_type": "INVERTED"},   # time-window range filters
+    "score": {"index_type": "INVERTED"},
+    "contacted": {"index_type": "INVERTED"},
+    "has_contact": {"index_type": "INVERTED"},
+    "action": {"index_type": "INVERTED"},
+    "created_ts": {"index_type": "STL_SORT"},
+    "updated_ts": {"index_type": "STL_SORT"},
+}
+
+TYPED_FIELDS = ("score", "contacted", "has_contact", "action", "created_ts", "updated_ts")
+
 # Define field names for the collection
-_all_fields = [f.name for f in get_collection_schema()]
+# Writable fields (function outputs are generated by Milvus)
+_all_fields = [f.name for f in get_collection_schema() if f.name not in BM25_FIELDS.values()]
 
-# List of all field names except "resume_vector"
-_readable_fields = [f.name for f in get_collection_schema() if f.dtype != DataType.FLOAT_VECTOR]
+# List of all field names except the vectors
+_readable_fields = [f.name for f in get_collection_schema() if f.dtype not in (DataType.FLOAT_VECTOR, DataType.SPARSE_FLOAT_VECTOR)]
 
 
 # ------------------------------------------------------------------
@@ -78,6 +144,49 @@ except Exception as exc:
     logger.critical("❌ 初始化Zilliz客户端失败. 应用无法启动: %s", exc, exc_info=True)
     raise RuntimeError(f"Zilliz 数据库启动失败: {exc}") from exc
 
+
+@lru_cache(maxsize=1)
+def _get_existing_field_names() -> frozenset:
+    """Field names of the remote candidates collection.
+
+    Keeps reads/writes working against collections that were not migrated yet
+    (e.g. before `scripts/backfill_candidate_typed_fields.py` added the typed fields).
+    """
+    try:
+        info = _client.describe_collection(collection_name=_collection_name)
+        return frozenset(f.get("name") for f in info.get("fields") or [] if f.get("name"))
+    except Exception as exc:
+        logger.warning("Failed to describe candidates collection %s: %s", _collection_name, exc)
+        return frozenset(_all_fields)
+
+
+def _hybrid_search_ready() -> bool:
+    """Whether the collection has the BM25 sparse fields (created by `migrate_collection.py candidates`)."""
+    return set(BM25_FIELDS.values()) <= _get_existing_field_names()
+
+
+def _typed_fields_ready(*fields: str) -> bool:
+    """Whether filters/sorts can use the given typed columns (default: all) instead of JSON paths / ISO strings."""
+    return set(fields or TYPED_FIELDS) <= _get_existing_field_names()
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    """Epoch milliseconds of a datetime or ISO string; naive values are local time, like `updated_at`."""
+    if not value:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            try:
+                value = date_parser.parse(str(value))
+            except (ValueError, OverflowError):
+                return None
+    return int(value.timestamp() * 1000)
+
+
+_readable_fields = [f for f in _readable_fields if f in _get_existing_field_names()]
+
 # ------------------------------------------------------------------
 # Embedding Generation
 # ------------------------------------------------------------------
@@ -136,15 +245,10 @@ def create_collection(collection_name: Optional[str] = None) -> bool:
             auto_id=False,
             max_length=64,
             metric_type="IP",
-            schema=get_collection_schema(),
+            schema=build_collection_schema(),
+            index_params=_build_index_params(SCALAR_INDEXES),
         )
         
-        # Create scalar field indexes for faster queries
-        logger.info("Creating scalar indexes...")
-        _client.create_index(collection_name=collection_name, field_name="chat_id", index_type="INVERTED")
-        _client.create_index(collection_name=collection_name, field_name="conversation_id", index_type="INVERTED")
-        _client.create_index(collection_name=collection_name, field_name="stage", index_type="INVERTED")
-        
         logger.info(f"✅ Collection {collection_name} created successfully")
         return True
         
@@ -152,6 +256,47 @@ def create_collection(collection_name: Optional[str] = None) -> bool:
         logger.exception(f"Failed to create collection {collection_name}: %s", exc)
         return False
 
+
+def _build_index_params(scalar_indexes: Dict[str, Dict[str, Any]], with_vector: bool = True):
+    index_params = _client.prepare_index_params()
+    if with_vector:
+        index_params.add_index(field_name="resume_vector", index_type="AUTOINDEX", metric_type="IP")
+        for sparse in BM25_FIELDS.values():
+            index_params.add_index(field_name=sparse, index_type="SPARSE_INVERTED_INDEX", metric_type="BM25")
+    for field, params in scalar_indexes.items():
+        index_params.add_index(field_name=field, **params)
+    return index_params
+
+
+def ensure_scalar_indexes(
+    collection_name: Optional[str] = None,
+    indexes: Optional[Dict[str, Dict[str, Any]]] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """Create the scalar indexes from `SCALAR_INDEXES` that a collection is missing.
+    
+    Args:
+        collection_name: Collection to check (defaults to candidate collection name from config)
+        indexes: Field -> index params (defaults to `SCALAR_INDEXES`)
+        dry_run: Only report the missing indexes
+        
+    Returns:
+        Names of the fields that were (or, with dry_run, would be) indexed
+    """
+    collection_name = collection_name or _collection_name
+    indexes = SCALAR_INDEXES if indexes is None else indexes
+    info = _client.describe_collection(collection_name=collection_name)
+    fields = {f.get("name") for f in info.get("fields") or []}
+    missing = [
+        field for field in indexes
+        if field in fields and not _client.list_indexes(collection_name=collection_name, field_name=field)
+    ]
+    if missing and not dry_run:
+        index_params = _build_index_params({field: indexes[field] for field in missing}, with_vector=False)
+        _client.create_index(collection_name=collection_name, index_params=index_params)
+        logger.info("Created scalar indexes on %s: %s", collection_name, ", ".join(missing))
+    return missing
+
 # ------------------------------------------------------------------
 # Candidate Operations
 # ------------------------------------------------------------------
@@ -201,6 +346,273 @@ def get_candidate_by_dict(kwargs: Dict[str, Any], strict: bool = True) -> Option
     return stored_candidate
 
 
+def _build_candidate_filter(
+    candidate_ids: Optional[List[str]] = None,
+    chat_ids: Optional[List[str]] = None,
+    conversation_ids: Optional[List[str]] = None,
+    names: Optional[List[str]] = None,
+    job_applied: Optional[str] = None,
+    stage: Optional[str] = None,
+    notified: Optional[bool] = None,
+    updated_from: Optional[str] = None,
+    updated_to: Optional[str] = None,
+    resume_contains: Optional[str] = None,
+    min_score: Optional[float] = None,
+    contacted: Optional[bool] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    resume_matches: Optional[List[str]] = None,
+    min_degree: Optional[str] = None,
+    school: Optional[str] = None,
+    strict: bool = True,
+) -> str:
+    """Build the Milvus filter expression shared by `search_candidates_advanced` and `scan_candidates`."""
+    _quote = lambda value: f"'{value.strip()}'" if value else ''
+    _build_in_clause = lambda field, values: f"{field} in [{', '.join(_quote(v) for v in values if v and v.strip())}]" if values else None
+
+    identifiers = []
+    identifiers.append(_build_in_clause("candidate_id", candidate_ids))
+    identifiers.append(_build_in_clause("chat_id", chat_ids))
+    identifiers.append(_build_in_clause("conversation_id", conversation_ids))
+    identifiers.append(_build_in_clause("name", names))
+    conditions = []
+    if job_applied:
+        conditions.append(f"job_applied == {_quote(job_applied)}")
+    if stage:
+        conditions.append(f"stage == {_quote(stage.upper())}")
+    if isinstance(notified, bool):
+        conditions.append(f"notified == {notified}")
+    # Time windows: numeric range scans on the epoch fields; legacy collections compare
+    # the ISO strings (and approximate "created" with "updated")
+    for field, bound, op in (("updated", updated_from, ">="), ("updated", updated_to, "<="),
+                             ("created", created_from, ">="), ("created", created_to, "<=")):
+        if not bound:
+            continue
+        if _typed_fields_ready(f"{field}_ts") and to_epoch_ms(bound) is not None:
+            conditions.append(f"{field}_ts {op} {to_epoch_ms(bound)}")
+        else:
+            conditions.append(f"updated_at {op} {_quote(bound)}")
+    if resume_matches is not None:
+        # Candidates the local resume index allows: the LIKE below only runs on these ids
+        conditions.append(_build_in_clause("candidate_id", resume_matches))
+    if resume_contains:
+        # Use Milvus like operator to search in both resume_text and full_resume
+        # Note: like is case-sensitive in Milvus
+        keyword = resume_contains.strip().replace("'", "\\'")
+        conditions.append(f"((resume_text like '%{keyword}%') or (full_resume like '%{keyword}%'))")
+    if min_score is not None:
+        # Legacy collections: bracket notation on the JSON field analysis["overall"]
+        identifiers.append(f'score >= {min_score}' if _typed_fields_ready("score") else f'analysis["overall"] >= {min_score}')
+    if isinstance(contacted, bool):
+        field = "contacted" if _typed_fields_ready("contacted") else 'metadata["contacted"]'
+        if contacted:
+            conditions.append(f'{field} == true')
+        else:
+            # For false, we also include records where the field is missing (IS NULL)
+            conditions.append(f'({field} == false or {field} IS NULL)')
+    if (min_degree or school) and "resume_profile" in _get_existing_field_names():
+        # Parsed resume profile: highest degree rank and the list of schools
+        if degree_rank(min_degree):
+            conditions.append(f'resume_profile["degree_rank"] >= {degree_rank(min_degree)}')
+        school = (school or "").replace("'", "").strip()
+        if school:
+            conditions.append(f'json_contains(resume_profile["schools"], {_quote(school)})')
+
+    filter_expr = f" {'AND' if strict else 'OR'} ".join([c for c in identifiers if c])
+    if conditions:
+        filter_expr = f"{filter_expr} AND {' AND '.join(conditions)}" if filter_expr else ' AND '.join(conditions)
+    return filter_expr
+
+
+# ------------------------------------------------------------------
+# Size-aware reads
+# ------------------------------------------------------------------
+# A Milvus response is one gRPC message (capped at 4 MB); reads size their batches to this budget
+_RESPONSE_BUDGET_BYTES = int(_zilliz_config.get("response_budget_bytes") or 3 * 1024 * 1024)
+# Fields left out of list/table reads and fetched on demand (`fetch_candidates`)
+HEAVY_FIELDS = ("resume_vector", "resume_text", "full_resume")
+# Prior for JSON fields, which have no schema bound (typical metadata with chat history)
+_JSON_PRIOR_BYTES = 16 * 1024
+_PROBE_ROWS = 16
+# Largest encoded size seen per field; replaces the schema prior once observed
+_field_bytes: Dict[str, int] = {}
+
+
+@lru_cache(maxsize=1)
+def _schema_field_map() -> Dict[str, FieldSchema]:
+    return {f.name: f for f in get_collection_schema()}
+
+
+def _value_bytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, list) and value and isinstance(value[0], (int, float)):
+        return 4 * len(value)
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _observe_row_sizes(rows: List[Dict[str, Any]], fields: List[str]) -> None:
+    for row in rows:
+        for field in fields:
+            size = _value_bytes(row.get(field))
+            if size > _field_bytes.get(field, -1):
+                _field_bytes[field] = size
+
+
+def estimate_row_bytes(fields: List[str]) -> int:
+    """Upper estimate of one row's response size: observed maxima (+25%), else schema bounds."""
+    total = 64
+    for field in fields:
+        if field in _field_bytes:
+            total += int(_field_bytes[field] * 1.25) + 8
+            continue
+        schema = _schema_field_map().get(field)
+        if schema is None or schema.dtype == DataType.JSON:
+            total += _JSON_PRIOR_BYTES
+        elif schema.dtype == DataType.FLOAT_VECTOR:
+            total += 4 * int(schema.params.get("dim") or _zilliz_config["embedding_dim"])
+        elif schema.dtype == DataType.VARCHAR:
+            total += int(schema.params.get("max_length") or _max_length)
+        else:
+            total += 8
+    return total
+
+
+def sized_batch_rows(fields: List[str], cap: int = 16384) -> int:
+    """Rows per request that keep a response for `fields` within the gRPC budget."""
+    return max(1, min(cap, 16384, _RESPONSE_BUDGET_BYTES // estimate_row_bytes(fields)))
+
+
+def _is_message_size_error(exc: Exception) -> bool:
+    text = str(exc).lower()
+    return any(s in text for s in ("larger than max", "resource_exhausted", "message size", "message too large"))
+
+
+def _scan_batch_size(fields: List[str]) -> int:
+    """query_iterator batch size: `zilliz.scan_batch_size`, reduced to fit the response budget."""
+    return sized_batch_rows(fields, cap=int(_zilliz_config.get("scan_batch_size") or 2000))
+
+
+def _query_ids(candidate_ids: List[str], fields: List[str]) -> List[Dict[str, Any]]:
+    """Query rows by primary key; halve and retry batches rejected for their response size."""
+    try:
+        rows = _client.query(
+            collection_name=_collection_name,
+            filter=f"candidate_id in [{', '.join(_literal(i) for i in candidate_ids)}]",
+            output_fields=fields,
+            limit=len(candidate_ids),
+        )
+    except Exception as exc:
+        if not _is_message_size_error(exc):
+            raise
+        if len(candidate_ids) == 1:
+            logger.error("候选人 %s 单行超过 gRPC 消息上限，已跳过: %s", candidate_ids[0], exc)
+            return []
+        logger.warning("批量读取 %d 行超过 gRPC 消息上限，拆分重试", len(candidate_ids))
+        mid = len(candidate_ids) // 2
+        return _query_ids(candidate_ids[:mid], fields) + _query_ids(candidate_ids[mid:], fields)
+    _observe_row_sizes(rows, fields)
+    return rows
+
+
+def fetch_candidates(candidate_ids: List[str], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Read candidates by id in batches sized to the gRPC response budget.
+
+    Batch sizes come from the largest field sizes observed so far (schema bounds
+    before the first read) and grow or shrink as rows are seen; a batch that still
+    exceeds the limit is split in half and retried. Use this for heavy projections
+    (`HEAVY_FIELDS`, metadata) instead of hand-tuned chunk sizes.
+
+    Args:
+        candidate_ids: Ids to read (duplicates and empty ids are ignored)
+        fields: Result fields (default: `_readable_fields`)
+
+    Returns:
+        Candidate dicts (empty values dropped) in the order of `candidate_ids`; missing ids are skipped
+    """
+    fields = list(dict.fromkeys(["candidate_id"] + [f for f in fields or _readable_fields if f in _get_existing_field_names()]))
+    ids = list(dict.fromkeys(i for i in candidate_ids if i))
+    found: Dict[str, Dict[str, Any]] = {}
+    start = 0
+    while start < len(ids):
+        chunk = ids[start:start + sized_batch_rows(fields)]
+        for row in _query_ids(chunk, fields):
+            found[row["candidate_id"]] = row
+        start += len(chunk)
+    return _clean_candidate_rows([found[i] for i in ids if i in found])
+
+
+def scan_candidates(
+    fields: Optional[List[str]] = None,
+    filter_expr: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    collection_name: Optional[str] = None,
+    **filters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Stream every matching candidate with Milvus `query_iterator`.
+
+    Unlike `query`, the iterator is not bounded by the 16384-row result window, and
+    only one batch is held in memory at a time. The batch size comes from a small probe,
+    so a later batch of larger rows can still exceed the gRPC limit: the scan then
+    restarts after the last yielded primary key (the iterator walks keys in order) with
+    half the batch size.
+
+    Args:
+        fields: Projected fields (default: `_readable_fields`); keep it minimal for large scans
+        filter_expr: Raw Milvus filter, combined (AND) with `filters`
+        batch_size: Rows per round trip (default: sized to the gRPC budget from probed field sizes)
+        collection_name: Collection to scan (default: the configured candidate collection)
+        **filters: Keyword filters accepted by `search_candidates_advanced`
+
+    Yields:
+        Candidate dicts with empty values dropped
+    """
+    fields = [f for f in fields or _readable_fields if f in _get_existing_field_names()]
+    expr = " AND ".join(f"({e})" for e in (filter_expr, _build_candidate_filter(**filters)) if e)
+    if not batch_size and any(f not in _field_bytes for f in fields):
+        # Probe a few rows so the batch is sized from real field sizes, not schema bounds
+        probe = _client.query(collection_name=collection_name or _collection_name, filter=expr, output_fields=fields, limit=_PROBE_ROWS)
+        _observe_row_sizes(probe, fields)
+    batch_size = batch_size or _scan_batch_size(fields)
+    last_id: Optional[str] = None
+    while True:
+        iterator = _client.query_iterator(
+            collection_name=collection_name or _collection_name,
+            filter=expr if last_id is None else _and(expr, f"candidate_id > {_literal(last_id)}"),
+            output_fields=fields,
+            batch_size=batch_size,
+        )
+        try:
+            while True:
+                try:
+                    batch = iterator.next()
+                except Exception as exc:
+                    if not _is_message_size_error(exc) or batch_size == 1:
+                        raise
+                    batch_size //= 2
+                    logger.warning("全量扫描批次超过 gRPC 消息上限，批大小减半为 %d 后从 %s 之后继续", batch_size, last_id or "开头")
+                    break
+                if not batch:
+                    return
+                for row in batch:
+                    last_id = row.get("candidate_id", last_id)
+                    yield {k: v for k, v in row.items() if v or v == 0}
+        finally:
+            iterator.close()
+
+
+def _resolve_resume_keyword(keyword: str) -> Optional[List[str]]:
+    """Candidate ids that can match `keyword` per the local resume index; None to scan every candidate."""
+    ids = search_candidate_ids(keyword)
+    if ids is None or len(ids) > int(get_resume_index_config().get("max_candidates") or 5000):
+        return None
+    return ids
+
+
 def search_candidates_advanced(
     candidate_ids: Optional[List[str]] = [],
     chat_ids: Optional[List[str]] = [],
@@ -219,6 +631,10 @@ def search_candidates_advanced(
     sort_direction: str = "desc",
     fields: Optional[List[str]] = None,
     contacted: Optional[bool] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    min_degree: Optional[str] = None,
+    school: Optional[str] = None,
     strict = True
 ) -> List[Dict[str, Any]]:
     """
@@ -227,9 +643,14 @@ def search_candidates_advanced(
     Supports filtering by one or more of:
         - Identifiers: candidate_ids, chat_ids, conversation_ids, names
         - Candidate/job metadata: job_applied, stage, notified status
-        - Update window: updated_from, updated_to (based on updated_at)
-        - Resume keyword: resume_contains matches `resume_text` or `full_resume`
+        - Update window: updated_from, updated_to (served by updated_ts once migrated)
+        - Creation window: created_from, created_to (created_ts; legacy collections fall back to updated_at)
+        - Resume keyword: resume_contains matches `resume_text` or `full_resume` (BM25 full-text
+          recall once the collection has the sparse fields, then the local n-gram index
+          `resume_index` if enabled, otherwise a LIKE scan)
+        - Semantic query: BM25 + dense retrieval fused with RRF (legacy: vector search, similarity > 0.5)
         - Semantic score: min_score (matches analysis["overall"])
+        - Parsed resume profile: min_degree (one of `DEGREES`) and school (exact school name)
         - Custom result fields (default: _readable_fields)
         - Strict/relaxed combining of identifier conditions (strict = AND, else OR)
         - Sorting and result count limit
@@ -245,10 +666,14 @@ def search_candidates_advanced(
         updated_from: Start ISO date string for updated_at.
         updated_to: End ISO date string for updated_at.
         resume_contains: Keyword to search for in resumes.
-        semantic_query: (Not implemented) Reserved for semantic search phrase.
+        semantic_query: Natural-language query matched against the resumes.
         min_score: Minimum overall analysis score for candidate.
-        limit: Maximum number of results (default 100).
-        sort_by: Field to sort by (default 'updated_at').
+        created_from: Start ISO date string for the first insert.
+        created_to: End ISO date string for the first insert.
+        min_degree: Lowest accepted highest degree, e.g. '本科' (needs `resume_profile`).
+        school: School the candidate attended (needs `resume_profile`).
+        limit: Maximum number of results (default 100). None streams every match via `scan_candidates`.
+        sort_by: Field to sort by (default 'updated_at'); 'relevance' keeps the retrieval order.
         sort_direction: 'asc' or 'desc' (default 'desc').
         fields: List of result fields to return. Uses `_readable_fields` if None.
         strict: If True (default), combine identifier clauses with AND. If False, use OR.
@@ -256,45 +681,34 @@ def search_candidates_advanced(
     Returns:
         List of candidate records matching all supplied filters, up to `limit`.
     """
-    _quote = lambda value: f"'{value.strip()}'" if value else ''
-    _build_in_clause = lambda field, values: f"{field} in [{', '.join(_quote(v) for v in values if v and v.strip())}]" if values else None
-
-    fields = fields or _readable_fields
-
-    identifiers = []
-    identifiers.append(_build_in_clause("candidate_id", candidate_ids))
-    identifiers.append(_build_in_clause("chat_id", chat_ids))
-    identifiers.append(_build_in_clause("conversation_id", conversation_ids))
-    identifiers.append(_build_in_clause("name", names))
-    conditions = []
-    if job_applied:
-        conditions.append(f"job_applied == {_quote(job_applied)}")
-    if stage:
-        conditions.append(f"stage == {_quote(stage.upper())}")
-    if isinstance(notified, bool):
-        conditions.append(f"notified == {notified}")
-    if updated_from:
-        conditions.append(f"updated_at >= {_quote(updated_from)}")
-    if updated_to:
-        conditions.append(f"updated_at <= {_quote(updated_to)}")
-    if resume_contains:
-        # Use Milvus like operator to search in both resume_text and full_resume
-        # Note: like is case-sensitive in Milvus
-        keyword = resume_contains.strip().replace("'", "\\'")
-        conditions.append(f"(resume_text like '%{keyword}%') or (full_resume like '%{keyword}%')")
-    if min_score is not None:
-        # Use bracket notation to filter JSON field: analysis["overall"] >= min_score
-        identifiers.append(f'analysis["overall"] >= {min_score}')
-    if isinstance(contacted, bool):
-        if contacted:
-            conditions.append('metadata["contacted"] == true')
-        else:
-            # For false, we also include records where the field is missing (IS NULL)
-            conditions.append('(metadata["contacted"] == false or metadata["contacted"] IS NULL)')
-
-    filter_expr = f" {'AND' if strict else 'OR'} ".join([c for c in identifiers if c])
-    if conditions:
-        filter_expr = f"{filter_expr} AND {' AND '.join(conditions)}" if filter_expr else ' AND '.join(conditions)
+    fields = [f for f in fields or _readable_fields if f in _get_existing_field_names()]
+    # Keywords stay an exact containment filter (LIKE), narrowed by the local n-gram index to
+    # the candidates that can match; BM25 only orders that match set when available
+    has_keyword = bool(resume_contains and resume_contains.strip())
+    keyword_search = has_keyword and _hybrid_search_ready()
+    resume_matches = _resolve_resume_keyword(resume_contains) if has_keyword else None
+    if resume_matches == []:
+        return []
+    filter_expr = _build_candidate_filter(
+        candidate_ids=candidate_ids,
+        chat_ids=chat_ids,
+        conversation_ids=conversation_ids,
+        names=names,
+        job_applied=job_applied,
+        stage=stage,
+        notified=notified,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        min_score=min_score,
+        contacted=contacted,
+        created_from=created_from,
+        created_to=created_to,
+        resume_contains=resume_contains,
+        resume_matches=resume_matches,
+        min_degree=min_degree,
+        school=school,
+        strict=strict,
+    )
 
     sortable_fields = {
         "updated_at",
@@ -306,12 +720,13 @@ def search_candidates_advanced(
         "chat_id",
         "conversation_id",
         "contact",  # Special field for sorting by contact info availability
+        "relevance",  # Keep the retrieval order of resume_contains / semantic_query
     }
     sort_by_normalized = sort_by if sort_by in sortable_fields else "updated_at"
     sort_dir = "DESC" if sort_direction.lower() != "asc" else "ASC"
     # Only use order_clause for Milvus if the field is a real database field
     # "contact" is a computed field, so we'll sort in Python instead
-    use_milvus_order = sort_by_normalized != "contact"
+    use_milvus_order = sort_by_normalized not in ("contact", "relevance")
     order_clause = f"{sort_by_normalized} {sort_dir}" if use_milvus_order else None
 
     try:
@@ -319,7 +734,18 @@ def search_candidates_advanced(
         # The function multiplies limit by 3, so we cap the effective limit
         effective_limit = limit * 3 % 16384 if limit else None
         
-        if semantic_query:
+        results = None
+        if semantic_query or keyword_search:
+            results = hybrid_search_candidates(
+                query=semantic_query,
+                keywords=resume_contains if keyword_search else None,
+                filter_expr=filter_expr,
+                fields=fields,
+                limit=effective_limit or 16384,
+            )
+        if results is not None:
+            logger.debug("Hybrid resume search returned %d candidates", len(results))
+        elif semantic_query:
             results = search_candidates_by_resume(
                 resume_text=semantic_query,
                 filter_expr=filter_expr,
@@ -327,6 +753,24 @@ def search_candidates_advanced(
                 limit=effective_limit,
                 similarity_threshold=0.5,
             )
+        elif not limit:
+            # Unlimited reads stream the whole match set instead of stopping at the query window
+            results = list(scan_candidates(fields=fields, filter_expr=filter_expr))
+        elif sort_by_normalized == "contact" and _typed_fields_ready("has_contact"):
+            # Push the contact ordering down: fetch the preferred group first, then fill up
+            with_contact, without_contact = "has_contact == true", "(has_contact == false or has_contact IS NULL)"
+            groups = [with_contact, without_contact] if sort_dir == "DESC" else [without_contact, with_contact]
+            results = []
+            for clause in groups:
+                remaining = effective_limit - len(results)
+                if remaining <= 0:
+                    break
+                results += _client.query(
+                    collection_name=_collection_name,
+                    filter=f"({filter_expr}) AND {clause}" if filter_expr else clause,
+                    output_fields=fields,
+                    limit=remaining,
+                )
         else:
             query_params = {
                 "collection_name": _collection_name,
@@ -339,23 +783,22 @@ def search_candidates_advanced(
                 query_params["output_fields_order"] = order_clause
             results = _client.query(**query_params)
         
-        candidates = [{k: v for k, v in result.items() if v or v == 0} for result in results or []]
-        
-        for candidate in candidates:
-            candidate["score"] = candidate.get("analysis", {}).get("overall")
+        candidates = _clean_candidate_rows(results)
 
         reverse = sort_direction.lower() != "asc"
         
         # Special handling for contact field (derived from metadata)
         if sort_by_normalized == "contact":
             def get_contact_value(c):
+                if "has_contact" in c:
+                    return 1 if c["has_contact"] else 0
                 metadata = c.get("metadata") or {}
                 has_phone = bool(metadata.get("phone_number"))
                 has_wechat = bool(metadata.get("wechat_number"))
                 # Return 1 if has contact, 0 if not (for sorting)
                 return 1 if (has_phone or has_wechat) else 0
             candidates.sort(key=get_contact_value, reverse=reverse)
-        else:
+        elif sort_by_normalized != "relevance":
             candidates.sort(key=lambda c: c.get(sort_by_normalized) or "", reverse=reverse)
 
         return candidates[:limit] if limit else candidates
@@ -364,8 +807,288 @@ def search_candidates_advanced(
         return []
         
 
+def _clean_candidate_rows(results: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Drop empty values and expose the overall score as `score`."""
+    candidates = [{k: v for k, v in result.items() if v or v == 0} for result in results or []]
+    for candidate in candidates:
+        candidate["score"] = (candidate.get("analysis") or {}).get("overall", candidate.get("score"))
+    return candidates
+
+
+# ------------------------------------------------------------------
+# Keyset pagination
+# ------------------------------------------------------------------
+# Sort options pageable by (sort key, candidate_id); `updated_at` / `score` page on
+# their typed columns once they exist (score has no string fallback)
+KEYSET_SORTS = ("updated_at", "score", "name", "job_applied", "stage", "candidate_id")
+# Query ORDER BY is only used when configured: a server that ignores it returns rows in
+# storage order, which cannot be told apart from a sorted page. Rejection turns it off.
+_order_by_pushdown = bool(_zilliz_config.get("query_order_by", False))
+
+
+def keyset_sort_field(sort_by: str) -> Optional[str]:
+    """Column used to page `sort_by`, or None if that sort cannot be paged."""
+    if sort_by == "updated_at":
+        return "updated_ts" if _typed_fields_ready("updated_ts") else "updated_at"
+    if sort_by == "score":
+        return "score" if _typed_fields_ready("score") else None
+    return sort_by if sort_by in KEYSET_SORTS else None
+
+
+def encode_cursor(value: Any, candidate_id: str, nulls: bool = False) -> str:
+    """Opaque page cursor: the last row's sort value and id (and whether the null tail was reached)."""
+    raw = json.dumps([value, candidate_id, nulls], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str, bool]:
+    try:
+        value, candidate_id, nulls = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    return value, str(candidate_id), bool(nulls)
+
+
+def _literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _and(*exprs: Optional[str]) -> str:
+    return " AND ".join(f"({e})" for e in exprs if e)
+
+
+def _fetch_ordered(
+    filter_expr: str, key: Optional[str], descending: bool, limit: int, fields: List[str]
+) -> List[Dict[str, Any]]:
+    """The first `limit` rows matching `filter_expr` ordered by (`key`, candidate_id).
+
+    Uses query ORDER BY when enabled (``zilliz.query_order_by``); otherwise streams only
+    the sort columns, keeps the top `limit` in a heap and fetches those rows by primary key.
+    """
+    global _order_by_pushdown
+    sort_fields = [key, "candidate_id"] if key else ["candidate_id"]
+    row_key = lambda row: tuple(row.get(f, "") for f in sort_fields)
+    if _order_by_pushdown:
+        try:
+            return _client.query(
+                collection_name=_collection_name,
+                filter=filter_expr,
+                output_fields=fields,
+                limit=limit,
+                order_by_fields=[{"field": f, "order": "desc" if descending else "asc"} for f in sort_fields],
+            )
+        except MilvusException as exc:
+            logger.warning("Milvus 不支持查询排序（%s），分页改为本地 Top-N 扫描", exc)
+            _order_by_pushdown = False
+
+    pick = heapq.nlargest if descending else heapq.nsmallest
+    ids = [r["candidate_id"] for r in pick(limit, scan_candidates(fields=sort_fields, filter_expr=filter_expr), key=row_key)]
+    if not ids:
+        return []
+    by_id = {r["candidate_id"]: r for r in _query_ids(ids, fields)}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def _page_filter(resume_contains: Optional[str] = None, **filters: Any) -> Optional[str]:
+    """Filter expression for paging/counting; None when the resume index rules out every candidate."""
+    resume_matches = _resolve_resume_keyword(resume_contains) if resume_contains and resume_contains.strip() else None
+    if resume_matches == []:
+        return None
+    return _build_candidate_filter(
+        **filters,
+        resume_matches=resume_matches,
+        resume_contains=resume_contains,
+    )
+
+
+def page_candidates(
+    sort_by: str = "updated_at",
+    sort_direction: str = "desc",
+    cursor: Optional[str] = None,
+    page_size: int = 100,
+    fields: Optional[List[str]] = None,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of candidates ordered by (`sort_by`, candidate_id), resuming after `cursor`.
+
+    Keyset pagination: the cursor carries the last row's sort value and id, so every
+    page is a range predicate on the indexed sort column instead of an offset or a
+    growing over-fetch. Rows whose sort value is null come after all others.
+
+    Args:
+        sort_by: One of `KEYSET_SORTS` (see `keyset_sort_field`)
+        sort_direction: 'asc' or 'desc' (ties are broken by candidate_id in the same direction)
+        cursor: `next_cursor` of the previous page; None for the first page
+        page_size: Rows per page
+        fields: Result fields (default: `_readable_fields`)
+        **filters: Keyword filters accepted by `search_candidates_advanced` (no semantic query)
+
+    Returns:
+        (candidates, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: `sort_by` cannot be paged or the cursor is malformed
+    """
+    key = keyset_sort_field(sort_by)
+    if key is None:
+        raise ValueError(f"sort_by '{sort_by}' does not support keyset pagination")
+    descending = sort_direction.lower() != "asc"
+    op = "<" if descending else ">"
+    fields = list(dict.fromkeys([f for f in fields or _readable_fields if f in _get_existing_field_names()] + [key, "candidate_id"]))
+    value, last_id, nulls = decode_cursor(cursor) if cursor else (None, None, False)
+    base = _page_filter(**filters)
+    if base is None:
+        return [], None
+
+    rows: List[Dict[str, Any]] = []
+    if not nulls:
+        after = None
+        if last_id is not None:
+            after = f"{key} {op} {_literal(value)} or ({key} == {_literal(value)} and candidate_id {op} {_literal(last_id)})"
+        rows = _fetch_ordered(_and(base, f"{key} IS NOT NULL", after), key, descending, page_size, fields)
+    if len(rows) < page_size and key != "candidate_id":
+        after = f"candidate_id {op} {_literal(last_id)}" if nulls else None
+        rows += _fetch_ordered(_and(base, f"{key} IS NULL", after), None, descending, page_size - len(rows), fields)
+
+    next_cursor = None
+    if len(rows) >= page_size:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.get(key), last["candidate_id"], last.get(key) is None)
+    return _clean_candidate_rows(rows), next_cursor
+
+
+def count_candidates(**filters: Any) -> int:
+    """Number of candidates matching the keyword filters of `page_candidates`."""
+    expr = _page_filter(**filters)
+    if expr is None:
+        return 0
+    result = _client.query(collection_name=_collection_name, filter=expr, output_fields=["count(*)"])
+    return int(result[0]["count(*)"]) if result else 0
+
+
 truncate_field = lambda string, length: string.encode('utf-8')[:length].decode('utf-8', errors='ignore').strip()
 
+def derive_typed_fields(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed column values mirrored from the `analysis` / `metadata` JSON and `updated_at` present in `candidate`.
+
+    Only fields whose source is present are returned, so partial updates leave the
+    other typed columns untouched. `metadata` must be the full (merged) object.
+    """
+    typed: Dict[str, Any] = {}
+    updated_ts = to_epoch_ms(candidate.get("updated_at"))
+    if updated_ts is not None:
+        typed["updated_ts"] = updated_ts
+    analysis = candidate.get("analysis")
+    if isinstance(analysis, dict):
+        try:
+            if analysis.get("overall") is not None:
+                typed["score"] = float(analysis["overall"])
+        except (TypeError, ValueError):
+            pass
+        if analysis.get("action"):
+            typed["action"] = str(analysis["action"]).upper()
+    metadata = candidate.get("metadata")
+    if isinstance(metadata, dict):
+        typed["contacted"] = bool(metadata.get("contacted"))
+        typed["has_contact"] = bool(metadata.get("phone_number") or metadata.get("wechat_number"))
+        if "action" not in typed:
+            history = metadata.get("history") if isinstance(metadata.get("history"), list) else []
+            action = next(
+                (m.get("action") for m in reversed(history) if isinstance(m, dict) and m.get("role") == "assistant" and m.get("action")),
+                None,
+            )
+            if action:
+                typed["action"] = str(action).upper()
+    return typed
+
+
+def _normalize_candidate_fields(
+    candidate: Dict[str, Any], touch: bool = True, stored_profile: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Stamp updated_at (if `touch`), sync the typed columns, drop unknown/empty fields and coerce values to the schema types.
+
+    `stored_profile` is the record's current `resume_profile` (see `build_resume_profile`).
+    """
+    if touch:
+        candidate['updated_at'] = datetime.now().isoformat()
+    for k, v in derive_typed_fields(candidate).items():
+        candidate.setdefault(k, v)  # explicitly passed values win
+    existing = _get_existing_field_names()
+    candidate = {k: v for k, v in candidate.items() if k in _all_fields and k in existing and (v or v == 0)}
+    for k, v in candidate.items():
+        field = next((f for f in get_collection_schema() if f.name == k), None)
+        if field.dtype == DataType.VARCHAR:
+            candidate[k] = truncate_field(str(v), field.max_length)
+        elif field.dtype == DataType.BOOL and isinstance(v, str):
+            candidate[k] = True if v.lower() in ['true', 'yes', '1'] else False
+        elif field.dtype == DataType.FLOAT:
+            candidate[k] = float(v)
+        elif field.dtype == DataType.INT64:
+            candidate[k] = int(v)
+        elif field.dtype == DataType.JSON and isinstance(v, str):
+            candidate[k] = json.loads(v)
+    if candidate.get("resume_text") and "resume_minhash" in existing and "resume_minhash" not in candidate:
+        signature = resume_signature(candidate["resume_text"])
+        if signature:
+            candidate["resume_minhash"] = signature
+    if "resume_profile" in existing:
+        profile = build_resume_profile(candidate, stored=stored_profile)
+        if profile:
+            candidate["resume_profile"] = profile
+    return candidate
+
+
+def build_resume_profile(
+    candidate: Dict[str, Any], stored: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Structured profile of the candidate's resume (`full_resume`, else `resume_text`) to store as `resume_profile`.
+
+    A profile passed by the caller (e.g. parsed from the wasm payload of `resume_text`) is kept;
+    either way it is stamped with the fingerprint of its source text (`fp`) and which field that
+    was (`src`), so readers can tell whether it is current. Returns None (nothing to write) when
+    the `stored` profile already matches the source and parser version, or when it was parsed
+    from `full_resume` and the update only carries `resume_text`.
+    """
+    full_resume = candidate.get("full_resume")
+    profile = candidate.get("resume_profile")
+    if profile:
+        source_field = "resume_text" if candidate.get("resume_text") else "full_resume"
+    else:
+        source_field = "full_resume" if full_resume else "resume_text"
+    source = candidate.get(source_field)
+    if not source:
+        return None
+    fingerprint = resume_fingerprint(source)
+    if not profile:
+        if isinstance(stored, dict) and stored.get("v") == PROFILE_VERSION:
+            if stored.get("fp") == fingerprint or (stored.get("src") == "full_resume" and not full_resume):
+                return None
+        profile = parse_resume(source)
+    return {**profile, "fp": fingerprint, "src": source_field} if profile else None
+
+
+def _stored_fact_fields(candidate_id: str) -> Optional[Dict[str, Any]]:
+    """The stored fields a stats rollup fact is built from (see `stats_rollup_store`)."""
+    fields = ["job_applied", "stage", "analysis", "updated_at", "created_ts"]
+    fields.append("contacted" if _typed_fields_ready("contacted") else "metadata")
+    rows = fetch_candidates([candidate_id], fields)
+    return rows[0] if rows else None
+
+
+def _stored_resume_profile(candidate_id: str) -> Optional[Dict[str, Any]]:
+    rows = _client.query(
+        collection_name=_collection_name,
+        filter=f"candidate_id == {_literal(candidate_id)}",
+        output_fields=["resume_profile"],
+        limit=1,
+    )
+    return rows[0].get("resume_profile") if rows else None
+
+
 def upsert_candidate(**candidate) -> Optional[str]:
     """Insert or update candidate information.
     
@@ -394,18 +1117,18 @@ def upsert_candidate(**candidate) -> Optional[str]:
             new_metadata = {k: v for k, v in candidate.get("metadata", {}).items() if v or v == 0}
             candidate["metadata"] = {**existing_metadata, **new_metadata}
     
+    # an unchanged resume keeps its stored profile instead of being parsed again
+    stored_profile = None
+    if (
+        candidate_id
+        and not candidate.get("resume_profile")
+        and (candidate.get("resume_text") or candidate.get("full_resume"))
+        and "resume_profile" in _get_existing_field_names()
+    ):
+        stored_profile = _stored_resume_profile(candidate_id)
+
     # fixing fields types and filtering only valid fields
-    candidate['updated_at'] = datetime.now().isoformat()
-    candidate = {k: v for k, v in candidate.items() if k in _all_fields and (v or v == 0)}
-    for k, v in candidate.items():
-        field = next((f for f in get_collection_schema() if f.name == k), None)
-        if field.dtype == DataType.VARCHAR:
-            candidate[k] = truncate_field(str(v), field.max_length)
-        elif field.dtype == DataType.BOOL and isinstance(v, str):
-            candidate[k] = True if v.lower() in ['true', 'yes', '1'] else False
-        elif field.dtype == DataType.JSON and isinstance(v, str):
-            candidate[k] = json.loads(v)
-    
+    candidate = _normalize_candidate_fields(candidate, stored_profile=stored_profile)
     
     # Generate embedding if needed
     resume_text = candidate.get("resume_text")
@@ -421,18 +1144,125 @@ def upsert_candidate(**candidate) -> Optional[str]:
             data=[candidate],
             partial_update=True,  # Partial update for existing records
         )
+        record_candidate_update(candidate_id, candidate, load_stored=lambda: _stored_fact_fields(candidate_id))
+        index_candidate(candidate_id, candidate)
         return candidate_id
     else:
         # Generate a unique candidate_id using UUID
         candidate_id = str(uuid.uuid4())
         candidate['candidate_id'] = candidate_id
+        if "updated_ts" in candidate:
+            candidate.setdefault("created_ts", candidate["updated_ts"])
         logger.debug(f'upsert_candidate: generated {candidate_id} for new candidate: {candidate.get("name")}');
         if not candidate.get("resume_vector"): # generate embedding if not provided
             candidate["resume_vector"] = [0.0] * _zilliz_config["embedding_dim"]
         _client.insert(collection_name=_collection_name, data=[candidate])
+        record_candidate_update(candidate_id, candidate)
+        index_candidate(candidate_id, candidate)
         return candidate_id
 
 
+def bulk_update_candidates(updates: List[Dict[str, Any]], batch_size: int = 100, touch: bool = True) -> int:
+    """Partially update many existing candidates with one upsert per batch.
+
+    Unlike `upsert_candidate`, this never inserts, never merges metadata and never
+    generates embeddings: every row must carry `candidate_id` and only the given
+    fields are overwritten. Intended for offline bulk write-backs (e.g. re-scoring).
+    A partial upsert must carry the same fields on every row, so rows are grouped by
+    their field set (after the typed columns are derived) and each group is upserted
+    on its own.
+
+    Args:
+        updates: Rows with `candidate_id` plus the fields to overwrite
+        batch_size: Rows per upsert request
+        touch: Stamp `updated_at`; pass False for offline back-fills that should not
+            reorder candidates in recency-based views
+
+    Returns:
+        int: Number of rows written
+    """
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for update in updates:
+        if update.get("candidate_id"):
+            row = _normalize_candidate_fields(dict(update), touch=touch)
+            groups.setdefault(frozenset(row), []).append(row)
+    batch_size = max(1, batch_size)
+    written = 0
+    for rows in groups.values():
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            _client.upsert(collection_name=_collection_name, data=chunk, partial_update=True)
+            for row in chunk:
+                record_candidate_update(row["candidate_id"], row, load_stored=lambda cid=row["candidate_id"]: _stored_fact_fields(cid))
+                index_candidate(row["candidate_id"], row)
+            written += len(chunk)
+    logger.info("bulk_update_candidates: wrote %d/%d rows", written, len(updates))
+    return written
+
+
+def delete_candidates(candidate_ids: List[str], batch_size: int = 100) -> int:
+    """Delete candidates by id in batches; returns the number of ids submitted."""
+    ids = list(dict.fromkeys(i for i in candidate_ids if i))
+    for start in range(0, len(ids), max(1, batch_size)):
+        chunk = ids[start:start + max(1, batch_size)]
+        _client.delete(collection_name=_collection_name, filter=f"candidate_id in [{', '.join(_literal(i) for i in chunk)}]")
+    logger.info("delete_candidates: deleted %d candidates", len(ids))
+    return len(ids)
+
+
+def hybrid_search_candidates(
+    query: Optional[str] = None,
+    keywords: Optional[str] = None,
+    filter_expr: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = 100,
+) -> Optional[List[Dict[str, Any]]]:
+    """Resume retrieval fusing BM25 full-text and dense vector search with RRF.
+
+    One BM25 request per sparse field (`resume_text`, `full_resume`) on `keywords`
+    (or `query`), plus a `resume_vector` request on the embedding of `query`. The filter
+    is applied inside every request, so only matching candidates are ranked: keyword
+    containment belongs in `filter_expr`, BM25 scores any of the tokens.
+
+    Args:
+        query: Natural-language query; drives the dense side (skipped when None)
+        keywords: Keywords for the BM25 side (defaults to `query`)
+        filter_expr: Milvus filter pushed down into each request
+        fields: Output fields (default: `_readable_fields`)
+        limit: Number of fused results
+
+    Returns:
+        Candidates ranked by fused relevance, or None when the collection has no BM25
+        fields or the search failed (callers fall back to LIKE / vector search)
+    """
+    text = (keywords or query or "").strip()
+    if not text or not _hybrid_search_ready():
+        return None
+    limit = max(1, min(limit, 16384))
+    requests = [
+        AnnSearchRequest(data=[text], anns_field=sparse, param={"metric_type": "BM25"}, limit=limit, expr=filter_expr or None)
+        for sparse in BM25_FIELDS.values()
+    ]
+    if query:
+        resume_vector = get_embedding(query)
+        if resume_vector:
+            requests.append(AnnSearchRequest(
+                data=[resume_vector], anns_field="resume_vector", param={"metric_type": "IP"}, limit=limit, expr=filter_expr or None,
+            ))
+    try:
+        results = _client.hybrid_search(
+            collection_name=_collection_name,
+            reqs=requests,
+            ranker=RRFRanker(int(_zilliz_config.get("hybrid_rrf_k") or 60)),
+            limit=limit,
+            output_fields=fields or _readable_fields,
+        )
+    except Exception as exc:
+        logger.warning("Hybrid resume search failed, falling back: %s", exc)
+        return None
+    return [hit["entity"] for hit in results[0]]
+
+
 def search_candidates_by_resume(
     resume_text: str,
     filter_expr: Optional[str] = None,
@@ -507,48 +1337,14 @@ def candidate_matched(candidate: Dict[str, Any], stored_candidate: Dict[str, Any
         if similarity < 0.7:
             logger.debug(f"last_message similarity ({candidate['name']}): {similarity*100:.2f}% < 70%\n{last_message}\n != \n{last_message2}")
             return False
-    elif resume1 and resume2:
-        similarity = calculate_resume_similarity(resume1, resume2)
-        if similarity < 0.7:
+    elif resume1 and (resume2 or stored_candidate.get("resume_minhash")):
+        matched, similarity = resumes_match(resume1, resume2, stored_candidate.get("resume_minhash"))
+        if not matched:
             logger.debug(f"resume similarity mismatch: {similarity*100:.2f}% for {candidate.get('name')} and {stored_candidate.get('name')}")
             return False
     return True
 
 
-def normalize_resume_for_matching(text: str) -> str:
-    """Normalize resume text for similarity comparison.
-    
-    Removes metadata sections that vary between captures (like statistics,
-    other candidates, privacy notices) and normalizes whitespace to focus
-    on the core resume content.
-    
-    Args:
-        text: Raw resume text
-        
-    Returns:
-        Normalized resume text with only core content
-    """
-    if not text:
-        return ""
-    
-    # Clean literal line-break escape sequences that appear in scraped text
-    text = text.replace(r"\r\n", " ")
-    
-    # Remove 牛人分析器 section (statistics that vary)
-    text = re.sub(r'牛人分析器.*?查看全部\d+项分析', '', text, flags=re.DOTALL)
-    # Remove privacy notice section
-    text = re.sub(r'为妥善保护.*?传播、存储。', '', text, flags=re.DOTALL)
-    # Remove 其他名…牛人 section (other candidates recommendations; variants exist)
-    text = re.sub(r'其他名.*?牛人.*?经历概览', '经历概览', text, flags=re.DOTALL)
-    # Remove 经历概览 section (summary at the end)
-    text = re.sub(r'经历概览.*', '', text, flags=re.DOTALL)
-    # Normalize line breaks (both \r\n and \n to space)
-    text = re.sub(r'[\r\n]+', ' ', text)
-    # Normalize multiple spaces to single space
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-
 def calculate_resume_similarity(text1: str, text2: str) -> float:
     """Calculate similarity between two resume texts.
     
@@ -565,21 +1361,86 @@ def calculate_resume_similarity(text1: str, text2: str) -> float:
     """
     if not text1 or not text2:
         return 0.0
-    
-    norm1 = normalize_resume_for_matching(text1)
-    norm2 = normalize_resume_for_matching(text2)
-    
-    if not norm1 or not norm2:
-        return 0.0
-    
-    return SequenceMatcher(None, norm1, norm2).ratio()
+    # large pairs run in the shared process pool (see cpu_pool)
+    return cpu_pool.call(resume_similarity, text1, text2, size=len(text1) + len(text2))
+
+
+# MinHash Jaccard estimates above / below these bounds settle `resumes_match` without the
+# exact ratio. Calibrated against SequenceMatcher at the 0.7 threshold: re-captures of a
+# resume that differ by whole sections keep a shingle Jaccard of ~0.55 at ratio 0.7, and
+# unrelated resumes stay below ~0.1 (see scripts/benchmark_resume_similarity.py).
+MINHASH_MATCH = 0.65
+MINHASH_MISMATCH = 0.15
+
+
+@lru_cache(maxsize=256)
+def _resume_signature(text: str):
+    return minhash_signature(normalize_resume_for_matching(text)) if text else None
+
+
+def resume_signature(text: str) -> Optional[str]:
+    """Encoded MinHash signature of a resume's normalized core content (stored as `resume_minhash`)."""
+    signature = _resume_signature(text)
+    return encode_signature(signature) if signature is not None else None
+
+
+def resumes_match(
+    resume1: str,
+    resume2: Optional[str] = None,
+    signature2: Optional[str] = None,
+    threshold: float = 0.7,
+) -> Tuple[bool, float]:
+    """Whether two resumes are the same document (`calculate_resume_similarity` >= threshold).
+
+    Compares MinHash signatures first (O(NUM_PERM) instead of the quadratic
+    SequenceMatcher); only estimates between `MINHASH_MISMATCH` and `MINHASH_MATCH`
+    fall back to the exact ratio. Without the second text (signature only) such
+    borderline pairs count as a match.
+
+    Args:
+        resume1: Resume text to check
+        resume2: Stored resume text (optional when `signature2` is given)
+        signature2: Stored `resume_minhash` of resume2
+        threshold: Exact similarity threshold
+
+    Returns:
+        (matched, similarity): similarity is the Jaccard estimate or, near the bounds, the exact ratio
+    """
+    sig1 = _resume_signature(resume1)
+    sig2 = decode_signature(signature2) if signature2 else None
+    if sig2 is None and resume2:
+        sig2 = _resume_signature(resume2)
+    if sig1 is not None and sig2 is not None:
+        estimate = estimate_jaccard(sig1, sig2)
+        if estimate >= MINHASH_MATCH or (estimate > MINHASH_MISMATCH and not resume2):
+            return True, estimate
+        if estimate <= MINHASH_MISMATCH:
+            return False, estimate
+    elif not resume2:
+        return True, 0.0  # nothing comparable: do not reject on the resume alone
+    similarity = calculate_resume_similarity(resume1, resume2 or "")
+    return similarity >= threshold, similarity
 
 __all__ = [
     "get_collection_schema",
     "get_embedding",
     "create_collection",
+    "ensure_scalar_indexes",
+    "SCALAR_INDEXES",
+    "TYPED_FIELDS",
+    "resume_signature",
+    "resumes_match",
+    "build_resume_profile",
+    "derive_typed_fields",
+    "to_epoch_ms",
+    "hybrid_search_candidates",
+    "build_collection_schema",
+    "BM25_FIELDS",
     "search_candidates_advanced",
+    "scan_candidates",
     "upsert_candidate",
+    "bulk_update_candidates",
+    "delete_candidates",
     "search_candidates_by_resume",
     "get_candidate_count",
 ]
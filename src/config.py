@@ -24,6 +24,12 @@ def _load_yaml(path: Path, *, label: str) -> dict[str, Any]:
     return payload
 
 
+def resolve_repo_path(path: str | Path) -> Path:
+    """Resolve a configured file path: relative paths are taken from the repo root, not the CWD."""
+    path = Path(path).expanduser()
+    return path if path.is_absolute() else _REPO_ROOT / path
+
+
 _config_path = Path(os.getenv("BOSS_CONFIG_YAML", str(_DEFAULT_CONFIG_PATH))).expanduser()
 _secrets_path = Path(os.getenv("BOSS_SECRETS_YAML", str(_DEFAULT_SECRETS_PATH))).expanduser()
 
@@ -76,3 +82,38 @@ def get_sentry_config() -> Dict[str, Any]:
 def get_vercel_config() -> Dict[str, str]:
     """Get Vercel configuration."""
     return _config_values.get("vercel", {})
+
+
+def get_prescreen_config() -> Dict[str, Any]:
+    """Get keyword pre-screen configuration (job metadata may override per job)."""
+    return _config_values.get("prescreen", {})
+
+
+def get_compaction_config() -> Dict[str, Any]:
+    """Get conversation compaction thresholds (job metadata may override per job)."""
+    return _config_values.get("compaction", {})
+
+
+def get_stats_config() -> Dict[str, Any]:
+    """Get statistics rollup configuration."""
+    return _config_values.get("stats", {})
+
+
+def get_snapshot_config() -> Dict[str, Any]:
+    """Get local candidate snapshot configuration."""
+    return _config_values.get("snapshot", {})
+
+
+def get_resume_index_config() -> Dict[str, Any]:
+    """Get local resume keyword index configuration."""
+    return _config_values.get("resume_index", {})
+
+
+def get_dedupe_config() -> Dict[str, Any]:
+    """Get near-duplicate candidate detection configuration."""
+    return _config_values.get("dedupe", {})
+
+
+def get_cpu_pool_config() -> Dict[str, Any]:
+    """Get process pool configuration for CPU-heavy text work."""
+    return _config_values.get("cpu_pool", {})
@@ -0,0 +1,168 @@
+"""Context compaction for long candidate conversations.
+
+Every `responses.parse(conversation=...)` call replays the whole OpenAI conversation,
+so long-running followups get slower and more expensive each round. Once the part of
+the chat the conversation holds exceeds ``max_turns`` messages or ``max_tokens``
+(estimated) tokens, the older turns are summarized into a single developer note and
+the candidate is moved to a fresh conversation seeded with:
+
+    job/intro developer items from init_chat + resume + summary note
+
+The most recent ``keep_recent`` messages are then sent through the normal incremental
+sync (`src.conversation_sync`). The summary is cached in candidate
+``metadata.compaction`` and extended incrementally on the next compaction, so old turns
+are never summarized twice.
+
+Thresholds: defaults < config.yaml ``compaction`` < job ``metadata.compaction``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .config import get_compaction_config
+from .conversation_sync import MAX_DELTA_MESSAGES, SYNC_ROLES, message_hash
+
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "max_turns": 40,
+    "max_tokens": 12000,
+    "keep_recent": 12,
+}
+
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uff00-\uffef]")
+_ROLE_LABELS = {"user": "候选人", "assistant": "招聘顾问"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate without a tokenizer: ~1 token per CJK char, ~4 chars per token otherwise."""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def get_job_compaction_config(job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge defaults, config.yaml `compaction` and the job's `metadata.compaction` overrides."""
+    config = {**_DEFAULT_CONFIG, **(get_compaction_config() or {})}
+    overrides = ((job or {}).get("metadata") or {}).get("compaction")
+    if isinstance(overrides, dict):
+        config.update({k: v for k, v in overrides.items() if k in _DEFAULT_CONFIG})
+    return config
+
+
+def _is_turn(message: Dict[str, Any]) -> bool:
+    return message.get("role") in SYNC_ROLES and bool(str(message.get("content") or "").strip())
+
+
+@dataclass
+class CompactionPlan:
+    needed: bool
+    turns: int
+    tokens: int
+    older: List[Dict[str, Any]] = field(default_factory=list)
+    split_index: int = 0  # history index of the first message kept verbatim
+    previous_summary: str = ""
+    previous_count: int = 0
+    reason: str = ""
+
+
+def plan_compaction(
+    history: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    cache: Optional[Dict[str, Any]] = None,
+    conversation_id: Optional[str] = None,
+) -> CompactionPlan:
+    """Decide whether the conversation needs compaction.
+
+    Only the turns after the cached summary are counted, since those are the ones
+    the current conversation actually holds.
+
+    Args:
+        history: Merged chat history (oldest first)
+        config: Result of `get_job_compaction_config`
+        cache: Candidate ``metadata.compaction`` (may be None)
+        conversation_id: Current conversation; a cache for another conversation is ignored
+    """
+    start, summary, count = 0, "", 0
+    if cache and cache.get("conversation_id") == conversation_id and cache.get("last_hash"):
+        matches = [i for i, m in enumerate(history) if message_hash(m) == cache["last_hash"]]
+        if matches:
+            start = matches[-1] + 1
+            summary = cache.get("summary") or ""
+            count = int(cache.get("summarized_count") or 0)
+
+    window = [(i, m) for i, m in enumerate(history) if i >= start and _is_turn(m)]
+    turns = len(window)
+    tokens = estimate_tokens(summary) + sum(estimate_tokens(str(m.get("content"))) for _, m in window)
+    keep = max(1, min(int(config.get("keep_recent") or 1), MAX_DELTA_MESSAGES))
+    over_turns = turns > int(config.get("max_turns") or 0)
+    over_tokens = tokens > int(config.get("max_tokens") or 0)
+    if not config.get("enabled") or not (over_turns or over_tokens) or turns <= keep:
+        return CompactionPlan(False, turns, tokens, previous_summary=summary, previous_count=count)
+
+    older = [m for _, m in window[:-keep]]
+    return CompactionPlan(
+        needed=True,
+        turns=turns,
+        tokens=tokens,
+        older=older,
+        split_index=window[-keep][0],
+        previous_summary=summary,
+        previous_count=count,
+        reason=f"{turns} 条消息 / 约 {tokens} tokens 超过阈值（{config.get('max_turns')} 条 / {config.get('max_tokens')} tokens）",
+    )
+
+
+def build_summary_input(plan: CompactionPlan) -> str:
+    """Summarizer input: previous summary (if any) + the turns being compacted."""
+    lines = []
+    for m in plan.older:
+        ts = str(m.get("timestamp") or "").strip()
+        label = _ROLE_LABELS.get(m.get("role"), m.get("role"))
+        lines.append(f"[{ts}] {label}: {m.get('content')}" if ts else f"{label}: {m.get('content')}")
+    parts = []
+    if plan.previous_summary:
+        parts += ["【已有摘要】", plan.previous_summary, ""]
+    parts += ["【需要合并进摘要的早期对话】", "\n".join(lines)]
+    return "\n".join(parts).strip()
+
+
+def build_summary_note(summary: str, summarized_count: int) -> Dict[str, str]:
+    """Developer item that replaces the compacted turns in the new conversation."""
+    return {
+        "role": "developer",
+        "content": f"【早期对话摘要（已压缩前 {summarized_count} 条消息，仅供内部参考）】\n{summary}",
+    }
+
+
+def build_compaction_cache(
+    plan: CompactionPlan,
+    summary: str,
+    conversation_id: str,
+    source_conversation_id: str,
+) -> Dict[str, Any]:
+    """Value stored in candidate ``metadata.compaction``."""
+    return {
+        "summary": summary,
+        "last_hash": message_hash(plan.older[-1]),
+        "summarized_count": plan.previous_count + len(plan.older),
+        "conversation_id": conversation_id,
+        "source_conversation_id": source_conversation_id,
+        "tokens_before": plan.tokens,
+        "created_at": datetime.now().isoformat(),
+    }
+
+
+__all__ = [
+    "CompactionPlan",
+    "estimate_tokens",
+    "get_job_compaction_config",
+    "plan_compaction",
+    "build_summary_input",
+    "build_summary_note",
+    "build_compaction_cache",
+]
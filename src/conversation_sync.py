@@ -0,0 +1,208 @@
+"""Incremental sync of browser chat history into OpenAI conversations.
+
+`init_chat` seeds the OpenAI conversation with the chat history once. Afterwards
+only the messages the conversation has not seen yet are sent as `input`, tracked by
+a watermark stored in candidate ``metadata.conversation_sync``::
+
+    {
+        "conversation_id": "conv_xxx",      # watermark is only valid for this conversation
+        "last_hash": "9f2c...",             # hash of the last synced message (role + content)
+        "last_timestamp": "2025-11-10 10:00:00",
+        "synced_count": 12,                 # history position right after the last synced message
+        "echo_hashes": ["..."],             # generated replies the conversation already holds
+        "synced_at": "2025-11-10T10:00:03",
+    }
+
+Messages are matched by content hash rather than by position, because the browser
+history is re-merged on every request (timestamps get normalized, messages may be
+missing from the DOM). The delta is capped at `MAX_DELTA_MESSAGES`, so the request
+payload stays bounded no matter how long the conversation grows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import dateutil.parser as parser
+
+SYNC_ROLES = ("user", "assistant")
+MAX_DELTA_MESSAGES = 20
+MAX_ECHO_HASHES = 5
+
+STRATEGY_WATERMARK = "watermark"  # watermark message found in history
+STRATEGY_TIMESTAMP = "timestamp"  # watermark message gone, fell back to its timestamp
+STRATEGY_LEGACY = "legacy"        # no watermark (conversation created before sync existed)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_SORTABLE_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}(:\d{2})?$")
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]+")
+
+
+def message_hash(message: Dict[str, Any]) -> str:
+    """Stable hash of a chat message (role + whitespace-normalized content)."""
+    content = _WHITESPACE_RE.sub(" ", str(message.get("content") or "")).strip()
+    raw = f"{message.get('role') or ''}\x1f{content}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_syncable(message: Dict[str, Any]) -> bool:
+    return message.get("role") in SYNC_ROLES and bool(str(message.get("content") or "").strip())
+
+
+@dataclass
+class SyncDelta:
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    strategy: str = STRATEGY_WATERMARK
+    dropped: int = 0  # older unsynced messages cut by the size cap
+
+    def to_input(self) -> List[Dict[str, str]]:
+        """Responses API input items for the delta."""
+        return [{"role": m["role"], "content": m["content"]} for m in self.messages]
+
+
+def _locate(history: List[Dict[str, Any]], watermark: Dict[str, Any]) -> Optional[int]:
+    """Index of the watermark message in history, -1 if nothing was synced, None if not found."""
+    last_hash = watermark.get("last_hash")
+    if not last_hash:
+        return -1
+    matches = [i for i, m in enumerate(history) if message_hash(m) == last_hash]
+    if not matches:
+        return None
+    # Identical messages (e.g. "好的") may repeat; prefer the one nearest the recorded position.
+    expected = int(watermark.get("synced_count") or 0) - 1
+    return min(matches, key=lambda i: (abs(i - expected), -i))
+
+
+def compute_sync_delta(
+    history: List[Dict[str, Any]],
+    watermark: Optional[Dict[str, Any]],
+    conversation_id: str,
+    max_messages: int = MAX_DELTA_MESSAGES,
+) -> SyncDelta:
+    """Return the chat messages that have not been sent to the conversation yet.
+
+    Args:
+        history: Merged chat history (metadata + browser), oldest first
+        watermark: Candidate ``metadata.conversation_sync`` (may be None)
+        conversation_id: Conversation the delta will be sent to
+        max_messages: Cap on returned messages (newest are kept)
+
+    Returns:
+        SyncDelta with the messages to send and how they were determined
+    """
+    history = history or []
+    if not watermark or watermark.get("conversation_id") != conversation_id:
+        # Pre-sync conversations only ever received the user messages after the last reply.
+        start = len(history)
+        while start > 0 and history[start - 1].get("role") != "assistant":
+            start -= 1
+        pending, strategy = history[start:], STRATEGY_LEGACY
+    else:
+        index = _locate(history, watermark)
+        if index is not None:
+            pending, strategy = history[index + 1:], STRATEGY_WATERMARK
+        else:
+            last_ts = str(watermark.get("last_timestamp") or "")
+            if _SORTABLE_TS_RE.match(last_ts):
+                pending = [
+                    m for m in history
+                    if _SORTABLE_TS_RE.match(str(m.get("timestamp") or "")) and str(m["timestamp"]) > last_ts
+                ]
+            else:
+                pending = [m for m in history if m.get("role") == "user"][-1:]
+            strategy = STRATEGY_TIMESTAMP
+
+    echoes = set((watermark or {}).get("echo_hashes") or [])
+    messages = [m for m in pending if _is_syncable(m) and message_hash(m) not in echoes]
+    dropped = max(0, len(messages) - max_messages)
+    return SyncDelta(messages=messages[dropped:], strategy=strategy, dropped=dropped)
+
+
+def build_watermark(
+    conversation_id: str,
+    history: List[Dict[str, Any]],
+    echoes: Iterable[str] = (),
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build the watermark after `history` has been synced to the conversation.
+
+    Args:
+        conversation_id: Conversation that now contains `history`
+        history: The history that was synced (oldest first)
+        echoes: Assistant replies generated inside the conversation; when they show up
+            in the browser history later they are not sent again
+        previous: Previous watermark, whose echo hashes are carried over
+    """
+    index = len(history) - 1
+    while index >= 0 and not _is_syncable(history[index]):
+        index -= 1
+    echo_hashes = list((previous or {}).get("echo_hashes") or []) if (previous or {}).get("conversation_id") == conversation_id else []
+    echo_hashes += [message_hash({"role": "assistant", "content": e}) for e in echoes if e]
+    return {
+        "conversation_id": conversation_id,
+        "last_hash": message_hash(history[index]) if index >= 0 else None,
+        "last_timestamp": history[index].get("timestamp") if index >= 0 else None,
+        "synced_count": index + 1,
+        "echo_hashes": list(dict.fromkeys(echo_hashes))[-MAX_ECHO_HASHES:],
+        "synced_at": datetime.now().isoformat(),
+    }
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    # the browser's own format parses without dateutil's format guessing
+    if _SORTABLE_TS_RE.match(timestamp):
+        return datetime.fromisoformat(timestamp)
+    return parser.parse(timestamp)
+
+
+def merge_history(
+    metadata_history: Optional[List[Dict[str, Any]]],
+    browser_history: Optional[List[Dict[str, Any]]],
+) -> Optional[List[Dict[str, Any]]]:
+    """Merge the browser chat history into the stored ``metadata.history``.
+
+    Messages are matched by (role, content); stored messages take the browser's
+    timestamp, unseen browser messages are appended, and the result is sorted by
+    time. Chinese date words (今天, 昨天, ...) are stripped from the timestamps.
+    Module-level and import-light, so the web routes can run it in `cpu_pool`.
+
+    Args:
+        metadata_history: Stored history, e.g. ``[{"role": "user", "timestamp": "2025-11-10 10:00:00", "content": "你好", "status": "未读", "action": "CHAT"}]``
+        browser_history: History read from the chat page (same shape, without ``action``)
+    """
+    if not metadata_history:
+        return browser_history
+    if not browser_history:
+        return metadata_history
+
+    merged = metadata_history.copy()
+    for msg in merged:
+        msg["timestamp"] = _CJK_RE.sub("", msg.get("timestamp", ""))
+    metadata_messages = {(msg.get("role"), msg.get("content")): msg for msg in metadata_history}
+    for browser_msg in browser_history:
+        key = (browser_msg.get("role"), browser_msg.get("content"))
+        if key not in metadata_messages:
+            browser_msg["timestamp"] = _CJK_RE.sub("", browser_msg.get("timestamp"))
+            merged.append(browser_msg)
+        else:
+            metadata_messages[key]["timestamp"] = _CJK_RE.sub("", browser_msg["timestamp"])
+
+    merged.sort(key=lambda x: _parse_timestamp(x.get("timestamp", "1970-01-01 00:00:00")))
+    return merged
+
+
+__all__ = [
+    "MAX_DELTA_MESSAGES",
+    "STRATEGY_WATERMARK",
+    "STRATEGY_TIMESTAMP",
+    "STRATEGY_LEGACY",
+    "SyncDelta",
+    "message_hash",
+    "compute_sync_delta",
+    "build_watermark",
+    "merge_history",
+]
@@ -0,0 +1,197 @@
+"""Shared process pool for CPU-heavy text work.
+
+Resume cleaning (`text_normalize.clean_resume_text`), exact resume similarity
+(`text_normalize.resume_similarity`, ``SequenceMatcher``) and chat history merging
+(`conversation_sync.merge_history`, timestamp parsing) are pure Python and hold the
+GIL, so run inside an async handler they stall the event loop for as long as a large
+resume takes. This module keeps one `ProcessPoolExecutor` per service process:
+
+  - ``await run(fn, *args, size=...)`` from async code (resume capture, web routes)
+  - ``call(fn, *args, size=...)`` from sync code (candidate store, worker threads)
+
+Jobs whose `size` hint (characters) is below ``min_chars`` run inline: for those the
+pickling round trip costs more than the work. At most ``max_pending`` jobs are
+submitted at a time; further callers wait for a slot (async callers poll, so the
+loop keeps running). Workers are spawned rather than forked (the service process
+runs Playwright and gRPC threads) and `start` warms all of them at service startup,
+so the first large resume does not pay for interpreter start-up. A broken pool is
+dropped (the next job creates a new one) and the job runs inline instead.
+
+Job functions must be module-level functions of modules that are cheap to import:
+workers import them by name (`WARM_MODULES` are imported when a worker starts).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from .config import get_cpu_pool_config
+from .global_logger import logger
+
+T = TypeVar("T")
+
+WARM_MODULES = ("src.text_normalize", "src.conversation_sync")
+
+_SLOT_POLL_SECONDS = 0.01
+_LOCK = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_in_worker = False
+
+
+def _config() -> Dict[str, Any]:
+    config = get_cpu_pool_config()
+    return {
+        "enabled": config.get("enabled", True),
+        "workers": config.get("workers") or max(1, min(4, (os.cpu_count() or 2) - 1)),
+        "max_pending": config.get("max_pending") or 32,
+        "min_chars": config.get("min_chars", 20000),
+    }
+
+
+def _init_worker(modules: Tuple[str, ...]) -> None:
+    global _in_worker
+    _in_worker = True  # jobs never start a nested pool
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _worker_pid(_: int) -> int:
+    return os.getpid()
+
+
+def _get_executor() -> Tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _executor, _slots
+    with _LOCK:
+        if _executor is None:
+            config = _config()
+            _executor = ProcessPoolExecutor(
+                max_workers=config["workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(WARM_MODULES,),
+            )
+            _slots = threading.BoundedSemaphore(config["max_pending"])
+            logger.debug("CPU 进程池已创建: workers=%s, max_pending=%s", config["workers"], config["max_pending"])
+        return _executor, _slots
+
+
+def _discard(executor: ProcessPoolExecutor, exc: BaseException) -> None:
+    global _executor
+    logger.warning("CPU 进程池不可用，改为本进程执行（下次任务重建进程池）: %s", exc)
+    with _LOCK:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(
+    executor: ProcessPoolExecutor,
+    slots: threading.BoundedSemaphore,
+    fn: Callable[..., T],
+    args: tuple,
+    kwargs: dict,
+) -> Future:
+    # the slot is already held; it is released when the job finishes or is cancelled
+    try:
+        future = executor.submit(fn, *args, **kwargs)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def offloaded(size: Optional[int] = None) -> bool:
+    """Whether a job of `size` characters (None: always large enough) goes to the pool."""
+    if _in_worker:
+        return False
+    config = _config()
+    return bool(config["enabled"]) and (size is None or size >= config["min_chars"])
+
+
+def submit(fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+    """Submit ``fn(*args, **kwargs)`` to the pool, blocking while `max_pending` jobs are in flight."""
+    executor, slots = _get_executor()
+    slots.acquire()
+    return _submit(executor, slots, fn, args, kwargs)
+
+
+def call(fn: Callable[..., T], *args: Any, size: Optional[int] = None, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` in the pool and wait for the result (inline when small or disabled).
+
+    Blocks the calling thread without holding the GIL, so use it from sync code that
+    already runs off the event loop (``asyncio.to_thread``); async code uses `run`.
+    """
+    if not offloaded(size):
+        return fn(*args, **kwargs)
+    executor, slots = _get_executor()
+    try:
+        slots.acquire()
+        return _submit(executor, slots, fn, args, kwargs).result()
+    except BrokenProcessPool as exc:
+        _discard(executor, exc)
+    return fn(*args, **kwargs)
+
+
+async def run(fn: Callable[..., T], *args: Any, size: Optional[int] = None, **kwargs: Any) -> T:
+    """Await ``fn(*args, **kwargs)`` from the pool (inline when small or disabled).
+
+    Args:
+        fn: Module-level function of an import-light module
+        size: Job size in characters; below ``min_chars`` the job runs inline
+    """
+    if not offloaded(size):
+        return fn(*args, **kwargs)
+    executor, slots = _get_executor()
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_SECONDS)
+    try:
+        return await asyncio.wrap_future(_submit(executor, slots, fn, args, kwargs))
+    except BrokenProcessPool as exc:
+        _discard(executor, exc)
+    return fn(*args, **kwargs)
+
+
+def start() -> int:
+    """Create the pool and spawn every worker; returns how many answered (0 when disabled or failed)."""
+    config = _config()
+    if not config["enabled"]:
+        return 0
+    executor, _ = _get_executor()
+    try:
+        # submitted together, the jobs make the executor spawn every worker
+        pids = set(executor.map(_worker_pid, range(config["workers"])))
+    except Exception as exc:  # noqa: BLE001
+        _discard(executor, exc)
+        return 0
+    logger.info("CPU 进程池已预热: %s 个 worker", len(pids))
+    return len(pids)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop the workers (a later job creates a new pool)."""
+    global _executor
+    with _LOCK:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+        logger.debug("CPU 进程池已关闭")
+
+
+__all__ = [
+    "WARM_MODULES",
+    "offloaded",
+    "submit",
+    "call",
+    "run",
+    "start",
+    "shutdown",
+]
@@ -1,6 +1,9 @@
 """Zilliz/Milvus-backed job profile store integration."""
 from functools import lru_cache
+import copy
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from pymilvus import DataType, FieldSchema, CollectionSchema
@@ -21,6 +24,8 @@ def get_job_collection_schema() -> list[FieldSchema]:
     fields: list[FieldSchema] = [
     # Primary key
     FieldSchema(name="job_id", dtype=DataType.VARCHAR, max_length=64, is_primary=True),
+    # job_id without the _vN suffix (INVERTED index: exact version-history lookups)
+    FieldSchema(name="base_job_id", dtype=DataType.VARCHAR, max_length=64, nullable=True),
     
     # Job content fields
     FieldSchema(name="position", dtype=DataType.VARCHAR, max_length=200),
@@ -39,7 +44,7 @@ def get_job_collection_schema() -> list[FieldSchema]:
     FieldSchema(name="job_embedding", dtype=DataType.FLOAT_VECTOR, dim=_job_store_config["embedding_dim"]),
     
     # Versioning fields
-    FieldSchema(name="version", dtype=DataType.INT64),
+    FieldSchema(name="version", dtype=DataType.INT64),  # STL_SORT index
     FieldSchema(name="current", dtype=DataType.BOOL),
     
     # Timestamps
@@ -104,6 +109,28 @@ def get_base_job_id(job_id: str) -> str:
     return re.sub(r'_v\d+$', '', job_id)
 
 
+def _is_version_of(job_id: str, base_job_id: str) -> bool:
+    """Whether `job_id` is a versioned id (``<base>_vN``) of `base_job_id`."""
+    return bool(re.match(rf'^{re.escape(base_job_id)}_v\d+$', job_id or ""))
+
+
+def _versions_filter(base_job_id: str) -> str:
+    """Milvus filter selecting every version of a job.
+    
+    Uses the indexed `base_job_id` field; collections that were not migrated yet fall
+    back to a lexicographic range over the primary key (post-filter with `_is_version_of`).
+    """
+    if "base_job_id" in _get_existing_field_names():
+        return f'base_job_id == "{base_job_id}"'
+    return f'job_id >= "{base_job_id}_v" and job_id < "{base_job_id}_w"'
+
+
+def _with_base_job_id(data: Dict[str, Any], base_job_id: str) -> Dict[str, Any]:
+    if "base_job_id" in _get_existing_field_names():
+        data["base_job_id"] = base_job_id
+    return data
+
+
 def _build_job_data(job_data: Dict[str, Any], current_job: Optional[Dict[str, Any]] = None, 
                     version: int = 1, created_at: Optional[str] = None) -> Dict[str, Any]:
     """Build job data dictionary from job_data with optional fallback to current_job.
@@ -251,6 +278,8 @@ def create_job_collection(collection_name: Optional[str] = None) -> bool:
         logger.info("Creating scalar indexes...")
         _client.create_index(collection_name=collection_name, field_name="job_id", index_type="INVERTED")
         _client.create_index(collection_name=collection_name, field_name="position", index_type="INVERTED")
+        _client.create_index(collection_name=collection_name, field_name="base_job_id", index_type="INVERTED")
+        _client.create_index(collection_name=collection_name, field_name="version", index_type="STL_SORT")
         
         logger.info(f"✅ Collection {collection_name} created successfully")
         return True
@@ -260,44 +289,122 @@ def create_job_collection(collection_name: Optional[str] = None) -> bool:
         return False
 
 # ------------------------------------------------------------------
-# Job Operations
+# In-process job catalog
 # ------------------------------------------------------------------
+# All current job versions are loaded once and indexed by base id, versioned id and
+# position. Writes through this module invalidate the catalog; changes made by other
+# processes are picked up when it expires (zilliz.job_catalog_ttl_seconds). Each
+# invalidation bumps the generation, so a load that overlapped a write is not cached.
+_CATALOG_TTL_SECONDS = float(_job_store_config.get("job_catalog_ttl_seconds") or 60)
+_catalog_lock = threading.Lock()
+_generation_lock = threading.Lock()
+_catalog: Optional[Dict[str, Any]] = None
+_catalog_generation = 0
 
-def get_all_jobs() -> List[Dict[str, Any]]:
-    """Get all jobs from the collection (only current versions).
-    
-    Returns jobs with base job_id extracted (version suffix removed) for display.
-    Jobs are sorted by updated_at in descending order (most recently updated first).
-    """
-    # Query only current versions
+
+def _clean_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in job.items() if v or v == 0}
+
+
+def _load_catalog() -> Dict[str, Any]:
+    # Strong consistency so a reload right after a write sees that write
     results = _client.query(
         collection_name=_collection_name,
         filter='current == true',
         output_fields=_get_readable_fields(),
-        limit=1000  # Reasonable limit
+        limit=1000,  # Reasonable limit
+        consistency_level="Strong",
     )
-    
-    # Remove empty fields and extract base job_id for display
     jobs = []
     for job in results:
-        job_dict = {k: v for k, v in job.items() if v or v == 0}
+        job_dict = _clean_job(job)
         # Extract base job_id for display (remove _vN suffix)
         if "job_id" in job_dict:
             job_dict["base_job_id"] = get_base_job_id(job_dict["job_id"])
         jobs.append(job_dict)
-    
     # Sort by updated_at in descending order (most recent first)
     jobs.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    by_base: Dict[str, Dict[str, Any]] = {}
+    by_position: Dict[str, Dict[str, Any]] = {}
+    for job in jobs:
+        by_base.setdefault(job.get("base_job_id", ""), job)
+        by_position.setdefault(job.get("position", ""), job)  # most recently updated wins
+    return {
+        "jobs": jobs,
+        "by_base": by_base,
+        "by_versioned": {job["job_id"]: job for job in jobs if job.get("job_id")},
+        "by_position": by_position,
+        "loaded_at": time.monotonic(),
+    }
+
+
+def _get_catalog() -> Dict[str, Any]:
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - catalog["loaded_at"] <= _CATALOG_TTL_SECONDS:
+        return catalog
+    with _catalog_lock:
+        catalog = _catalog
+        if catalog is None or time.monotonic() - catalog["loaded_at"] > _CATALOG_TTL_SECONDS:
+            generation = _catalog_generation
+            catalog = _load_catalog()
+            with _generation_lock:
+                if generation == _catalog_generation:
+                    _catalog = catalog
+            logger.debug("Loaded job catalog: %d current jobs", len(catalog["jobs"]))
+    return catalog
+
+
+def invalidate_job_catalog() -> None:
+    """Drop the cached job catalog; the next lookup reloads it from Milvus."""
+    global _catalog, _catalog_generation
+    with _generation_lock:
+        _catalog_generation += 1
+        _catalog = None
+
+
+# ------------------------------------------------------------------
+# Job Operations
+# ------------------------------------------------------------------
+
+def get_all_jobs() -> List[Dict[str, Any]]:
+    """Get all jobs from the collection (only current versions).
     
-    logger.debug("Retrieved %d current jobs from collection (sorted by updated_at)", len(jobs))
+    Returns jobs with base job_id extracted (version suffix removed) for display.
+    Jobs are sorted by updated_at in descending order (most recently updated first).
+    Served from the in-process job catalog.
+    """
+    jobs = copy.deepcopy(_get_catalog()["jobs"])
+    logger.debug("Retrieved %d current jobs from catalog (sorted by updated_at)", len(jobs))
     return jobs
-            
+
+
+def _query_current_job(base_job_id: str) -> Optional[Dict[str, Any]]:
+    """Query Milvus for the current version of a base job_id (bypasses the catalog)."""
+    results = _client.query(
+        collection_name=_collection_name,
+        filter=f'{_versions_filter(base_job_id)} and current == true',
+        output_fields=_get_readable_fields(),
+        limit=100
+    )
+    
+    # Get the first exact match (should be only one current version)
+    for job in results:
+        job_dict = _clean_job(job)
+        if _is_version_of(job_dict.get("job_id", ""), base_job_id):
+            return job_dict
+    
+    return None
+
 
 def get_job_by_id(job_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific job by ID (returns current version).
     
     If job_id has a version suffix, extracts base_job_id and returns current version.
     If job_id is base (no suffix), returns current version directly.
+    Looked up in the job catalog; on a miss Milvus is queried (the job may have been
+    created by another process since the catalog was loaded).
     
     Args:
         job_id: Job ID (can be base_job_id or versioned job_id)
@@ -311,25 +418,22 @@ def get_job_by_id(job_id: str) -> Optional[Dict[str, Any]]:
         
     # Extract base job_id (remove _vN suffix if present)
     base_job_id = get_base_job_id(job_id)
-    
-    # Query current version for this base job_id
-    # We need to find the job where job_id starts with base_job_id_v and current=True
-    results = _client.query(
-        collection_name=_collection_name,
-        filter=f'job_id >= "{base_job_id}_v" and job_id < "{base_job_id}_w" and current == true',
-        output_fields=_get_readable_fields(),
-        limit=100
-    )
-    
-    # Filter to exact matches and get the first one (should be only one current version)
-    for job in results:
-        job_dict = {k: v for k, v in job.items() if v or v == 0}
-        job_id_value = job_dict.get("job_id", "")
-        # Verify it matches the pattern
-        if job_id_value.startswith(f"{base_job_id}_v") and re.match(rf'^{re.escape(base_job_id)}_v\d+$', job_id_value):
-            return job_dict
-    
-    return None
+    job = _get_catalog()["by_base"].get(base_job_id)
+    if job is not None:
+        return copy.deepcopy(job)
+
+    job = _query_current_job(base_job_id)
+    if job is not None:
+        invalidate_job_catalog()
+    return job
+
+
+def get_job_by_position(position: str) -> Optional[Dict[str, Any]]:
+    """Get the current job whose position title matches exactly (e.g. a candidate's `job_applied`)."""
+    if not position:
+        return None
+    job = _get_catalog()["by_position"].get(position)
+    return copy.deepcopy(job) if job is not None else None
 
 
 def get_job_by_versioned_id(versioned_job_id: str) -> Optional[Dict[str, Any]]:
@@ -337,6 +441,9 @@ def get_job_by_versioned_id(versioned_job_id: str) -> Optional[Dict[str, Any]]:
     versioned_job_id = (versioned_job_id or "").strip()
     if not versioned_job_id:
         return None
+    job = _get_catalog()["by_versioned"].get(versioned_job_id)
+    if job is not None:
+        return copy.deepcopy(job)
     try:
         results = _client.query(
             collection_name=_collection_name,
@@ -375,9 +482,11 @@ def insert_job(**job_data) -> bool:
     # Build job data using helper function (no current_job for new inserts)
     insert_data = _build_job_data(job_data, current_job=None, version=1)
     insert_data["job_id"] = versioned_job_id
+    _with_base_job_id(insert_data, base_job_id)
         
     # Insert data
     _client.insert(collection_name=_collection_name, data=[insert_data])
+    invalidate_job_catalog()
         
     logger.debug("Successfully inserted job: %s (version 1)", versioned_job_id)
     return True
@@ -402,7 +511,7 @@ def update_job_status(job_id: str, status: str, metadata: Optional[Dict[str, Any
     base_job_id = get_base_job_id(job_id)
     
     # Get current job (where current=True)
-    current_job = get_job_by_id(base_job_id)
+    current_job = _query_current_job(base_job_id)
     if not current_job:
         logger.warning("Job %s not found for status update", base_job_id)
         return False
@@ -443,6 +552,7 @@ def update_job_status(job_id: str, status: str, metadata: Optional[Dict[str, Any
         data=[update_data],
         partial_update=True,
     )
+    invalidate_job_catalog()
     
     logger.debug("Successfully updated job status: %s -> %s", old_job_id, status)
     return old_job_id
@@ -471,7 +581,7 @@ def update_job(job_id: str, **job_data) -> Optional[str]:
     base_job_id = get_base_job_id(job_id)
     
     # Get current job (where current=True)
-    current_job = get_job_by_id(base_job_id)
+    current_job = _query_current_job(base_job_id)
     if not current_job:
         logger.warning("Job %s not found for update", base_job_id)
         return False
@@ -515,9 +625,11 @@ def update_job(job_id: str, **job_data) -> Optional[str]:
     # Build new version data using helper function (with current_job for fallback)
     new_version_data = _build_job_data(job_data, current_job=current_job, version=next_version)
     new_version_data["job_id"] = new_versioned_job_id
+    _with_base_job_id(new_version_data, base_job_id)
         
     # Insert new version
     _client.insert(collection_name=_collection_name, data=[new_version_data])
+    invalidate_job_catalog()
     
     logger.debug("Successfully updated job: %s (created version %d)", new_versioned_job_id, next_version)
     return new_versioned_job_id
@@ -532,19 +644,18 @@ def get_job_versions(base_job_id: str) -> List[Dict[str, Any]]:
         List of all versions sorted by created_at DESC (latest first)
     """
     
-    # Query all records where job_id starts with base_job_id_v
     results = _client.query(
         collection_name=_collection_name,
-        filter=f'job_id >= "{base_job_id}_v" and job_id < "{base_job_id}_w"',  # String range query
+        filter=_versions_filter(base_job_id),
         output_fields=_get_readable_fields(),
         limit=1000
     )
     
-    # Filter to only exact matches (job_id starts with base_job_id_v followed by digits)
+    # Filter to only exact matches (job_id is base_job_id_v followed by digits)
     versions = [
-        {k: v for k, v in job.items() if v or v == 0}
+        _clean_job(job)
         for job in results
-        if job.get("job_id", "").startswith(f"{base_job_id}_v") and re.match(rf'^{re.escape(base_job_id)}_v\d+$', job.get("job_id", ""))
+        if _is_version_of(job.get("job_id", ""), base_job_id)
     ]
     
     # Sort by created_at DESC (latest first)
@@ -582,7 +693,7 @@ def switch_job_version(base_job_id: str, version: int) -> bool:
     # Query all versions to get position fields
     results = _client.query(
         collection_name=_collection_name,
-        filter=f'job_id >= "{base_job_id}_v" and job_id < "{base_job_id}_w"',
+        filter=_versions_filter(base_job_id),
         output_fields=['job_id', 'position', 'current'],
         limit=1000
     )
@@ -621,7 +732,9 @@ def switch_job_version(base_job_id: str, version: int) -> bool:
             )
         else:
             logger.warning("Could not find position for job %s", target_job_id)
+            invalidate_job_catalog()
             return False
+    invalidate_job_catalog()
     
     logger.debug("Switched job %s to version %d", base_job_id, version)
     return True
@@ -640,6 +753,7 @@ def delete_job_version(base_job_id: str, version: int) -> bool:
     
     versioned_job_id = f"{base_job_id}_v{version}"
     _client.delete(collection_name=_collection_name, filter=f'job_id == "{versioned_job_id}"')
+    invalidate_job_catalog()
     
     logger.debug("Successfully deleted job version: %s", versioned_job_id)
     return True
@@ -664,6 +778,7 @@ def delete_job(job_id: str) -> bool:
         versioned_job_id = v.get("job_id")
         if versioned_job_id:
             _client.delete(collection_name=_collection_name, filter=f'job_id == "{versioned_job_id}"')
+    invalidate_job_catalog()
     
     logger.debug("Successfully deleted job: %s (all versions)", base_job_id)
     return True
@@ -32,6 +32,16 @@ INIT_CHAT_PROMPT_PREFIX = """你是星尘数据的招聘顾问，正在 Boss 直
 """
 
 
+COMPACT_HISTORY_PROMPT = """你是招聘顾问的助理，负责把与候选人的早期沟通记录压缩成一段内部摘要，供后续对话继续使用。
+
+要求：
+- 如提供了【已有摘要】，将其与新的早期对话合并为一份完整摘要，不要丢失已有摘要中的事实。
+- 保留：候选人已回答的关键信息（经验细节、项目、技术栈、意向、顾虑、求职状态）、已经问过的问题、双方的约定与承诺、候选人明确拒绝或不感兴趣的点。
+- 删除：寒暄、重复内容、系统/UI 提示。
+- 只陈述事实，不做评价与打分；使用中文条目列表，不超过 500 字；不要输出 JSON 或 markdown 标题。
+"""
+
+
 # def build_init_chat_prompt(job_info: dict[str, Any]) -> str:
 #     """Build init_chat() developer prompt with an embedded job portrait JSON."""
 
@@ -0,0 +1,100 @@
+"""Stale-while-revalidate cache for expensive JSON endpoints (e.g. `/stats`).
+
+- Fresh entry (younger than ``ttl_seconds``): served as is.
+- Stale entry: served immediately while one background task recomputes it.
+- No entry yet: the caller waits for the computation.
+
+Concurrent callers always share a single in-flight computation. Every entry carries
+an ETag (hash of the serialized body) so clients can send ``If-None-Match`` and
+receive ``304 Not Modified`` when nothing changed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from .global_logger import logger
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    computed_at: float  # time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.computed_at
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an ``If-None-Match`` header value already names this entry."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+def make_response(payload: Any) -> CachedResponse:
+    """Serialize a payload and compute its ETag."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+    return CachedResponse(body=body, etag=etag, computed_at=time.monotonic())
+
+
+class StaleWhileRevalidateCache:
+    """Single-entry SWR cache around an async payload factory.
+
+    Args:
+        compute: Coroutine function returning the JSON-serializable payload
+        ttl_seconds: Age after which the entry is refreshed in the background
+        name: Used in log messages
+    """
+
+    def __init__(self, compute: Callable[[], Awaitable[Any]], ttl_seconds: float, name: str = "response") -> None:
+        self._compute = compute
+        self._ttl = float(ttl_seconds)
+        self._name = name
+        self._entry: Optional[CachedResponse] = None
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def get(self) -> CachedResponse:
+        entry = self._entry
+        if entry is None:
+            return await asyncio.shield(self._refresh())
+        if entry.age() > self._ttl:
+            self._refresh()  # background: serve the stale entry right away
+        return entry
+
+    def invalidate(self) -> None:
+        """Drop the entry; the next `get` waits for a fresh computation."""
+        self._entry = None
+
+    def _refresh(self) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._run())
+        return self._inflight
+
+    async def _run(self) -> CachedResponse:
+        started = time.monotonic()
+        try:
+            entry = make_response(await self._compute())
+        except Exception as exc:
+            if self._entry is None:
+                raise
+            # keep serving the stale entry; the next request retries
+            logger.warning("Refreshing cached %s failed, serving stale data: %s", self._name, exc)
+            return self._entry
+        self._entry = entry
+        logger.debug("Cached %s refreshed in %.2fs", self._name, time.monotonic() - started)
+        return entry
+
+
+__all__ = [
+    "CachedResponse",
+    "StaleWhileRevalidateCache",
+    "make_response",
+]
@@ -13,12 +13,14 @@ Steps (in order):
 
 This module is intentionally verbose and defensive.
 """
-import re, json
+import json
 import time
 from textwrap import dedent
 from typing import Any, Dict, Optional, TYPE_CHECKING
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from .text_normalize import collapse_line_breaks
+
 if TYPE_CHECKING:
     from playwright.sync_api import Frame
 
@@ -1427,7 +1429,7 @@ def extract_pdf_viewer_text(frame: 'Frame') -> Dict[str, Any]:
     except Exception:
         pages = []
         fallback = frame.evaluate("() => document.body.innerText || ''")
-        fallback = clean_resume_text(fallback)
+        fallback = collapse_line_breaks(fallback)
         return {'pages': [], 'text': fallback}
 
     if isinstance(pages, dict):
@@ -1443,17 +1445,5 @@ def extract_pdf_viewer_text(frame: 'Frame') -> Dict[str, Any]:
                 combined.append(line)
 
 
-    cleaned_text = clean_resume_text('\n'.join(combined))
+    cleaned_text = collapse_line_breaks('\n'.join(combined))
     return {'pages': pages, 'text': cleaned_text}
-
-
-def clean_resume_text(text: str) -> str:
-    # Replace triple or more newlines with a unique marker to preserve them
-    text = re.sub(r'\n{3,}', '<TRIPLE_NL>', text)
-    # Replace double newlines and single newlines with nothing (collapse)
-    text = re.sub(r'\n{2,}', '', text)
-    text = re.sub(r'\n\s\n', '', text)
-    text = re.sub(r'\n', '', text)
-    # Restore triple newlines
-    text = text.replace('<TRIPLE_NL>', '\n\n')
-    return text
@@ -6,7 +6,6 @@ fallbacks, etc.) behaves the same when running with the async Playwright API.
 """
 
 import asyncio
-import re
 from textwrap import dedent
 from typing import Any, Dict, List, Optional
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -19,6 +18,8 @@ from playwright.async_api import (
 )
 
 from .global_logger import logger
+from . import cpu_pool
+from .text_normalize import clean_resume_text
 
 INLINE_RESUME_SELECTORS = [
     "div.resume-box",
@@ -1250,36 +1251,103 @@ async def _process_resume_entry(page: Page, context_info: Dict[str, Any], logger
     return {"success": False, "details": "未知的简历模式"}
 
 
+# One pass over every PDF.js text layer: positioned spans as [top, left, text] (inline
+# `top:/left: <n>px` styles), plus the layer's bare text for layers without positions
+_TEXT_LAYER_SCRIPT = dedent(
+    r"""
+    () => Array.from(document.querySelectorAll('div.textLayer')).map(layer => {
+      const items = [];
+      for (const span of layer.querySelectorAll('span')) {
+        const style = span.getAttribute('style') || '';
+        const top = /top:\s*([\d.]+)px/.exec(style);
+        const left = /left:\s*([\d.]+)px/.exec(style);
+        const text = (span.textContent || '').trim();
+        if (top && left && text) {
+          items.push([parseFloat(top[1]), parseFloat(left[1]), text]);
+        }
+      }
+      if (items.length) {
+        return { items, text: '' };
+      }
+      const parts = [];
+      const walker = document.createTreeWalker(layer, NodeFilter.SHOW_TEXT);
+      while (walker.nextNode()) {
+        const part = walker.currentNode.nodeValue.trim();
+        if (part) parts.push(part);
+      }
+      return { items, text: parts.join('') };
+    })
+    """
+).strip()
+# The text layer is used as is (skipping the PDF.js text-content and innerText passes)
+# when it is long enough and not garbled into one-glyph lines
+_TEXT_LAYER_MIN_CHARS = 200
+_TEXT_LAYER_MIN_LINE_CHARS = 6
+_LINE_TOLERANCE_PX = 5
+
+
+def assemble_text_layer_lines(items: List[Any]) -> str:
+    """Join text-layer spans ``(top, left, text)`` into lines, top to bottom then left to right.
+
+    Spans whose top is within `_LINE_TOLERANCE_PX` of the line's first span belong to that
+    line; each line is then ordered by left, so baseline jitter does not reorder its spans.
+    """
+    lines: List[List[Any]] = []
+    current_y = None
+    for item in sorted(items, key=lambda item: (item[0], item[1])):
+        if current_y is None or abs(item[0] - current_y) > _LINE_TOLERANCE_PX:
+            lines.append([])
+            current_y = item[0]
+        lines[-1].append(item)
+    return "\n".join("".join(text for _, _, text in sorted(line, key=lambda item: item[1])) for line in lines)
+
+
+def text_layer_usable(text: str) -> bool:
+    """Whether text-layer output is good enough to skip the fallback extractions."""
+    lines = [line for line in text.split("\n") if line.strip()]
+    return (
+        len(text) >= _TEXT_LAYER_MIN_CHARS
+        and sum(len(line) for line in lines) / len(lines) >= _TEXT_LAYER_MIN_LINE_CHARS
+    )
+
+
 async def extract_pdf_viewer_text(frame: Frame) -> Dict[str, Any]:
-    # use inner_html to extract text
+    """Text of the PDF.js viewer in `frame`.
+
+    The rendered text layers are read in a single evaluate and assembled here; only
+    when that text fails `text_layer_usable` are the PDF.js text content and the
+    page innerText extracted as well, and the best of the three (`rate_text`) is used.
+    """
+    layer_text = ""
     try:
-        text_list = []
-        pdf_text_layer = frame.locator("div.textLayer")
-        await pdf_text_layer.first.wait_for(state="visible", timeout=5000)
-        for page in await pdf_text_layer.all():
-            html = await page.inner_html()
-            text = extract_text_from_pdfjs_html(html)
-            text_list.append(text)
-        bs_text = "\n".join(text_list)
-        bs_text = clean_resume_text(bs_text)
+        await frame.locator("div.textLayer").first.wait_for(state="visible", timeout=5000)
+        layers = await frame.evaluate(_TEXT_LAYER_SCRIPT)
+        layer_text = "\n".join(
+            assemble_text_layer_lines(layer["items"]) if layer.get("items") else layer.get("text") or ""
+            for layer in layers or []
+        )
+        layer_text = await cpu_pool.run(clean_resume_text, layer_text, size=len(layer_text))
     except Exception as e:
-        logger.error(f"提取PDF文本失败: {e}\n {bs_text}")
+        logger.error(f"提取PDF文本失败: {e}")
+    if text_layer_usable(layer_text):
+        logger.debug(f"PDF文本层提取成功，跳过备用提取 (length: {len(layer_text)})")
+        return {"pages": [], "text": layer_text}
 
     # use evaluate to extract text
     js_text = await extract_text_from_js(frame)
 
     # fallback to inner_text
     DOM_text = await frame.evaluate("() => document.body ? document.body.innerText || '' : ''")
-    DOM_text = clean_resume_text(DOM_text)
+    DOM_text = await cpu_pool.run(clean_resume_text, DOM_text, size=len(DOM_text))
     if len(DOM_text) < 100:
         logger.error(f"fallback to inner_text文本长度小于100: {DOM_text}")
     
     # Calculate average total length for normalization
-    avg_total_length = len(bs_text) + len(js_text) + len(DOM_text) / 3
+    avg_total_length = len(layer_text) + len(js_text) + len(DOM_text) / 3
     
     # Select best text version using simple rating function
     candidates = [
-        ("bs_text", bs_text, rate_text(bs_text, avg_total_length)),
+        ("layer_text", layer_text, rate_text(layer_text, avg_total_length)),
         ("js_text", js_text, rate_text(js_text, avg_total_length)),
         ("DOM_text", DOM_text, rate_text(DOM_text, avg_total_length)),
     ]
@@ -1308,79 +1376,6 @@ def rate_text(text: str, avg_total_length: int) -> float:
     return rating
 
 
-def clean_resume_text(text: str) -> str:
-    """Clean resume text by removing control characters, BOSS tokens, and normalizing formatting.
-    This function:
-    - Removes null bytes and control characters (PRESERVES newlines and tabs)
-    - Removes BOSS-style hashed tokens (e.g., "07ab71446862f8541Xx629-5F1RQxY6-VfmXWOGkl_7RPhFl3g~~")
-    - Preserves ALL newlines (single and double newlines are kept)
-    - Normalizes unicode
-    - Cleans up excessive spaces (but preserves newlines)
-    """
-    import unicodedata
-    if not text:
-        return ""
-    # Remove null bytes and control characters
-    # IMPORTANT: Preserve \n (0x0A) and \t (0x09) - exclude them from removal
-    # Remove: \x01-\x08, \x0B-\x0C, \x0E-\x1F, \x7F
-    text = text.replace('\x00', '')
-    text = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-    # Remove BOSS-style hashed tokens like f6a4b4051154ea161XJ_2tS-GFFTwYu4VvOcWOGkl_7RPhFl3g~~
-    text = re.sub(r'[A-Za-z0-9_-]{10,}~~', '', text)
-    # Normalize unicode (NFKC: compatibility decomposition + canonical composition)
-    text = unicodedata.normalize('NFKC', text)
-    # Handle empty lines with only whitespace - preserve the newline structure
-    text = re.sub(r'\n\s+\n', '\n\n', text)
-    # Collapse excessive newlines (4+) to triple newline, but keep 1-3 newlines as-is
-    text = re.sub(r'\n{4,}', '\n\n\n', text)
-    # Clean up excessive spaces within lines (2+ spaces to single space)
-    # CRITICAL: Use negative lookahead to ensure we don't touch anything near newlines
-    text = re.sub(r'[ \t]{2,}(?!\n)', ' ', text)
-    # Remove trailing spaces/tabs from lines (but keep the newlines themselves)
-    text = re.sub(r'[ \t]+\n', '\n', text)
-    return text.strip()
-
-from bs4 import BeautifulSoup
-
-def extract_text_from_pdfjs_html(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Try standard textLayer spans first
-    spans = soup.select(".textLayer span")
-    if not spans:
-        # fallback: PDF.js markedContent structure
-        spans = soup.select("span.markedContent span[role='presentation']")
-
-    items = []
-    for s in spans:
-        style = s.get("style", "")
-        m_top = re.search(r"top:\s*([\d.]+)px", style)
-        m_left = re.search(r"left:\s*([\d.]+)px", style)
-        text = s.get_text(strip=True)
-        if m_top and m_left and text:
-            items.append((float(m_top.group(1)), float(m_left.group(1)), text))
-
-    if not items:
-        # fallback to simple innerText for debugging
-        return soup.get_text(separator="", strip=True)
-
-    # Sort by vertical then horizontal position
-    items.sort(key=lambda x: (round(x[0], 1), x[1]))
-    lines = []
-    buffer, current_y = [], None
-    for y, x, t in items:
-        if current_y is None or abs(y - current_y) > 5:
-            if buffer:
-                lines.append("".join(buffer))
-            buffer = [t]
-            current_y = y
-        else:
-            buffer.append(t)
-    if buffer:
-        lines.append("".join(buffer))
-    return "\n".join(lines)
-
-
 async def extract_text_from_js(frame: Frame) -> Optional[str]:
     js_text = ""
     try:
@@ -1467,7 +1462,7 @@ async def extract_text_from_js(frame: Frame) -> Optional[str]:
             for line in page_data.get("lines", ''):
                 js_text += line + "\n"
 
-        js_text = clean_resume_text(js_text)
+        js_text = await cpu_pool.run(clean_resume_text, js_text, size=len(js_text))
         if len(js_text) < 100:
             logger.error(f"evaluate frame文本长度小于100: {js_text}")
     except Exception as e:
@@ -1483,6 +1478,8 @@ __all__ = [
     "_create_error_result",
     "_process_resume_entry",
     "extract_pdf_viewer_text",
+    "assemble_text_layer_lines",
+    "text_layer_usable",
     "collect_resume_debug_info",
     "clean_resume_text",
 ]
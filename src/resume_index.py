@@ -0,0 +1,386 @@
+"""Local inverted index for resume keyword search (`resume_contains`).
+
+Without Zilliz full-text search, keyword filters are ``LIKE '%kw%'`` scans over two
+64 KB VARCHAR fields. This index resolves a keyword to the candidate ids that can
+match; the search then runs the ``LIKE`` on those ids only (primary-key lookup), so
+results keep the exact ``LIKE`` semantics.
+
+Terms are overlapping character bigrams and trigrams of every run of CJK characters
+and of every lower-cased run of ASCII letters / digits (``.``, ``+``, ``#`` and other
+punctuation split runs: ``node.js`` -> ``node`` + ``js``). A query keyword yields the
+trigrams of each of its runs (the bigram for 2-character runs; single characters add
+nothing). Every such n-gram lies inside a single run, so any text containing the
+keyword contains them all, even when the keyword starts or ends inside a word
+(``React`` in ``React.js``, ``pyth`` in ``Python``): the ids are a superset of the
+``LIKE`` matches. ``resume_text`` and ``full_resume`` are indexed as separate
+documents, matching the ``LIKE`` on either field.
+
+Storage is a local SQLite file (like `stats_rollup_store`):
+  - ``docs``: one row per indexed field version; re-indexing a field retires its
+    previous document number instead of editing posting lists
+  - ``pending``: ``(term, docno)`` rows appended by incremental updates
+  - ``postings``: per-term sorted document numbers, delta-encoded and zlib-compressed;
+    `compact` merges ``pending`` into them and drops retired documents
+
+Updates come from `upsert_candidate` (`index_candidate`) and from `sync_resume_index`,
+which pulls candidates changed since a ``updated_at`` watermark (like the snapshot).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from datetime import datetime
+from itertools import accumulate, groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .config import get_resume_index_config, resolve_repo_path
+from .global_logger import logger
+
+INDEXED_FIELDS = ("resume_text", "full_resume")
+SYNC_FIELDS = ["candidate_id", *INDEXED_FIELDS, "updated_at"]
+
+_CJK_RUN = re.compile(r"[㐀-䶿一-鿿]+")
+_LATIN_RUN = re.compile(r"[a-z0-9]+")
+# Stored in index_meta; an index built with other terms is rebuilt by the next sync
+INDEX_VERSION = "2"
+_BATCH_ROWS = 500
+_SQL_VARS = 900  # stay below SQLite's bound-parameter limit
+
+_INDEX_PATH = resolve_repo_path(get_resume_index_config().get("path") or "data/resume_index.sqlite3")
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    docno INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    live INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_docs_candidate ON docs(candidate_id, field, live);
+CREATE TABLE IF NOT EXISTS pending (
+    term TEXT NOT NULL,
+    docno INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pending_term ON pending(term);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT PRIMARY KEY,
+    ids BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(_INDEX_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+    return _conn
+
+
+# ------------------------------------------------------------------
+# Tokenization and posting encoding
+# ------------------------------------------------------------------
+def _ngrams(run: str, n: int) -> List[str]:
+    return [run[i:i + n] for i in range(len(run) - n + 1)]
+
+
+def _runs(text: str) -> List[str]:
+    text = (text or "").lower()
+    return _CJK_RUN.findall(text) + _LATIN_RUN.findall(text)
+
+
+def index_terms(text: str) -> Set[str]:
+    """Distinct terms of a document: bigrams + trigrams of its CJK and Latin runs."""
+    terms: Set[str] = set()
+    for run in _runs(text):
+        terms.update(_ngrams(run, 2))
+        terms.update(_ngrams(run, 3))
+    return terms
+
+
+def query_terms(keyword: str) -> Optional[Set[str]]:
+    """Terms every document containing `keyword` has; None if the index cannot narrow it.
+
+    Single characters are not indexed, so keywords made only of 1-character runs
+    (``C``, ``C++``, ``法``) fall back to LIKE.
+    """
+    terms: Set[str] = set()
+    for run in _runs(keyword):
+        if len(run) >= 2:
+            terms.update(_ngrams(run, 3) if len(run) > 2 else [run])
+    return terms or None
+
+
+def encode_postings(docnos: Iterable[int]) -> bytes:
+    """Sorted document numbers -> zlib-compressed uint32 deltas."""
+    ids = sorted(set(docnos))
+    deltas = array("I", (b - a for a, b in zip([0] + ids, ids)))
+    return zlib.compress(deltas.tobytes())
+
+
+def decode_postings(blob: Optional[bytes]) -> List[int]:
+    if not blob:
+        return []
+    deltas = array("I")
+    deltas.frombytes(zlib.decompress(blob))
+    return list(accumulate(deltas))
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------------------------
+# Updates
+# ------------------------------------------------------------------
+def _index_fields(conn: sqlite3.Connection, candidate_id: str, fields: Dict[str, Any]) -> int:
+    """(Re-)index the given fields of one candidate; returns the number of new documents."""
+    added = 0
+    for field in INDEXED_FIELDS:
+        if field not in fields:
+            continue
+        text = str(fields.get(field) or "")
+        digest = _digest(text)
+        current = conn.execute(
+            "SELECT docno, digest FROM docs WHERE candidate_id = ? AND field = ? AND live = 1", (candidate_id, field)
+        ).fetchone()
+        if current and current[1] == digest:
+            continue
+        if current:
+            conn.execute("UPDATE docs SET live = 0 WHERE docno = ?", (current[0],))
+        if not text.strip():
+            continue
+        docno = conn.execute(
+            "INSERT INTO docs (candidate_id, field, digest) VALUES (?, ?, ?)", (candidate_id, field, digest)
+        ).lastrowid
+        conn.executemany("INSERT INTO pending (term, docno) VALUES (?, ?)", ((t, docno) for t in index_terms(text)))
+        added += 1
+    return added
+
+
+def index_candidate(candidate_id: str, fields: Dict[str, Any]) -> None:
+    """Index the resume fields present in a just-written candidate (no-op when disabled).
+
+    Called from `upsert_candidate`; unchanged texts are skipped by digest.
+    """
+    if not candidate_id or not is_enabled() or not any(f in fields for f in INDEXED_FIELDS):
+        return
+    try:
+        with _LOCK:
+            conn = _connect()
+            with conn:
+                _index_fields(conn, candidate_id, fields)
+    except Exception as exc:  # noqa: BLE001 - the index must never break candidate writes
+        logger.warning("Failed to update resume index for %s: %s", candidate_id, exc)
+
+
+def compact(full: bool = False) -> Dict[str, int]:
+    """Merge pending rows into the compressed posting lists.
+
+    Args:
+        full: Also rewrite posting lists without pending rows, so that every retired
+            document can be dropped from `docs`
+
+    Returns:
+        Dict with the number of ``terms`` rewritten and ``pending`` rows merged
+    """
+    with _LOCK:
+        conn = _connect()
+        retired = {row[0] for row in conn.execute("SELECT docno FROM docs WHERE live = 0")}
+        merged = rewritten = 0
+        with conn:
+            writes = []
+            rows = conn.execute("SELECT term, docno FROM pending ORDER BY term")
+            for term, group in groupby(rows, key=itemgetter(0)):
+                new = [docno for _, docno in group]
+                merged += len(new)
+                blob = conn.execute("SELECT ids FROM postings WHERE term = ?", (term,)).fetchone()
+                ids = [d for d in decode_postings(blob[0] if blob else None) + new if d not in retired]
+                writes.append((term, encode_postings(ids)))
+            if full and retired:
+                pending_terms = {term for term, _ in writes}
+                for term, blob in conn.execute("SELECT term, ids FROM postings").fetchall():
+                    if term not in pending_terms:
+                        writes.append((term, encode_postings(d for d in decode_postings(blob) if d not in retired)))
+            empty = encode_postings([])
+            conn.executemany("INSERT OR REPLACE INTO postings (term, ids) VALUES (?, ?)", writes)
+            conn.execute("DELETE FROM postings WHERE ids = ?", (empty,))
+            conn.execute("DELETE FROM pending")
+            if full:
+                conn.execute("DELETE FROM docs WHERE live = 0")
+            rewritten = len(writes)
+    logger.info("简历索引合并完成: %s 个词项, %s 条增量", rewritten, merged)
+    return {"terms": rewritten, "pending": merged}
+
+
+def sync_resume_index(full: bool = False, source: Optional[Callable[..., Iterable[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """Index candidates changed since the stored watermark, then compact if needed.
+
+    Args:
+        full: Drop the index and rebuild it from every candidate
+        source: Row source with the `scan_candidates(fields=..., updated_from=...)` signature
+
+    Returns:
+        Dict with ``fetched`` rows, ``indexed`` documents and ``watermark``
+    """
+    if source is None:
+        from .candidate_store import scan_candidates as source
+
+    with _LOCK:
+        conn = _connect()
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != INDEX_VERSION:
+            full = True  # built with other terms (or never): rebuild
+        if full:
+            with conn:
+                for table in ("docs", "pending", "postings", "index_meta"):
+                    conn.execute(f"DELETE FROM {table}")
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'watermark'").fetchone()
+        previous = row[0] if row else None
+
+    watermark = previous or ""
+    fetched = indexed = 0
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal indexed, batch
+        with _LOCK:
+            conn = _connect()
+            with conn:
+                for cand in batch:
+                    # a missing field means it is empty in Milvus: retire its document
+                    indexed += _index_fields(conn, cand["candidate_id"], {f: cand.get(f) for f in INDEXED_FIELDS})
+        batch = []
+
+    for cand in source(fields=SYNC_FIELDS, updated_from=previous):
+        if not cand.get("candidate_id"):
+            continue
+        fetched += 1
+        watermark = max(watermark, str(cand.get("updated_at") or ""))
+        batch.append(cand)
+        if len(batch) >= _BATCH_ROWS:
+            flush()
+    flush()
+
+    with _LOCK:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+                [("watermark", watermark), ("synced_at", datetime.now().isoformat()), ("version", INDEX_VERSION)],
+            )
+        pending = conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+    if full or pending >= int(get_resume_index_config().get("compact_pending_rows") or 200000):
+        compact(full=full)
+    logger.info("简历索引同步完成: 拉取 %s 位候选人, 新增 %s 份文档, 水位 %s", fetched, indexed, watermark or "-")
+    return {"fetched": fetched, "indexed": indexed, "watermark": watermark}
+
+
+# ------------------------------------------------------------------
+# Queries
+# ------------------------------------------------------------------
+def is_enabled() -> bool:
+    return bool(get_resume_index_config().get("enabled"))
+
+
+def is_ready() -> bool:
+    """Enabled and built at least once with the current terms (a partial index would miss candidates)."""
+    if not is_enabled() or not _INDEX_PATH.exists():
+        return False
+    with _LOCK:
+        conn = _connect()
+        synced = conn.execute("SELECT 1 FROM index_meta WHERE key = 'synced_at'").fetchone() is not None
+        version = conn.execute("SELECT value FROM index_meta WHERE key = 'version'").fetchone()
+    return synced and version is not None and version[0] == INDEX_VERSION
+
+
+def _docnos(conn: sqlite3.Connection, term: str) -> Set[int]:
+    row = conn.execute("SELECT ids FROM postings WHERE term = ?", (term,)).fetchone()
+    docnos = set(decode_postings(row[0] if row else None))
+    docnos.update(r[0] for r in conn.execute("SELECT docno FROM pending WHERE term = ?", (term,)))
+    return docnos
+
+
+def search_candidate_ids(keyword: str) -> Optional[List[str]]:
+    """Candidate ids whose resume has every term of `keyword`: a superset of the LIKE matches.
+
+    Callers still apply the ``LIKE`` to these ids (n-grams ignore order, case and the
+    characters between runs).
+
+    Returns:
+        Candidate ids, most recently indexed first; None when the index is not ready or
+        cannot narrow the keyword (callers fall back to the full LIKE scan)
+    """
+    terms = query_terms(keyword)
+    if terms is None or not is_ready():
+        return None
+    with _LOCK:
+        conn = _connect()
+        # most selective terms first, stop as soon as the intersection is empty
+        matched: Optional[Set[int]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            docnos = _docnos(conn, term)
+            matched = docnos if matched is None else matched & docnos
+            if not matched:
+                return []
+        ordered = sorted(matched, reverse=True)
+        ids: Dict[str, None] = {}
+        for start in range(0, len(ordered), _SQL_VARS):
+            chunk = ordered[start:start + _SQL_VARS]
+            rows = conn.execute(
+                f"SELECT docno, candidate_id FROM docs WHERE live = 1 AND docno IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for _, candidate_id in sorted(rows, reverse=True):
+                ids.setdefault(candidate_id)
+    return list(ids)
+
+
+def index_info() -> Optional[Dict[str, Any]]:
+    """Path, document / term / pending counts, watermark and last sync; None if never built."""
+    if not _INDEX_PATH.exists():
+        return None
+    with _LOCK:
+        conn = _connect()
+        meta = dict(conn.execute("SELECT key, value FROM index_meta").fetchall())
+        if "synced_at" not in meta:
+            return None
+        return {
+            "path": str(_INDEX_PATH),
+            "documents": conn.execute("SELECT COUNT(*) FROM docs WHERE live = 1").fetchone()[0],
+            "terms": conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            "pending": conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0],
+            "watermark": meta.get("watermark") or None,
+            "synced_at": meta.get("synced_at"),
+        }
+
+
+__all__ = [
+    "INDEXED_FIELDS",
+    "index_terms",
+    "query_terms",
+    "encode_postings",
+    "decode_postings",
+    "index_candidate",
+    "compact",
+    "sync_resume_index",
+    "search_candidate_ids",
+    "index_info",
+    "is_ready",
+]
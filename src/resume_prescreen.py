@@ -0,0 +1,318 @@
+"""Cheap local keyword pre-screen that runs before LLM resume analysis.
+
+The pre-screen scores an online resume against the job portrait's
+``keywords`` (positive/negative) and the plain-text ``requirements`` scorecard
+(one weighted line per dimension, e.g. ``30 门槛：条件1；条件2``). Terms are
+normalized (NFKC + lowercase) and matched in a single pass with a precompiled
+Aho-Corasick automaton, so scoring a 60 KB resume costs microseconds compared
+to a full LLM round trip.
+
+Decisions:
+    PASS: score below ``pass_floor`` -> skip the LLM and mark the candidate PASS
+    LOW:  score below ``deprioritize_floor`` -> still analyzed, but sorted last
+    OK:   score at or above ``deprioritize_floor``
+    SKIP: not enough signal (pre-screen disabled, no terms, resume too short)
+
+With ``min_degree`` set, a resume whose parsed highest degree (`src.resume_profile`)
+is known and below it is a PASS regardless of the keyword score.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import get_prescreen_config
+from .global_logger import logger
+from .resume_profile import degree_rank, normalize_degree, parse_resume
+from .text_normalize import nfkc
+
+DECISION_PASS = "PASS"
+DECISION_LOW = "LOW"
+DECISION_OK = "OK"
+DECISION_SKIP = "SKIP"
+
+# Score composition (0-10 scale)
+POSITIVE_WEIGHT = 0.6
+REQUIREMENT_WEIGHT = 0.4
+NEGATIVE_PENALTY = 2.0
+
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "pass_floor": 1.0,
+    "deprioritize_floor": 3.0,
+    "min_resume_length": 200,
+    "min_degree": None,
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PARENTHESES_RE = re.compile(r"[（(][^（）()]*[)）]")
+_TERM_SPLIT_RE = re.compile(r"[；;，,、/|。\n]+")
+_REQUIREMENT_LINE_RE = re.compile(r"^\s*(\d{1,3})\s*分?\s*(.*)$")
+_MIN_TERM_LENGTH = 2
+_MAX_TERM_LENGTH = 16
+
+
+def normalize_term(text: str) -> str:
+    """Normalize text for matching: NFKC (full-width -> half-width), lowercase, collapse spaces."""
+    if not text:
+        return ""
+    text = nfkc(str(text)).lower()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over normalized terms.
+
+    English terms only match on word boundaries (``go`` does not hit
+    ``google``); Chinese terms match anywhere since there are no word breaks.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = []
+        seen = set()
+        for term in terms:
+            norm = normalize_term(term)
+            if norm and norm not in seen:
+                seen.add(norm)
+                self.terms.append(norm)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for index, term in enumerate(self.terms):
+            node = 0
+            for ch in term:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = nxt
+            self._output[node].append(index)
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt].extend(self._output[self._fail[nxt]])
+
+        self._bounded = [
+            (_is_word_char(term[0]), _is_word_char(term[-1]))
+            for term in self.terms
+        ]
+
+    def find(self, text: str, normalized: bool = False) -> set[int]:
+        """Return indices of terms that occur in ``text``."""
+        if not self.terms or not text:
+            return set()
+        if not normalized:
+            text = normalize_term(text)
+        found: set[int] = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        length = len(text)
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for index in output[node]:
+                if index in found:
+                    continue
+                check_start, check_end = self._bounded[index]
+                start = pos - len(self.terms[index]) + 1
+                if check_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_end and pos + 1 < length and _is_word_char(text[pos + 1]):
+                    continue
+                found.add(index)
+        return found
+
+
+@lru_cache(maxsize=128)
+def _compile_matcher(terms: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(terms)
+
+
+def _clean_terms(values: Any) -> List[str]:
+    if isinstance(values, str):
+        values = values.splitlines()
+    if not isinstance(values, list):
+        return []
+    return [normalize_term(v) for v in values if normalize_term(v)]
+
+
+def parse_requirement_scorecard(requirements: str) -> List[Dict[str, Any]]:
+    """Parse the plain-text requirements scorecard into weighted term groups.
+
+    Each line ``<weight> <dimension>：<item>；<item>`` becomes
+    ``{"dimension", "weight", "terms"}``. Parenthetical notes are dropped and
+    only short phrases are kept as terms, since long sentences never match a
+    resume verbatim. Lines without terms (e.g. ``备注：...``) are skipped.
+    """
+    dimensions: List[Dict[str, Any]] = []
+    for raw_line in (requirements or "").splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("备注"):
+            continue
+        match = _REQUIREMENT_LINE_RE.match(line)
+        weight, body = (int(match.group(1)), match.group(2)) if match else (1, line)
+        parts = re.split(r"[：:]", body, maxsplit=1)
+        dimension, items = parts if len(parts) == 2 else ("", body)
+        items = _PARENTHESES_RE.sub("", items)
+        terms = [
+            term for term in (normalize_term(t) for t in _TERM_SPLIT_RE.split(items))
+            if _MIN_TERM_LENGTH <= len(term) <= _MAX_TERM_LENGTH
+        ]
+        if terms and weight > 0:
+            dimensions.append({"dimension": dimension.strip(), "weight": weight, "terms": terms})
+    return dimensions
+
+
+@dataclass
+class PrescreenResult:
+    decision: str
+    score: Optional[float]
+    positive_hits: List[str] = field(default_factory=list)
+    negative_hits: List[str] = field(default_factory=list)
+    requirement_coverage: Optional[float] = None
+    reason: str = ""
+    checked_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def get_job_prescreen_config(job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge defaults, config.yaml `prescreen` and the job's `metadata.prescreen` overrides."""
+    config = {**_DEFAULT_CONFIG, **(get_prescreen_config() or {})}
+    overrides = ((job or {}).get("metadata") or {}).get("prescreen")
+    if isinstance(overrides, dict):
+        config.update({k: v for k, v in overrides.items() if k in _DEFAULT_CONFIG})
+    return config
+
+
+def prescreen_resume(
+    resume_text: str, job: Optional[Dict[str, Any]], profile: Optional[Dict[str, Any]] = None
+) -> PrescreenResult:
+    """Score a resume against the job's keywords and requirements scorecard.
+
+    Args:
+        resume_text: Online resume text captured from the browser
+        job: Job record (as returned by `get_job_by_id`)
+        profile: Parsed resume profile (stored `resume_profile`); parsed from `resume_text` if None
+
+    Returns:
+        PrescreenResult with the decision and the matched evidence
+    """
+    config = get_job_prescreen_config(job)
+    if not config.get("enabled") or not job:
+        return PrescreenResult(DECISION_SKIP, None, reason="预筛未启用")
+    min_degree = normalize_degree(config.get("min_degree"))
+    if min_degree:
+        profile = profile if profile is not None else parse_resume(resume_text)
+        degree = (profile or {}).get("degree")
+        if degree and degree_rank(degree) < degree_rank(min_degree):
+            return PrescreenResult(DECISION_PASS, 0.0, reason=f"学历{degree}低于岗位要求（{min_degree}）")
+    text = normalize_term(resume_text)
+    if len(text) < int(config.get("min_resume_length") or 0):
+        return PrescreenResult(DECISION_SKIP, None, reason="简历过短，跳过预筛")
+
+    keywords = job.get("keywords") or {}
+    if isinstance(keywords, list):
+        keywords = {"positive": keywords, "negative": []}
+    positive = _clean_terms(keywords.get("positive"))
+    negative = _clean_terms(keywords.get("negative"))
+    dimensions = parse_requirement_scorecard(job.get("requirements") or "")
+    if not positive and not negative and not dimensions:
+        return PrescreenResult(DECISION_SKIP, None, reason="岗位未配置关键词或评分标准")
+
+    # One automaton (and one scan) for every term of the job
+    all_terms = tuple(dict.fromkeys(positive + negative + [t for d in dimensions for t in d["terms"]]))
+    matcher = _compile_matcher(all_terms)
+    hits = {matcher.terms[i] for i in matcher.find(text, normalized=True)}
+
+    positive_hits = [t for t in positive if t in hits]
+    negative_hits = [t for t in negative if t in hits]
+
+    components: List[Tuple[float, float]] = []
+    if positive:
+        components.append((POSITIVE_WEIGHT, len(positive_hits) / len(positive)))
+    requirement_coverage = None
+    if dimensions:
+        total_weight = sum(d["weight"] for d in dimensions)
+        covered = sum(d["weight"] * sum(1 for t in d["terms"] if t in hits) / len(d["terms"]) for d in dimensions)
+        requirement_coverage = round(covered / total_weight, 3)
+        components.append((REQUIREMENT_WEIGHT, requirement_coverage))
+
+    base = sum(w * v for w, v in components) / sum(w for w, _ in components) if components else 1.0
+    score = round(max(0.0, min(10.0, base * 10 - NEGATIVE_PENALTY * len(negative_hits))), 1)
+
+    if score < float(config["pass_floor"]):
+        decision = DECISION_PASS
+    elif score < float(config["deprioritize_floor"]):
+        decision = DECISION_LOW
+    else:
+        decision = DECISION_OK
+    reason = (
+        f"关键词预筛得分 {score}/10：命中加分项 {len(positive_hits)}/{len(positive)}"
+        + (f"，评分标准覆盖 {requirement_coverage * 100:.0f}%" if requirement_coverage is not None else "")
+        + (f"，命中减分项：{'、'.join(negative_hits)}" if negative_hits else "")
+    )
+    logger.debug("prescreen: %s %s", decision, reason)
+    return PrescreenResult(
+        decision=decision,
+        score=score,
+        positive_hits=positive_hits,
+        negative_hits=negative_hits,
+        requirement_coverage=requirement_coverage,
+        reason=reason,
+    )
+
+
+def build_prescreen_analysis(result: PrescreenResult) -> Dict[str, Any]:
+    """Build an ANALYZE_AND_MESSAGE_ACTION-shaped result for an auto-PASS decision."""
+    overall = int(result.score or 0) // 3  # 0-3, always below the PASS guard (overall < 4)
+    return {
+        "skill": overall,
+        "startup_fit": 0,
+        "background": 0,
+        "overall": overall,
+        "summary": f"【本地预筛】{result.reason}",
+        "followup_tips": "预筛判定为明显不匹配，未调用 AI 分析；如需复核可强制重新分析。",
+        "action": DECISION_PASS,
+        "message": "",
+        "reason": result.reason,
+        "prescreen": result.to_dict(),
+    }
+
+
+__all__ = [
+    "DECISION_PASS",
+    "DECISION_LOW",
+    "DECISION_OK",
+    "DECISION_SKIP",
+    "KeywordMatcher",
+    "PrescreenResult",
+    "normalize_term",
+    "parse_requirement_scorecard",
+    "get_job_prescreen_config",
+    "prescreen_resume",
+    "build_prescreen_analysis",
+]
@@ -0,0 +1,400 @@
+"""Deterministic structured parsing of captured resumes.
+
+Extracts education (school, degree, major, years), work experience (company, title,
+start/end) and skills from either the captured resume text (sections such as
+``工作经历`` / ``教育经历`` / ``技能标签``) or the wasm ``geek_detail_info`` payload
+(``geekEduExpList`` / ``geekWorkExpList`` ...). No model calls: the same input always
+yields the same profile, so it is computed once per resume fingerprint and stored
+with the candidate (``resume_profile`` JSON) for the pre-screen, the search filters
+(``degree_rank`` / ``schools``) and the prompt builder (`format_resume_profile`).
+
+Profile (empty keys omitted)::
+
+    {"v": 1, "fp": "<sha1/16 of the source>",
+     "education": [{"school", "degree", "major", "start", "end"}],
+     "work": [{"company", "title", "start", "end"}],
+     "skills": [...], "degree": "硕士", "degree_rank": 5, "schools": [...]}
+
+Dates are ``YYYY`` or ``YYYY.MM``; an open-ended entry ends with ``至今``. Stored
+profiles also carry ``"src"``: the candidate field they were parsed from.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+PROFILE_VERSION = 1
+PRESENT = "至今"
+
+# Ascending degree levels; `degree_rank` is the 1-based position
+DEGREES = ("高中", "中专", "大专", "本科", "硕士", "博士")
+_DEGREE_ALIASES = {
+    "中技": "中专", "专科": "大专", "学士": "本科", "研究生": "硕士", "mba": "硕士", "emba": "硕士",
+    "master": "硕士", "bachelor": "本科", "phd": "博士", "ph.d": "博士", "doctor": "博士",
+}
+_DEGREE_RE = re.compile(r"(博士|硕士|研究生|EMBA|MBA|本科|学士|大专|专科|中专|中技|高中|Ph\.?D|Master|Bachelor|Doctor)", re.I)
+
+_SECTION_HEADINGS = {
+    "工作经历": "work", "实习经历": "work",
+    "项目经验": "project", "项目经历": "project",
+    "教育经历": "education", "教育经理": "education", "教育背景": "education",
+    "技能标签": "skills", "专业技能": "skills", "技能特长": "skills",
+    "期望职位": "other", "资格证书": "other", "自我评价": "other", "个人优势": "other",
+}
+_HEADING_RE = re.compile(r"^\s*(" + "|".join(_SECTION_HEADINGS) + r")\s*[:：]?\s*$")
+_DATE = r"((?:19|20)\d{2})(?:\s*[./\-年]\s*(\d{1,2})\s*月?)?"
+_RANGE_RE = re.compile(_DATE + r"\s*(?:-|–|—|~|～|至|到)\s*(?:" + _DATE + r"|(至今|今|现在|present|now))", re.I)
+_SCHOOL_RE = re.compile(
+    r"([一-龥（）()]{2,24}?(?:大学|学院|学校|中学)(?:[（(][一-龥]{2,8}[）)])?"
+    r"|[A-Z][A-Za-z&.' ]{2,60}?(?:University|College|Institute of Technology|Institute|School)(?: of [A-Z][A-Za-z ]+)?)"
+)
+_COMPANY_HINT_RE = re.compile(r"(公司|集团|科技|有限|银行|研究院|研究所|实验室|工作室|医院|大学|学院|Inc|Ltd|LLC|Co\.|Corp|Group|Lab)", re.I)
+_SEPARATORS_RE = re.compile(r"[|｜·•,，、/;；\s]+")
+_SKILL_SPLIT_RE = re.compile(r"[、,，;；/|｜·•\n]+|\s{2,}")
+_MAX_HEADER_LENGTH = 40
+_MAX_SKILLS = 50
+
+
+def resume_fingerprint(text: str) -> str:
+    """Short stable fingerprint of a resume (whitespace-insensitive)."""
+    return hashlib.sha1("".join((text or "").split()).encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_degree(value: Any) -> Optional[str]:
+    """Canonical degree name (one of `DEGREES`) of a free-form degree string."""
+    match = _DEGREE_RE.search(str(value or ""))
+    if not match:
+        return None
+    token = match.group(1)
+    return _DEGREE_ALIASES.get(token.lower().replace(" ", ""), token if token in DEGREES else None)
+
+
+def degree_rank(degree: Optional[str]) -> int:
+    """1-based rank of a degree in `DEGREES` (0 if unknown)."""
+    canonical = normalize_degree(degree)
+    return DEGREES.index(canonical) + 1 if canonical else 0
+
+
+def _format_date(year: Any, month: Any = None) -> Optional[str]:
+    if not year:
+        return None
+    return f"{int(year)}.{int(month):02d}" if month and 1 <= int(month) <= 12 else str(int(year))
+
+
+def _parse_range(text: str) -> Optional[Tuple[str, str, Tuple[int, int]]]:
+    """(start, end, span) of the first date range in `text`."""
+    match = _RANGE_RE.search(text)
+    if not match:
+        return None
+    y1, m1, y2, m2, present = match.groups()
+    end = PRESENT if present else _format_date(y2, m2)
+    return _format_date(y1, m1), end, match.span()
+
+
+def _strip_parts(text: str) -> List[str]:
+    return [p for p in (s.strip(" -—:：()（）") for s in _SEPARATORS_RE.split(text)) if p]
+
+
+def _compact(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in entry.items() if v}
+
+
+# ------------------------------------------------------------------
+# Text resumes
+# ------------------------------------------------------------------
+def _split_sections(text: str) -> Dict[str, List[str]]:
+    sections: Dict[str, List[str]] = {}
+    current = "header"
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or set(line) <= {"-", "—", "="}:
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            current = _SECTION_HEADINGS[heading.group(1)]
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _parse_education_lines(lines: List[str]) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for line in lines:
+        school = _SCHOOL_RE.search(line)
+        if school:
+            entries.append({"school": school.group(1).strip()})
+            line = line[:school.start()] + " " + line[school.end():]
+        if not entries:
+            continue
+        entry = entries[-1]
+        span = _parse_range(line)
+        if span and "start" not in entry:
+            entry["start"], entry["end"] = span[0], span[1]
+            line = line[:span[2][0]] + " " + line[span[2][1]:]
+        degree = _DEGREE_RE.search(line)
+        if degree and "degree" not in entry:
+            entry["degree"] = normalize_degree(degree.group(1))
+            line = line[:degree.start()] + " " + line[degree.end():]
+        if "major" not in entry:
+            parts = [p for p in _strip_parts(line) if 2 <= len(p) <= 20 and not p.isdigit()]
+            if parts and len(line.strip()) <= _MAX_HEADER_LENGTH:
+                entry["major"] = parts[0]
+    return [_compact(e) for e in entries]
+
+
+def _parse_work_lines(lines: List[str]) -> List[Dict[str, Any]]:
+    """Entries start at a date-range line; the header is that line plus the short lines right before it."""
+    entries: List[Dict[str, Any]] = []
+    for index, line in enumerate(lines):
+        span = _parse_range(line)
+        if not span:
+            continue
+        parts = _strip_parts(line[:span[2][0]] + " " + line[span[2][1]:])
+        previous = index - 1
+        while len(parts) < 2 and previous >= 0:
+            before = lines[previous]
+            if len(before) > _MAX_HEADER_LENGTH or _parse_range(before) or "。" in before:
+                break
+            parts = _strip_parts(before) + parts
+            previous -= 1
+        if not parts:
+            continue
+        company = next((p for p in parts if _COMPANY_HINT_RE.search(p)), parts[0])
+        title = next((p for p in parts if p != company), None)
+        entries.append(_compact({"company": company, "title": title, "start": span[0], "end": span[1]}))
+    return entries
+
+
+def _parse_skill_lines(lines: List[str]) -> List[str]:
+    skills: Dict[str, None] = {}
+    for line in lines:
+        for token in _SKILL_SPLIT_RE.split(line):
+            token = token.strip()
+            if 1 < len(token) <= 30 and not token.endswith("。"):
+                skills.setdefault(token)
+    return list(skills)[:_MAX_SKILLS]
+
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """Structured profile of a captured resume text (without ``v`` / ``fp``)."""
+    sections = _split_sections(text or "")
+    education_lines = sections.get("education")
+    if education_lines is None:
+        # no heading: every line naming a school, plus the line after it
+        lines = [line for lines in sections.values() for line in lines]
+        education_lines = [l for i, l in enumerate(lines) if _SCHOOL_RE.search(l) or (i and _SCHOOL_RE.search(lines[i - 1]))]
+    return {
+        "education": _parse_education_lines(education_lines),
+        "work": _parse_work_lines(sections.get("work", [])),
+        "skills": _parse_skill_lines(sections.get("skills", [])),
+    }
+
+
+# ------------------------------------------------------------------
+# wasm geek_detail_info payloads
+# ------------------------------------------------------------------
+def _first(item: Dict[str, Any], *keys: str) -> Any:
+    return next((item[k] for k in keys if item.get(k) not in (None, "", [])), None)
+
+
+def _payload_date(value: Any) -> Optional[str]:
+    """``2019.07`` / ``2019-07-01`` / ``201907`` / ``20190701`` / 2019 -> ``YYYY[.MM]``."""
+    if value in (None, "", 0, -1):
+        return None
+    text = str(value)
+    if re.search(r"至今|今|present", text, re.I):
+        return PRESENT
+    digits = re.sub(r"\D", "", text)
+    if len(digits) >= 6 and digits[:2] in ("19", "20"):
+        return _format_date(digits[:4], digits[4:6])
+    match = re.search(_DATE, text)
+    return _format_date(match.group(1), match.group(2)) if match else None
+
+
+def _find_lists(payload: Any, depth: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Experience lists anywhere in a (nested) capture payload; the first occurrence wins."""
+    found: Dict[str, List[Dict[str, Any]]] = {}
+    if depth > 4:
+        return found
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            if isinstance(value, list) and value and all(isinstance(v, dict) for v in value) and key.endswith("List"):
+                found.setdefault(key, value)
+            elif isinstance(value, (dict, list)):
+                for k, v in _find_lists(value, depth + 1).items():
+                    found.setdefault(k, v)
+    elif isinstance(payload, list):
+        for value in payload:
+            for k, v in _find_lists(value, depth + 1).items():
+                found.setdefault(k, v)
+    return found
+
+
+def parse_resume_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Structured profile of a wasm ``geek_detail_info`` payload (without ``v`` / ``fp``)."""
+    lists = _find_lists(payload)
+    education = [
+        _compact({
+            "school": _first(e, "school", "schoolName"),
+            "degree": normalize_degree(_first(e, "degreeName", "degree", "degreeCategory", "eduLevel")),
+            "major": _first(e, "major", "majorName"),
+            "start": _payload_date(_first(e, "startYearStr", "startDate", "startYear", "startYearMonStr")),
+            "end": _payload_date(_first(e, "endYearStr", "endDate", "endYear", "endYearMonStr")),
+        })
+        for e in lists.get("geekEduExpList") or lists.get("eduExpList") or []
+    ]
+    work = []
+    for w in lists.get("geekWorkExpList") or lists.get("workExpList") or []:
+        start = _payload_date(_first(w, "startYearMonStr", "startDate", "startYearMon", "startYear"))
+        end = _payload_date(_first(w, "endYearMonStr", "endDate", "endYearMon", "endYear")) or (PRESENT if start else None)
+        work.append(_compact({
+            "company": _first(w, "company", "companyName", "brandName"),
+            "title": _first(w, "positionName", "positionTitle", "title", "position"),
+            "start": start,
+            "end": end,
+        }))
+    skills: Dict[str, None] = {}
+    for key in ("geekSkillList", "skillList", "geekSkillTagList", "skillTagList"):
+        for s in lists.get(key) or []:
+            name = _first(s, "name", "skillName", "tagName", "content")
+            if name:
+                skills.setdefault(str(name).strip())
+    for w in lists.get("geekWorkExpList") or []:
+        for s in w.get("workEmphasisList") or []:
+            if isinstance(s, str) and s.strip():
+                skills.setdefault(s.strip())
+    return {
+        "education": [e for e in education if e.get("school")],
+        "work": [w for w in work if w.get("company") or w.get("title")],
+        "skills": list(skills)[:_MAX_SKILLS],
+    }
+
+
+def _as_payload(text: str) -> Optional[Dict[str, Any]]:
+    """A payload dict stored as its JSON / Python repr (captures that returned structured data)."""
+    stripped = text.strip()
+    if not stripped.startswith("{"):
+        return None
+    for loads in (json.loads, ast.literal_eval):
+        try:
+            value = loads(stripped)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+
+# ------------------------------------------------------------------
+# Profiles
+# ------------------------------------------------------------------
+@lru_cache(maxsize=512)
+def _parse_cached(fingerprint: str, text: str) -> str:
+    payload = _as_payload(text)
+    parsed = parse_resume_payload(payload) if payload is not None else parse_resume_text(text)
+    return json.dumps(parsed, ensure_ascii=False)
+
+
+def parse_resume(source: Union[str, Dict[str, Any], None]) -> Optional[Dict[str, Any]]:
+    """Profile of a resume text or capture payload; None if nothing was recognized."""
+    if isinstance(source, dict):
+        parsed = parse_resume_payload(source)
+        fingerprint = resume_fingerprint(json.dumps(source, ensure_ascii=False, sort_keys=True, default=str))
+    elif source and str(source).strip():
+        fingerprint = resume_fingerprint(str(source))
+        parsed = json.loads(_parse_cached(fingerprint, str(source)))
+    else:
+        return None
+    if not any(parsed.values()):
+        return None
+    profile: Dict[str, Any] = {"v": PROFILE_VERSION, "fp": fingerprint, **{k: v for k, v in parsed.items() if v}}
+    ranked = [e for e in parsed["education"] if e.get("degree")]
+    if ranked:
+        best = max(ranked, key=lambda e: degree_rank(e["degree"]))
+        profile["degree"], profile["degree_rank"] = best["degree"], degree_rank(best["degree"])
+    schools = list(dict.fromkeys(e["school"] for e in parsed["education"] if e.get("school")))
+    if schools:
+        profile["schools"] = schools
+    return profile
+
+
+def get_resume_profile(candidate: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The candidate's stored profile if it matches the current resume, else a fresh parse.
+
+    The stored ``resume_profile`` is reused when its fingerprint equals that of
+    ``resume_text`` or ``full_resume`` (and the parser version is unchanged).
+    """
+    stored = candidate.get("resume_profile")
+    texts = [t for t in (candidate.get("resume_text"), candidate.get("full_resume")) if t]
+    if isinstance(stored, dict) and stored.get("v") == PROFILE_VERSION:
+        if not texts or stored.get("fp") in {resume_fingerprint(str(t)) for t in texts}:
+            return stored
+    return next((p for p in map(parse_resume, texts) if p), None)
+
+
+def _months(start: Optional[str], end: Optional[str], today: date) -> int:
+    def to_month(value: str) -> int:
+        year, _, month = value.partition(".")
+        return int(year) * 12 + (int(month) if month else 1)
+
+    if not start or not end:
+        return 0
+    end_month = today.year * 12 + today.month if end == PRESENT else to_month(end)
+    return max(0, end_month - to_month(start))
+
+
+def work_years(profile: Optional[Dict[str, Any]], today: Optional[date] = None) -> Optional[float]:
+    """Total years of the work entries (open-ended entries count until `today`)."""
+    entries = (profile or {}).get("work") or []
+    if not entries:
+        return None
+    today = today or date.today()
+    return round(sum(_months(w.get("start"), w.get("end"), today) for w in entries) / 12, 1)
+
+
+def format_resume_profile(profile: Optional[Dict[str, Any]]) -> str:
+    """Compact Chinese summary of a profile for prompts (empty string if nothing parsed)."""
+    if not profile:
+        return ""
+
+    def period(entry: Dict[str, Any]) -> str:
+        return f"{entry.get('start', '?')}-{entry.get('end', '?')}" if entry.get("start") or entry.get("end") else ""
+
+    lines = []
+    for e in profile.get("education") or []:
+        lines.append("教育：" + " ".join(filter(None, [e.get("school"), e.get("degree"), e.get("major"), period(e)])))
+    for w in profile.get("work") or []:
+        lines.append("工作：" + " ".join(filter(None, [w.get("company"), w.get("title"), period(w)])))
+    years = work_years(profile)
+    if years:
+        lines.append(f"工作年限：约{years}年")
+    if profile.get("skills"):
+        lines.append("技能：" + "、".join(profile["skills"][:20]))
+    return "\n".join(lines)
+
+
+def with_profile_summary(resume: str, profile: Optional[Dict[str, Any]]) -> str:
+    """Prefix a resume with its structured summary for the LLM (unchanged if nothing parsed)."""
+    summary = format_resume_profile(profile)
+    return f"【简历结构化摘要】\n{summary}\n\n【简历原文】\n{resume}" if summary else resume
+
+
+__all__ = [
+    "PROFILE_VERSION",
+    "DEGREES",
+    "resume_fingerprint",
+    "normalize_degree",
+    "degree_rank",
+    "parse_resume_text",
+    "parse_resume_payload",
+    "parse_resume",
+    "get_resume_profile",
+    "work_years",
+    "format_resume_profile",
+    "with_profile_summary",
+]
@@ -0,0 +1,295 @@
+"""Materialized per-job daily rollups for `stats_service`.
+
+`/stats` and the DingTalk report used to fetch every recent candidate of every job
+from Milvus and aggregate in Python. Instead, each candidate contributes one *fact*
+``(job, day, stage, score, contacted)`` — day being the date of its ``updated_at``,
+exactly how the stats bucket candidates — and the rollup table keeps a count per
+distinct fact. Reading a job's last 7 days is then a handful of indexed rows,
+independent of candidate volume. Facts also keep the candidate's creation day
+(``created_ts``), from which the daily "new candidates" series is counted.
+
+Rollups are maintained incrementally by `record_candidate_update` (called from
+`upsert_candidate` after every write: the old fact's bucket is decremented, the new
+one incremented) and reconciled by `replace_window` during the periodic backfill in
+`stats_service.backfill_stats_rollups`.
+
+Storage is a local SQLite file (like the other file-backed stores under `data/`),
+so the Milvus schema is untouched.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .candidate_stages import normalize_stage
+from .config import get_stats_config, resolve_repo_path
+from .global_logger import logger
+
+NO_SCORE = -1
+
+_STORE_PATH = resolve_repo_path(get_stats_config().get("rollup_path") or "data/stats_rollups.sqlite3")
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidate_facts (
+    candidate_id TEXT PRIMARY KEY,
+    job TEXT NOT NULL,
+    day TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    contacted INTEGER NOT NULL,
+    created_day TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_facts_day ON candidate_facts(day);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    job TEXT NOT NULL,
+    day TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    contacted INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (job, day, stage, score, contacted)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_rollups_day ON daily_rollups(day);
+CREATE TABLE IF NOT EXISTS rollup_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+@dataclass(frozen=True)
+class CandidateFact:
+    job: str
+    day: str  # YYYY-MM-DD (local date of updated_at)
+    stage: str  # normalized stage or ""
+    score: int  # analysis.overall clipped to 0-10, NO_SCORE if missing
+    contacted: bool
+    created_day: str = ""  # YYYY-MM-DD (local date of created_ts, else of updated_at); not part of the bucket
+
+    def key(self) -> tuple:
+        return (self.job, self.day, self.stage, self.score, int(self.contacted))
+
+    def row(self) -> tuple:
+        return (*self.key(), self.created_day)
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(_STORE_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        if "created_day" not in {r[1] for r in conn.execute("PRAGMA table_info(candidate_facts)")}:
+            # facts written before creation days were kept: serve nothing until the next backfill
+            with conn:
+                conn.execute("ALTER TABLE candidate_facts ADD COLUMN created_day TEXT NOT NULL DEFAULT ''")
+                conn.execute("DELETE FROM rollup_meta WHERE key = 'last_backfill_at'")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_candidate_facts_created_day ON candidate_facts(created_day)")
+        _conn = conn
+    return _conn
+
+
+def _to_day(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        return None
+
+
+def _ms_to_day(value: Any) -> Optional[str]:
+    try:
+        return datetime.fromtimestamp(int(value) / 1000).date().isoformat() if value else None
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _to_score(analysis: Any) -> int:
+    overall = (analysis or {}).get("overall") if isinstance(analysis, dict) else None
+    try:
+        return max(0, min(10, int(overall)))
+    except (TypeError, ValueError):
+        return NO_SCORE
+
+
+def fact_from_candidate(fields: Dict[str, Any], previous: Optional[CandidateFact] = None) -> CandidateFact:
+    """Build a candidate's fact from (possibly partial) written fields.
+
+    Fields absent from a partial update keep their previous value.
+    """
+    metadata = fields.get("metadata")
+    day = _to_day(fields.get("updated_at")) or (previous.day if previous else date.today().isoformat())
+    return CandidateFact(
+        job=str(fields.get("job_applied") or "") if "job_applied" in fields else (previous.job if previous else ""),
+        day=day,
+        stage=(normalize_stage(fields.get("stage")) or "") if "stage" in fields else (previous.stage if previous else ""),
+        score=_to_score(fields.get("analysis")) if "analysis" in fields else (previous.score if previous else NO_SCORE),
+        contacted=(
+            bool(metadata.get("contacted")) if isinstance(metadata, dict)
+            else bool(fields["contacted"]) if "contacted" in fields
+            else (previous.contacted if previous else False)
+        ),
+        # like `build_daily_candidate_counts`: records without created_ts count on their update day
+        created_day=_ms_to_day(fields.get("created_ts")) or (previous.created_day if previous else "") or day,
+    )
+
+
+def _get_fact(conn: sqlite3.Connection, candidate_id: str) -> Optional[CandidateFact]:
+    row = conn.execute(
+        "SELECT job, day, stage, score, contacted, created_day FROM candidate_facts WHERE candidate_id = ?", (candidate_id,)
+    ).fetchone()
+    return CandidateFact(row[0], row[1], row[2], row[3], bool(row[4]), row[5]) if row else None
+
+
+def _bump(conn: sqlite3.Connection, fact: CandidateFact, delta: int) -> None:
+    conn.execute(
+        "INSERT INTO daily_rollups (job, day, stage, score, contacted, count) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (job, day, stage, score, contacted) DO UPDATE SET count = count + excluded.count",
+        (*fact.key(), delta),
+    )
+
+
+def _has_fact(candidate_id: str) -> bool:
+    with _LOCK:
+        return _get_fact(_connect(), candidate_id) is not None
+
+
+def record_candidate_update(
+    candidate_id: str,
+    fields: Dict[str, Any],
+    load_stored: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+) -> None:
+    """Move a candidate's contribution to the bucket of its new state.
+
+    A partial update without ``job_applied`` of a candidate that has no fact yet (last
+    updated before the backfill window) is completed from the stored record returned by
+    `load_stored`; without one it is not recorded (the next backfill picks it up) rather
+    than counted under an empty job.
+
+    Args:
+        candidate_id: Candidate primary key
+        fields: Fields just written by `upsert_candidate` (already normalized)
+        load_stored: Reads the candidate's stored fact fields (job_applied, stage, ...)
+    """
+    if not candidate_id:
+        return
+    try:
+        base = None
+        if "job_applied" not in fields and not _has_fact(candidate_id):
+            stored = load_stored() if load_stored else None  # a Milvus read: outside the lock
+            if not (stored or {}).get("job_applied"):
+                logger.debug("Stats rollup: %s has no fact and no job, left to the backfill", candidate_id)
+                return
+            base = fact_from_candidate(stored)
+        with _LOCK:
+            conn = _connect()
+            with conn:
+                previous = _get_fact(conn, candidate_id)
+                fact = fact_from_candidate(fields, previous or base)
+                if fact == previous:
+                    return
+                if previous:
+                    _bump(conn, previous, -1)
+                    conn.execute(
+                        "DELETE FROM daily_rollups WHERE job = ? AND day = ? AND stage = ? AND score = ? "
+                        "AND contacted = ? AND count <= 0",
+                        previous.key(),
+                    )
+                _bump(conn, fact, 1)
+                conn.execute(
+                    "INSERT OR REPLACE INTO candidate_facts (candidate_id, job, day, stage, score, contacted, created_day) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (candidate_id, *fact.row()),
+                )
+    except Exception as exc:  # noqa: BLE001 - stats must never break candidate writes
+        logger.warning("Failed to update stats rollup for %s: %s", candidate_id, exc)
+
+
+def replace_window(facts: Dict[str, CandidateFact], start_day: str) -> int:
+    """Reconcile all facts/rollups with ``day >= start_day`` against a full scan.
+
+    Args:
+        facts: candidate_id -> fact for every candidate updated since `start_day`
+        start_day: First day (YYYY-MM-DD) covered by the scan
+
+    Returns:
+        int: Number of facts written
+    """
+    with _LOCK:
+        conn = _connect()
+        with conn:
+            # Facts that moved out of / into the window are replaced as a whole
+            conn.execute("DELETE FROM candidate_facts WHERE day >= ?", (start_day,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO candidate_facts (candidate_id, job, day, stage, score, contacted, created_day) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cid, *fact.row()) for cid, fact in facts.items()],
+            )
+            conn.execute("DELETE FROM daily_rollups")
+            conn.execute(
+                "INSERT INTO daily_rollups (job, day, stage, score, contacted, count) "
+                "SELECT job, day, stage, score, contacted, COUNT(*) FROM candidate_facts "
+                "GROUP BY job, day, stage, score, contacted"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO rollup_meta (key, value) VALUES ('last_backfill_at', ?)",
+                (datetime.now().isoformat(),),
+            )
+    return len(facts)
+
+
+def query_rollups(start_day: str, jobs: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Rollup rows with ``day >= start_day``, optionally restricted to some jobs."""
+    sql = "SELECT job, day, stage, score, contacted, count FROM daily_rollups WHERE day >= ?"
+    params: List[Any] = [start_day]
+    jobs = list(jobs) if jobs is not None else None
+    if jobs is not None:
+        sql += f" AND job IN ({', '.join('?' for _ in jobs) or 'NULL'})"
+        params += jobs
+    with _LOCK:
+        rows = _connect().execute(sql, params).fetchall()
+    return [
+        {"job": r[0], "day": r[1], "stage": r[2], "score": r[3], "contacted": bool(r[4]), "count": r[5]}
+        for r in rows
+    ]
+
+
+def query_created_counts(start_day: str) -> Dict[str, int]:
+    """Candidates per creation day (YYYY-MM-DD) with ``created_day >= start_day``.
+
+    Complete for the days the backfill covers: a candidate created since `start_day` was
+    also updated since, so the backfill scan (``backfill_days``) includes its fact.
+    """
+    with _LOCK:
+        rows = _connect().execute(
+            "SELECT created_day, COUNT(*) FROM candidate_facts WHERE created_day >= ? GROUP BY created_day", (start_day,)
+        ).fetchall()
+    return {day: count for day, count in rows}
+
+
+def get_last_backfill() -> Optional[str]:
+    """ISO timestamp of the last successful backfill, None if rollups were never built."""
+    with _LOCK:
+        row = _connect().execute("SELECT value FROM rollup_meta WHERE key = 'last_backfill_at'").fetchone()
+    return row[0] if row else None
+
+
+__all__ = [
+    "NO_SCORE",
+    "CandidateFact",
+    "fact_from_candidate",
+    "record_candidate_update",
+    "replace_window",
+    "query_rollups",
+    "query_created_counts",
+    "get_last_backfill",
+]
@@ -12,12 +12,15 @@ from __future__ import annotations
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, time
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
-from .candidate_store import search_candidates_advanced
+from .candidate_snapshot import is_snapshot_fresh, stats_columns as snapshot_stats_columns
+from .candidate_store import scan_candidates, search_candidates_advanced
 from .jobs_store import get_all_jobs
 from .assistant_actions import send_dingtalk_notification
+from .config import get_stats_config
 from .global_logger import logger
+from .stats_rollup_store import NO_SCORE, fact_from_candidate, get_last_backfill, query_created_counts, query_rollups, replace_window
 
 
 # Stage order used for conversion calculations
@@ -75,24 +78,39 @@ def _score_quality(scores: List[int]) -> ScoreAnalysis:
     import numpy as np  # type: ignore
 
     arr = np.clip(np.array(scores, dtype=int), 1, 10)
-    avg = float(arr.mean())
-    dist_dict = {int(k): int(v) for k, v in zip(*np.unique(arr, return_counts=True))}
+    return _score_quality_from_hist(np.bincount(arr, minlength=11))
+
+
+def _score_quality_from_hist(hist) -> ScoreAnalysis:
+    """Same as `_score_quality`, from a score histogram (index = score 1-10, index 0 ignored).
+
+    Lets the aggregated paths (single scan / rollups) evaluate every job in O(10)
+    without materializing per-candidate score lists.
+    """
+    import numpy as np  # type: ignore
+
+    counts_by_score = np.zeros(11, dtype=np.int64)
+    counts_by_score[1:] = np.asarray(hist, dtype=np.int64)[1:11]
+    total = int(counts_by_score.sum())
+    if not total:
+        return ScoreAnalysis(0, 0.0, 0.0, {}, 0.0, "暂无评分数据")
+
+    avg = float((counts_by_score * np.arange(11)).sum() / total)
+    dist_dict = {int(k): int(counts_by_score[k]) for k in np.nonzero(counts_by_score)[0]}
 
     # 计算 3-8 分的分布均匀度
-    focus = arr[(arr >= 3) & (arr <= 8)]
-    if focus.size:
-        # 统计 3-8 各分数的数量 (bin 3 to 8)
-        # minlength=9 保证有 index 0-8，取 [3:9] 对应 3,4,5,6,7,8
-        counts = np.bincount(focus, minlength=9)[3:9]
+    counts = counts_by_score[3:9]
+    focus_size = int(counts.sum())
+    if focus_size:
         # 计算最大偏差占比：(最大桶 - 最小桶) / 总样本数
-        max_dev = (counts.max() - counts.min()) / max(1, focus.size)
+        max_dev = (counts.max() - counts.min()) / focus_size
         # 均匀度得分：偏差越小分越高
         # 系数 1.2 意味着如果偏差达到 83% (1/1.2)，得分为 0
         uniform_score = max(0.0, 1 - max_dev * 1.2)
     else:
         uniform_score = 0.0
 
-    high_share = float((arr >= HIGH_SCORE_THRESHOLD).mean())
+    high_share = float(counts_by_score[HIGH_SCORE_THRESHOLD:].sum() / total)
 
     # 综合计算肖像得分：100% 取决于分布均匀度
     quality = uniform_score
@@ -109,7 +127,7 @@ def _score_quality(scores: List[int]) -> ScoreAnalysis:
     )
 
     return ScoreAnalysis(
-        count=sum(dist_dict.values()),
+        count=total,
         average=round(avg, 2),
         high_share=round(high_share, 3),
         distribution=dist_dict,
@@ -165,6 +183,11 @@ def conversion_table(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     # Normalize stage names using unified stage utilities
     stage_counts = Counter(normalize_stage(cand.get("stage")) or "" for cand in candidates)
+    return _conversion_rows(stage_counts)
+
+
+def _conversion_rows(stage_counts: Counter) -> List[Dict[str, Any]]:
+    """Conversion rows from per-stage counts (see `conversion_table`)."""
     rows: List[Dict[str, Any]] = []
     
     # Calculate stage counts
@@ -215,28 +238,37 @@ def conversion_table(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return rows
 
 
-def build_daily_candidate_counts(candidates: List[Dict[str, Any]], total_count: int, days: int = 30) -> List[Dict[str, Any]]:
+def build_daily_candidate_counts(
+    candidates: Iterable[Dict[str, Any]],
+    total_count: Optional[int] = None,
+    days: int = 30,
+) -> List[Dict[str, Any]]:
     """Build daily cumulative candidate counts for historical chart.
     
-    Note: Candidate collection only has updated_at field, not created_at.
-    We use updated_at as the date for counting.
+    Candidates are counted on the day of `created_ts` (epoch ms of the first insert);
+    records without it (collections not backfilled yet) fall back to `updated_at`.
     
     Args:
-        candidates: List of candidate records (limited by Milvus query limit)
-        total_count: Total number of candidates in the collection
+        candidates: Candidate records; a full `scan_candidates` stream gives exact counts
+        total_count: Total number of candidates in the collection. Only needed when
+            `candidates` is a truncated list: the candidates before the period are then
+            estimated as total_count - fetched in period - fetched without date.
         days: Number of days to show in the chart
     """
     today = datetime.now().date()
     start = today - timedelta(days=days - 1)
     
-    # Count candidates by updated_at date (candidate collection doesn't have created_at)
+    # Count candidates by creation date
     daily_counts = defaultdict(int)
     candidates_without_date = 0
     candidates_in_period = 0
+    candidates_before_period = 0
+    fetched = 0
     
     for cand in candidates:
-        # Candidate collection only has updated_at, not created_at
-        dt = _parse_dt(cand.get("updated_at"))
+        fetched += 1
+        created_ts = cand.get("created_ts")
+        dt = datetime.fromtimestamp(created_ts / 1000) if created_ts else _parse_dt(cand.get("updated_at"))
         if not dt:
             candidates_without_date += 1
             continue
@@ -244,17 +276,22 @@ def build_daily_candidate_counts(candidates: List[Dict[str, Any]], total_count:
         if day >= start:
             daily_counts[day] += 1
             candidates_in_period += 1
+        else:
+            candidates_before_period += 1
     
-    # Calculate candidates before the period
-    # Since we can only fetch 16384 candidates, we estimate:
-    # total_count - candidates_in_period - candidates_without_date = candidates_before_start
-    candidates_before_start = max(0, total_count - candidates_in_period - candidates_without_date)
-    
-    logger.debug(f"build_daily_candidate_counts: total_fetched={len(candidates)}, total_in_db={total_count}, in_period={candidates_in_period}, without_date={candidates_without_date}, before_start={candidates_before_start}")
+    if total_count is None:
+        candidates_before_start = candidates_before_period
+    else:
+        candidates_before_start = max(0, total_count - candidates_in_period - candidates_without_date)
     
+    logger.debug(f"build_daily_candidate_counts: total_fetched={fetched}, total_in_db={total_count}, in_period={candidates_in_period}, without_date={candidates_without_date}, before_start={candidates_before_start}")
+    return _cumulative_series(daily_counts, candidates_before_start, start, days)
+
+
+def _cumulative_series(daily_counts: Dict[Any, int], before_start: int, start, days: int) -> List[Dict[str, Any]]:
     # Build cumulative series starting from candidates before the period
     series = []
-    cumulative = candidates_before_start
+    cumulative = before_start
     for i in range(days):
         d = start + timedelta(days=i)
         count = daily_counts.get(d, 0)
@@ -267,6 +304,153 @@ def build_daily_candidate_counts(candidates: List[Dict[str, Any]], total_count:
     return series
 
 
+# Rollups older than this many backfill intervals are not served (one missed run is tolerated)
+_ROLLUP_MAX_AGE_INTERVALS = 2
+
+
+def rollups_ready() -> bool:
+    """Whether the rollups were reconciled by a recent backfill.
+
+    Incremental updates only reach the local SQLite file of the writing process, so
+    writes from other processes (vercel, scripts, another service instance) are only
+    picked up by the periodic backfill. Once the last backfill is older than
+    `_ROLLUP_MAX_AGE_INTERVALS` x ``backfill_interval_minutes``, stats are scanned instead.
+    """
+    try:
+        last_backfill = get_last_backfill()
+    except Exception as exc:  # noqa: BLE001 - fall back to scanning Milvus
+        logger.warning("Stats rollups unavailable: %s", exc)
+        return False
+    if last_backfill is None:
+        return False
+    interval_minutes = float(get_stats_config().get("backfill_interval_minutes") or 60)
+    age = datetime.now() - datetime.fromisoformat(last_backfill)
+    if age > timedelta(minutes=interval_minutes * _ROLLUP_MAX_AGE_INTERVALS):
+        logger.warning("统计汇总表已过期（上次回填 %s），改用扫描统计", last_backfill)
+        return False
+    return True
+
+
+def backfill_stats_rollups(days: int | None = None) -> int:
+    """Rebuild the rollups of the last `days` days from Milvus.
+
+    Reconciles whatever the incremental updates missed (deleted candidates, writes
+    outside `upsert_candidate`, crashes between the Milvus write and the rollup update).
+
+    Returns:
+        int: Number of candidates scanned
+    """
+    days = int(days or get_stats_config().get("backfill_days") or 30)
+    start_day = datetime.now().date() - timedelta(days=days - 1)
+    candidates = scan_candidates(
+        fields=["candidate_id", "job_applied", "stage", "analysis", "updated_at", "created_ts", "metadata"],
+        updated_from=datetime.combine(start_day, time.min).isoformat(),
+    )
+    facts = {
+        cand["candidate_id"]: fact_from_candidate(cand)
+        for cand in candidates
+        if cand.get("candidate_id")
+    }
+    written = replace_window(facts, start_day.isoformat())
+    logger.info("统计汇总回填完成: %s 天, %s 位候选人", days, written)
+    return written
+
+
+def build_daily_candidate_counts_from_rollups(total_count: int, days: int = 30) -> List[Dict[str, Any]]:
+    """Same series as `build_daily_candidate_counts` (by creation day), read from the rollup facts."""
+    start = datetime.now().date() - timedelta(days=days - 1)
+    daily_counts: Dict[Any, int] = defaultdict(int)
+    for day, count in query_created_counts(start.isoformat()).items():
+        daily_counts[datetime.fromisoformat(day).date()] += count
+    before_start = max(0, total_count - sum(daily_counts.values()))
+    return _cumulative_series(daily_counts, before_start, start, days)
+
+
+def _assemble_job_stats(
+    job_name: str,
+    start,
+    daily_counts,
+    stage_counts: Counter,
+    score_hist,
+    total: int,
+    seek: int,
+    contacted: int,
+) -> Dict[str, Any]:
+    """Build the `compile_job_stats` result from pre-aggregated counts.
+
+    Args:
+        start: First day of the daily series
+        daily_counts: (new, seek, processed) rows, one column per day from `start`
+        stage_counts: Normalized stage -> candidate count
+        score_hist: Score histogram (index = score 1-10)
+        total / seek / contacted: Totals over the whole 7-day window
+    """
+    score_summary = _score_quality_from_hist(score_hist)
+    high = int(sum(score_hist[HIGH_SCORE_THRESHOLD:11]))
+    new_row, seek_row, processed_row = daily_counts
+    daily = [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "new": int(new_row[i]),
+            "seek": int(seek_row[i]),
+            "processed": int(processed_row[i]),
+        }
+        for i in range(len(new_row))
+    ]
+    # 进展分 = (近7日候选人数量 + SEEK人数 + CONTACT人数 x 10) × 肖像得分 / 10
+    metric = (total + seek + contacted * 10) * score_summary.quality_score / 10
+    return {
+        "job": job_name,
+        "daily": daily,
+        "conversions": _conversion_rows(stage_counts),
+        "score_summary": score_summary,
+        "today": {
+            "count": total,  # 近7天候选人数量（用于进展分计算）
+            "high": high,  # 近7天高分人数
+            "seek": seek,  # 近7天SEEK人数
+            "contacted": contacted,  # 近7天已联系人数
+            "metric": round(metric, 2),  # 进展分（基于近7天）
+        },
+        "total": total,
+    }
+
+
+def _job_stats_from_rollups(job_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """`compile_job_stats` result computed from a job's rollup rows of the last 7 days."""
+    start = datetime.now().date() - timedelta(days=6)
+    daily_counts = [[0] * 7 for _ in range(3)]
+    stage_counts: Counter = Counter()
+    score_hist = [0] * 11
+    total = seek = contacted = 0
+    for row in rows:
+        count = row["count"]
+        offset = (datetime.fromisoformat(row["day"]).date() - start).days
+        in_window = 0 <= offset < 7
+        total += count
+        stage_counts[row["stage"]] += count
+        if in_window:
+            daily_counts[0][offset] += count
+        if row["stage"] == STAGE_SEEK:
+            seek += count
+            if in_window:
+                daily_counts[1][offset] += count
+        if row["contacted"]:
+            contacted += count
+            if in_window:
+                daily_counts[2][offset] += count
+        if row["score"] != NO_SCORE:
+            score_hist[max(1, min(10, row["score"]))] += count
+    return _assemble_job_stats(job_name, start, daily_counts, stage_counts, score_hist, total, seek, contacted)
+
+
+def _rollup_rows_by_job(jobs: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    start = datetime.now().date() - timedelta(days=6)
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in query_rollups(start.isoformat(), jobs):
+        grouped[row["job"]].append(row)
+    return grouped
+
+
 def fetch_job_candidates(job_name: str, days: int | None = None) -> List[Dict[str, Any]]:
     """Fetch candidates for a job with optional time range and limit.
     
@@ -292,63 +476,202 @@ def fetch_job_candidates(job_name: str, days: int | None = None) -> List[Dict[st
     )
 
 
-def compile_job_stats(job_name: str) -> Dict[str, Any]:
-    # 获取最近一周的候选人数据用于统计
-    # 不设置 limit，使用默认的 10000 以获取所有符合条件的候选人
-    candidates = fetch_job_candidates(job_name, days=7)
-    # Score analysis uses latest 100
-    recent_scores = [
-        (cand.get("analysis") or {}).get("overall")
-        for cand in candidates
-        if (cand.get("analysis") or {}).get("overall") is not None
-    ]
-    score_summary = _score_quality(recent_scores)
-
-    daily = build_daily_series(candidates, days=7)
-    conversions = conversion_table(candidates)
-
-    # 近7天统计数据（用于进展分计算和"best record"评选）
-    # candidates 已经是最近7天的数据（通过 days=7 获取）
-    recent_7days_candidates = candidates  # 最近7天的所有候选人
-    recent_7days_high = dist_count(
-        [
-            (c.get("analysis") or {}).get("overall")
-            for c in recent_7days_candidates
-            if (c.get("analysis") or {}).get("overall") is not None
-        ],
-        lambda s: s >= HIGH_SCORE_THRESHOLD,
+def fetch_recent_candidates(days: int = 7) -> Iterator[Dict[str, Any]]:
+    """Stream the candidates of every job updated in the last `days` days in one scan.
+
+    Only the fields needed by `aggregate_job_stats` are projected.
+    """
+    return scan_candidates(
+        fields=["job_applied", "stage", "analysis", "updated_at", "metadata"],
+        updated_from=(datetime.now() - timedelta(days=days)).isoformat(),
     )
-    # 进展分：近7天进展到SEEK和CONTACT阶段的候选人数
-    recent_7days_seek = sum(1 for c in recent_7days_candidates if normalize_stage(c.get("stage")) == STAGE_SEEK)
-    recent_7days_contacted = sum(1 for c in recent_7days_candidates if c.get("metadata", {}).get("contacted"))
-    
-    # 进展分 = (近7日候选人数量 + SEEK人数 + CONTACT人数 x 10) × 肖像得分 / 10
-    recent_7days_metric = (len(recent_7days_candidates) + recent_7days_seek + recent_7days_contacted * 10) * score_summary.quality_score / 10
-    
-    # 今日数据（用于显示今日新增）
-    today = datetime.now().date()
-    today_candidates = [c for c in candidates if _parse_dt(c.get("updated_at")) and _parse_dt(c.get("updated_at")).date() == today]
 
-    return {
-        "job": job_name,
-        "daily": daily,
-        "conversions": conversions,
-        "score_summary": score_summary,
-        "today": {
-            "count": len(recent_7days_candidates),  # 近7天候选人数量（用于进展分计算）
-            "high": recent_7days_high,  # 近7天高分人数
-            "seek": recent_7days_seek,  # 近7天SEEK人数
-            "contacted": recent_7days_contacted,  # 近7天已联系人数
-            "metric": round(recent_7days_metric, 2),  # 进展分（基于近7天）
-        },
-        "total": len(candidates),
+
+# Stage codes used by the vectorized aggregation; 0 = no / unknown stage
+_STAGE_CODES = {STAGE_PASS: 1, STAGE_CHAT: 2, STAGE_SEEK: 3, STAGE_CONTACT: 4}
+
+
+def _day_array(values: List[Any]):
+    """ISO timestamps -> numpy datetime64[D] (NaT when missing / unparsable).
+
+    Only the date prefix is used, matching `_parse_dt(...).date()` for the naive
+    local timestamps stored in Milvus.
+    """
+    import numpy as np  # type: ignore
+
+    prefixes = [str(v)[:10] if v else "NaT" for v in values]
+    try:
+        return np.array(prefixes, dtype="datetime64[D]")
+    except ValueError:
+        days = []
+        for prefix in prefixes:
+            try:
+                days.append(np.datetime64(prefix, "D"))
+            except ValueError:
+                days.append(np.datetime64("NaT", "D"))
+        return np.array(days, dtype="datetime64[D]")
+
+
+def _score_code(analysis: Any) -> int:
+    overall = analysis.get("overall") if isinstance(analysis, dict) else None
+    if overall is None:
+        return 0
+    try:
+        return max(1, min(10, int(overall)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def aggregate_job_stats(
+    candidates: Iterable[Dict[str, Any]],
+    jobs: Optional[Iterable[str]] = None,
+    days: int = 7,
+) -> Dict[str, Dict[str, Any]]:
+    """Compute `compile_job_stats` for every job from one candidate scan.
+
+    The candidates are flattened into columns in a single pass and handed to
+    `aggregate_job_columns`.
+
+    Args:
+        candidates: Candidates of the window (see `fetch_recent_candidates`)
+        jobs: Jobs that must appear in the result even without candidates
+        days: Length of the daily series
+
+    Returns:
+        Dict mapping job name to its stats
+    """
+    import numpy as np  # type: ignore
+
+    stage_cache: Dict[Any, str] = {}
+    job_names, stages, score_codes, contacted, updated = [], [], [], [], []
+    for cand in candidates:
+        job_names.append(cand.get("job_applied") or "")
+        raw_stage = cand.get("stage")
+        if raw_stage not in stage_cache:
+            stage_cache[raw_stage] = normalize_stage(raw_stage) or ""
+        stages.append(stage_cache[raw_stage])
+        score_codes.append(_score_code(cand.get("analysis")))
+        contacted.append(bool((cand.get("metadata") or {}).get("contacted")))
+        updated.append(cand.get("updated_at"))
+
+    columns = {
+        "job": np.array(job_names, dtype=object),
+        "stage": np.array(stages, dtype=object),
+        "score": np.array(score_codes, dtype=np.int64),
+        "contacted": np.array(contacted, dtype=bool),
+        "day": _day_array(updated),
     }
+    return aggregate_job_columns(columns, jobs=jobs, days=days)
+
+
+def aggregate_job_columns(
+    columns: Dict[str, Any],
+    jobs: Optional[Iterable[str]] = None,
+    days: int = 7,
+) -> Dict[str, Dict[str, Any]]:
+    """Vectorized `compile_job_stats` for every job from columnar candidate data.
+
+    Jobs and stages are dictionary-encoded with ``np.unique``; per-day series, stage
+    counts and score histograms of all jobs are then computed with one
+    ``np.bincount`` each over ``job_index * width + value``.
+
+    Args:
+        columns: Equal-length arrays ``job`` (str), ``stage`` (normalized str),
+            ``score`` (1-10, 0 if not analyzed), ``contacted`` (bool) and
+            ``day`` (datetime64[D], NaT if unknown) — e.g. `candidate_snapshot.stats_columns`
+        jobs: Jobs that must appear in the result even without candidates
+        days: Length of the daily series
+
+    Returns:
+        Dict mapping job name to its stats
+    """
+    import numpy as np  # type: ignore
+
+    job_index: Dict[str, int] = {job: i for i, job in enumerate(dict.fromkeys(jobs or []))}
+    job_names, job_inverse = np.unique(np.asarray(columns["job"]).astype(str), return_inverse=True)
+    job_lookup = np.array([job_index.setdefault(str(name), len(job_index)) for name in job_names], dtype=np.int64)
+    job_arr = job_lookup[job_inverse.reshape(-1)]
+    stage_names, stage_inverse = np.unique(np.asarray(columns["stage"]).astype(str), return_inverse=True)
+    stage_lookup = np.array([_STAGE_CODES.get(str(name), 0) for name in stage_names], dtype=np.int64)
+    stage_arr = stage_lookup[stage_inverse.reshape(-1)]
+    score_arr = np.clip(np.asarray(columns["score"], dtype=np.int64), 0, 10)
+    contacted_arr = np.asarray(columns["contacted"], dtype=bool)
+    is_seek = stage_arr == _STAGE_CODES[STAGE_SEEK]
+
+    n_jobs = len(job_index)
+    start = datetime.now().date() - timedelta(days=days - 1)
+    day_arr = np.asarray(columns["day"], dtype="datetime64[D]")
+    valid = ~np.isnat(day_arr)
+    offsets = np.full(len(job_arr), -1, dtype=np.int64)
+    offsets[valid] = (day_arr[valid] - np.datetime64(start, "D")).astype(np.int64)
+    in_window = (offsets >= 0) & (offsets < days)
+
+    def _grouped(width: int, values, mask=None, weights=None):
+        keys = job_arr * width + values
+        if mask is not None:
+            keys = keys[mask]
+            weights = weights[mask] if weights is not None else None
+        counts = np.bincount(keys, weights=weights, minlength=n_jobs * width)
+        return counts.astype(np.int64).reshape(n_jobs, width)
+
+    window_offsets = np.where(in_window, offsets, 0)
+    daily_new = _grouped(days, window_offsets, in_window)
+    daily_seek = _grouped(days, window_offsets, in_window, is_seek.astype(np.int64))
+    daily_processed = _grouped(days, window_offsets, in_window, contacted_arr.astype(np.int64))
+    stage_matrix = _grouped(len(_STAGE_CODES) + 1, stage_arr)
+    score_matrix = _grouped(11, score_arr)
+    totals = np.bincount(job_arr, minlength=n_jobs)
+    seek_totals = np.bincount(job_arr, weights=is_seek, minlength=n_jobs).astype(np.int64)
+    contacted_totals = np.bincount(job_arr, weights=contacted_arr, minlength=n_jobs).astype(np.int64)
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for job, i in job_index.items():
+        stage_counts = Counter({stage: int(stage_matrix[i, code]) for stage, code in _STAGE_CODES.items()})
+        result[job] = _assemble_job_stats(
+            job,
+            start,
+            (daily_new[i], daily_seek[i], daily_processed[i]),
+            stage_counts,
+            score_matrix[i],
+            int(totals[i]),
+            int(seek_totals[i]),
+            int(contacted_totals[i]),
+        )
+    return result
+
+
+def _stats_by_job(positions: List[str], scan: Callable[[], List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Last-7-day stats of `positions` from the first source that works.
+
+    Rollups, then the local snapshot, then `scan` (candidates fetched from Milvus); an
+    error in one source falls through to the next instead of failing the stats.
+    """
+    if rollups_ready():
+        try:
+            # 汇总表可用时一次查询取回所有岗位近7天的数据
+            rollup_rows = _rollup_rows_by_job(positions)
+            return {p: _job_stats_from_rollups(p, rollup_rows.get(p, [])) for p in positions}
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("汇总表统计失败，改用快照或扫描: %s", exc)
+    try:
+        if is_snapshot_fresh():
+            # 本地列式快照足够新时直接在快照上向量化统计
+            return aggregate_job_columns(snapshot_stats_columns(days=7), jobs=positions)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("快照统计失败，改用 Milvus 扫描: %s", exc)
+    return aggregate_job_stats(scan(), jobs=positions)
+
+
+def compile_job_stats(job_name: str) -> Dict[str, Any]:
+    # 获取最近一周的候选人数据用于统计
+    return _stats_by_job([job_name], lambda: fetch_job_candidates(job_name, days=7))[job_name]
 
 
 def compile_all_jobs() -> Dict[str, Any]:
     jobs = get_all_jobs() or []
     stats: List[Dict[str, Any]] = []
     skipped_inactive_jobs = 0
+    active: List[tuple] = []
     for job in jobs:
         position = job.get("position") or job.get("job_id")
         if not position:
@@ -357,12 +680,21 @@ def compile_all_jobs() -> Dict[str, Any]:
         if status == "inactive":
             skipped_inactive_jobs += 1
             continue
-        try:
-            job_stat = compile_job_stats(position)
-            job_stat["status"] = status
-            stats.append(job_stat)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("统计岗位 %s 失败: %s", position, exc)
+        active.append((position, status))
+
+    positions = [position for position, _ in active]
+    try:
+        # 扫描时一次取回所有岗位近7天的候选人，按岗位分组向量化统计
+        by_job = _stats_by_job(positions, lambda: fetch_recent_candidates(days=7))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("统计岗位失败: %s", exc)
+        by_job = {}
+    for position, status in active:
+        if position not in by_job:
+            continue
+        job_stat = by_job[position]
+        job_stat["status"] = status
+        stats.append(job_stat)
     best = max(stats, key=lambda s: s["today"]["metric"], default=None)
     result = {"jobs": stats, "best": best}
     if skipped_inactive_jobs > 0:
@@ -404,6 +736,12 @@ def send_daily_dingtalk_report() -> bool:
 __all__ = [
     "compile_all_jobs",
     "compile_job_stats",
+    "aggregate_job_columns",
+    "aggregate_job_stats",
+    "backfill_stats_rollups",
+    "build_daily_candidate_counts",
+    "build_daily_candidate_counts_from_rollups",
+    "rollups_ready",
     "build_daily_series",
     "conversion_table",
     "send_daily_dingtalk_report",
@@ -0,0 +1,163 @@
+"""Precompiled resume text normalization shared by capture and matching.
+
+Shared by the capture modules (`clean_resume_text`, `collapse_line_breaks`) and by
+resume matching (`normalize_resume_for_matching`, whose output the stored
+`resume_minhash` signatures are computed from). Each function is output-identical
+to the multi-pass ``re.sub`` chain it replaces; `test/golden/text_normalize.json`
+pins that and `scripts/benchmark_text_normalize.py` re-checks it against the
+original chains on random input and reports the speedup.
+
+Where the time went and what replaced it:
+    NFKC dominates: Chinese resumes are full of full-width punctuation, so the
+        quick check fails and the whole text is normalized. `nfkc` first maps
+        runs of full-width forms / ideographic spaces to their NFKC form (exact,
+        since NFKD(NFKC(c)) == NFKD(c)), after which the quick check usually
+        passes and the full normalization is skipped.
+    clean_resume_text: patterns are compiled once, BOSS tokens are only searched
+        when ``~~`` occurs, the ``\\n{4,}`` pass is dropped (it cannot fire after
+        the blank-line collapse) and trailing spaces are removed before space runs
+        are collapsed, so the latter needs no lookahead.
+    collapse_line_breaks: the literal newline passes are ``str.replace`` and only
+        ``\\n<space>\\n`` needs a (precompiled) pattern.
+    normalize_resume_for_matching: the section patterns only run when their
+        literal prefix occurs, the trailing section cut is two ``str.find`` and the
+        whitespace passes are ``" ".join(text.split())`` (same whitespace as ``\\s``).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+# ------------------------------------------------------------------
+# NFKC
+# ------------------------------------------------------------------
+# Full-width ASCII forms, ideographic space and no-break space: single characters under NFKC
+_WIDE_CHARS = {c: unicodedata.normalize("NFKC", chr(c)) for c in (*range(0xFF01, 0xFF5F), 0x3000, 0xA0)}
+_WIDE_RUN_RE = re.compile("[" + "".join(re.escape(chr(c)) for c in _WIDE_CHARS) + "]+")
+
+
+def _narrow(match: re.Match) -> str:
+    return match.group().translate(_WIDE_CHARS)
+
+
+def nfkc(text: str) -> str:
+    """``unicodedata.normalize("NFKC", text)``, skipping the full pass when only full-width forms differ."""
+    text = _WIDE_RUN_RE.sub(_narrow, text)
+    return text if unicodedata.is_normalized("NFKC", text) else unicodedata.normalize("NFKC", text)
+
+
+# ------------------------------------------------------------------
+# clean_resume_text
+# ------------------------------------------------------------------
+# NUL and C0 controls except \t \n \r, plus DEL
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+# BOSS-style hashed tokens, e.g. f6a4b4051154ea161XJ_2tS-GFFTwYu4VvOcWOGkl_7RPhFl3g~~
+_BOSS_TOKEN_RE = re.compile(r"[A-Za-z0-9_-]{10,}~~")
+_BLANK_LINES_RE = re.compile(r"\n\s+\n")
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+\n")
+_SPACE_RUN_RE = re.compile(r"[ \t]{2,}")
+
+
+def clean_resume_text(text: str) -> str:
+    """Clean resume text by removing control characters, BOSS tokens, and normalizing formatting.
+
+    This function:
+    - Removes null bytes and control characters (PRESERVES newlines and tabs)
+    - Removes BOSS-style hashed tokens (e.g., "07ab71446862f8541Xx629-5F1RQxY6-VfmXWOGkl_7RPhFl3g~~")
+    - Normalizes unicode (NFKC)
+    - Collapses whitespace-only lines (and 3+ newlines) into one blank line
+    - Removes trailing spaces and collapses space runs (but preserves newlines)
+    """
+    if not text:
+        return ""
+    text = _CONTROL_CHARS_RE.sub("", text)
+    if "~~" in text:
+        text = _BOSS_TOKEN_RE.sub("", text)
+    text = nfkc(text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    text = _TRAILING_SPACE_RE.sub("\n", text)
+    return _SPACE_RUN_RE.sub(" ", text).strip()
+
+
+# ------------------------------------------------------------------
+# collapse_line_breaks
+# ------------------------------------------------------------------
+_HARD_BREAK_RE = re.compile(r"\n{3,}")
+_SPACED_BREAK_RE = re.compile(r"\n\s\n")
+_HARD_BREAK_MARKER = "<TRIPLE_NL>"
+
+
+def collapse_line_breaks(text: str) -> str:
+    """Join PDF text-layer lines: drop single/double newlines, keep 3+ newlines as one blank line."""
+    text = _HARD_BREAK_RE.sub(_HARD_BREAK_MARKER, text)
+    # only runs of exactly two newlines are left to drop here
+    text = text.replace("\n\n", "")
+    text = _SPACED_BREAK_RE.sub("", text)
+    return text.replace("\n", "").replace(_HARD_BREAK_MARKER, "\n\n")
+
+
+# ------------------------------------------------------------------
+# normalize_resume_for_matching
+# ------------------------------------------------------------------
+# 牛人分析器 section (statistics that vary)
+_ANALYZER_RE = re.compile(r"牛人分析器.*?查看全部\d+项分析", re.DOTALL)
+# Privacy notice section
+_PRIVACY_RE = re.compile(r"为妥善保护.*?传播、存储。", re.DOTALL)
+
+
+def normalize_resume_for_matching(text: str) -> str:
+    """Normalize resume text for similarity comparison.
+
+    Removes metadata sections that vary between captures (like statistics,
+    other candidates, privacy notices) and normalizes whitespace to focus
+    on the core resume content.
+
+    Args:
+        text: Raw resume text
+
+    Returns:
+        Normalized resume text with only core content
+    """
+    if not text:
+        return ""
+    # Clean literal line-break escape sequences that appear in scraped text
+    text = text.replace(r"\r\n", " ")
+    if "牛人分析器" in text:
+        text = _ANALYZER_RE.sub("", text)
+    if "为妥善保护" in text:
+        text = _PRIVACY_RE.sub("", text)
+    # Cut at the 经历概览 summary, or earlier at the 其他名…牛人 recommendations that precede it
+    cut = text.find("经历概览")
+    others = text.find("其他名")
+    if others >= 0 and (cut < 0 or others < cut):
+        people = text.find("牛人", others + 3)
+        if people >= 0 and text.find("经历概览", people + 2) >= 0:
+            cut = others
+    if cut >= 0:
+        text = text[:cut]
+    return " ".join(text.split())
+
+
+def resume_similarity(text1: str, text2: str) -> float:
+    """``SequenceMatcher`` ratio of the two resumes' `normalize_resume_for_matching` text.
+
+    Quadratic in the worst case, so `candidate_store` runs it in `cpu_pool` for large resumes.
+    """
+    if not text1 or not text2:
+        return 0.0
+    norm1 = normalize_resume_for_matching(text1)
+    norm2 = normalize_resume_for_matching(text2)
+    if not norm1 or not norm2:
+        return 0.0
+    return SequenceMatcher(None, norm1, norm2).ratio()
+
+
+__all__ = [
+    "nfkc",
+    "clean_resume_text",
+    "collapse_line_breaks",
+    "normalize_resume_for_matching",
+    "resume_similarity",
+]
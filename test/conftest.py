@@ -0,0 +1,43 @@
+import importlib
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_job_catalog():
+    """Tests patch `src.jobs_store._client`; never serve jobs cached by a previous test."""
+    jobs_store = sys.modules.get("src.jobs_store")
+    if jobs_store is not None:
+        jobs_store.invalidate_job_catalog()
+    yield
+
+
+# (module, path attribute, cached connection attribute or None, file name)
+_LOCAL_STORES = [
+    ("src.stats_rollup_store", "_STORE_PATH", "_conn", "stats_rollups.sqlite3"),
+    ("src.candidate_snapshot", "_SNAPSHOT_PATH", None, "candidate_snapshot.arrow"),
+    ("src.resume_index", "_INDEX_PATH", "_conn", "resume_index.sqlite3"),
+    ("src.candidate_dedupe", "_INDEX_PATH", "_conn", "candidate_dedupe.sqlite3"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _tmp_local_stores(tmp_path_factory, monkeypatch):
+    """Point the file-backed stores under `data/` at a temp dir, so tests never touch the real ones."""
+    root = tmp_path_factory.mktemp("stores")
+    patched = []
+    for name, path_attr, conn_attr, filename in _LOCAL_STORES:
+        try:
+            module = importlib.import_module(name)
+        except Exception:  # noqa: BLE001 - e.g. no secrets.yaml; tests needing the store fail on their own
+            continue
+        monkeypatch.setattr(module, path_attr, root / filename)
+        if conn_attr:
+            monkeypatch.setattr(module, conn_attr, None)
+            patched.append((module, conn_attr))
+    yield
+    for module, conn_attr in patched:
+        conn = getattr(module, conn_attr)
+        if conn is not None:
+            conn.close()
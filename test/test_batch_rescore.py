@@ -0,0 +1,81 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts" / "prompt_optmization"))
+
+from src import candidate_store
+
+batch_rescore = pytest.importorskip("batch_rescore")
+
+_SCORES = {"skill": 8, "startup_fit": 7, "background": 6, "overall": 7, "summary": "匹配", "followup_tips": "约面试"}
+
+
+def _line(custom_id, body=None, status_code=200, error=None):
+    response = None if error else {"status_code": status_code, "body": body}
+    return {"id": f"req_{custom_id}", "custom_id": custom_id, "response": response, "error": error}
+
+
+def _output(obj):
+    text = obj if isinstance(obj, str) else json.dumps(obj, ensure_ascii=False)
+    return {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+
+
+class PartialUpsertClient:
+    """Fake Milvus client enforcing pymilvus' rule that partial upsert rows share one field set."""
+
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, collection_name, data, partial_update):
+        if len({frozenset(row) for row in data}) > 1:
+            raise Exception("DataNotMatchException: The data fields length is inconsistent")
+        self.upserts.append(data)
+
+
+def test_parse_batch_results():
+    scores, errors = batch_rescore.parse_batch_results([
+        _line("ok", _output(_SCORES)),
+        _line("prose", _output("结论如下：" + json.dumps(_SCORES, ensure_ascii=False))),
+        _line("http", {"error": {"message": "rate limited"}}, status_code=429),
+        _line("failed", error={"code": "timeout", "message": "request timed out"}),
+        _line("garbled", _output("无法评分")),
+        _line("partial", _output({"overall": 7})),
+        {"custom_id": None, "response": {"status_code": 200, "body": _output(_SCORES)}},
+    ])
+    assert scores == {"ok": _SCORES, "prose": _SCORES}
+    assert errors["http"] == "HTTP 429: rate limited" and errors["failed"] == "request timed out"
+    assert errors["garbled"] == "failed to parse analysis JSON"
+    assert errors["partial"].startswith("analysis schema validation failed")
+
+
+def test_ingest_merges_scores_onto_the_live_analysis(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(candidate_store._all_fields))
+    run_dir = tmp_path / "run"
+    (run_dir / "candidates").mkdir(parents=True)
+    for cid in ("c1", "c2", "gone"):
+        # export-time snapshot: superseded by the live record
+        export = {"candidate_id": cid, "name": f"候选人{cid}", "analysis": {"overall": 3, "action": "PASS", "message": "旧消息"}}
+        (run_dir / "candidates" / f"{cid}.json").write_text(json.dumps(export, ensure_ascii=False), encoding="utf-8")
+    batch_rescore._write_jsonl(run_dir / "rescore" / "results_001.jsonl", [_line(cid, _output(_SCORES)) for cid in ("c1", "c2", "gone")])
+    batch_rescore._save_state(run_dir, {"model": "m", "files": [{"requests": "requests_001.jsonl", "results": "results_001.jsonl"}]})
+
+    live = [
+        {"candidate_id": "c1", "analysis": {"overall": 5, "action": "CHAT", "message": "新消息", "reason": "聊过了"}},
+        {"candidate_id": "c2", "analysis": {"overall": 6}},  # no action: the typed column is not derived
+    ]
+    client = PartialUpsertClient()
+    with patch.object(candidate_store, "_client", client), patch("src.candidate_store.fetch_candidates", return_value=live):
+        summary = batch_rescore.step_ingest(run_dir, dry_run=False, write_batch_size=100)
+
+    written = {row["candidate_id"]: row for batch in client.upserts for row in batch}
+    assert summary["written"] == 2 and set(written) == {"c1", "c2"}
+    assert summary["errors"] == {"gone": "candidate no longer exists"}
+    c1 = written["c1"]["analysis"]
+    assert (c1["action"], c1["message"], c1["reason"], c1["overall"], c1["rescore_model"]) == ("CHAT", "新消息", "聊过了", 7, "m")
+    assert written["c1"]["action"] == "CHAT" and "action" not in written["c2"]
+    assert [(c["name"], c["overall_before"]) for c in summary["changes"]] == [("候选人c1", 5), ("候选人c2", 6)]
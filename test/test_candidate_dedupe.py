@@ -0,0 +1,182 @@
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_dedupe
+from src.candidate_dedupe import (
+    band_keys,
+    estimate_cosine,
+    find_duplicates,
+    read_report,
+    resolve_duplicates,
+    simhash_sketch,
+    sync_dedupe_index,
+    write_report,
+)
+from src.minhash import encode_signature, minhash_signature
+
+_CHARS = [chr(0x4E00 + i) for i in range(2000)]
+
+
+def _text(seed: int, n: int = 2000) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(_CHARS) for _ in range(n))
+
+
+def _ts(days_ago: int) -> str:
+    return (datetime.now() - timedelta(days=days_ago)).isoformat()
+
+
+def _row(cid, name, text, days_ago, **extra):
+    return {"candidate_id": cid, "name": name, "updated_at": _ts(days_ago), "resume_minhash": encode_signature(minhash_signature(text)), **extra}
+
+
+@pytest.fixture(autouse=True)
+def _tmp_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_dedupe, "_INDEX_PATH", tmp_path / "dedupe.sqlite3")
+    monkeypatch.setattr(candidate_dedupe, "_conn", None)
+    monkeypatch.setattr(candidate_dedupe, "get_dedupe_config", lambda: {"match_fields": ["name"], "use_vectors": True})
+    yield
+    if candidate_dedupe._conn is not None:
+        candidate_dedupe._conn.close()
+
+
+class FakeSource:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __call__(self, fields, updated_from=None):
+        return [r for r in self.rows if not updated_from or r["updated_at"] >= updated_from]
+
+
+def test_sketches_and_bands():
+    rng = np.random.default_rng(1)
+    v = rng.standard_normal(64)
+    near = v + 0.05 * rng.standard_normal(64)
+    assert simhash_sketch([0.0] * 64) is None and simhash_sketch(None) is None
+    assert estimate_cosine(simhash_sketch(v), simhash_sketch(near)) > 0.95
+    assert abs(estimate_cosine(simhash_sketch(v), simhash_sketch(rng.standard_normal(64)))) < 0.3
+    keys = band_keys(minhash_signature("abcdefgh").astype("<u4").tobytes(), simhash_sketch(v))
+    assert len(keys) == 32 + 16 and keys[32][0] == 32
+
+
+def test_clusters_need_similar_resume_and_same_name():
+    base = _text(1)
+    source = FakeSource([
+        _row("a1", "张三", base, 3),
+        _row("a2", "张三", base[:1900] + _text(2, 50), 1),
+        _row("a3", "张三", base[100:], 2),
+        _row("b1", "李四", base, 2),                  # same resume, other name
+        _row("c1", "张三", _text(3), 1),              # same name, other resume
+        {"candidate_id": "v1", "name": "王五", "updated_at": _ts(2), "resume_vector": [1.0, 2.0, 3.0, 4.0]},
+        {"candidate_id": "v2", "name": "王五", "updated_at": _ts(1), "resume_vector": [1.0, 2.0, 3.0, 4.1]},
+        {"candidate_id": "z1", "name": "王五", "updated_at": _ts(1), "resume_vector": [0.0] * 4},
+    ])
+    assert sync_dedupe_index(source=source)["sketched"] == 7
+    clusters = sorted(find_duplicates(), key=lambda c: c["keep"])
+    assert [(c["keep"], c["duplicates"]) for c in clusters] == [("a2", ["a3", "a1"]), ("v2", ["v1"])]
+    assert 0.65 <= clusters[0]["similarity"] < 1.0
+    assert clusters[0]["members"][0] == {"candidate_id": "a2", "name": "张三", "job_applied": None, "updated_at": source.rows[1]["updated_at"]}
+
+
+def test_incremental_sync_reports_only_new_clusters(tmp_path):
+    base = _text(4)
+    source = FakeSource([_row("a1", "张三", base, 3), _row("b1", "李四", _text(5), 3)])
+    sync_dedupe_index(source=source)
+    report = tmp_path / "dupes.jsonl"
+    assert sync_dedupe_index(source=source, report_path=str(report))["clusters"] == 0
+
+    source.rows.append(_row("a2", "张三", base[:1950], 0))
+    result = sync_dedupe_index(source=source, report_path=str(report))
+    assert result["sketched"] == 1 and result["clusters"] == 1
+    assert [c["duplicates"] for c in read_report(str(report))] == [["a1"]]
+
+    # unchanged sketches are not reported again
+    assert sync_dedupe_index(source=source, report_path=str(report))["clusters"] == 0
+
+
+def test_resolve_merges_missing_fields_then_deletes(tmp_path):
+    clusters = [{"keep": "a2", "duplicates": ["a1"]}, {"keep": "x", "duplicates": []}]
+    sig = encode_signature(minhash_signature(_text(6)))
+    rows = [
+        {"candidate_id": "a2", "name": "张三", "resume_minhash": sig, "metadata": {"source": "recommend"}},
+        {"candidate_id": "a1", "name": "张三", "resume_minhash": sig, "chat_id": "chat-1", "metadata": {"source": "chat", "contacted": True}},
+    ]
+    with patch("src.candidate_store.fetch_candidates", return_value=rows), \
+            patch("src.candidate_store.bulk_update_candidates") as update, \
+            patch("src.candidate_store.delete_candidates") as delete:
+        assert resolve_duplicates(clusters, dry_run=True) == {"clusters": 1, "skipped": 0, "merged": 1, "deleted": 1}
+        update.assert_not_called()
+        delete.assert_not_called()
+        resolve_duplicates(clusters, dry_run=False)
+    assert update.call_args.args[0] == [
+        {"candidate_id": "a2", "chat_id": "chat-1", "metadata": {"source": "recommend", "contacted": True}}
+    ]
+    assert update.call_args.kwargs == {"touch": False}
+    delete.assert_called_once_with(["a1"])
+
+    path = tmp_path / "r.jsonl"
+    assert write_report(iter(clusters), str(path)) == 2 and len(list(read_report(str(path)))) == 2
+
+
+def test_resolve_rechecks_stale_clusters():
+    base = _text(7)
+    rows = [
+        {"candidate_id": "a2", "name": "张三", "resume_minhash": encode_signature(minhash_signature(base))},
+        {"candidate_id": "a1", "name": "张三", "resume_minhash": encode_signature(minhash_signature(base[:1950]))},
+        {"candidate_id": "a3", "name": "张三", "resume_minhash": encode_signature(minhash_signature(_text(8)))},  # resume changed since
+        {"candidate_id": "b1", "name": "李四", "resume_minhash": encode_signature(minhash_signature(base))},
+    ]
+    clusters = [
+        {"keep": "a2", "duplicates": ["a1", "a3", "gone"]},
+        {"keep": "deleted", "duplicates": ["b1"]},  # kept candidate no longer exists
+    ]
+    for merge in (True, False):
+        with patch("src.candidate_store.fetch_candidates", return_value=rows) as fetch, \
+                patch("src.candidate_store.bulk_update_candidates"), \
+                patch("src.candidate_store.delete_candidates") as delete:
+            totals = resolve_duplicates(clusters, merge=merge, dry_run=False)
+        fetch.assert_called_once()
+        delete.assert_called_once_with(["a1"])
+        assert totals == {"clusters": 1, "skipped": 1, "merged": 0, "deleted": 1}
+
+
+class PartialUpsertClient:
+    """Fake Milvus client enforcing pymilvus' rule that partial upsert rows share one field set."""
+
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, collection_name, data, partial_update):
+        if len({frozenset(row) for row in data}) > 1:
+            raise Exception("DataNotMatchException: The data fields length is inconsistent")
+        self.upserts.append(data)
+
+
+def test_resolve_writes_merges_with_different_fields(monkeypatch):
+    from src import candidate_store
+
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(candidate_store._all_fields))
+    sig_a, sig_b = (encode_signature(minhash_signature(_text(seed))) for seed in (9, 10))
+    rows = [
+        {"candidate_id": "a2", "name": "张三", "resume_minhash": sig_a},
+        {"candidate_id": "a1", "name": "张三", "resume_minhash": sig_a, "chat_id": "chat-1"},
+        {"candidate_id": "b2", "name": "李四", "resume_minhash": sig_b, "metadata": {"source": "recommend"}},
+        {"candidate_id": "b1", "name": "李四", "resume_minhash": sig_b, "metadata": {"contacted": True}},
+    ]
+    client = PartialUpsertClient()
+    with patch.object(candidate_store, "_client", client), \
+            patch("src.candidate_store.fetch_candidates", return_value=rows), \
+            patch("src.candidate_store.delete_candidates"):
+        totals = resolve_duplicates([{"keep": "a2", "duplicates": ["a1"]}, {"keep": "b2", "duplicates": ["b1"]}], dry_run=False)
+    assert totals["merged"] == 2
+    written = {row["candidate_id"]: row for batch in client.upserts for row in batch}
+    assert len(client.upserts) == 2 and written["a2"]["chat_id"] == "chat-1"
+    assert written["b2"]["metadata"] == {"source": "recommend", "contacted": True} and written["b2"]["contacted"] is True
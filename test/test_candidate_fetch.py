@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import _all_fields, estimate_row_bytes, fetch_candidates, scan_candidates, sized_batch_rows
+
+
+@pytest.fixture(autouse=True)
+def _fresh_estimates(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_field_bytes", {})
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+
+
+class SizeCappedClient:
+    """Fake Milvus rejecting responses above `max_bytes`, like the gRPC message limit."""
+
+    def __init__(self, rows, max_bytes):
+        self.rows = {r["candidate_id"]: r for r in rows}
+        self.max_bytes = max_bytes
+        self.batches = []
+
+    def query(self, collection_name, filter, output_fields, limit):
+        ids = [part.strip(" '") for part in filter[len("candidate_id in ["):-1].split(",")]
+        rows = [{f: self.rows[i].get(f) for f in output_fields} for i in ids if i in self.rows]
+        size = sum(len(str(r).encode("utf-8")) for r in rows)
+        self.batches.append((len(ids), size <= self.max_bytes))
+        if size > self.max_bytes:
+            raise Exception(f"<_MultiThreadedRendezvous: StatusCode.RESOURCE_EXHAUSTED, Received message larger than max ({size} vs. {self.max_bytes})>")
+        return rows
+
+
+def test_batches_follow_observed_sizes():
+    prior = sized_batch_rows(["candidate_id", "resume_text"])
+    assert prior == candidate_store._RESPONSE_BUDGET_BYTES // estimate_row_bytes(["candidate_id", "resume_text"])
+    candidate_store._observe_row_sizes([{"candidate_id": "c1", "resume_text": "短简历" * 100}], ["candidate_id", "resume_text"])
+    assert sized_batch_rows(["candidate_id", "resume_text"]) > 20 * prior
+    assert sized_batch_rows(["candidate_id"], cap=500) == 500
+
+
+def test_fetch_splits_oversized_batches_and_keeps_order(monkeypatch):
+    rows = [{"candidate_id": f"c{i}", "full_resume": "经历" * (50 if i % 2 else 2000)} for i in range(12)]
+    client = SizeCappedClient(rows, max_bytes=30_000)
+    monkeypatch.setattr(candidate_store, "_RESPONSE_BUDGET_BYTES", 10**7)  # force an oversized first batch
+    ids = [f"c{i}" for i in (5, 0, 11, 3, 99, 7, 2, 1, 4, 6, 8, 9, 10)]
+    with patch.object(candidate_store, "_client", client):
+        result = fetch_candidates(ids, fields=["full_resume"])
+    assert [r["candidate_id"] for r in result] == [i for i in ids if i != "c99"]
+    assert client.batches[0] == (13, False) and any(ok for _, ok in client.batches)
+    assert candidate_store._field_bytes["full_resume"] == len(("经历" * 2000).encode("utf-8"))
+
+
+def test_scan_probes_field_sizes_before_sizing_iterator():
+    client = MagicMock()
+    client.query.return_value = [{"candidate_id": "c1", "metadata": {"history": []}}]
+    client.query_iterator.return_value.next.return_value = []
+    with patch.object(candidate_store, "_client", client):
+        list(scan_candidates(fields=["candidate_id", "metadata"]))
+        list(scan_candidates(fields=["candidate_id", "metadata"]))
+    assert client.query.call_count == 1 and client.query.call_args.kwargs["limit"] == candidate_store._PROBE_ROWS
+    assert client.query_iterator.call_args.kwargs["batch_size"] == sized_batch_rows(["candidate_id", "metadata"], cap=2000)
+
+
+def test_scan_restarts_oversized_batches_after_last_key():
+    rows = [{"candidate_id": f"c{i}", "full_resume": "经历"} for i in range(5)]
+    first, second = MagicMock(), MagicMock()
+    first.next.side_effect = [rows[:2], Exception("StatusCode.RESOURCE_EXHAUSTED: Received message larger than max")]
+    second.next.side_effect = [rows[2:], []]
+    client = MagicMock()
+    client.query_iterator.side_effect = [first, second]
+    with patch.object(candidate_store, "_client", client):
+        result = list(scan_candidates(filter_expr="job_applied == 'J'", fields=["candidate_id", "full_resume"], batch_size=8))
+    assert [r["candidate_id"] for r in result] == [f"c{i}" for i in range(5)]
+    restart = client.query_iterator.call_args_list[1].kwargs
+    assert restart["batch_size"] == 4 and restart["filter"] == "((job_applied == 'J')) AND (candidate_id > 'c1')"
+    assert first.close.called and second.close.called
@@ -0,0 +1,99 @@
+import re
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import BM25_FIELDS, _all_fields, build_collection_schema, hybrid_search_candidates, search_candidates_advanced
+
+
+def _remote_fields(bm25=True):
+    fields = frozenset(_all_fields) | (frozenset(BM25_FIELDS.values()) if bm25 else frozenset())
+    return patch.object(candidate_store, "_get_existing_field_names", lambda: fields)
+
+
+def _hits(*ids):
+    return [[{"id": cid, "distance": 1.0, "entity": {"candidate_id": cid, "updated_at": f"2025-01-0{i + 1}"}} for i, cid in enumerate(ids)]]
+
+
+def test_schema_generates_sparse_fields_with_bm25():
+    schema = build_collection_schema()
+    outputs = {name for fn in schema.functions for name in fn.output_field_names}
+    assert outputs == set(BM25_FIELDS.values())
+    assert all(f.params.get("enable_analyzer") for f in schema.fields if f.name in BM25_FIELDS)
+    assert not set(BM25_FIELDS.values()) & set(_all_fields)  # never written by clients
+
+
+def test_keyword_search_uses_bm25_with_filters_pushed_down():
+    client = MagicMock()
+    client.hybrid_search.return_value = _hits("b", "a")
+    with _remote_fields(), patch.object(candidate_store, "_client", client):
+        results = search_candidates_advanced(resume_contains="机器学习", job_applied="J", sort_by="relevance", limit=5)
+    assert [c["candidate_id"] for c in results] == ["b", "a"]  # fused order kept
+    client.query.assert_not_called()
+    requests = client.hybrid_search.call_args.kwargs["reqs"]
+    assert [r.anns_field for r in requests] == list(BM25_FIELDS.values())  # keywords only: no embedding call
+    # BM25 only orders the candidates that contain the keyword
+    assert all(r.expr == "job_applied == 'J' AND ((resume_text like '%机器学习%') or (full_resume like '%机器学习%'))" for r in requests)
+
+
+def test_semantic_query_adds_dense_request():
+    client = MagicMock()
+    client.hybrid_search.return_value = _hits("a")
+    with _remote_fields(), patch.object(candidate_store, "_client", client), \
+            patch.object(candidate_store, "get_embedding", return_value=[0.1, 0.2]):
+        assert [c["candidate_id"] for c in hybrid_search_candidates(query="做过推荐系统的算法工程师")] == ["a"]
+    requests = client.hybrid_search.call_args.kwargs["reqs"]
+    assert [r.anns_field for r in requests] == [*BM25_FIELDS.values(), "resume_vector"]
+
+
+def test_falls_back_to_like_scan():
+    client = MagicMock()
+    client.query.return_value = [{"candidate_id": "a"}]
+    with _remote_fields(bm25=False), patch.object(candidate_store, "_client", client):
+        assert hybrid_search_candidates(keywords="Java") is None
+        search_candidates_advanced(resume_contains="Java", job_applied="J", limit=5)
+    assert client.query.call_args.kwargs["filter"] == (
+        "job_applied == 'J' AND ((resume_text like '%Java%') or (full_resume like '%Java%'))"
+    )
+
+    client.hybrid_search.side_effect = RuntimeError("no BM25 on this server")
+    with _remote_fields(), patch.object(candidate_store, "_client", client):
+        assert [c["candidate_id"] for c in search_candidates_advanced(resume_contains="Java", limit=5)] == ["a"]
+    assert "like '%Java%'" in client.query.call_args.kwargs["filter"]
+
+
+class FilteringClient:
+    """Fake Milvus applying the LIKE containment of a filter; BM25 / dense recall returns every row."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def _match(self, expr):
+        keywords = re.findall(r"resume_text like '%(.*?)%'", expr or "")
+        return [
+            {"entity": dict(r), **dict(r)} for r in self.rows
+            if all(k in (r.get("resume_text") or "") or k in (r.get("full_resume") or "") for k in keywords)
+        ]
+
+    def hybrid_search(self, collection_name, reqs, ranker, limit, output_fields):
+        return [self._match(reqs[0].expr)[:limit]]
+
+    def query(self, collection_name, filter, output_fields, limit, **kwargs):
+        return [{k: v for k, v in hit.items() if k != "entity"} for hit in self._match(filter)][:limit]
+
+
+def test_keyword_query_never_returns_non_matching_resumes():
+    rows = [
+        {"candidate_id": "a", "resume_text": "五年机器学习经验", "updated_at": "2025-01-01"},
+        {"candidate_id": "b", "resume_text": "机器视觉 + 深度学习", "updated_at": "2025-01-02"},  # shares the BM25 tokens only
+        {"candidate_id": "c", "full_resume": "负责机器学习平台", "updated_at": "2025-01-03"},
+    ]
+    client = FilteringClient(rows)
+    with _remote_fields(), patch.object(candidate_store, "_client", client), \
+            patch.object(candidate_store, "get_embedding", return_value=[0.1, 0.2]):
+        for kwargs in ({"sort_by": "relevance"}, {"sort_by": "updated_at"}, {"sort_by": "relevance", "semantic_query": "算法工程师"}):
+            results = search_candidates_advanced(resume_contains="机器学习", limit=10, **kwargs)
+            assert sorted(c["candidate_id"] for c in results) == ["a", "c"], kwargs
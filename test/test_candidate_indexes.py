@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.candidate_store import SCALAR_INDEXES, ensure_scalar_indexes
+
+
+def _mock_client(indexed):
+    client = MagicMock()
+    client.describe_collection.return_value = {"fields": [{"name": name} for name in ["candidate_id", *SCALAR_INDEXES]]}
+    client.list_indexes.side_effect = lambda collection_name, field_name: [field_name] if field_name in indexed else []
+    return client
+
+
+def test_hot_filter_fields_are_declared():
+    assert {"job_applied", "updated_at", "chat_id", "conversation_id", "stage"} <= set(SCALAR_INDEXES)
+
+
+def test_ensure_scalar_indexes_only_creates_missing():
+    client = _mock_client(indexed=set(SCALAR_INDEXES) - {"job_applied", "updated_at"})
+    with patch("src.candidate_store._client", client):
+        assert ensure_scalar_indexes("c", dry_run=True) == ["job_applied", "updated_at"]
+        client.create_index.assert_not_called()
+
+        assert ensure_scalar_indexes("c") == ["job_applied", "updated_at"]
+        client.create_index.assert_called_once()
+        added = [call.kwargs["field_name"] for call in client.prepare_index_params.return_value.add_index.call_args_list]
+        assert added == ["job_applied", "updated_at"]
+
+    client = _mock_client(indexed=set(SCALAR_INDEXES))
+    with patch("src.candidate_store._client", client):
+        assert ensure_scalar_indexes("c") == []
+        client.create_index.assert_not_called()
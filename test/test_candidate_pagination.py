@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import _all_fields, decode_cursor, encode_cursor, page_candidates
+
+
+@pytest.fixture(autouse=True)
+def _remote_fields(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+    monkeypatch.setattr(candidate_store, "_order_by_pushdown", True)
+
+
+def _row(cid, ts):
+    return {"candidate_id": cid, "updated_ts": ts, "name": f"n-{cid}"}
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor("张三's", "c1", False)
+    assert decode_cursor(cursor) == ("张三's", "c1", False)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_push_keyset_range_and_order_down():
+    client = MagicMock()
+    client.query.side_effect = [[_row("c9", 30), _row("c5", 20)], [_row("c4", 20)], [_row("c8", None)]]
+    with patch.object(candidate_store, "_client", client):
+        first, cursor = page_candidates(page_size=2, fields=["name"], job_applied="J")
+        second, end = page_candidates(cursor=cursor, page_size=2, fields=["name"], job_applied="J")
+
+    assert [c["candidate_id"] for c in first] == ["c9", "c5"] and decode_cursor(cursor) == (20, "c5", False)
+    assert [c["candidate_id"] for c in second] == ["c4", "c8"]  # null sort values come last
+    assert decode_cursor(end) == (None, "c8", True)
+    calls = [c.kwargs for c in client.query.call_args_list]
+    assert calls[0]["filter"] == "(job_applied == 'J') AND (updated_ts IS NOT NULL)"
+    assert calls[0]["order_by_fields"] == [{"field": "updated_ts", "order": "desc"}, {"field": "candidate_id", "order": "desc"}]
+    assert calls[0]["output_fields"] == ["name", "updated_ts", "candidate_id"] and calls[0]["limit"] == 2
+    assert calls[1]["filter"] == (
+        "(job_applied == 'J') AND (updated_ts IS NOT NULL) AND "
+        "(updated_ts < 20 or (updated_ts == 20 and candidate_id < 'c5'))"
+    )
+    assert calls[2]["filter"] == "(job_applied == 'J') AND (updated_ts IS NULL)" and calls[2]["limit"] == 1
+
+
+def test_top_n_scan_unless_order_by_pushdown_is_enabled(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_order_by_pushdown", False)
+    client = MagicMock()
+    client.query.return_value = [_row("c2", 20), _row("c3", 30)]
+    scanned = [_row("c1", 10), _row("c2", 20), _row("c3", 30), _row("c0", 10)]
+    with patch.object(candidate_store, "_client", client), \
+            patch.object(candidate_store, "scan_candidates", return_value=iter(scanned)) as scan:
+        page, cursor = page_candidates(page_size=2, fields=["name"])
+    assert [c["candidate_id"] for c in page] == ["c3", "c2"] and decode_cursor(cursor) == (20, "c2", False)
+    assert scan.call_args.kwargs["fields"] == ["updated_ts", "candidate_id"]  # only sort columns are streamed
+    assert client.query.call_count == 1  # no ORDER BY query, only the primary-key fetch
+    assert client.query.call_args.kwargs["filter"] == "candidate_id in ['c3', 'c2']"
+
+
+def test_rejected_order_by_falls_back_to_top_n_scan():
+    from pymilvus.exceptions import MilvusException
+
+    client = MagicMock()
+    client.query.side_effect = [MilvusException(message="order_by_fields not supported"), [_row("c3", 30), _row("c2", 20)]]
+    scanned = [_row("c1", 10), _row("c2", 20), _row("c3", 30)]
+    with patch.object(candidate_store, "_client", client), \
+            patch.object(candidate_store, "scan_candidates", return_value=iter(scanned)):
+        page, _ = page_candidates(page_size=2, fields=["name"])
+    assert [c["candidate_id"] for c in page] == ["c3", "c2"]
+    assert candidate_store._order_by_pushdown is False
+
+
+def test_unpageable_sort_is_rejected():
+    with pytest.raises(ValueError):
+        page_candidates(sort_by="contact")
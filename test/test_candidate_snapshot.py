@@ -0,0 +1,81 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_snapshot
+from src.candidate_snapshot import flatten_candidate, is_snapshot_fresh, query_snapshot, snapshot_info, stats_columns, sync_snapshot
+
+
+@pytest.fixture(autouse=True)
+def _tmp_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_snapshot, "_SNAPSHOT_PATH", tmp_path / "snapshot.arrow")
+
+
+def _ts(days_ago: int) -> str:
+    return (datetime.now() - timedelta(days=days_ago)).isoformat()
+
+
+class FakeSource:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, fields, updated_from=None):
+        self.calls.append(updated_from)
+        return [r for r in self.rows if not updated_from or r["updated_at"] >= updated_from]
+
+
+def test_flatten_candidate_extracts_hot_fields():
+    row = flatten_candidate({
+        "candidate_id": "c1",
+        "job_applied": "算法工程师",
+        "stage": "seek",
+        "analysis": {"overall": 12},
+        "metadata": {"contacted": True, "wechat_number": "wx"},
+        "updated_at": "2025-11-10T09:00:00",
+    })
+    assert row["stage"] == "SEEK" and row["score"] == 10
+    assert row["contacted"] and row["has_contact"] and not row["notified"]
+    assert flatten_candidate({"candidate_id": "c2", "analysis": None})["score"] is None
+
+
+def test_incremental_sync_replaces_changed_rows():
+    assert snapshot_info() is None and not is_snapshot_fresh()
+    source = FakeSource([
+        {"candidate_id": "c1", "job_applied": "A", "stage": "CHAT", "updated_at": _ts(3)},
+        {"candidate_id": "c2", "job_applied": "B", "stage": "PASS", "updated_at": _ts(2)},
+    ])
+    assert sync_snapshot(source=source)["rows"] == 2
+    watermark = snapshot_info()["watermark"]
+    assert watermark == source.rows[1]["updated_at"]
+
+    source.rows[0] = {"candidate_id": "c1", "job_applied": "A", "stage": "SEEK", "analysis": {"overall": 8}, "updated_at": _ts(0)}
+    result = sync_snapshot(source=source)
+    assert source.calls == [None, watermark]
+    assert result["fetched"] == 2 and result["rows"] == 2  # c2 re-fetched at the inclusive watermark
+    assert is_snapshot_fresh()
+
+    rows = {r["candidate_id"]: r for r in query_snapshot().to_pylist()}
+    assert rows["c1"]["stage"] == "SEEK" and rows["c1"]["score"] == 8
+    assert query_snapshot(["candidate_id"], jobs=["B"]).column("candidate_id").to_pylist() == ["c2"]
+
+
+def test_full_sync_drops_deleted_candidates_and_feeds_stats():
+    sync_snapshot(source=FakeSource([
+        {"candidate_id": "c1", "job_applied": "A", "stage": "SEEK", "analysis": {"overall": 7}, "updated_at": _ts(1)},
+        {"candidate_id": "old", "job_applied": "A", "updated_at": _ts(30)},
+    ]))
+    assert sync_snapshot(full=True, source=FakeSource([
+        {"candidate_id": "c1", "job_applied": "A", "stage": "SEEK", "analysis": {"overall": 7}, "metadata": {"contacted": True}, "updated_at": _ts(1)},
+    ]))["rows"] == 1
+
+    columns = stats_columns(days=7)
+    assert list(columns["job"]) == ["A"] and list(columns["stage"]) == ["SEEK"]
+    assert list(columns["score"]) == [7] and list(columns["contacted"]) == [True]
+    assert str(columns["day"][0]) == _ts(1)[:10]
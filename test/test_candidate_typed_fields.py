@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import (
+    TYPED_FIELDS,
+    _all_fields,
+    _build_candidate_filter,
+    _normalize_candidate_fields,
+    derive_typed_fields,
+    search_candidates_advanced,
+    to_epoch_ms,
+)
+
+
+def _remote_fields(typed=True):
+    fields = frozenset(f for f in _all_fields if typed or f not in TYPED_FIELDS)
+    return patch.object(candidate_store, "_get_existing_field_names", lambda: fields)
+
+
+def test_derive_typed_fields_from_json():
+    typed = derive_typed_fields({
+        "analysis": {"overall": "7", "action": "seek"},
+        "metadata": {"contacted": True, "wechat_number": "wx"},
+    })
+    assert typed == {"score": 7.0, "action": "SEEK", "contacted": True, "has_contact": True}
+
+    history = [{"role": "assistant", "action": "chat"}, {"role": "user"}]
+    assert derive_typed_fields({"metadata": {"history": history}}) == {"contacted": False, "has_contact": False, "action": "CHAT"}
+    # partial updates without analysis/metadata leave the typed columns alone
+    assert derive_typed_fields({"stage": "SEEK"}) == {}
+    assert derive_typed_fields({"updated_at": "2025-01-02T03:04:05"}) == {"updated_ts": to_epoch_ms("2025-01-02T03:04:05")}
+
+
+def test_normalize_syncs_typed_fields_and_respects_remote_schema():
+    with _remote_fields():
+        row = _normalize_candidate_fields({"candidate_id": "c1", "analysis": {"overall": 8}, "score": 9}, touch=False)
+        assert row["score"] == 9.0  # explicit value wins
+    with _remote_fields(typed=False):
+        row = _normalize_candidate_fields({"candidate_id": "c1", "analysis": {"overall": 8}, "metadata": {"contacted": True}})
+        assert not set(TYPED_FIELDS) & set(row)
+
+
+def test_filters_push_down_to_typed_columns():
+    with _remote_fields():
+        assert _build_candidate_filter(min_score=6, contacted=True) == "score >= 6 AND contacted == true"
+        assert "contacted IS NULL" in _build_candidate_filter(contacted=False)
+    with _remote_fields(typed=False):
+        assert _build_candidate_filter(min_score=6) == 'analysis["overall"] >= 6'
+
+
+def test_time_windows_use_epoch_fields():
+    start, end = "2025-01-01T00:00:00", "2025-01-31T23:59:59"
+    with _remote_fields():
+        assert _build_candidate_filter(updated_from=start, created_to=end) == (
+            f"updated_ts >= {to_epoch_ms(start)} AND created_ts <= {to_epoch_ms(end)}"
+        )
+    with _remote_fields(typed=False):
+        # legacy collections compare ISO strings and approximate creation with the last update
+        assert _build_candidate_filter(updated_from=start, created_to=end) == (
+            f"updated_at >= '{start}' AND updated_at <= '{end}'"
+        )
+    assert to_epoch_ms("not a date") is None
+
+
+def test_new_candidates_get_created_ts():
+    client = MagicMock()
+    with _remote_fields(), patch.object(candidate_store, "_client", client), \
+            patch.object(candidate_store, "record_candidate_update"):
+        candidate_store.upsert_candidate(name="张三", resume_vector=[0.1])
+    row = client.insert.call_args.kwargs["data"][0]
+    assert row["created_ts"] == row["updated_ts"] == to_epoch_ms(row["updated_at"])
+
+
+def test_contact_sort_fetches_contactable_candidates_first():
+    client = MagicMock()
+    client.query.side_effect = [
+        [{"candidate_id": "a", "has_contact": True, "updated_at": "2025-01-01"}],
+        [{"candidate_id": "b", "has_contact": False, "updated_at": "2025-01-02"}],
+    ]
+    with _remote_fields(), patch.object(candidate_store, "_client", client):
+        results = search_candidates_advanced(job_applied="J", sort_by="contact", limit=2)
+    assert [c["candidate_id"] for c in results] == ["a", "b"]
+    filters = [call.kwargs["filter"] for call in client.query.call_args_list]
+    assert filters[0].endswith("has_contact == true") and "has_contact IS NULL" in filters[1]
+    first, second = (call.kwargs["limit"] for call in client.query.call_args_list)
+    assert second == first - 1  # the second group only fills the remaining window
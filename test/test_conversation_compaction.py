@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.conversation_compaction import (
+    build_compaction_cache,
+    build_summary_input,
+    estimate_tokens,
+    get_job_compaction_config,
+    plan_compaction,
+)
+from src.conversation_sync import build_watermark, compute_sync_delta
+
+
+CONFIG = {"enabled": True, "max_turns": 10, "max_tokens": 100000, "keep_recent": 4}
+
+
+def _history(n: int) -> list[dict]:
+    history = [{"role": "developer", "content": "岗位信息"}]
+    for i in range(n):
+        history.append({"role": "user" if i % 2 == 0 else "assistant", "content": f"第{i}条消息"})
+    return history
+
+
+def test_estimate_tokens_counts_cjk_per_char():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("你好世界") == 4
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_job_overrides_thresholds():
+    config = get_job_compaction_config({"metadata": {"compaction": {"max_turns": 5, "unknown": 1}}})
+    assert config["max_turns"] == 5
+    assert "unknown" not in config
+
+
+def test_short_conversation_is_not_compacted():
+    plan = plan_compaction(_history(10), CONFIG)
+    assert not plan.needed
+    assert plan.turns == 10
+
+
+def test_compaction_keeps_recent_window():
+    history = _history(15)
+    plan = plan_compaction(history, CONFIG, conversation_id="conv_a")
+    assert plan.needed
+    assert len(plan.older) == 11
+    assert [m["content"] for m in history[plan.split_index:]] == [f"第{i}条消息" for i in range(11, 15)]
+    assert "第0条消息" in build_summary_input(plan)
+
+    # after switching conversations, the sync delta is exactly the recent window
+    watermark = build_watermark("conv_b", history[:plan.split_index])
+    delta = compute_sync_delta(history, watermark, "conv_b")
+    assert [m["content"] for m in delta.messages] == [f"第{i}条消息" for i in range(11, 15)]
+
+
+def test_cached_summary_is_extended_incrementally():
+    history = _history(15)
+    plan = plan_compaction(history, CONFIG, conversation_id="conv_a")
+    cache = build_compaction_cache(plan, "摘要v1", "conv_b", "conv_a")
+    assert cache["summarized_count"] == 11
+
+    # the new conversation only holds the recent window: no compaction until it grows again
+    assert not plan_compaction(history, CONFIG, cache, "conv_b").needed
+
+    history = _history(25)
+    plan = plan_compaction(history, CONFIG, cache, "conv_b")
+    assert plan.needed
+    assert plan.previous_summary == "摘要v1"
+    assert [m["content"] for m in plan.older] == [f"第{i}条消息" for i in range(11, 21)]
+    assert build_compaction_cache(plan, "摘要v2", "conv_c", "conv_b")["summarized_count"] == 21
+    assert "【已有摘要】" in build_summary_input(plan)
+
+
+def test_token_threshold_triggers_compaction():
+    history = [{"role": "user", "content": "很长的回复" * 400}, {"role": "assistant", "content": "好的"}] * 3
+    config = {**CONFIG, "max_tokens": 3000, "keep_recent": 2}
+    plan = plan_compaction(history, config)
+    assert plan.needed and plan.turns == 6 and len(plan.older) == 4
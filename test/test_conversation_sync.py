@@ -0,0 +1,104 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.conversation_sync import (
+    MAX_DELTA_MESSAGES,
+    STRATEGY_LEGACY,
+    STRATEGY_TIMESTAMP,
+    STRATEGY_WATERMARK,
+    build_watermark,
+    compute_sync_delta,
+    merge_history,
+)
+
+
+CONV = "conv_test"
+SEED = [
+    {"role": "developer", "content": "候选人主动投递简历，请分析是否匹配。"},
+    {"role": "user", "timestamp": "2025-11-10 09:00:00", "content": "您好，对这个岗位感兴趣"},
+]
+
+
+def _msg(role: str, i: int) -> dict:
+    return {"role": role, "timestamp": f"2025-11-10 {10 + i // 60:02d}:{i % 60:02d}:00", "content": f"{role} message {i} " + "内容" * 20}
+
+
+def test_seeded_history_is_not_resent():
+    watermark = build_watermark(CONV, SEED)
+    delta = compute_sync_delta(SEED, watermark, CONV)
+    assert delta.strategy == STRATEGY_WATERMARK
+    assert delta.messages == []
+
+
+def test_payload_stays_bounded_as_conversation_grows():
+    history = list(SEED)
+    watermark = build_watermark(CONV, history)
+    payload_sizes = []
+    for i in range(200):
+        # the reply generated in the previous round shows up in the browser history
+        history.append(_msg("user", i))
+        delta = compute_sync_delta(history, watermark, CONV)
+        assert [m["content"] for m in delta.messages] == [history[-1]["content"]]
+        payload_sizes.append(len(json.dumps(delta.to_input(), ensure_ascii=False)))
+
+        reply = _msg("assistant", i)
+        watermark = build_watermark(CONV, history, echoes=[reply["content"]], previous=watermark)
+        history.append(reply)
+
+    assert len(history) > 400
+    assert max(payload_sizes) <= payload_sizes[0] + 8  # only the message counter grows
+    assert max(payload_sizes) < len(json.dumps(history, ensure_ascii=False)) / 100
+
+
+def test_manual_replies_are_synced_once():
+    watermark = build_watermark(CONV, SEED)
+    history = SEED + [{"role": "assistant", "content": "HR 手动回复"}, {"role": "user", "content": "好的"}]
+    delta = compute_sync_delta(history, watermark, CONV)
+    assert [m["role"] for m in delta.messages] == ["assistant", "user"]
+
+    watermark = build_watermark(CONV, history, previous=watermark)
+    assert compute_sync_delta(history, watermark, CONV).messages == []
+
+
+def test_delta_is_capped_and_falls_back_without_watermark_message():
+    history = list(SEED)
+    watermark = build_watermark(CONV, history)
+    history += [_msg("user", i) for i in range(MAX_DELTA_MESSAGES + 15)]
+    delta = compute_sync_delta(history, watermark, CONV)
+    assert len(delta.messages) == MAX_DELTA_MESSAGES
+    assert delta.dropped == 15
+    assert delta.messages[-1] == history[-1]
+
+    # the watermark message disappeared from the merged history (e.g. DOM not fully loaded)
+    delta = compute_sync_delta(history[2:], watermark, CONV)
+    assert delta.strategy == STRATEGY_TIMESTAMP
+    assert len(delta.messages) == MAX_DELTA_MESSAGES
+
+
+def test_legacy_conversation_only_sends_unreplied_user_messages():
+    history = SEED + [_msg("assistant", 1), _msg("user", 2), _msg("user", 3)]
+    delta = compute_sync_delta(history, None, CONV)
+    assert delta.strategy == STRATEGY_LEGACY
+    assert delta.messages == history[-2:]
+    # a watermark from another conversation is ignored
+    assert compute_sync_delta(history, build_watermark("conv_old", history), CONV).strategy == STRATEGY_LEGACY
+
+
+def test_merge_history_matches_by_content_and_sorts_by_time():
+    stored = [
+        {"role": "assistant", "timestamp": "2025-11-10 10:00", "content": "你好", "action": "CHAT"},
+        {"role": "user", "timestamp": "昨天 2025-11-10 11:00:00", "content": "在的"},
+    ]
+    browser = [
+        {"role": "user", "timestamp": "2025-11-10 09:30:00", "content": "您好，对这个岗位感兴趣"},
+        {"role": "assistant", "timestamp": "2025-11-10 10:05:00", "content": "你好"},
+        {"role": "user", "timestamp": "Nov 10 2025 12:00", "content": "简历已发"},
+    ]
+    merged = merge_history(stored, browser)
+    assert [m["content"] for m in merged] == ["您好，对这个岗位感兴趣", "你好", "在的", "简历已发"]
+    assert merged[1] == {"role": "assistant", "timestamp": "2025-11-10 10:05:00", "content": "你好", "action": "CHAT"}
+    assert merged[2]["timestamp"] == " 2025-11-10 11:00:00"
+    assert merge_history([], browser) is browser and merge_history(stored, None) is stored
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import cpu_pool
+from src.text_normalize import clean_resume_text, resume_similarity
+
+
+@pytest.fixture(autouse=True)
+def _pool_config(monkeypatch):
+    config = {"enabled": True, "workers": 1, "max_pending": 2, "min_chars": 100}
+    monkeypatch.setattr(cpu_pool, "get_cpu_pool_config", lambda: config)
+    yield config
+    cpu_pool.shutdown()
+
+
+def test_small_or_disabled_jobs_run_inline(_pool_config):
+    assert cpu_pool.call(os.getpid, size=10) == os.getpid()
+    assert asyncio.run(cpu_pool.run(clean_resume_text, "张三\x00  简历", size=8)) == "张三 简历"
+    _pool_config["enabled"] = False
+    assert cpu_pool.call(os.getpid) == os.getpid() and cpu_pool.start() == 0
+    assert cpu_pool._executor is None
+
+
+def test_large_jobs_run_in_warm_workers():
+    assert cpu_pool.start() == 1
+    worker = cpu_pool.call(os.getpid)
+    assert worker != os.getpid() and cpu_pool.call(os.getpid, size=100) == worker
+
+    resume = "工作经历\n字节跳动 推荐系统\n" * 200
+    assert cpu_pool.call(resume_similarity, resume, resume + "补充", size=len(resume) * 2) == resume_similarity(resume, resume + "补充")
+    with pytest.raises(ValueError):
+        cpu_pool.call(int, "not a number")
+
+
+def test_queue_is_bounded_and_loop_stays_responsive(_pool_config):
+    _pool_config["max_pending"] = 1
+    cpu_pool.start()
+    busy = cpu_pool.submit(time.sleep, 0.5)
+    assert not cpu_pool._slots.acquire(blocking=False)  # the only slot is taken
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        worker = await cpu_pool.run(os.getpid)
+        task.cancel()
+        return worker, ticks
+
+    worker, ticks = asyncio.run(main())
+    assert busy.done() and worker != os.getpid()
+    assert ticks >= 20  # the loop kept running while the job waited for its slot
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import jobs_store
+from src.jobs_store import delete_job_version, get_all_jobs, get_job_by_id, get_job_by_position, get_job_by_versioned_id
+
+_JOBS = [
+    {"job_id": "algo_v3", "position": "算法工程师", "version": 3, "current": True, "updated_at": "2025-01-02", "metadata": {"a": 1}},
+    {"job_id": "pm_v1", "position": "产品经理", "version": 1, "current": True, "updated_at": "2025-01-03"},
+]
+
+
+def _mock_client(rows=_JOBS):
+    client = MagicMock()
+    client.query.return_value = [dict(r) for r in rows]
+    return client
+
+
+def test_lookups_are_served_from_one_catalog_load():
+    client = _mock_client()
+    with patch("src.jobs_store._client", client):
+        assert [j["job_id"] for j in get_all_jobs()] == ["pm_v1", "algo_v3"]
+        assert get_job_by_id("algo")["job_id"] == "algo_v3"
+        assert get_job_by_id("algo_v1")["job_id"] == "algo_v3"  # versioned id -> current version
+        assert get_job_by_id("algo")["base_job_id"] == "algo"
+        assert get_job_by_versioned_id("pm_v1")["base_job_id"] == "pm"
+        assert get_job_by_position("算法工程师")["job_id"] == "algo_v3"
+        assert get_job_by_position("不存在") is None
+        assert client.query.call_count == 1
+        assert client.query.call_args.kwargs["consistency_level"] == "Strong"
+
+        # callers get copies
+        get_job_by_id("algo")["metadata"]["a"] = 2
+        assert get_job_by_id("algo")["metadata"] == {"a": 1}
+
+
+def test_miss_falls_back_to_milvus_and_writes_invalidate():
+    client = _mock_client()
+    with patch("src.jobs_store._client", client):
+        get_all_jobs()
+        client.query.return_value = [{"job_id": "new_v1", "position": "新岗位", "current": True}]
+        assert get_job_by_id("new")["job_id"] == "new_v1"  # created by another process
+        assert jobs_store._catalog is None
+
+        client.query.return_value = [dict(r) for r in _JOBS]
+        get_all_jobs()
+        delete_job_version("algo", 3)
+        assert jobs_store._catalog is None
+
+
+def test_catalog_expires_after_ttl(monkeypatch):
+    client = _mock_client()
+    with patch("src.jobs_store._client", client):
+        get_all_jobs()
+        monkeypatch.setattr(jobs_store, "_CATALOG_TTL_SECONDS", -1)
+        get_all_jobs()
+        assert client.query.call_count == 2
+
+
+def test_version_queries_use_indexed_base_job_id(monkeypatch):
+    monkeypatch.setattr(jobs_store, "_get_existing_field_names", lambda: {"job_id", "base_job_id", "version"})
+    assert jobs_store._versions_filter("algo") == 'base_job_id == "algo"'
+    assert jobs_store._with_base_job_id({}, "algo") == {"base_job_id": "algo"}
+
+    monkeypatch.setattr(jobs_store, "_get_existing_field_names", lambda: {"job_id", "version"})
+    assert jobs_store._versions_filter("algo") == 'job_id >= "algo_v" and job_id < "algo_w"'
+    assert jobs_store._with_base_job_id({}, "algo") == {}
+    assert jobs_store._is_version_of("algo_v12", "algo") and not jobs_store._is_version_of("algo_x_v1", "algo")
+
+
+def test_load_overlapping_a_write_is_not_cached():
+    client = _mock_client()
+
+    def query_during_write(**kwargs):
+        jobs_store.invalidate_job_catalog()  # a write lands while the catalog is loading
+        return [dict(r) for r in _JOBS]
+
+    client.query.side_effect = query_during_write
+    with patch("src.jobs_store._client", client):
+        assert len(get_all_jobs()) == 2
+        assert jobs_store._catalog is None
+        client.query.side_effect = None
+        client.query.return_value = [dict(r) for r in _JOBS]
+        get_all_jobs()
+        assert jobs_store._catalog is not None and client.query.call_count == 2
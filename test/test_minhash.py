@@ -0,0 +1,64 @@
+import random
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import _all_fields, _normalize_candidate_fields, candidate_matched, resume_signature, resumes_match
+from src.minhash import NUM_PERM, SIGNATURE_CHARS, decode_signature, encode_signature, estimate_jaccard, minhash_signature
+
+_CHARS = [chr(0x4E00 + i) for i in range(2000)]
+
+
+def _text(seed: int, n: int = 3000) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(_CHARS) for _ in range(n))
+
+
+def test_signature_is_deterministic_and_roundtrips():
+    sig = minhash_signature(_text(1))
+    assert sig.dtype.name == "uint32" and len(sig) == NUM_PERM
+    assert (sig == minhash_signature(_text(1))).all()
+    encoded = encode_signature(sig)
+    assert len(encoded) == SIGNATURE_CHARS and (decode_signature(encoded) == sig).all()
+    assert decode_signature("abcd") is None and decode_signature("not base64!") is None
+    assert minhash_signature("") is None and minhash_signature(" \n") is None
+    assert minhash_signature("张三") is not None  # shorter than a shingle
+
+
+def test_estimate_tracks_jaccard():
+    base = _text(2)
+    half = base[:1500] + _text(3, 1500)
+    assert estimate_jaccard(minhash_signature(base), minhash_signature(base + " ")) == 1.0
+    assert 0.2 < estimate_jaccard(minhash_signature(base), minhash_signature(half)) < 0.45  # true J = 1/3
+    assert estimate_jaccard(minhash_signature(base), minhash_signature(_text(4))) < 0.05
+
+
+def test_resumes_match_settles_clear_cases_without_the_exact_ratio():
+    base = _text(5)
+    recapture = "牛人分析器 活跃度12 查看全部6项分析\n" + base[:2800]
+    with patch.object(candidate_store, "calculate_resume_similarity", wraps=candidate_store.calculate_resume_similarity) as exact:
+        assert resumes_match(base, recapture)[0] is True
+        assert resumes_match(base, signature2=resume_signature(recapture))[0] is True
+        assert resumes_match(base, _text(6))[0] is False
+        exact.assert_not_called()
+        # Borderline estimates fall back to SequenceMatcher when the stored text is available
+        matched, similarity = resumes_match(base, base[:1500] + _text(7, 1500))
+        exact.assert_called_once()
+        assert matched is False and similarity == pytest.approx(0.5, abs=0.05)
+    assert resumes_match("", signature2=resume_signature(base)) == (True, 0.0)
+
+
+def test_signature_is_written_and_used_for_matching(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+    row = _normalize_candidate_fields({"candidate_id": "c1", "name": "张三", "resume_text": _text(8)})
+    assert row["resume_minhash"] == resume_signature(_text(8))
+    assert "resume_minhash" not in _normalize_candidate_fields({"candidate_id": "c1", "name": "张三"})
+
+    stored = {"name": "张三", "updated_at": "2026-01-01T00:00:00", "resume_minhash": row["resume_minhash"]}
+    assert candidate_matched({"name": "张三", "resume_text": _text(8)[:2900]}, stored, "greet")
+    assert not candidate_matched({"name": "张三", "resume_text": _text(9)}, stored, "greet")
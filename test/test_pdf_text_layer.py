@@ -0,0 +1,59 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import resume_capture_async
+from src.resume_capture_async import assemble_text_layer_lines, extract_pdf_viewer_text, text_layer_usable
+
+LINE = "北京某某科技有限公司 算法工程师 负责推荐系统召回与排序"
+
+
+class FakeLocator:
+    first = property(lambda self: self)
+
+    async def wait_for(self, **kwargs):
+        return None
+
+
+class FakeFrame:
+    def __init__(self, layers):
+        self.layers = layers
+        self.scripts = []
+
+    def locator(self, selector):
+        return FakeLocator()
+
+    async def evaluate(self, script):
+        self.scripts.append(script)
+        return self.layers if script == resume_capture_async._TEXT_LAYER_SCRIPT else "innerText " + LINE * 5
+
+
+def test_assemble_orders_spans_into_lines():
+    items = [(40.2, 10, "第二行"), (20.0, 60, "World"), (21.5, 10, "Hello "), (40.0, 80, "右侧"), (60, 10, "第三行")]
+    assert assemble_text_layer_lines(items) == "Hello World\n第二行右侧\n第三行"
+    assert assemble_text_layer_lines([]) == ""
+
+
+def test_text_layer_usable():
+    assert text_layer_usable("\n".join([LINE] * 10))
+    assert not text_layer_usable(LINE)  # too short
+    assert not text_layer_usable("\n".join("字" * 300))  # one glyph per line
+    assert not text_layer_usable("")
+
+
+def test_usable_text_layer_skips_fallbacks():
+    items = [[20.0 + 18 * i, 10.0, f"{i} {LINE}"] for i in range(10)]
+    frame = FakeFrame([{"items": items, "text": ""}, {"items": [], "text": "无定位文本"}])
+    result = asyncio.run(extract_pdf_viewer_text(frame))
+    assert frame.scripts == [resume_capture_async._TEXT_LAYER_SCRIPT]
+    assert result["text"].startswith(f"0 {LINE}\n1 {LINE}") and result["text"].endswith("无定位文本")
+
+
+def test_garbled_text_layer_falls_back():
+    items = [[20.0 + 18 * i, 10.0, "字"] for i in range(300)]
+    frame = FakeFrame([{"items": items, "text": ""}])
+    result = asyncio.run(extract_pdf_viewer_text(frame))
+    assert len(frame.scripts) == 3  # text layer, PDF.js text content, innerText
+    assert result["text"].startswith("innerText")
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.response_cache import StaleWhileRevalidateCache, make_response
+
+
+class SlowCounter:
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("db down")
+        return {"version": self.calls}
+
+
+def test_concurrent_cold_requests_share_one_computation():
+    compute = SlowCounter()
+    cache = StaleWhileRevalidateCache(compute, ttl_seconds=60)
+
+    async def run():
+        return await asyncio.gather(*(cache.get() for _ in range(10)))
+
+    entries = asyncio.run(run())
+    assert compute.calls == 1
+    assert {e.etag for e in entries} == {entries[0].etag}
+    assert entries[0].body == b'{"version":1}'
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    compute = SlowCounter()
+    cache = StaleWhileRevalidateCache(compute, ttl_seconds=0)
+
+    async def run():
+        first = await cache.get()
+        stale = await asyncio.gather(*(cache.get() for _ in range(5)))
+        await asyncio.sleep(0.05)
+        return first, stale, await cache.get()
+
+    first, stale, refreshed = asyncio.run(run())
+    assert all(e is first for e in stale)  # no request waited for the refresh
+    assert compute.calls >= 2 and refreshed.body != first.body
+    assert compute.calls <= 3  # 5 stale hits coalesced onto a single refresh
+
+
+def test_failed_refresh_keeps_stale_entry_and_cold_failure_raises():
+    compute = SlowCounter(fail_after=1)
+    cache = StaleWhileRevalidateCache(compute, ttl_seconds=0)
+
+    async def run():
+        first = await cache.get()
+        await cache.get()
+        await asyncio.sleep(0.05)
+        return first, await cache.get()
+
+    first, after = asyncio.run(run())
+    assert after is first
+
+    cache.invalidate()
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get())
+
+
+def test_etag_matching():
+    entry = make_response({"a": "中文"})
+    assert entry.etag == make_response({"a": "中文"}).etag != make_response({"a": 1}).etag
+    assert entry.matches(entry.etag) and entry.matches(f'"x", W/{entry.etag}') and entry.matches("*")
+    assert not entry.matches(None) and not entry.matches('"other"')
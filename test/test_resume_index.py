@@ -0,0 +1,156 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import resume_index
+from src.resume_index import (
+    compact,
+    decode_postings,
+    encode_postings,
+    index_candidate,
+    index_info,
+    index_terms,
+    query_terms,
+    search_candidate_ids,
+    sync_resume_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def _tmp_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_index, "_INDEX_PATH", tmp_path / "resume_index.sqlite3")
+    monkeypatch.setattr(resume_index, "_conn", None)
+    monkeypatch.setattr(resume_index, "get_resume_index_config", lambda: {"enabled": True, "compact_pending_rows": 10**9})
+    yield
+    if resume_index._conn is not None:
+        resume_index._conn.close()
+
+
+def _ts(days_ago: int) -> str:
+    return (datetime.now() - timedelta(days=days_ago)).isoformat()
+
+
+class FakeSource:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, fields, updated_from=None):
+        self.calls.append(updated_from)
+        return [r for r in self.rows if not updated_from or r["updated_at"] >= updated_from]
+
+
+def test_terms_are_ngrams_of_cjk_and_latin_runs():
+    terms = index_terms("熟悉机器学习, Python / C++ / Node.js")
+    assert {"机器", "机器学", "学习", "py", "pyt", "hon", "no", "ode", "js"} <= terms
+    assert "机" not in terms and "c" not in terms and "node.js" not in terms
+    assert query_terms("机器学习") == {"机器学", "器学习"}
+    assert query_terms("算法 Python") == {"算法", "pyt", "yth", "tho", "hon"}
+    assert query_terms("Node.js") == {"nod", "ode", "js"}
+    assert query_terms("C++ 后端") == {"后端"}
+    assert query_terms("法") is None and query_terms("C++") is None and query_terms("  ") is None
+
+
+def test_keyword_substrings_inside_words_are_found():
+    sync_resume_index(source=FakeSource([
+        {"candidate_id": "c1", "resume_text": "熟悉 React.js / Node.js, Python3", "updated_at": _ts(1)},
+        {"candidate_id": "c2", "resume_text": "熟悉 Vue", "updated_at": _ts(1)},
+    ]))
+    for keyword in ("react", "React.js", "node", "pyth", "Python3", "act.j"):
+        assert search_candidate_ids(keyword) == ["c1"], keyword
+    assert search_candidate_ids("golang") == []
+
+
+def test_index_built_with_other_terms_is_rebuilt():
+    source = FakeSource([{"candidate_id": "c1", "resume_text": "React.js", "updated_at": _ts(1)}])
+    sync_resume_index(source=source)
+    with resume_index._LOCK:
+        conn = resume_index._connect()
+        with conn:
+            conn.execute("UPDATE index_meta SET value = '1' WHERE key = 'version'")
+    assert not resume_index.is_ready() and search_candidate_ids("react") is None
+    assert sync_resume_index(source=source)["indexed"] == 1
+    assert source.calls[-1] is None and search_candidate_ids("react") == ["c1"]
+
+
+def test_postings_roundtrip():
+    ids = [5, 1, 70000, 3, 5]
+    assert decode_postings(encode_postings(ids)) == [1, 3, 5, 70000]
+    assert decode_postings(None) == []
+
+
+def test_sync_search_and_incremental_updates():
+    source = FakeSource([
+        {"candidate_id": "c1", "resume_text": "5年机器学习经验", "updated_at": _ts(3)},
+        {"candidate_id": "c2", "full_resume": "负责推荐系统, 熟悉 Python", "updated_at": _ts(2)},
+        {"candidate_id": "c3", "resume_text": "前端开发 React", "full_resume": "机器人控制", "updated_at": _ts(1)},
+    ])
+    assert search_candidate_ids("机器学习") is None  # never built: fall back to LIKE
+
+    result = sync_resume_index(source=source)
+    assert result["fetched"] == 3 and result["indexed"] == 4
+    assert search_candidate_ids("机器学习") == ["c1"]
+    assert sorted(search_candidate_ids("机器")) == ["c1", "c3"]
+    assert search_candidate_ids("python 推荐") == ["c2"]
+    assert search_candidate_ids("golang") == []
+
+    # Writes through upsert_candidate retire the previous text of that field only
+    index_candidate("c1", {"resume_text": "golang 后端"})
+    assert search_candidate_ids("机器学习") == []
+    assert search_candidate_ids("golang") == ["c1"]
+    index_candidate("c3", {"name": "no resume fields"})
+    assert sorted(search_candidate_ids("机器")) == ["c3"]
+
+    compact(full=True)
+    info = index_info()
+    assert info["documents"] == 4 and info["pending"] == 0
+    assert search_candidate_ids("golang") == ["c1"] and search_candidate_ids("机器人") == ["c3"]
+
+    # Incremental sync only asks for rows at/after the watermark; unchanged texts are skipped
+    source.rows.append({"candidate_id": "c4", "resume_text": "golang 微服务", "updated_at": _ts(0)})
+    assert sync_resume_index(source=source) | {"watermark": None} == {"fetched": 2, "indexed": 1, "watermark": None}
+    assert source.calls[-1] == source.rows[2]["updated_at"]
+    assert sorted(search_candidate_ids("golang")) == ["c1", "c4"]
+
+
+def test_disabled_index_is_a_no_op(monkeypatch):
+    sync_resume_index(source=FakeSource([{"candidate_id": "c1", "resume_text": "机器学习", "updated_at": _ts(1)}]))
+    monkeypatch.setattr(resume_index, "get_resume_index_config", lambda: {"enabled": False})
+    index_candidate("c2", {"resume_text": "机器学习"})
+    assert search_candidate_ids("机器学习") is None
+    assert index_info()["documents"] == 1
+
+
+def test_search_narrows_like_to_indexed_candidates(monkeypatch):
+    from unittest.mock import MagicMock
+
+    from src import candidate_store
+    from src.candidate_store import BM25_FIELDS, _all_fields, search_candidates_advanced
+
+    sync_resume_index(source=FakeSource([
+        {"candidate_id": "c1", "resume_text": "机器学习", "updated_at": _ts(2)},
+        {"candidate_id": "c2", "full_resume": "深度机器学习", "updated_at": _ts(1)},
+    ]))
+    client = MagicMock()
+    client.query.return_value = [{"candidate_id": "c2"}]
+    monkeypatch.setattr(candidate_store, "_client", client)
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields) - set(BM25_FIELDS.values()))
+    monkeypatch.setattr(candidate_store, "get_resume_index_config", lambda: {"max_candidates": 5000})
+
+    search_candidates_advanced(resume_contains="机器学习", job_applied="J", limit=5)
+    assert client.query.call_args.kwargs["filter"] == (
+        "job_applied == 'J' AND candidate_id in ['c2', 'c1'] AND "
+        "((resume_text like '%机器学习%') or (full_resume like '%机器学习%'))"
+    )
+
+    client.query.reset_mock()
+    assert search_candidates_advanced(resume_contains="区块链", limit=5) == []
+    client.query.assert_not_called()
+
+    monkeypatch.setattr(candidate_store, "get_resume_index_config", lambda: {"max_candidates": 1})
+    search_candidates_advanced(resume_contains="机器学习", limit=5)
+    assert "like '%机器学习%'" in client.query.call_args.kwargs["filter"]
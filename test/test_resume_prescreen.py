@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.resume_prescreen import (
+    DECISION_LOW,
+    DECISION_OK,
+    DECISION_PASS,
+    DECISION_SKIP,
+    KeywordMatcher,
+    build_prescreen_analysis,
+    parse_requirement_scorecard,
+    prescreen_resume,
+)
+
+
+JOB = {
+    "keywords": {"positive": ["Python", "机器学习", "Kubernetes"], "negative": ["外包"]},
+    "requirements": "30 门槛：Python；分布式系统（必须具备）\n45 场景：推荐系统；广告\n备注：缺失信息可记为潜力",
+}
+
+
+def _matches(matcher: KeywordMatcher, text: str) -> set[str]:
+    return {matcher.terms[i] for i in matcher.find(text)}
+
+
+def test_matcher_handles_overlapping_chinese_terms():
+    matcher = KeywordMatcher(["机器学习", "学习", "深度学习"])
+    assert _matches(matcher, "擅长机器学习") == {"机器学习", "学习"}
+
+
+def test_matcher_respects_english_word_boundaries_and_width():
+    matcher = KeywordMatcher(["Go", "K8S"])
+    assert _matches(matcher, "熟悉 google 搜索") == set()
+    assert _matches(matcher, "熟悉ＧＯ语言和k8s") == {"go", "k8s"}
+
+
+def test_parse_requirement_scorecard():
+    dims = parse_requirement_scorecard(JOB["requirements"])
+    assert [d["weight"] for d in dims] == [30, 45]
+    assert dims[0]["dimension"] == "门槛"
+    assert dims[0]["terms"] == ["python", "分布式系统"]
+
+
+def test_prescreen_passes_obvious_mismatch():
+    result = prescreen_resume("外包公司 Java 开发工程师，负责 CRUD。" * 20, JOB)
+    assert result.decision == DECISION_PASS
+    assert result.negative_hits == ["外包"]
+
+    analysis = build_prescreen_analysis(result)
+    assert analysis["action"] == "PASS"
+    assert analysis["overall"] < 4
+
+
+def test_prescreen_keeps_matching_resume():
+    result = prescreen_resume("5年Python经验，负责推荐系统与机器学习平台。" * 20, JOB)
+    assert result.decision == DECISION_OK
+    assert set(result.positive_hits) == {"python", "机器学习"}
+
+
+def test_prescreen_job_override_and_skip():
+    job = {**JOB, "metadata": {"prescreen": {"pass_floor": 0, "deprioritize_floor": 9}}}
+    assert prescreen_resume("Python 开发" * 50, job).decision == DECISION_LOW
+    assert prescreen_resume("太短", JOB).decision == DECISION_SKIP
+    assert prescreen_resume("Python 开发" * 50, {"keywords": {}}).decision == DECISION_SKIP
+
+
+def test_min_degree_passes_known_lower_degrees():
+    job = {**JOB, "metadata": {"prescreen": {"min_degree": "硕士"}}}
+    resume = "教育经历\n---\n某某大学 计算机 本科 2014-2018\n" + "熟悉 Python 机器学习 Kubernetes 推荐系统 分布式系统。" * 10
+    result = prescreen_resume(resume, job)
+    assert result.decision == DECISION_PASS and "本科" in result.reason
+    assert prescreen_resume(resume, job, profile={"degree": "博士"}).decision == DECISION_OK
+    # unknown degree: keyword scoring decides
+    assert prescreen_resume(resume.replace("本科", ""), job).decision == DECISION_OK
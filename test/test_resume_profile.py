@@ -0,0 +1,114 @@
+import sys
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import candidate_store
+from src.candidate_store import _all_fields, _build_candidate_filter, _normalize_candidate_fields
+from src.resume_profile import (
+    degree_rank,
+    format_resume_profile,
+    get_resume_profile,
+    parse_resume,
+    resume_fingerprint,
+    work_years,
+)
+
+RESUME = """张三
+期望职位
+---
+算法工程师 北京
+工作经历
+---
+字节跳动
+高级算法工程师
+2020.07 - 至今
+负责推荐系统的召回与排序模型优化，提升点击率。
+北京某某科技有限公司 算法工程师 2018.03-2020.06
+教育经历
+---
+清华大学
+计算机科学与技术 硕士
+2015-2018
+北京邮电大学 通信工程 本科 2011-2015
+技能标签
+---
+Python、PyTorch、推荐系统 / 机器学习
+"""
+
+PAYLOAD = {
+    "WASM导出": {
+        "geekBaseInfo": {"name": "李四"},
+        "geekEduExpList": [{"school": "浙江大学", "degreeName": "博士", "major": "CS", "startYearStr": "2012", "endYearStr": "2017"}],
+        "geekWorkExpList": [{"company": "阿里巴巴", "positionName": "研究员", "startYearMonStr": "2017.07", "endYearMonStr": "", "workEmphasisList": ["深度学习"]}],
+    }
+}
+
+
+def test_parse_text_resume():
+    profile = parse_resume(RESUME)
+    assert profile["education"][0] == {"school": "清华大学", "degree": "硕士", "major": "计算机科学与技术", "start": "2015", "end": "2018"}
+    assert profile["education"][1]["school"] == "北京邮电大学" and profile["education"][1]["degree"] == "本科"
+    assert profile["work"] == [
+        {"company": "字节跳动", "title": "高级算法工程师", "start": "2020.07", "end": "至今"},
+        {"company": "北京某某科技有限公司", "title": "算法工程师", "start": "2018.03", "end": "2020.06"},
+    ]
+    assert profile["skills"] == ["Python", "PyTorch", "推荐系统", "机器学习"]
+    assert (profile["degree"], profile["degree_rank"], profile["schools"]) == ("硕士", 5, ["清华大学", "北京邮电大学"])
+    assert profile["fp"] == resume_fingerprint(RESUME) == resume_fingerprint(RESUME.replace("\n", "\n  "))
+    assert work_years(profile, today=date(2026, 7, 1)) == 8.2
+    assert "清华大学 硕士 计算机科学与技术 2015-2018" in format_resume_profile(profile)
+    assert parse_resume("没有结构的一段文字") is None and parse_resume("") is None
+
+
+def test_parse_wasm_payload_and_its_repr():
+    profile = parse_resume(PAYLOAD)
+    assert profile["education"] == [{"school": "浙江大学", "degree": "博士", "major": "CS", "start": "2012", "end": "2017"}]
+    assert profile["work"] == [{"company": "阿里巴巴", "title": "研究员", "start": "2017.07", "end": "至今"}]
+    assert profile["skills"] == ["深度学习"] and profile["degree_rank"] == degree_rank("PhD") == 6
+    # captures stored as the payload's repr parse the same way
+    assert {k: v for k, v in parse_resume(str(PAYLOAD)).items() if k != "fp"} == {k: v for k, v in profile.items() if k != "fp"}
+
+
+def test_profile_is_stored_once_and_reused(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+    row = _normalize_candidate_fields({"candidate_id": "c1", "resume_text": RESUME})
+    assert row["resume_profile"]["degree"] == "硕士" and row["resume_profile"]["fp"] == resume_fingerprint(row["resume_text"])
+    # a payload profile passed by the caller is kept, bound to the stored text
+    payload_row = _normalize_candidate_fields({"candidate_id": "c2", "resume_text": str(PAYLOAD), "resume_profile": parse_resume(PAYLOAD)})
+    assert payload_row["resume_profile"]["schools"] == ["浙江大学"]
+
+    with patch("src.resume_profile.parse_resume", wraps=parse_resume) as parse:
+        assert get_resume_profile(row) is row["resume_profile"]
+        assert get_resume_profile(payload_row) is payload_row["resume_profile"]
+        parse.assert_not_called()
+        assert get_resume_profile({**row, "resume_text": RESUME.replace("2015-2018\n", "2015-2018\n北京大学 博士 2018-2022\n")})["degree"] == "博士"
+        parse.assert_called_once()
+
+
+def test_profile_filters(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+    assert _build_candidate_filter(min_degree="本科", school=" 清华大学 ") == (
+        'resume_profile["degree_rank"] >= 4 AND json_contains(resume_profile["schools"], \'清华大学\')'
+    )
+    assert _build_candidate_filter(min_degree="不限") == ""
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields) - {"resume_profile"})
+    assert _build_candidate_filter(min_degree="本科") == ""
+
+
+def test_stored_profile_is_not_parsed_again_or_downgraded(monkeypatch):
+    monkeypatch.setattr(candidate_store, "_get_existing_field_names", lambda: frozenset(_all_fields))
+    stored = _normalize_candidate_fields({"candidate_id": "c1", "full_resume": RESUME})["resume_profile"]
+    assert stored["src"] == "full_resume"
+    with patch("src.candidate_store.parse_resume", wraps=parse_resume) as parse:
+        # same text and parser version: nothing to parse or write
+        assert "resume_profile" not in _normalize_candidate_fields({"candidate_id": "c1", "full_resume": RESUME}, stored_profile=stored)
+        # an online resume does not replace the profile parsed from the full resume
+        online = _normalize_candidate_fields({"candidate_id": "c1", "resume_text": "张三 本科 北京大学"}, stored_profile=stored)
+        assert "resume_profile" not in online
+        parse.assert_not_called()
+        stale = {**stored, "v": stored["v"] - 1}
+        assert _normalize_candidate_fields({"candidate_id": "c1", "full_resume": RESUME}, stored_profile=stale)["resume_profile"]["v"] == stored["v"]
+        parse.assert_called_once()
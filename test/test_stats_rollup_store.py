@@ -0,0 +1,118 @@
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import stats_rollup_store
+from src.stats_rollup_store import (
+    NO_SCORE,
+    fact_from_candidate,
+    get_last_backfill,
+    query_created_counts,
+    query_rollups,
+    record_candidate_update,
+    replace_window,
+)
+
+
+@pytest.fixture(autouse=True)
+def _tmp_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats_rollup_store, "_STORE_PATH", tmp_path / "rollups.sqlite3")
+    monkeypatch.setattr(stats_rollup_store, "_conn", None)
+    yield
+    if stats_rollup_store._conn is not None:
+        stats_rollup_store._conn.close()
+
+
+def _counts(start_day: str = "2000-01-01") -> dict:
+    return {(r["job"], r["day"], r["stage"], r["score"], r["contacted"]): r["count"] for r in query_rollups(start_day)}
+
+
+def test_fact_keeps_previous_values_for_partial_updates():
+    fact = fact_from_candidate({"job_applied": "算法工程师", "stage": "SEEK", "analysis": {"overall": 8}, "updated_at": "2025-11-10T09:00:00"})
+    assert (fact.job, fact.day, fact.stage, fact.score, fact.contacted) == ("算法工程师", "2025-11-10", "SEEK", 8, False)
+
+    updated = fact_from_candidate({"metadata": {"contacted": True}}, fact)
+    assert updated.day == "2025-11-10" and updated.stage == "SEEK" and updated.contacted
+    assert fact_from_candidate({"analysis": None}, fact).score == NO_SCORE
+
+
+def test_incremental_updates_move_candidate_between_buckets():
+    record_candidate_update("c1", {"job_applied": "A", "stage": "CHAT", "updated_at": "2025-11-10T09:00:00"})
+    record_candidate_update("c2", {"job_applied": "A", "stage": "CHAT", "updated_at": "2025-11-10T10:00:00"})
+    assert _counts() == {("A", "2025-11-10", "CHAT", NO_SCORE, False): 2}
+
+    record_candidate_update("c1", {"stage": "SEEK", "analysis": {"overall": 9}, "updated_at": "2025-11-11T09:00:00"})
+    assert _counts() == {
+        ("A", "2025-11-10", "CHAT", NO_SCORE, False): 1,
+        ("A", "2025-11-11", "SEEK", 9, False): 1,
+    }
+
+    # emptied buckets are removed
+    record_candidate_update("c2", {"stage": "PASS", "updated_at": "2025-11-11T10:00:00"})
+    assert ("A", "2025-11-10", "CHAT", NO_SCORE, False) not in _counts()
+    assert sum(_counts().values()) == 2
+
+
+def test_replace_window_reconciles_recent_days_only():
+    record_candidate_update("old", {"job_applied": "A", "stage": "CHAT", "updated_at": "2025-10-01T09:00:00"})
+    record_candidate_update("gone", {"job_applied": "A", "stage": "CHAT", "updated_at": "2025-11-10T09:00:00"})
+    assert get_last_backfill() is None
+
+    facts = {
+        "c3": fact_from_candidate({"job_applied": "B", "stage": "SEEK", "metadata": {"contacted": True}, "updated_at": "2025-11-12T09:00:00"}),
+    }
+    assert replace_window(facts, "2025-11-01") == 1
+    assert _counts() == {
+        ("A", "2025-10-01", "CHAT", NO_SCORE, False): 1,
+        ("B", "2025-11-12", "SEEK", NO_SCORE, True): 1,
+    }
+    assert get_last_backfill() is not None
+    assert [r["job"] for r in query_rollups("2025-11-01", jobs=["B"])] == ["B"]
+    assert query_rollups("2025-11-01", jobs=["A"]) == []
+
+
+def _ms(day: str) -> int:
+    return int(datetime.fromisoformat(day).timestamp() * 1000)
+
+
+def test_new_candidates_are_counted_by_creation_day():
+    record_candidate_update("c1", {"job_applied": "A", "created_ts": _ms("2025-11-01T09:00:00"), "updated_at": "2025-11-01T09:00:00"})
+    record_candidate_update("c1", {"stage": "SEEK", "updated_at": "2025-11-10T09:00:00"})  # later updates keep the creation day
+    record_candidate_update("c2", {"job_applied": "A", "updated_at": "2025-11-10T10:00:00"})  # no created_ts: update day
+    assert query_created_counts("2025-10-01") == {"2025-11-01": 1, "2025-11-10": 1}
+
+    facts = {"c3": fact_from_candidate({"job_applied": "B", "created_ts": _ms("2025-11-05T09:00:00"), "updated_at": "2025-11-12T09:00:00"})}
+    replace_window(facts, "2025-11-01")
+    assert query_created_counts("2025-11-01") == {"2025-11-05": 1}
+
+
+def test_facts_without_creation_days_wait_for_a_backfill(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        "CREATE TABLE candidate_facts (candidate_id TEXT PRIMARY KEY, job TEXT NOT NULL, day TEXT NOT NULL, "
+        "stage TEXT NOT NULL, score INTEGER NOT NULL, contacted INTEGER NOT NULL);"
+        "CREATE TABLE rollup_meta (key TEXT PRIMARY KEY, value TEXT);"
+        "INSERT INTO rollup_meta VALUES ('last_backfill_at', '2025-11-10T09:00:00');"
+    )
+    conn.close()
+    monkeypatch.setattr(stats_rollup_store, "_STORE_PATH", path)
+    assert get_last_backfill() is None
+    record_candidate_update("c1", {"job_applied": "A", "created_ts": _ms("2025-11-01T09:00:00")})
+    assert query_created_counts("2025-11-01") == {"2025-11-01": 1}
+
+
+def test_partial_update_without_fact_takes_job_from_stored_record():
+    stored = {"job_applied": "A", "stage": "CHAT", "contacted": True, "updated_at": "2025-09-01T09:00:00"}
+    record_candidate_update("old", {"analysis": {"overall": 7}, "updated_at": "2025-11-10T09:00:00"}, load_stored=lambda: stored)
+    assert _counts() == {("A", "2025-11-10", "CHAT", 7, True): 1}
+
+    # nothing to resolve the job from: left to the backfill instead of counted under ""
+    record_candidate_update("orphan", {"stage": "SEEK", "updated_at": "2025-11-10T09:00:00"}, load_stored=lambda: None)
+    record_candidate_update("orphan2", {"stage": "SEEK", "updated_at": "2025-11-10T09:00:00"})
+    assert sum(_counts().values()) == 1
@@ -4,7 +4,7 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from src.stats_service import build_daily_series, conversion_table, _score_quality
+from src.stats_service import aggregate_job_stats, build_daily_candidate_counts, build_daily_series, conversion_table, _score_quality
 
 
 def _dt(days_ago: int) -> str:
@@ -45,3 +45,78 @@ def test_conversion_table_orders_stages():
     assert stages[:4] == ["GREET", "CHAT", "SEEK", "CONTACT"]
     pass_row = next(row for row in table if row["stage"] == "PASS")
     assert pass_row["count"] == 1
+
+
+def test_aggregate_job_stats_matches_per_candidate_helpers():
+    candidates = [
+        {"job_applied": "A", "updated_at": _dt(0), "stage": "SEEK", "analysis": {"overall": 8}, "metadata": {"contacted": True}},
+        {"job_applied": "A", "updated_at": _dt(1), "stage": "CHAT", "analysis": {"overall": 5}, "metadata": {}},
+        {"job_applied": "A", "updated_at": _dt(1), "stage": "PASS", "analysis": None},
+        {"job_applied": "B", "updated_at": "not-a-date", "stage": "CONTACT", "analysis": {"overall": 12}},
+    ]
+    stats = aggregate_job_stats(candidates, jobs=["A", "B", "C"])
+    assert set(stats) == {"A", "B", "C"}
+
+    job_a = [c for c in candidates if c["job_applied"] == "A"]
+    a = stats["A"]
+    assert a["total"] == 3
+    assert a["today"] == {"count": 3, "high": 1, "seek": 1, "contacted": 1, "metric": a["today"]["metric"]}
+    assert [(d["new"], d["seek"], d["processed"]) for d in a["daily"]] == [
+        (d["new"], d["seek"], d["processed"]) for d in build_daily_series(job_a, days=7)
+    ]
+    assert a["score_summary"] == _score_quality([8, 5])
+    assert {r["stage"]: r["count"] for r in a["conversions"]} == {r["stage"]: r["count"] for r in conversion_table(job_a)}
+
+    b = stats["B"]
+    assert b["total"] == 1 and sum(d["new"] for d in b["daily"]) == 0
+    assert b["score_summary"].distribution == {10: 1}
+    assert stats["C"]["total"] == 0 and stats["C"]["score_summary"].count == 0
+
+
+def test_daily_candidate_counts_are_exact_for_full_scans():
+    candidates = iter([{"updated_at": _dt(0)}, {"updated_at": _dt(3)}, {"updated_at": _dt(45)}, {"updated_at": None}])
+    series = build_daily_candidate_counts(candidates, days=30)
+    assert series[0]["count"] == 1  # only the candidate before the period
+    assert series[-1]["count"] == 3 and series[-1]["new"] == 1
+
+    # truncated input still estimates the candidates before the period from the total
+    truncated = [{"updated_at": _dt(0)}]
+    assert build_daily_candidate_counts(truncated, total_count=10, days=30)[-1]["count"] == 10
+
+
+def test_daily_candidate_counts_prefer_creation_time():
+    created = int((datetime.datetime.now() - datetime.timedelta(days=40)).timestamp() * 1000)
+    # updated today but created before the period: not a new candidate
+    series = build_daily_candidate_counts([{"created_ts": created, "updated_at": _dt(0)}, {"updated_at": _dt(0)}], days=30)
+    assert series[0]["count"] == 1 and series[-1]["new"] == 1
+
+
+def test_compile_all_jobs_falls_through_failing_tiers(monkeypatch):
+    from src import stats_service
+
+    def broken(*_args, **_kwargs):
+        raise RuntimeError("tier unavailable")
+
+    candidates = [{"job_applied": "A", "updated_at": _dt(0), "stage": "SEEK", "analysis": {"overall": 8}}]
+    monkeypatch.setattr(stats_service, "get_all_jobs", lambda: [{"position": "A"}, {"position": "B", "status": "inactive"}])
+    monkeypatch.setattr(stats_service, "rollups_ready", lambda: True)
+    monkeypatch.setattr(stats_service, "_rollup_rows_by_job", broken)
+    monkeypatch.setattr(stats_service, "is_snapshot_fresh", lambda: True)
+    monkeypatch.setattr(stats_service, "snapshot_stats_columns", broken)
+    monkeypatch.setattr(stats_service, "fetch_recent_candidates", lambda days: candidates)
+
+    summary = stats_service.compile_all_jobs()
+    assert [job["total"] for job in summary["jobs"]] == [1] and summary["skipped_inactive_jobs"] == 1
+
+
+def test_rollups_are_not_served_once_stale(monkeypatch):
+    from src import stats_service
+
+    monkeypatch.setattr(stats_service, "get_stats_config", lambda: {"backfill_interval_minutes": 60})
+    monkeypatch.setattr(stats_service, "get_last_backfill", lambda: None)
+    assert not stats_service.rollups_ready()
+    monkeypatch.setattr(stats_service, "get_last_backfill", lambda: _dt(0))
+    assert stats_service.rollups_ready()
+    stale = (datetime.datetime.now() - datetime.timedelta(hours=3)).isoformat()
+    monkeypatch.setattr(stats_service, "get_last_backfill", lambda: stale)
+    assert not stats_service.rollups_ready()
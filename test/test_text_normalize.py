@@ -0,0 +1,35 @@
+import json
+import sys
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.text_normalize import clean_resume_text, collapse_line_breaks, nfkc, normalize_resume_for_matching
+
+# Outputs of the original multi-pass implementations
+# (regenerate with `python scripts/benchmark_text_normalize.py --write-golden`)
+GOLDEN = json.loads((Path(__file__).parent / "golden" / "text_normalize.json").read_text(encoding="utf-8"))
+FUNCTIONS = {
+    "clean_resume_text": clean_resume_text,
+    "collapse_line_breaks": collapse_line_breaks,
+    "normalize_resume_for_matching": normalize_resume_for_matching,
+}
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[c["name"] for c in GOLDEN])
+def test_matches_golden_outputs(case):
+    for name, fn in FUNCTIONS.items():
+        assert fn(case["input"]) == case[name], name
+
+
+def test_nfkc_matches_unicodedata():
+    for text in ["ＰＹＴＨＯＮ，工程师　（北京）", "Ａ́ ﬁ ① ㍿", "é，́", "纯中文无需处理", ""]:
+        assert nfkc(text) == unicodedata.normalize("NFKC", text)
+
+
+def test_matching_cuts_trailing_sections():
+    text = "牛人分析器 活跃度12 查看全部6项分析\n工作经历  A公司\n其他名企经历牛人\n张三\n经历概览\nA公司"
+    assert normalize_resume_for_matching(text) == "工作经历 A公司"
@@ -10,7 +10,9 @@ import time
 import hmac
 import hashlib
 import base64
+import threading
 import urllib.parse
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Iterable
 from collections import Counter, defaultdict
@@ -96,6 +98,8 @@ ZILLIZ_PASSWORD = _env_str("ZILLIZ_PASSWORD")
 CANDIDATE_COLLECTION_NAME = _env_str("ZILLIZ_CANDIDATE_COLLECTION_NAME", "CN_candidates") or "CN_candidates"
 JOB_COLLECTION_NAME = _env_str("ZILLIZ_JOB_COLLECTION_NAME", "CN_jobs") or "CN_jobs"
 EMBEDDING_DIM = _env_int("ZILLIZ_EMBEDDING_DIM", 1536)
+SCAN_BATCH_SIZE = _env_int("ZILLIZ_SCAN_BATCH_SIZE", 2000)
+STATS_CACHE_TTL_SECONDS = _env_int("STATS_CACHE_TTL_SECONDS", 60)
 
 # Stage definitions (from candidate_stages.py)
 STAGE_PASS = "PASS"
@@ -176,6 +180,16 @@ def get_candidate_client() -> MilvusClient:
     # If we reach here, client is guaranteed to be valid
     return _candidate_client
 
+_candidate_field_names = None
+
+def get_candidate_field_names() -> frozenset:
+    """Fields of the remote candidates collection (cached; typed fields may not be migrated yet)."""
+    global _candidate_field_names
+    if _candidate_field_names is None:
+        info = get_candidate_client().describe_collection(collection_name=CANDIDATE_COLLECTION_NAME)
+        _candidate_field_names = frozenset(f.get("name") for f in info.get("fields") or [])
+    return _candidate_field_names
+
 def get_job_client():
     """Get or create job collection Zilliz client (reuse same connection)"""
     global _job_client
@@ -292,28 +306,30 @@ def build_daily_series(candidates: List[Dict[str, Any]], days: int = 7) -> List[
         series.append({"date": d.isoformat(), **data})
     return series
 
-def build_daily_candidate_counts(candidates: List[Dict[str, Any]], total_count: int, days: int = 30) -> List[Dict[str, Any]]:
+def build_daily_candidate_counts(candidates: Iterable[Dict[str, Any]], total_count: Optional[int] = None, days: int = 30) -> List[Dict[str, Any]]:
     """Build daily cumulative candidate counts for historical chart.
     
-    Note: Candidate collection only has updated_at field, not created_at.
-    We use updated_at as the date for counting.
+    Candidates are counted on the day of `created_ts` (epoch ms of the first insert),
+    falling back to `updated_at` for records without it.
     
     Args:
-        candidates: List of candidate records (limited by Milvus query limit)
-        total_count: Total number of candidates in the collection
+        candidates: Candidate records; a full `scan_candidates` stream gives exact counts
+        total_count: Total number of candidates in the collection, only needed when
+            `candidates` is a truncated list (candidates before the period are then estimated)
         days: Number of days to show in the chart
     """
     today = datetime.now().date()
     start = today - timedelta(days=days - 1)
     
-    # Count candidates by updated_at date (candidate collection doesn't have created_at)
+    # Count candidates by creation date
     daily_counts = defaultdict(int)
     candidates_without_date = 0
     candidates_in_period = 0
+    candidates_before_period = 0
     
     for cand in candidates:
-        # Candidate collection only has updated_at, not created_at
-        dt = _parse_dt(cand.get("updated_at"))
+        created_ts = cand.get("created_ts")
+        dt = datetime.fromtimestamp(created_ts / 1000) if created_ts else _parse_dt(cand.get("updated_at"))
         if not dt:
             candidates_without_date += 1
             continue
@@ -321,11 +337,14 @@ def build_daily_candidate_counts(candidates: List[Dict[str, Any]], total_count:
         if day >= start:
             daily_counts[day] += 1
             candidates_in_period += 1
+        else:
+            candidates_before_period += 1
     
-    # Calculate candidates before the period
-    # Since we can only fetch 16384 candidates, we estimate:
-    # total_count - candidates_in_period - candidates_without_date = candidates_before_start
-    candidates_before_start = max(0, total_count - candidates_in_period - candidates_without_date)
+    if total_count is None:
+        candidates_before_start = candidates_before_period
+    else:
+        # Truncated input: total_count - candidates_in_period - candidates_without_date
+        candidates_before_start = max(0, total_count - candidates_in_period - candidates_without_date)
     
     # NOTE: Keep this function quiet; it runs on many requests.
     
@@ -385,6 +404,40 @@ def conversion_table(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     return rows
 
+def _clean_candidate(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe copy of a Milvus row (analysis stored as a JSON string is parsed)."""
+    cleaned_result = _json_safe(result)
+    # If analysis is a JSON string, parse and clean it
+    if "analysis" in cleaned_result and isinstance(cleaned_result["analysis"], str):
+        try:
+            analysis_dict = json.loads(cleaned_result["analysis"])
+            cleaned_result["analysis"] = _json_safe(analysis_dict)
+        except:
+            pass  # Keep as string if parsing fails
+    return cleaned_result
+
+def scan_candidates(
+    filter_expr: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    batch_size: int = SCAN_BATCH_SIZE,
+) -> Iterable[Dict[str, Any]]:
+    """Stream all matching candidates with `query_iterator` (no 16384 cap, one batch in memory)."""
+    client = get_candidate_client()
+    iterator = client.query_iterator(
+        collection_name=CANDIDATE_COLLECTION_NAME,
+        filter=filter_expr or "",
+        output_fields=fields or ["candidate_id", "updated_at"],
+        batch_size=batch_size,
+    )
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            yield from batch
+    finally:
+        iterator.close()
+
 def search_candidates_advanced(
     job_applied: Optional[str] = None,
     updated_from: Optional[str] = None,
@@ -403,7 +456,10 @@ def search_candidates_advanced(
     conditions = []
     if job_applied:
         conditions.append(f"job_applied == {_quote(job_applied)}")
-    if updated_from:
+    if updated_from and "updated_ts" in get_candidate_field_names():
+        # Numeric range scan on the epoch-ms field
+        conditions.append(f"updated_ts >= {int(datetime.fromisoformat(updated_from).timestamp() * 1000)}")
+    elif updated_from:
         conditions.append(f"updated_at >= {_quote(updated_from)}")
     
     filter_expr = " and ".join(conditions) if conditions else None
@@ -413,25 +469,19 @@ def search_candidates_advanced(
     sort_dir = "DESC" if sort_direction.lower() != "asc" else "ASC"
     order_clause = f"{sort_by_normalized} {sort_dir}"
     
-    results = client.query(
-        collection_name=CANDIDATE_COLLECTION_NAME,
-        filter=filter_expr,
-        output_fields=fields,
-        limit=limit,
-    )
+    if limit:
+        results = client.query(
+            collection_name=CANDIDATE_COLLECTION_NAME,
+            filter=filter_expr,
+            output_fields=fields,
+            limit=limit,
+        )
+    else:
+        # Unlimited reads stream the whole match set instead of stopping at the 16384 query window
+        results = scan_candidates(filter_expr=filter_expr, fields=fields)
     # Clean Milvus results immediately to prevent bytes keys from propagating
     if results:
-        cleaned_results = []
-        for result in results:
-            cleaned_result = _json_safe(result)
-            # If analysis is a JSON string, parse and clean it
-            if "analysis" in cleaned_result and isinstance(cleaned_result["analysis"], str):
-                try:
-                    analysis_dict = json.loads(cleaned_result["analysis"])
-                    cleaned_result["analysis"] = _json_safe(analysis_dict)
-                except:
-                    pass  # Keep as string if parsing fails
-            cleaned_results.append(cleaned_result)
+        cleaned_results = [_clean_candidate(result) for result in results]
         
         # Sort in memory to ensure consistency (Milvus query order_by might not be reliable)
         reverse = sort_direction.lower() != "asc"
@@ -781,14 +831,10 @@ def _get_statistics_data() -> Dict[str, Any]:
     jobs = stats_data.get("jobs", [])
     best = stats_data.get("best")
     
-    # Get daily candidate counts
-    all_candidates = search_candidates_advanced(
-        fields=["candidate_id", "updated_at"],
-        limit=16384,  # Milvus max limit
-        sort_by="updated_at",
-        sort_direction="desc"
-    )
-    daily_candidate_counts = build_daily_candidate_counts(all_candidates, total_candidates, days=30)
+    # Get daily candidate counts (exact: streams every candidate's creation time)
+    fields = ["candidate_id", "updated_at"] + (["created_ts"] if "created_ts" in get_candidate_field_names() else [])
+    all_candidates = (_clean_candidate(c) for c in scan_candidates(fields=fields))
+    daily_candidate_counts = build_daily_candidate_counts(all_candidates, None, days=30)
     
     # Convert ScoreAnalysis objects to dictionaries
     jobs_serialized = convert_score_analysis(jobs)
@@ -802,6 +848,51 @@ def _get_statistics_data() -> Dict[str, Any]:
     }
     return result
 
+
+# Stale-while-revalidate cache for /api/stats (per warm instance): a stale entry is
+# served immediately while one background thread recomputes it; concurrent requests
+# share the single in-flight computation.
+_stats_cache_lock = threading.Lock()
+_stats_cache_entry: Optional[Dict[str, Any]] = None  # {"data": ..., "at": monotonic}
+_stats_inflight: Optional[Future] = None
+
+
+def _run_stats_refresh(future: Future) -> None:
+    global _stats_cache_entry, _stats_inflight
+    try:
+        data = _get_statistics_data()
+        with _stats_cache_lock:
+            _stats_cache_entry = {"data": data, "at": time.monotonic()}
+        future.set_result(data)
+    except Exception as e:
+        print(f"Refreshing cached stats failed: {type(e).__name__}: {e}", file=sys.stderr)
+        future.set_exception(e)
+    finally:
+        with _stats_cache_lock:
+            _stats_inflight = None
+
+
+def _get_cached_statistics_data() -> Dict[str, Any]:
+    """`_get_statistics_data` behind the stale-while-revalidate cache."""
+    global _stats_inflight
+    start_refresh = False
+    with _stats_cache_lock:
+        entry = _stats_cache_entry
+        stale = entry is None or time.monotonic() - entry["at"] > STATS_CACHE_TTL_SECONDS
+        if stale and _stats_inflight is None:
+            _stats_inflight = Future()
+            start_refresh = True
+        inflight = _stats_inflight
+
+    if start_refresh:
+        if entry is None:
+            _run_stats_refresh(inflight)
+        else:
+            threading.Thread(target=_run_stats_refresh, args=(inflight,), daemon=True).start()
+    if entry is not None:
+        return entry["data"]
+    return inflight.result()
+
 def _get_job_notification_config(job_name: str, default_url: str, default_secret: str) -> Dict[str, Any]:
     """Get notification configuration for a job (job-specific or fallback).
     
@@ -1097,11 +1188,25 @@ from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs
 
 
-def _send_json(handler_obj, status_code: int, payload: dict):
+def _send_json(handler_obj, status_code: int, payload: dict, etag: bool = False):
     body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    if etag:
+        # Clients send the ETag back as If-None-Match and skip unchanged payloads (304)
+        tag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        requested = {t.strip().removeprefix('W/') for t in (handler_obj.headers.get('If-None-Match') or '').split(',')}
+        if tag in requested:
+            handler_obj.send_response(304)
+            handler_obj.send_header('ETag', tag)
+            handler_obj.send_header('Cache-Control', 'no-cache')
+            handler_obj.send_header('Access-Control-Allow-Origin', '*')
+            handler_obj.end_headers()
+            return
     handler_obj.send_response(status_code)
     handler_obj.send_header('Content-Type', 'application/json')
     handler_obj.send_header('Access-Control-Allow-Origin', '*')
+    if etag:
+        handler_obj.send_header('ETag', tag)
+        handler_obj.send_header('Cache-Control', 'no-cache')
     handler_obj.send_header('Content-Length', str(len(body)))
     handler_obj.end_headers()
     handler_obj.wfile.write(body)
@@ -1125,7 +1230,7 @@ class handler(BaseHTTPRequestHandler):
                 job_index_raw = query.get('job_index', [None])[0]
                 job_index = int(job_index_raw) if job_index_raw is not None else None
 
-                stats = _get_statistics_data()
+                stats = _get_cached_statistics_data()
 
                 if fmt in ('report', 'text'):
                     report = format_homepage_stats_report(
@@ -1154,7 +1259,7 @@ class handler(BaseHTTPRequestHandler):
                     'best': stats['best_serialized'],
                     'jobs': stats['jobs_serialized'],
                 }
-                _send_json(self, 200, result)
+                _send_json(self, 200, result, etag=True)
                 return
 
             if path == '/api/send-report':
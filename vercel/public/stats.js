@@ -671,6 +671,9 @@ function renderJobStats(data) {
     initConversionPieCharts();
 }
 
+// ETag of the last rendered /api/stats payload (server answers 304 when unchanged)
+let statsEtag = null;
+
 /**
  * Load and render stats page
  */
@@ -685,11 +688,20 @@ async function loadStatsPage() {
     
     console.log('Loading stats page...');
     try {
+        const headers = { 'Accept': 'application/json' };
+        if (statsEtag) {
+            headers['If-None-Match'] = statsEtag;
+        }
         const response = await fetch('/api/stats', {
             method: 'GET',
-            headers: { 'Accept': 'application/json' }
+            headers,
+            cache: 'no-store'
         });
         
+        if (response.status === 304) {
+            console.log('Stats unchanged (304), keeping current render');
+            return;
+        }
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}`);
         }
@@ -704,6 +716,7 @@ async function loadStatsPage() {
             if (jobStatsContainer) {
                 renderJobStats(data);
             }
+            statsEtag = response.headers.get('ETag');
         } else {
             console.error('Stats API returned success=false:', data);
         }
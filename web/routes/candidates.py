@@ -10,18 +10,20 @@ import asyncio
 from datetime import datetime, timedelta
 import dateutil.parser as parser
 import json
-import re
 from typing import Any, Dict, Optional
 from fastapi import APIRouter, BackgroundTasks, Form, Query, Request, Response, Body, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from tenacity import retry, stop_after_attempt, wait_exponential
-from src.candidate_store import search_candidates_advanced, get_candidate_by_dict, upsert_candidate, _readable_fields, calculate_resume_similarity, candidate_matched
+from src.candidate_store import HEAVY_FIELDS, search_candidates_advanced, get_candidate_by_dict, upsert_candidate, _readable_fields, calculate_resume_similarity, candidate_matched
 from src.jobs_store import get_job_by_id 
 from src.global_logger import logger
-from src import chat_actions, assistant_actions, assistant_utils, recommendation_actions
+from src import chat_actions, assistant_actions, assistant_utils, cpu_pool, recommendation_actions
 from src.assistant_actions import send_dingtalk_notification
 from src.candidate_stages import STAGE_PASS, STAGE_CHAT, STAGE_SEEK, STAGE_CONTACT, ALL_STAGES, derive_stage_from_action
+from src.resume_prescreen import DECISION_LOW, DECISION_PASS, DECISION_SKIP, PrescreenResult, build_prescreen_analysis, prescreen_resume
+from src.conversation_sync import build_watermark, compute_sync_delta, merge_history
+from src.resume_profile import get_resume_profile, parse_resume, with_profile_summary
 import boss_service
 
 router = APIRouter()
@@ -123,7 +125,7 @@ async def list_candidates(
             </div>''')
     
     # Batch query candidates from cloud store
-    fields = [f for f in _readable_fields if f not in {"resume_vector", "full_resume", "resume_text"}]
+    fields = [f for f in _readable_fields if f not in HEAVY_FIELDS]
     found_candidates = search_candidates_advanced(
         candidate_ids= [c.get("candidate_id") for c in candidates if c.get("candidate_id")],
         chat_ids= [c.get("chat_id") for c in candidates if c.get("chat_id")],
@@ -136,19 +138,15 @@ async def list_candidates(
     )
 
     # Render candidate cards
-    html = ""
+    cards = []
     restored = 0
     for i, candidate in enumerate(candidates):
         candidate["mode"] = mode
         candidate["job_id"] = job_id
         # candidate["index"] = i
         candidate["saved"] = False
-        # match stored candidate by chat_id, or name + job_applied
-        matched_candidate = next((c for c in found_candidates if \
-            c.get("name") == candidate['name'] and candidate_matched(candidate, c, mode)), None)
-        # fallback to find individual candidate 
-        if not matched_candidate:
-            matched_candidate = get_candidate_by_dict(dict(**candidate, fields=fields))
+        # match stored candidate by chat_id, or name + job_applied (in a thread: resume comparison is CPU-bound)
+        matched_candidate = await asyncio.to_thread(_match_stored_candidate, candidate, found_candidates, mode, fields)
 
         if matched_candidate:
             if matched_candidate in found_candidates: 
@@ -176,9 +174,11 @@ async def list_candidates(
         if any(h for h in metadata.get("history", []) if h.get("role") == "assistant"):
             candidate['greeted'] = True
         generated_message = candidate.pop("generated_message", '')
+        # candidates de-prioritized by the keyword pre-screen are rendered last
+        low_priority = (metadata.get("prescreen") or {}).get("decision") == DECISION_LOW
         
         template = templates.get_template("partials/candidate_card.html")
-        html += template.render({
+        cards.append((low_priority, template.render({
             "analysis": analysis,
             "resume_text": resume_text,
             "full_resume": full_resume,
@@ -186,11 +186,22 @@ async def list_candidates(
             "generated_message": generated_message,
             "candidate": candidate,
             "selected": False
-        })
+        })))
     logger.info(f"Restored {restored}/{len(candidates)} candidates from cloud store")
+    html = "".join(card for _, card in sorted(cards, key=lambda c: c[0]))
     return HTMLResponse(content=html)
 
 
+def _match_stored_candidate(candidate, found_candidates, mode, fields):
+    """Stored candidate for a listed one: from the batch query, else queried individually."""
+    matched_candidate = next((c for c in found_candidates if \
+        c.get("name") == candidate['name'] and candidate_matched(candidate, c, mode)), None)
+    # fallback to find individual candidate 
+    if not matched_candidate:
+        matched_candidate = get_candidate_by_dict(dict(**candidate, fields=fields))
+    return matched_candidate
+
+
 # ============================================================================
 # Candidate detail endpoints
 # ============================================================================
@@ -328,6 +339,7 @@ async def analyze_and_generate(
     candidate_id: str = Form(...),
     conversation_id: str = Form(...),
     job_applied: str = Form(...),
+    job_id: Optional[str] = Form(None),
     resume_text: str = Form(None),
     full_resume: str = Form(None),
     analysis: Optional[str] = Form(None),
@@ -340,26 +352,55 @@ async def analyze_and_generate(
     analysis = json.loads(analysis) if analysis else None
     resume_type = analysis.get('resume_type') if analysis else None
     new_user_messages = []
+    profile = None
+    prescreen_reset = None
     # check if should generate message
-    need_reply, user_messages, assistant_message, chat_history = await _should_generate_message(
+    need_reply, user_messages, assistant_message, chat_history, candidate = await _should_generate_message(
         candidate_id, chat_id, mode, force
     )
     # build user messages from resume
     if full_resume and analysis and resume_type != "full":
         need_reply = True
         logger.debug(f"Analyzing full resume for {name}")
-        new_user_messages += [{"role": "developer", "content": f'这是候选人{name}的完整简历，结合已有对话记录，分析是否匹配{job_applied}这个岗位？\n{full_resume}'}]
+        profile = get_resume_profile({**(candidate or {}), "resume_text": None, "full_resume": full_resume})
+        # the online-resume prescreen (e.g. LOW) no longer applies once the full resume is analysed
+        prescreen_reset = PrescreenResult(DECISION_SKIP, None, reason="已分析完整简历")
+        new_user_messages += [{"role": "developer", "content": f'这是候选人{name}的完整简历，结合已有对话记录，分析是否匹配{job_applied}这个岗位？\n{with_profile_summary(full_resume, profile)}'}]
         resume_type = "full"
     elif resume_text and not analysis:
         need_reply = True
         logger.debug(f"Analyzing online resume for {name}")
-        new_user_messages += [{"role": "developer", "content": f'这是候选人{name}的在线简历，结合已有对话记录，分析是否匹配{job_applied}这个岗位？\n{resume_text}'}]
+        profile = get_resume_profile({**(candidate or {}), "resume_text": resume_text, "full_resume": None})
+        new_user_messages += [{"role": "developer", "content": f'这是候选人{name}的在线简历，结合已有对话记录，分析是否匹配{job_applied}这个岗位？\n{with_profile_summary(resume_text, profile)}'}]
         resume_type = "online"
+
+    job_info = get_job_by_id(job_id) if job_id else None
+    # cheap local keyword pre-screen before spending an LLM call on the online resume
+    prescreen = None
+    if resume_type == "online" and not analysis and not force and job_info:
+        prescreen = prescreen_resume(resume_text, job_info, profile=profile)
         
-    # add new user messages
-    new_user_messages += user_messages
     # Build input for followup action if needed
-    if (mode == "followup" or force) and not new_user_messages:
+    candidate_silent = (mode == "followup" or force) and not new_user_messages and not user_messages
+    candidate_metadata = (candidate or {}).get("metadata") or {}
+    # the page may still hold the conversation that was replaced by compaction
+    compaction_cache = candidate_metadata.get("compaction") or {}
+    if compaction_cache.get("source_conversation_id") == conversation_id:
+        conversation_id = compaction_cache["conversation_id"]
+    sync_watermark = candidate_metadata.get("conversation_sync")
+    # long conversations: summarize older turns into a fresh conversation before syncing
+    if (need_reply or candidate_silent) and not (prescreen and prescreen.decision == DECISION_PASS):
+        compacted = await asyncio.to_thread(
+            assistant_actions.compact_conversation, conversation_id, chat_history, candidate, job_info
+        )
+        if compacted:
+            conversation_id, sync_watermark = compacted["conversation_id"], compacted["watermark"]
+    # add only the chat messages the conversation has not seen yet
+    sync_delta = compute_sync_delta(chat_history, sync_watermark, conversation_id)
+    if sync_delta.dropped:
+        logger.warning(f"Conversation sync for {name} dropped {sync_delta.dropped} older messages ({sync_delta.strategy})")
+    new_user_messages += sync_delta.to_input()
+    if candidate_silent:
         new_user_messages += [{"role": "user", "content": "[沉默]"}]
         need_reply = True
 
@@ -370,15 +411,24 @@ async def analyze_and_generate(
             headers={"HX-Trigger": json.dumps({"showToast": {"message": "不需要回复", "type": "error"}}, ensure_ascii=True)}
         )
 
-    # Always re-run analysis on every request.
-    additional_instruction = f'HR设定的沟通阈值（action=CHAT）是{chat_threshold}， 推荐阈值（action=SEEK）是{borderline_threshold}，请在分析打分时参考。'
-    analysis_result = await asyncio.to_thread(
-        assistant_actions.generate_message,
-        input_message=new_user_messages,
-        conversation_id=conversation_id,
-        purpose="ANALYZE_AND_MESSAGE_ACTION",
-        additional_instruction=additional_instruction,
-    )
+    new_watermark = None
+    if prescreen and prescreen.decision == DECISION_PASS:
+        logger.info(f"Prescreen PASS for {name}, skipping LLM analysis: {prescreen.reason}")
+        analysis_result = build_prescreen_analysis(prescreen)
+    else:
+        # Always re-run analysis on every request.
+        additional_instruction = f'HR设定的沟通阈值（action=CHAT）是{chat_threshold}， 推荐阈值（action=SEEK）是{borderline_threshold}，请在分析打分时参考。'
+        analysis_result = await asyncio.to_thread(
+            assistant_actions.generate_message,
+            input_message=new_user_messages,
+            conversation_id=conversation_id,
+            purpose="ANALYZE_AND_MESSAGE_ACTION",
+            additional_instruction=additional_instruction,
+        )
+        # the conversation now holds the delta and the generated reply
+        new_watermark = build_watermark(
+            conversation_id, chat_history, echoes=[analysis_result.get("message")], previous=sync_watermark
+        )
     analysis_result["resume_type"] = resume_type
     # 安全检查（基于规则），用于检测模型是否按照规则行事
     action = analysis_result.get("action")
@@ -415,6 +465,8 @@ async def analyze_and_generate(
         "action": action,
         "reason": analysis_result.get("reason"),
     }
+    # None values are not written: the stored decision is kept unless the full resume reset it
+    prescreen_record = prescreen if prescreen and prescreen.decision != DECISION_SKIP else prescreen_reset
     # new_chat_history = chat_history + [generated_history_item]
     # new_chat_history = [m for m in new_chat_history if m.get("role") in ["user", "assistant"]] # prevent json over size limit
     # 更新数据
@@ -428,7 +480,9 @@ async def analyze_and_generate(
         stage=stage,
         generated_message=message_text,
         metadata={
-            "history": chat_history + [generated_history_item]
+            "history": chat_history + [generated_history_item],
+            "prescreen": prescreen_record.to_dict() if prescreen_record else None,
+            "conversation_sync": new_watermark,
         }
     )
     
@@ -456,7 +510,7 @@ async def should_reply(
     candidate_id: Optional[str] = Body(None),
     mode: Optional[str] = Body(None),
 ) -> bool:
-    should_generate, _, _, _ = await _should_generate_message(candidate_id, chat_id, mode)
+    should_generate, *_ = await _should_generate_message(candidate_id, chat_id, mode)
     return should_generate
 
 @router.post("/send", response_class=HTMLResponse)
@@ -606,6 +660,8 @@ async def fetch_online_resume(
         if candidate_id: # only update resume_text if candidate_id is provided (initiated), otherwise wait for init-chat to create candidate_id
             upsert_candidate(
                 resume_text=resume_text,
+                # iframe captures return the wasm payload: parse it before it is stringified
+                resume_profile=parse_resume(resume_text) if isinstance(resume_text, dict) else None,
                 chat_id=chat_id,
                 conversation_id=conversation_id,
                 candidate_id=candidate_id,
@@ -787,14 +843,14 @@ async def get_thread_history(
 #----------------------
 FOLLOWUP_DELTA_DAYS = 2
 MAX_FOLLOWUP_DAYS = 20
-async def _should_generate_message(candidate_id: str, chat_id: str, mode: str, force = False) -> tuple[bool, list]:
+async def _should_generate_message(candidate_id: str, chat_id: str, mode: str, force = False) -> tuple[bool, list, dict, list, Optional[dict]]:
     """Check if should generate message for candidate.
     Args:
         chat_id: Chat ID to get chat history from browser
         mode: Mode (recommend/chat/greet/followup)
         force: Force generate message
     Returns:
-        bool, list
+        should_generate, new_user_messages, assistant_message, chat_history, candidate
     """   
     should_generate = False
     new_user_messages, chat_history = [], []
@@ -802,9 +858,9 @@ async def _should_generate_message(candidate_id: str, chat_id: str, mode: str, f
     # get candidate from database
     candidate = get_candidate_by_dict({"candidate_id": candidate_id})
     # if candidate not saved, it's probably a new candidate, so we should generate message
-    if not candidate: return True, [], {}, []
+    if not candidate: return True, [], {}, [], None
     # if the candidate is already passed, don't reply
-    if candidate.get("stage") == STAGE_PASS: return False, [], {}, []
+    if candidate.get("stage") == STAGE_PASS: return False, [], {}, [], candidate
     # Get analysis result
     analysis_result = candidate.get("analysis")
     # Get new user messages and assistant message from candidate metadata
@@ -820,13 +876,16 @@ async def _should_generate_message(candidate_id: str, chat_id: str, mode: str, f
     elif bool(new_user_messages):
         should_generate = True
     elif mode == "followup":
-        # check if updated_at has exceeded FOLLOWUP_MAX_DAYS
-        updated_at = candidate.get("updated_at")
-        updated_at = parser.parse(updated_at).replace(tzinfo=None)
+        # check if the last update is inside the followup window
+        updated_ts = candidate.get("updated_ts")
+        if updated_ts:
+            updated_at = datetime.fromtimestamp(updated_ts / 1000)
+        else:
+            updated_at = parser.parse(candidate.get("updated_at")).replace(tzinfo=None)
         diff_days = (datetime.now() - updated_at).days
         if diff_days > FOLLOWUP_DELTA_DAYS and diff_days < MAX_FOLLOWUP_DAYS:
             should_generate = True
-    return should_generate, new_user_messages, assistant_message, chat_history
+    return should_generate, new_user_messages, assistant_message, chat_history, candidate
 
 
 async def _get_chat_history(candidate) -> Optional[dict]:
@@ -840,8 +899,8 @@ async def _get_chat_history(candidate) -> Optional[dict]:
     page = await boss_service.service._ensure_browser_session()
     chat_history = await chat_actions.get_chat_history_action(page, candidate["chat_id"])
     new_user_messages, assistant_message, _, _ = _extract_user_assistant_messages(chat_history, skip_words=['方便发一份简历过来吗'])
-    # merge history from browser to metadata
-    merged_history = _merge_history(metadata_history, chat_history)
+    # merge history from browser to metadata (long histories are merged in the process pool)
+    merged_history = await cpu_pool.run(merge_history, metadata_history, chat_history, size=_history_chars(metadata_history, chat_history))
     if len(metadata_history) < len(merged_history):
         upsert_candidate(
             candidate_id=candidate["candidate_id"],
@@ -849,6 +908,9 @@ async def _get_chat_history(candidate) -> Optional[dict]:
         )
     return new_user_messages, assistant_message, merged_history
 
+def _history_chars(*histories) -> int:
+    return sum(len(str(msg.get("content") or "")) for history in histories for msg in history or [])
+
 def _extract_user_assistant_messages(history, skip_words:list=[], detect_words:list=[]):
     """Extract user and last assistant messages from history.
     Args:
@@ -876,30 +938,3 @@ def _extract_user_assistant_messages(history, skip_words:list=[], detect_words:l
         elif role == "user":
             new_user_messages.insert(0, msg)
     return new_user_messages, assistant_message, skipped, detected
-
-def _merge_history(metadata_history, browser_history):
-    ''' merge history from browser to metadata
-    metadata_history: list of dict [{"role": "user/assistant", "timestamp": "2025-11-10 10:00:00", "content": "你好，我叫张三", "status": "未读", "action": "CHAT"}]
-    browser_history: list of dict [{"role": "user/assistant", "timestamp": "2025-11-10 10:00:00", "content": "你好，我叫张三", "status": "未读"}]
-    '''
-    if not metadata_history:
-        return browser_history
-    if not browser_history:
-        return metadata_history
-    
-    merged = metadata_history.copy()
-    for msg in merged:
-        msg["timestamp"] = re.sub(r'[\u4e00-\u9fff]+', '', msg.get("timestamp", ""))
-    metadata_messages_set = {(msg.get("role"), msg.get("content")):msg for msg in metadata_history}
-    for browser_msg in browser_history:
-        key = (browser_msg.get("role"), browser_msg.get("content"))
-        if key not in metadata_messages_set:
-            timestamp_str = browser_msg.get("timestamp")
-            browser_msg['timestamp'] = re.sub(r'[\u4e00-\u9fff]+', '', timestamp_str)
-            merged.append(browser_msg)
-        else:
-            msg = metadata_messages_set[key]
-            msg["timestamp"] = re.sub(r'[\u4e00-\u9fff]+', '', browser_msg["timestamp"])
-    
-    merged.sort(key=lambda x: parser.parse(x.get("timestamp", "1970-01-01 00:00:00")))
-    return merged
\ No newline at end of file
@@ -4,15 +4,22 @@ Allows searching candidates by name and job_applied for viewing by other colleag
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlencode
 
 from fastapi import APIRouter, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from src.candidate_store import (
+    HEAVY_FIELDS,
+    _readable_fields,
+    count_candidates,
+    keyset_sort_field,
+    page_candidates,
     search_candidates_advanced,
 )
 from src.jobs_store import get_all_jobs
+from src.resume_profile import DEGREES
 from src.global_logger import logger
 from web.utils.performance import profile_operation
 
@@ -48,6 +55,25 @@ def _days_ago_filter(date_val):
 templates.env.filters["days_ago"] = _days_ago_filter
 
 STAGE_OPTIONS = ["PASS", "CHAT", "SEEK", "CONTACT"]
+# Flush the streamed HTML once this many characters are buffered
+STREAM_CHUNK_CHARS = 16 * 1024
+
+
+def _stream_template(name: str, context: Dict[str, Any]) -> StreamingResponse:
+    """Render a template incrementally and send it as a chunked HTML response."""
+    def _chunks() -> Iterator[str]:
+        buffer, size = [], 0
+        for piece in templates.get_template(name).generate(context):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= STREAM_CHUNK_CHARS:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+
+    # A sync iterator is consumed in the thread pool, so rendering never blocks the event loop
+    return StreamingResponse(_chunks(), media_type="text/html; charset=utf-8")
 
 
 @router.get("", response_class=HTMLResponse)
@@ -67,6 +93,7 @@ async def search_page(request: Request):
             "jobs": jobs,
             "job_positions": job_positions,
             "stage_options": STAGE_OPTIONS,
+            "degree_options": DEGREES,
         })
     
     html_content = await asyncio.to_thread(_render_template)
@@ -82,15 +109,23 @@ async def search_candidates(
     notified: Optional[str] = Query(None, description="Notified flag (true/false)"),
     contacted: Optional[str] = Query(None, description="Contacted flag (true/false)"),
     score_min: Optional[float] = Query(None, ge=0, le=10, description="Minimum analysis score (0-10)"),
+    min_degree: Optional[str] = Query(None, description="Lowest highest degree (e.g. 本科), from the parsed resume"),
+    school: Optional[str] = Query(None, description="School name, from the parsed resume"),
     date_from: Optional[str] = Query(None, description="Updated at (from, YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="Updated at (to, YYYY-MM-DD)"),
     resume_contains: Optional[str] = Query(None, description="Resume text contains"),
     semantic_query: Optional[str] = Query(None, description="Semantic search query"),
-    sort_by: str = Query("updated_at"),
+    sort_by: str = Query("", description="Sort field (default: relevance for text queries, else updated_at)"),
     sort_dir: str = Query("desc"),
-    limit: int = Query(100, gt=0, le=500, description="Result limit (1-500)"),
+    limit: int = Query(100, gt=0, le=500, description="Page size (1-500)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor of the next page (returns rows only)"),
 ):
-    """Search for candidates with advanced filters and return a table view."""
+    """Search for candidates with advanced filters and return a table view.
+
+    Column sorts are paged with keyset cursors: the first request renders the table
+    with the first page, and a sentinel row fetches the next page (`cursor`) when it
+    scrolls into view. Relevance / semantic / contact orderings return one page.
+    """
 
     def _parse_date(date_value: Optional[str], end_of_day: bool = False) -> Optional[str]:
         if not date_value:
@@ -103,6 +138,10 @@ async def search_candidates(
         except ValueError:
             return None
 
+    # Text queries are ranked by the hybrid retrieval unless a column sort was chosen
+    has_text_query = bool((resume_contains or "").strip() or (semantic_query or "").strip())
+    sort_by = sort_by or ("relevance" if has_text_query else "updated_at")
+
     updated_from = _parse_date(date_from)
     updated_to = _parse_date(date_to, end_of_day=True)
     
@@ -125,12 +164,10 @@ async def search_candidates(
             contacted_bool = False
 
     # Search candidates (database query, no browser lock needed)
-    # Exclude large fields to prevent gRPC message size limit errors
-    from src.candidate_store import _readable_fields
-    fields_to_remove = {"resume_vector", "full_resume", "resume_text"}
-    fields = [f for f in _readable_fields if f not in fields_to_remove]
+    # Heavy fields are only loaded by the detail view
+    fields = [f for f in _readable_fields if f not in HEAVY_FIELDS]
     
-    candidates = search_candidates_advanced(
+    filters = dict(
         names=[name.strip()] if name and name.strip() else None,
         job_applied=job_applied.strip() if job_applied else None,
         stage=stage.strip() if stage else None,
@@ -139,27 +176,52 @@ async def search_candidates(
         updated_from=updated_from,
         updated_to=updated_to,
         resume_contains=resume_contains.strip() if resume_contains else None,
-        semantic_query=semantic_query.strip() if semantic_query else None,
         min_score=score_min,
-        limit=limit,
-        sort_by=sort_by,
-        sort_direction=sort_dir,
-        fields=fields,
+        min_degree=min_degree.strip() if min_degree else None,
+        school=school.strip() if school else None,
     )
+    context = {"request": request, "sort_by": sort_by, "sort_dir": sort_dir, "next_url": None}
 
-    # Render template content in thread pool to avoid blocking event loop
-    def _render_template():
-        template = templates.get_template("partials/search_results_table.html")
-        return template.render({
-            "request": request,
-            "candidates": candidates,
-            "result_count": len(candidates),
-            "sort_by": sort_by,
-            "sort_dir": sort_dir,
-        })
-    
-    html_content = await asyncio.to_thread(_render_template)
-    return HTMLResponse(content=html_content)
+    if semantic_query and semantic_query.strip() or keyset_sort_field(sort_by) is None:
+        candidates = await asyncio.to_thread(
+            search_candidates_advanced,
+            **filters,
+            semantic_query=semantic_query.strip() if semantic_query else None,
+            limit=limit,
+            sort_by=sort_by,
+            sort_direction=sort_dir,
+            fields=fields,
+        )
+        return _stream_template(
+            "partials/search_results_table.html",
+            {**context, "candidates": candidates, "result_count": len(candidates)},
+        )
+
+    try:
+        page = asyncio.to_thread(
+            page_candidates, sort_by=sort_by, sort_direction=sort_dir, cursor=cursor, page_size=limit, fields=fields, **filters
+        )
+        if cursor:
+            candidates, next_cursor = await page
+            total = None
+        else:
+            (candidates, next_cursor), total = await asyncio.gather(page, asyncio.to_thread(count_candidates, **filters))
+    except ValueError as exc:
+        logger.warning("search page error: %s", exc)
+        return HTMLResponse(content="", status_code=400)
+    except Exception as exc:
+        logger.exception("Failed to page candidates: %s", exc)
+        candidates, next_cursor, total = [], None, 0
+
+    if next_cursor:
+        params = {k: v for k, v in request.query_params.items() if v and k != "cursor"}
+        context["next_url"] = f"{request.url.path}?{urlencode({**params, 'cursor': next_cursor})}"
+    if cursor:
+        return _stream_template("partials/search_result_rows.html", {**context, "candidates": candidates})
+    return _stream_template(
+        "partials/search_results_table.html",
+        {**context, "candidates": candidates, "result_count": total if total is not None else len(candidates)},
+    )
 
 
 @router.get("/detail/{candidate_id}", response_class=HTMLResponse)